@@ -0,0 +1,73 @@
+"""
+Benchmark incremental bar aggregation against resampling tick history.
+
+Streams SyntheticFeed ticks through a TickStore with a BarAggregator
+attached and reports sustained ticks per second with and without bar
+building. Then compares reading the latest 1s/1m/5m bars of every token
+(zero-copy views) with rebuilding them by pandas resample each cycle.
+Usage:
+
+    python benchmarks/bench_bar_aggregator.py --tokens 200 --ticks 500000
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--tokens', type=int, default=200)
+    parser.add_argument('--ticks', type=int, default=500000)
+    parser.add_argument('--bars', type=int, default=100)
+    args = parser.parse_args()
+
+    import pandas as pd
+    from models.bar_aggregator import BarAggregator, TIMEFRAMES
+    from models.synthetic_feed import SyntheticFeed
+    from models.tick_store import TickStore
+
+    tokens = list(range(40000, 40000 + args.tokens))
+    ticks = list(SyntheticFeed(tokens, seed=0).ticks(args.ticks))
+    capacity = args.ticks // args.tokens * 4
+
+    plain = TickStore(capacity=capacity)
+    start = time.perf_counter()
+    for tick in ticks:
+        plain.write(*tick)
+    store_only = time.perf_counter() - start
+
+    store = TickStore(capacity=capacity)
+    aggregator = BarAggregator(capacity=1000)
+    aggregator.attach(store)
+    start = time.perf_counter()
+    for tick in ticks:
+        store.write(*tick)
+    with_bars = time.perf_counter() - start
+    # The feed has stopped; close the last bar of every token
+    aggregator.flush()
+
+    start = time.perf_counter()
+    for token in tokens:
+        for timeframe in TIMEFRAMES:
+            aggregator.bars(token, timeframe, args.bars)
+    views = time.perf_counter() - start
+
+    rules = {'1s': '1s', '1m': '1min', '5m': '5min'}
+    start = time.perf_counter()
+    for token in tokens:
+        history = pd.DataFrame(store.history(token))
+        history.index = pd.to_datetime(history['ts'], unit='ms')
+        for rule in rules.values():
+            history['ltp'].resample(rule).ohlc().dropna().tail(args.bars)
+    resampled = time.perf_counter() - start
+
+    print(f"{args.ticks:,} ticks over {args.tokens} tokens, timeframes {', '.join(TIMEFRAMES)}")
+    print(f"{'ingest, ticks only':<28}{args.ticks / store_only:>14,.0f} ticks/s")
+    print(f"{'ingest, with bars':<28}{args.ticks / with_bars:>14,.0f} ticks/s")
+    print(f"{'latest bars (views)':<28}{views * 1000:>14.2f} ms per cycle")
+    print(f"{'latest bars (resample)':<28}{resampled * 1000:>14.2f} ms per cycle")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""
+Benchmark bulk token resolution against the per-call get_token_info loop.
+
+Builds a synthetic option master, then resolves a basket of option keys
+with TokenData.resolve_tokens and with one get_token_info call per key
+(cold and warm lookup cache). Usage:
+
+    python benchmarks/bench_bulk_resolve.py --rows 100000 --keys 500
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--keys', type=int, default=500)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    import numpy as np
+    from bench_scrip_parser import make_payload
+    from models.scrip_parser import parse_scrip_master
+    from models.token_data import TokenData, _parse_expiry
+
+    df, _ = parse_scrip_master([make_payload(args.rows)])
+    df['expiry'] = _parse_expiry(df['expiry'])
+
+    token_data = TokenData(snapshot_dir=tempfile.mkdtemp(), cache_size=args.keys * 2)
+    token_data._set_data(df)
+    token_data._last_update = datetime.now()
+
+    rng = np.random.default_rng(0)
+    rows = rng.choice(len(df), size=args.keys)
+    keys = [
+        (df['name'].iloc[i], 'OPTIDX', df['strike'].iloc[i] / 100, df['symbol'].iloc[i][-2:])
+        for i in rows
+    ]
+
+    def per_call() -> None:
+        for symbol, instrumenttype, strike, pe_ce in keys:
+            token_data.get_token_info(symbol, 'NFO', instrumenttype, strike, pe_ce)
+
+    def timed(fn, setup=None) -> float:
+        best = float('inf')
+        for _ in range(args.repeat):
+            if setup is not None:
+                setup()
+            start = time.perf_counter()
+            fn()
+            best = min(best, time.perf_counter() - start)
+        return best
+
+    token_data.resolve_tokens(keys[:1])  # build the join table once
+    results = {
+        'resolve_tokens': timed(lambda: token_data.resolve_tokens(keys)),
+        'get_token_info (cold cache)': timed(per_call, setup=lambda: token_data._set_data(df)),
+        'get_token_info (warm cache)': timed(per_call),
+    }
+
+    print(f"{args.keys} keys against {len(df)} rows (best of {args.repeat})")
+    for name, seconds in results.items():
+        print(f"{name:<30}{seconds * 1000:>10.2f} ms{args.keys / seconds:>14,.0f} keys/s")
+
+if __name__ == '__main__':
+    main()
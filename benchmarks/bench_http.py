@@ -0,0 +1,100 @@
+"""
+Benchmark SmartAPI-style requests with and without the pooled transport.
+
+Serves a small JSON reply from a local HTTP/1.1 server that sleeps for
+--connect-ms whenever a connection is opened, standing in for the TCP and
+TLS handshake to the broker, and sends the same calls with a bare
+``requests.request`` per call and through ``HttpTransport``, sequentially
+and from --threads threads. Reports total time, p50/p99 latency and how
+many connections each mode opened.
+Usage:
+
+    python benchmarks/bench_http.py --requests 200 --threads 8 --connect-ms 40
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+BODY = json.dumps({'status': True, 'message': 'SUCCESS', 'data': {'orderid': '201020000000080'}}).encode()
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+        time.sleep(self.server.connect_seconds)
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+def run(send, url: str, count: int, threads: int):
+    def call(_):
+        start = time.perf_counter()
+        send('POST', url, data='{}', headers={'Content-Type': 'application/json'}, timeout=7).raise_for_status()
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    if threads > 1:
+        with ThreadPoolExecutor(threads) as executor:
+            latencies = list(executor.map(call, range(count)))
+    else:
+        latencies = [call(i) for i in range(count)]
+    return latencies, time.perf_counter() - start
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--connect-ms', type=float, default=40.0)
+    args = parser.parse_args()
+
+    import requests
+    from models.order_dispatcher import latency_percentiles
+    from utils.http import HttpTransport
+    from utils.profiling import Profiler
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.connections = 0
+    server.connect_seconds = args.connect_ms / 1000
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/rest/secure/angelbroking/order/v1/placeOrder"
+
+    print(f"{args.requests} requests, {args.connect_ms:.0f} ms per new connection")
+    print(f"{'mode':<24}{'total':>12}{'p50':>12}{'p99':>12}{'connections':>14}")
+    for threads in (1, args.threads):
+        transport = HttpTransport(profiler=Profiler())
+        for name, send in (('requests.request', requests.request), ('HttpTransport', transport.request)):
+            server.connections = 0
+            latencies, total = run(send, url, args.requests, threads)
+            stats = latency_percentiles(latencies)
+            print(
+                f"{f'{name} x{threads}':<24}{total * 1000:>9.1f} ms"
+                f"{stats['p50'] * 1000:>9.1f} ms{stats['p99'] * 1000:>9.1f} ms{server.connections:>14}"
+            )
+        host = transport.stats()['hosts'][url[:url.index('/rest')]]
+        print(f"{'':<24}reuse ratio {host['reuse_ratio']:.2f}")
+        transport.close()
+    server.shutdown()
+
+if __name__ == '__main__':
+    main()
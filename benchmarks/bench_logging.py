@@ -0,0 +1,104 @@
+"""
+Benchmark the order-path cost of logging.
+
+Places orders through Client.place_order against a mocked SmartConnect,
+which logs one audit line per order, with the previous synchronous
+handlers (FileHandler + StreamHandler on the caller's thread) and with
+the queued JSON-lines pipeline from setup_logger. Reports per-order
+latency percentiles for each, plus the cost of a debug call that is
+filtered out with f-string versus %-style arguments. Console output goes
+to /dev/null. Usage:
+
+    python benchmarks/bench_logging.py --orders 20000
+"""
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--orders', type=int, default=20000)
+    args = parser.parse_args()
+
+    import numpy as np
+    from unittest.mock import Mock, patch
+    from config import Config
+    from models import client as client_module
+    from utils.logger import setup_logger
+
+    log_dir = tempfile.mkdtemp()
+    Config.LOG_DIR = log_dir
+    devnull = open(os.devnull, 'w')
+    stderr, sys.stderr = sys.stderr, devnull
+
+    # The handlers setup_logger used to attach, writing on the caller's thread
+    sync_logger = logging.getLogger('bench_sync')
+    sync_logger.setLevel(logging.INFO)
+    sync_logger.propagate = False
+    file_handler = logging.FileHandler(os.path.join(log_dir, 'sync.log'))
+    file_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(logging.Formatter('%(levelname)s: %(message)s'))
+    sync_logger.addHandler(file_handler)
+    sync_logger.addHandler(console_handler)
+
+    queued_logger = setup_logger('bench_queued')
+    queued_logger.propagate = False
+    sys.stderr = stderr
+
+    with patch('models.client.SmartConnect') as smart_connect:
+        api = Mock()
+        api.generateSession.return_value = {'data': {'refreshToken': 'token'}}
+        api.getProfile.return_value = {'name': 'Bench'}
+        api.holding.return_value = {'data': []}
+        api.position.return_value = {'data': []}
+        smart_connect.return_value = api
+        with patch.object(client_module, 'app_logger', queued_logger):
+            client = client_module.Client('BENCH01', 'pass', 100000.0)
+    # Plain callable: Mock call bookkeeping would dominate the timings
+    client.obj.placeOrder = lambda params: '201020000000080'
+
+    order = {
+        'variety': 'NORMAL', 'tradingsymbol': 'SBIN-EQ', 'symboltoken': '3045',
+        'transactiontype': 'BUY', 'exchange': 'NSE', 'ordertype': 'MARKET',
+        'producttype': 'INTRADAY', 'duration': 'DAY', 'price': '0', 'quantity': '1'
+    }
+
+    def run(logger):
+        latencies = np.empty(args.orders)
+        with patch.object(client_module, 'app_logger', logger):
+            for i in range(args.orders):
+                start = time.perf_counter()
+                client.place_order(order)
+                latencies[i] = time.perf_counter() - start
+        return latencies
+
+    results = {}
+    for name, logger in (('sync handlers', sync_logger), ('queued JSON lines', queued_logger)):
+        run(logger)  # warm up
+        results[name] = run(logger)
+    queued_logger.listener.stop()
+
+    print(f"{args.orders:,} orders, one audit log line each")
+    for name, latencies in results.items():
+        p50, p99 = np.percentile(latencies, [50, 99]) * 1e6
+        print(f"{name:<20}mean {latencies.mean() * 1e6:>7.1f} us  p50 {p50:>7.1f} us  p99 {p99:>7.1f} us")
+
+    state = {'client': 'BENCH01', 'positions': list(range(50))}
+    start = time.perf_counter()
+    for _ in range(args.orders):
+        queued_logger.debug(f"State {state}")
+    eager = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(args.orders):
+        queued_logger.debug("State %s", state)
+    lazy = time.perf_counter() - start
+    print(f"{'filtered debug':<20}f-string {eager / args.orders * 1e6:.2f} us, %-style {lazy / args.orders * 1e6:.2f} us")
+
+if __name__ == '__main__':
+    main()
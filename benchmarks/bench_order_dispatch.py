@@ -0,0 +1,87 @@
+"""
+Benchmark a basket order across many accounts through the OrderDispatcher.
+
+Logs in mocked SmartConnect clients whose placeOrder sleeps for a fixed
+broker round trip, fires one basket across all of them and reports the
+p50/p99 submit-to-acknowledgement latency next to a sequential loop.
+Usage:
+
+    python benchmarks/bench_order_dispatch.py --clients 50 --broker-ms 30
+"""
+import argparse
+import os
+import sys
+import time
+from unittest.mock import Mock, patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+ORDER = {
+    'variety': 'NORMAL',
+    'tradingsymbol': 'SBIN-EQ',
+    'symboltoken': '3045',
+    'transactiontype': 'BUY',
+    'exchange': 'NSE',
+    'ordertype': 'MARKET',
+    'producttype': 'INTRADAY',
+    'duration': 'DAY',
+    'price': '0',
+    'quantity': '1'
+}
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--clients', type=int, default=50)
+    parser.add_argument('--broker-ms', type=float, default=30.0)
+    parser.add_argument('--global-rate', type=float, default=None)
+    parser.add_argument('--client-rate', type=float, default=None)
+    parser.add_argument('--concurrency', type=int, default=None)
+    args = parser.parse_args()
+
+    from config import Config
+    from models.client import Client
+    from models.order_dispatcher import OrderDispatcher, latency_percentiles
+
+    def place_order(params):
+        time.sleep(args.broker_ms / 1000)
+        return '201020000000080'
+
+    with patch('models.client.SmartConnect') as smart_connect:
+        api = Mock()
+        api.generateSession.return_value = {'data': {'refreshToken': 'token'}}
+        api.holding.return_value = {'data': []}
+        api.position.return_value = {'data': []}
+        api.placeOrder.side_effect = place_order
+        smart_connect.return_value = api
+        clients = [Client(f"C{i:04d}", 'pass', 100000.0) for i in range(args.clients)]
+
+    latencies = []
+    start = time.perf_counter()
+    for client in clients:
+        client.place_order(ORDER)
+        latencies.append(time.perf_counter() - start)
+    sequential = latency_percentiles(latencies), time.perf_counter() - start
+
+    dispatcher = OrderDispatcher(args.global_rate, args.client_rate, args.concurrency)
+    try:
+        start = time.perf_counter()
+        acks = [f.result() for f in dispatcher.submit_basket(clients, ORDER)]
+        dispatched = latency_percentiles([ack.latency for ack in acks]), time.perf_counter() - start
+    finally:
+        dispatcher.stop()
+
+    print(f"Basket across {args.clients} clients, {args.broker_ms:.0f} ms broker round trip")
+    print(
+        f"Limits: {args.global_rate or Config.ORDER_RATE_GLOBAL:g}/s global, "
+        f"{args.client_rate or Config.ORDER_RATE_PER_CLIENT:g}/s per client, "
+        f"{args.concurrency or Config.ORDER_CONCURRENCY} in flight"
+    )
+    print(f"{'mode':<14}{'total':>12}{'p50':>12}{'p99':>12}")
+    for name, (stats, total) in (('sequential', sequential), ('dispatcher', dispatched)):
+        print(
+            f"{name:<14}{total * 1000:>9.1f} ms"
+            f"{stats['p50'] * 1000:>9.1f} ms{stats['p99'] * 1000:>9.1f} ms"
+        )
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""
+Benchmark streaming scrip master ingest against json() + from_dict.
+
+Each mode runs in its own subprocess so peak RSS is not polluted by the
+other run. Usage:
+
+    python benchmarks/bench_scrip_parser.py --rows 50000 100000 200000
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+CHUNK_SIZE = 256 * 1024
+
+def make_payload(rows: int) -> bytes:
+    """Build a synthetic scrip master payload with the given row count."""
+    # Encode record by record so building the input does not set the RSS peak
+    payload = bytearray(b'[')
+    for i in range(rows):
+        strike = 1500000 + (i % 400) * 5000
+        side = 'CE' if i % 2 else 'PE'
+        if i:
+            payload += b','
+        payload += json.dumps({
+            'token': str(40000 + i),
+            'symbol': f"NIFTY27JUN24{strike // 100}{side}",
+            'name': 'NIFTY' if i % 3 else 'BANKNIFTY',
+            'expiry': '27JUN2024',
+            'strike': f"{strike:.6f}",
+            'lotsize': '25',
+            'instrumenttype': 'OPTIDX',
+            'exch_seg': 'NFO',
+            'tick_size': '5.000000'
+        }).encode()
+    payload += b']'
+    return bytes(payload)
+
+def run_mode(mode: str, rows: int) -> None:
+    """Parse a synthetic payload once and print a JSON result line."""
+    import pandas as pd
+    from models.scrip_parser import parse_scrip_master, peak_rss_bytes
+
+    payload = make_payload(rows)
+    chunks = (payload[i:i + CHUNK_SIZE] for i in range(0, len(payload), CHUNK_SIZE))
+    baseline = peak_rss_bytes()
+
+    start = time.perf_counter()
+    if mode == 'stream':
+        # Hand over the only reference so the payload can be released
+        df, _ = parse_scrip_master(chunks)
+    else:
+        df = pd.DataFrame.from_dict(json.loads(b''.join(chunks)))
+        df = df.astype({'strike': float})
+    seconds = time.perf_counter() - start
+
+    print(json.dumps({
+        'mode': mode,
+        'rows': len(df),
+        'rows_per_second': len(df) / seconds,
+        'peak_rss_mb': peak_rss_bytes() / 2 ** 20,
+        'peak_rss_delta_mb': (peak_rss_bytes() - baseline) / 2 ** 20
+    }))
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, nargs='+', default=[25000, 50000, 100000])
+    parser.add_argument('--mode', choices=['stream', 'json'])
+    args = parser.parse_args()
+
+    if args.mode:
+        run_mode(args.mode, args.rows[0])
+        return
+
+    print(f"{'mode':<8}{'rows':>10}{'rows/s':>14}{'peak MB':>10}{'delta MB':>10}")
+    for rows in args.rows:
+        for mode in ('json', 'stream'):
+            output = subprocess.run(
+                [sys.executable, __file__, '--mode', mode, '--rows', str(rows)],
+                check=True, capture_output=True, text=True
+            ).stdout.strip().splitlines()[-1]
+            result = json.loads(output)
+            print(
+                f"{result['mode']:<8}{result['rows']:>10}"
+                f"{result['rows_per_second']:>14,.0f}"
+                f"{result['peak_rss_mb']:>10.1f}{result['peak_rss_delta_mb']:>10.1f}"
+            )
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""
+Benchmark vectorized lot-aware sizing against the scalar per-cell loop.
+
+Sizes a grid of random client capitals against random instrument prices
+and lot sizes with size_positions, and with the scalar
+floor(capital / 10 / price) formula per client and instrument. Usage:
+
+    python benchmarks/bench_sizing.py --clients 500 --instruments 200
+"""
+import argparse
+import math
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--clients', type=int, default=500)
+    parser.add_argument('--instruments', type=int, default=200)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    import numpy as np
+    from models.sizing import size_positions
+
+    rng = np.random.default_rng(0)
+    capitals = rng.uniform(50000, 5000000, size=args.clients)
+    prices = rng.uniform(1, 5000, size=args.instruments)
+    lot_sizes = rng.choice([1, 15, 25, 50, 75], size=args.instruments)
+
+    def scalar() -> list:
+        grid = []
+        for capital in capitals.tolist():
+            row = []
+            for price, lot in zip(prices.tolist(), lot_sizes.tolist()):
+                row.append(math.floor(capital / 10 / price) // lot * lot)
+            grid.append(row)
+        return grid
+
+    def timed(fn) -> float:
+        best = float('inf')
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            fn()
+            best = min(best, time.perf_counter() - start)
+        return best
+
+    assert np.array_equal(np.array(scalar()), size_positions(capitals, prices, lot_sizes))
+    results = {
+        'size_positions': timed(lambda: size_positions(capitals, prices, lot_sizes)),
+        'scalar loop': timed(scalar),
+    }
+
+    cells = args.clients * args.instruments
+    print(f"{args.clients} clients x {args.instruments} instruments (best of {args.repeat})")
+    for name, seconds in results.items():
+        print(f"{name:<20}{seconds * 1000:>10.2f} ms{cells / seconds:>16,.0f} cells/s")
+
+if __name__ == '__main__':
+    main()
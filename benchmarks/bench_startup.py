@@ -0,0 +1,100 @@
+"""
+Benchmark application cold start.
+
+Imports the application module in fresh interpreters with ``python -X
+importtime``, reporting the median import time, the slowest imports and
+any heavy modules pulled in, then times a fresh interpreter from launch
+to the main window being shown (offscreen, from a directory whose
+clients.csv lists no clients, so nothing logs in). Exits non-zero when
+the median import exceeds ``--max-import-ms`` so regressions can be
+caught in CI. Usage:
+
+    python benchmarks/bench_startup.py --runs 5 --max-import-ms 300
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY = ('pandas', 'numpy', 'smartapi', 'requests', 'cryptography', 'twisted')
+
+FIRST_WINDOW = """
+import os
+import time
+from PyQt5 import QtWidgets
+import ft
+app = QtWidgets.QApplication([])
+window = ft.MainWindow()
+window.show()
+app.processEvents()
+print(time.time(), flush=True)
+os._exit(0)
+"""
+
+def run_python(args: List[str], cwd: str, timeout: float = 60) -> subprocess.CompletedProcess:
+    env = dict(os.environ, PYTHONPATH=ROOT, QT_QPA_PLATFORM='offscreen')
+    return subprocess.run(
+        [sys.executable] + args, cwd=cwd, env=env,
+        capture_output=True, text=True, check=True, timeout=timeout
+    )
+
+def parse_importtime(stderr: str) -> Tuple[float, Dict[str, float]]:
+    """Get total microseconds and cumulative microseconds per module."""
+    total = 0.0
+    modules: Dict[str, float] = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        modules[name.strip()] = float(cumulative)
+        # Top-level imports sit one space after the separator
+        if not name[1:].startswith(' '):
+            total += float(cumulative)
+    return total, modules
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--module', default='ft')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--top', type=int, default=10)
+    parser.add_argument('--max-import-ms', type=float, default=None,
+                        help='fail if the median import takes longer')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as cwd:
+        with open(os.path.join(cwd, 'clients.csv'), 'w') as f:
+            f.write('Code,Pass\n')
+        totals = []
+        modules: Dict[str, float] = {}
+        for _ in range(args.runs):
+            result = run_python(['-X', 'importtime', '-c', f"import {args.module}"], cwd)
+            total, modules = parse_importtime(result.stderr)
+            totals.append(total)
+
+        windows = []
+        for _ in range(args.runs):
+            start = time.time()
+            result = run_python(['-c', FIRST_WINDOW], cwd)
+            windows.append(float(result.stdout.split()[-1]) - start)
+
+    import_ms = statistics.median(totals) / 1000
+    heavy = [name for name in HEAVY if name in modules]
+    print(f"python -c \"import {args.module}\": median {import_ms:.1f} ms of imports over {args.runs} runs")
+    print(f"heavy modules loaded: {', '.join(heavy) or 'none'}")
+    print("slowest imports (cumulative ms):")
+    for name, cumulative in sorted(modules.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"  {name:<40}{cumulative / 1000:>9.1f}")
+    print(f"launch to first window: median {statistics.median(windows) * 1000:.1f} ms")
+
+    if args.max_import_ms is not None and import_ms > args.max_import_ms:
+        print(f"FAIL: import exceeds {args.max_import_ms:.0f} ms")
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+"""
+Benchmark writing a burst of status messages to the status log widget.
+
+Writes the same burst of order-ack style messages to a QTextBrowser with
+one append per message (the old show_status) and through StatusSink with
+one flush per timer interval, reporting total time and the lines the
+widget ends up holding. Runs offscreen. Usage:
+
+    python benchmarks/bench_status_log.py --messages 20000 --batch 500
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--messages', type=int, default=20000)
+    parser.add_argument('--batch', type=int, default=500,
+                        help='messages arriving per flush interval')
+    parser.add_argument('--max-lines', type=int, default=5000)
+    args = parser.parse_args()
+
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PyQt5 import QtWidgets
+    from ui.status_log import StatusSink
+
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    messages = [f"C{i % 50:03d}: order 2010200{i:08d} placed" for i in range(args.messages)]
+
+    def widget():
+        browser = QtWidgets.QTextBrowser()
+        browser.resize(600, 400)
+        browser.show()
+        app.processEvents()
+        return browser
+
+    direct = widget()
+    start = time.perf_counter()
+    for message in messages:
+        direct.append(message)
+        app.processEvents()
+    direct_seconds = time.perf_counter() - start
+
+    batched = widget()
+    sink = StatusSink(batched, interval_ms=60000, max_lines=args.max_lines)
+    start = time.perf_counter()
+    for i, message in enumerate(messages, 1):
+        sink.post(message)
+        if i % args.batch == 0:
+            sink.flush()
+            app.processEvents()
+    sink.flush()
+    app.processEvents()
+    sink_seconds = time.perf_counter() - start
+
+    print(f"{args.messages:,} messages, {args.batch} per flush, {args.max_lines} lines kept")
+    print(f"{'append per message':<22}{direct_seconds * 1000:>10.1f} ms  {direct.document().blockCount():>7} lines")
+    print(f"{'StatusSink':<22}{sink_seconds * 1000:>10.1f} ms  {batched.document().blockCount():>7} lines")
+
+if __name__ == '__main__':
+    main()
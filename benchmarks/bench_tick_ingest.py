@@ -0,0 +1,64 @@
+"""
+Benchmark sustained tick ingestion into the TickStore ring buffers.
+
+Generates ticks with the local SyntheticFeed and measures ticks per second
+for direct TickStore.write calls and for SmartAPI V2 style messages going
+through SmartWebSocketAdapter, plus buffer memory, memory allocated while
+ingesting (tracemalloc) and peak RSS. Usage:
+
+    python benchmarks/bench_tick_ingest.py --tokens 500 --ticks 1000000
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--tokens', type=int, default=500)
+    parser.add_argument('--ticks', type=int, default=1000000)
+    parser.add_argument('--capacity', type=int, default=4096)
+    args = parser.parse_args()
+
+    from models.scrip_parser import peak_rss_bytes
+    from models.synthetic_feed import SyntheticFeed
+    from models.tick_store import TickStore, SmartWebSocketAdapter
+
+    tokens = list(range(40000, 40000 + args.tokens))
+
+    # Pre-generate so only ingestion is timed
+    ticks = list(SyntheticFeed(tokens, seed=0).ticks(args.ticks))
+    messages = list(SyntheticFeed(tokens, seed=1).messages(args.ticks))
+
+    store = TickStore(capacity=args.capacity)
+    store.subscribe(tokens)
+    write = store.write
+    start = time.perf_counter()
+    for tick in ticks:
+        write(*tick)
+    direct = time.perf_counter() - start
+
+    adapter = SmartWebSocketAdapter(TickStore(capacity=args.capacity))
+    adapter.store.subscribe(tokens)
+    on_data = adapter.on_data
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    for message in messages:
+        on_data(None, message)
+    via_adapter = time.perf_counter() - start
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    print(f"{args.ticks:,} ticks over {args.tokens} tokens, {args.capacity} ticks per token")
+    print(f"{'TickStore.write':<26}{args.ticks / direct:>14,.0f} ticks/s")
+    print(f"{'websocket adapter':<26}{args.ticks / via_adapter:>14,.0f} ticks/s (under tracemalloc)")
+    print(f"{'ring buffer memory':<26}{store.memory_bytes() / 2**20:>14.1f} MiB")
+    print(f"{'retained while ingesting':<26}{retained / 1024:>14.1f} KiB")
+    print(f"{'peak RSS':<26}{peak_rss_bytes() / 2**20:>14.1f} MiB (includes pre-generated ticks)")
+
+if __name__ == '__main__':
+    main()
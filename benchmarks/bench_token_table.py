@@ -0,0 +1,85 @@
+"""
+Benchmark opening a large Token Info result set in the results table.
+
+Builds a synthetic scrip master of option rows and shows all of them in a
+QStandardItemModel (one item per cell) and in TokenTableModel, reporting
+time to populate, Python memory allocated (tracemalloc; Qt item memory
+comes on top) and time to sort every row by strike. Runs offscreen.
+Usage:
+
+    python benchmarks/bench_token_table.py --rows 100000
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=100000)
+    args = parser.parse_args()
+
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    import numpy as np
+    import pandas as pd
+    from PyQt5 import QtGui, QtWidgets
+    from PyQt5.QtCore import Qt
+    from ui.table_model import TokenTableModel
+
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    n = args.rows
+    strikes = np.arange(n) % 1000 * 5000 + 1500000
+    master = pd.DataFrame({
+        'token': np.arange(40000, 40000 + n),
+        'symbol': [f"NIFTY{s // 100}{'CE' if i % 2 else 'PE'}" for i, s in enumerate(strikes)],
+        'name': pd.Categorical(['NIFTY'] * n),
+        'expiry': pd.to_datetime('2024-06-27') + pd.to_timedelta(np.arange(n) % 8 * 7, unit='D'),
+        'strike': strikes,
+        'lotsize': np.full(n, 25),
+        'instrumenttype': pd.Categorical(['OPTIDX'] * n),
+        'exch_seg': pd.Categorical(['NFO'] * n)
+    })
+    positions = np.arange(n)
+
+    def measure(populate):
+        tracemalloc.start()
+        start = time.perf_counter()
+        model = populate()
+        elapsed = time.perf_counter() - start
+        allocated = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        return model, elapsed, allocated
+
+    def standard():
+        model = QtGui.QStandardItemModel(0, len(TokenTableModel.COLUMNS))
+        rows = master.iloc[positions].astype(str)
+        for values in rows[list(TokenTableModel.COLUMNS)].itertuples(index=False):
+            model.appendRow([QtGui.QStandardItem(value) for value in values])
+        return model
+
+    def virtual():
+        model = TokenTableModel()
+        model.set_rows(master, positions)
+        return model
+
+    results = {}
+    for name, populate in (('QStandardItemModel', standard), ('TokenTableModel', virtual)):
+        model, elapsed, allocated = measure(populate)
+        start = time.perf_counter()
+        model.sort(TokenTableModel.COLUMNS.index('strike'), Qt.DescendingOrder)
+        results[name] = (elapsed, allocated, time.perf_counter() - start)
+        del model
+
+    print(f"{n:,} rows x {len(TokenTableModel.COLUMNS)} columns")
+    for name, (elapsed, allocated, sort) in results.items():
+        print(
+            f"{name:<20}open {elapsed * 1000:>9.1f} ms  "
+            f"allocated {allocated / 2**20:>8.1f} MiB  sort {sort * 1000:>8.1f} ms"
+        )
+    app.quit()
+
+if __name__ == '__main__':
+    main()
@@ -1,7 +1,10 @@
 import os
+import threading
+from typing import TYPE_CHECKING, Optional
 from dotenv import load_dotenv
-from cryptography.fernet import Fernet
-import pandas as pd
+
+if TYPE_CHECKING:
+    from cryptography.fernet import Fernet
 
 # Load environment variables
 load_dotenv()
@@ -13,7 +16,8 @@ class Config:
     
     # Trading Settings
     SYMBOLS = ['NIFTY', 'BANKNIFTY']
-    ORDER_TYPES = ['MARKET', 'LIMIT']
+    ORDER_TYPES = ['MARKET', 'LIMIT', 'STOPLOSS_LIMIT', 'STOPLOSS_MARKET']
+    EXCHANGES = ['NSE', 'BSE', 'NFO', 'BFO', 'MCX', 'CDS', 'NCDEX']
     OPTION_TYPES = ['CE', 'PE']
     SEGMENT_TYPES = ['OPTION', 'FUTURE']
     
@@ -21,17 +25,93 @@ class Config:
     DEBUG = os.getenv('DEBUG', 'False').lower() == 'true'
     LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
     
+    # Log files: rotated at LOG_MAX_BYTES or after LOG_ROTATE_HOURS,
+    # keeping LOG_BACKUP_COUNT old files
+    LOG_MAX_BYTES = int(os.getenv('LOG_MAX_BYTES', str(10 * 1024 * 1024)))
+    LOG_BACKUP_COUNT = int(os.getenv('LOG_BACKUP_COUNT', '10'))
+    LOG_ROTATE_HOURS = float(os.getenv('LOG_ROTATE_HOURS', '24'))
+    
+    # Token lookup cache size (entries, LRU eviction)
+    TOKEN_CACHE_SIZE = int(os.getenv('TOKEN_CACHE_SIZE', '4096'))
+    
+    # Daily scrip master refresh (local HH:MM, ahead of the 09:15 open)
+    SCRIP_REFRESH_TIME = os.getenv('SCRIP_REFRESH_TIME', '08:30')
+    
+    # Client login settings
+    LOGIN_WORKERS = int(os.getenv('LOGIN_WORKERS', '8'))
+    DEFAULT_CAPITAL = float(os.getenv('DEFAULT_CAPITAL', '100000'))
+    
+    # Order dispatch: broker rate limits (orders/second) and parallel submits
+    ORDER_RATE_GLOBAL = float(os.getenv('ORDER_RATE_GLOBAL', '20'))
+    ORDER_RATE_PER_CLIENT = float(os.getenv('ORDER_RATE_PER_CLIENT', '10'))
+    ORDER_CONCURRENCY = int(os.getenv('ORDER_CONCURRENCY', '16'))
+    
+    # Market data: ticks per token in the ring buffers, most tokens a tick
+    # store takes (its last-price table is allocated up front), bars per timeframe
+    TICK_BUFFER_SIZE = int(os.getenv('TICK_BUFFER_SIZE', '4096'))
+    TICK_MAX_TOKENS = int(os.getenv('TICK_MAX_TOKENS', '4096'))
+    BAR_HISTORY = int(os.getenv('BAR_HISTORY', '1000'))
+    
+    # PnL display refresh interval (milliseconds)
+    PNL_REFRESH_MS = int(os.getenv('PNL_REFRESH_MS', '500'))
+    
+    # Status log: batch flush interval (milliseconds), lines kept on screen
+    # and messages buffered between flushes before the oldest are dropped
+    STATUS_FLUSH_MS = int(os.getenv('STATUS_FLUSH_MS', '100'))
+    STATUS_MAX_LINES = int(os.getenv('STATUS_MAX_LINES', '5000'))
+    STATUS_MAX_PENDING = int(os.getenv('STATUS_MAX_PENDING', '1000'))
+    
+    # GUI event-loop stall length (milliseconds) at which the watchdog
+    # captures the blocking stack
+    WATCHDOG_STALL_MS = int(os.getenv('WATCHDOG_STALL_MS', '100'))
+    
+    # GUI heartbeat interval (milliseconds) used to measure stalls; kept
+    # well under WATCHDOG_STALL_MS so the watchdog sees regular beats
+    STALL_INTERVAL_MS = int(os.getenv('STALL_INTERVAL_MS', '50'))
+    
+    # Headless engine (python -m engine serve): bind address, shared
+    # secret required from clients (empty disables it), the URL the
+    # desktop app connects to instead of running an engine in process,
+    # and the client request timeout (seconds)
+    ENGINE_HOST = os.getenv('ENGINE_HOST', '127.0.0.1')
+    ENGINE_PORT = int(os.getenv('ENGINE_PORT', '8765'))
+    ENGINE_TOKEN = os.getenv('ENGINE_TOKEN', '')
+    ENGINE_URL = os.getenv('ENGINE_URL', '')
+    ENGINE_TIMEOUT = float(os.getenv('ENGINE_TIMEOUT', '30'))
+    
+    # Shared HTTP transport: connect and read timeouts (seconds), retries
+    # of idempotent requests with exponential backoff (seconds) and
+    # keep-alive connections pooled per host
+    HTTP_CONNECT_TIMEOUT = float(os.getenv('HTTP_CONNECT_TIMEOUT', '5'))
+    HTTP_READ_TIMEOUT = float(os.getenv('HTTP_READ_TIMEOUT', '30'))
+    HTTP_RETRIES = int(os.getenv('HTTP_RETRIES', '3'))
+    HTTP_BACKOFF = float(os.getenv('HTTP_BACKOFF', '0.5'))
+    HTTP_POOL_SIZE = int(os.getenv('HTTP_POOL_SIZE', '16'))
+    
+    # Client credentials file
+    CLIENTS_FILE = os.getenv('CLIENTS_FILE', 'clients.csv')
+    
+    # Session lifecycle: renew this many seconds before the JWT expires;
+    # sessions whose token carries no expiry are assumed to last SESSION_TTL
+    SESSION_RENEW_MARGIN = int(os.getenv('SESSION_RENEW_MARGIN', '600'))
+    SESSION_TTL = int(os.getenv('SESSION_TTL', '28800'))
+    
+    # Failed session refreshes are retried after SESSION_RETRY_DELAY seconds,
+    # doubling per failure up to SESSION_RETRY_MAX_DELAY
+    SESSION_RETRY_DELAY = int(os.getenv('SESSION_RETRY_DELAY', '30'))
+    SESSION_RETRY_MAX_DELAY = int(os.getenv('SESSION_RETRY_MAX_DELAY', '600'))
+    
     # File paths
     BASE_DIR = os.path.dirname(os.path.abspath(__file__))
     LOG_DIR = os.path.join(BASE_DIR, 'logs')
     DATA_DIR = os.path.join(BASE_DIR, 'data')
+    SESSION_DIR = os.path.join(DATA_DIR, 'sessions')
     
     @staticmethod
     def setup_directories():
         """Create necessary directories if they don't exist."""
         for directory in [Config.LOG_DIR, Config.DATA_DIR]:
-            if not os.path.exists(directory):
-                os.makedirs(directory)
+            os.makedirs(directory, exist_ok=True)
     
     @staticmethod
     def get_encryption_key():
@@ -41,19 +121,68 @@ class Config:
             with open(key_file, 'rb') as f:
                 return f.read()
         else:
+            from cryptography.fernet import Fernet
+            os.makedirs(Config.DATA_DIR, exist_ok=True)
             key = Fernet.generate_key()
             with open(key_file, 'wb') as f:
                 f.write(key)
             return key
+    
+    @staticmethod
+    def write_env_template(path: str = '.env') -> bool:
+        """
+        Write an example .env file if none exists.
+        
+        Args:
+            path: File to create
+        
+        Returns:
+            bool: True if the file was written
+        """
+        if os.path.exists(path):
+            return False
+        with open(path, 'w') as f:
+            f.write(ENV_TEMPLATE)
+        return True
 
-# Create necessary directories
-Config.setup_directories()
+# Example .env file content template
+ENV_TEMPLATE = """# API Configuration
+SMART_API_KEY=your_api_key_here
 
-# Create encryption instance
-fernet = Fernet(Config.get_encryption_key())
+# Application Settings
+DEBUG=False
+LOG_LEVEL=INFO
+"""
+
+# Created on first use so importing config touches no files
+_fernet: Optional['Fernet'] = None
+_fernet_lock = threading.Lock()
+
+def get_fernet() -> 'Fernet':
+    """
+    Get the shared encryption instance, reading or generating the key on
+    first use.
+    
+    Returns:
+        Fernet: Encryption instance
+    """
+    global _fernet
+    if _fernet is None:
+        with _fernet_lock:
+            if _fernet is None:
+                from cryptography.fernet import Fernet
+                _fernet = Fernet(Config.get_encryption_key())
+    return _fernet
+
+def __getattr__(name: str):
+    # Keep ``from config import fernet`` working without an import-time key
+    if name == 'fernet':
+        return get_fernet()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 def encrypt_credentials(client_code: str, password: str) -> tuple:
     """Encrypt client credentials."""
+    fernet = get_fernet()
     return (
         fernet.encrypt(client_code.encode()).decode(),
         fernet.encrypt(password.encode()).decode()
@@ -61,18 +190,8 @@ def encrypt_credentials(client_code: str, password: str) -> tuple:
 
 def decrypt_credentials(encrypted_code: str, encrypted_pass: str) -> tuple:
     """Decrypt client credentials."""
+    fernet = get_fernet()
     return (
         fernet.decrypt(encrypted_code.encode()).decode(),
         fernet.decrypt(encrypted_pass.encode()).decode()
     )
-
-# Example .env file content template
-if not os.path.exists('.env'):
-    with open('.env', 'w') as f:
-        f.write("""# API Configuration
-SMART_API_KEY=your_api_key_here
-
-# Application Settings
-DEBUG=False
-LOG_LEVEL=INFO
-""") 
\ No newline at end of file
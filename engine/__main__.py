@@ -0,0 +1,138 @@
+"""
+Headless trading engine.
+
+Serve an engine (loads the scrip master and logs in the clients from
+Config.CLIENTS_FILE):
+
+    python -m engine serve --port 8765
+
+Drive a running engine (URL from --url or ENGINE_URL):
+
+    python -m engine status
+    python -m engine clients
+    python -m engine search NIFTY
+    python -m engine rows NIFTY --strike 22000 --side CE
+    python -m engine order BUY NIFTY24DEC22000CE 43856 --exchange NFO --quantity 50
+    python -m engine pnl
+"""
+import argparse
+import json
+import signal
+import sys
+import threading
+from typing import List, Optional
+from config import Config
+
+def _print(payload) -> None:
+    print(json.dumps(payload, indent=2, default=str))
+
+def serve(args: argparse.Namespace) -> None:
+    """Run an engine and serve it until interrupted."""
+    from engine.core import TradingEngine
+    from engine.server import EngineServer
+    from utils.logger import app_logger, log_exception
+
+    Config.setup_directories()
+    engine = TradingEngine(credentials_path=args.clients)
+    try:
+        server = EngineServer(engine, host=args.host, port=args.port)
+    except ValueError as e:
+        engine.shutdown()
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    engine.start()
+
+    def load_clients():
+        try:
+            result = engine.load_clients()
+            app_logger.info("%d of %d clients logged in", result['logged_in'], result['requested'])
+        except Exception as e:
+            log_exception(app_logger, e, "Failed to load clients")
+
+    if not args.no_clients:
+        threading.Thread(target=load_clients, name='engine-login', daemon=True).start()
+    # Stop cleanly on SIGTERM as well as Ctrl+C
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    app_logger.info("Engine serving on %s", server.url)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        engine.shutdown()
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(prog='python -m engine', description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', default=None, help='engine URL (defaults to ENGINE_URL)')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    serve_parser = commands.add_parser('serve', help='run an engine')
+    serve_parser.add_argument('--host', default=None)
+    serve_parser.add_argument('--port', type=int, default=None)
+    serve_parser.add_argument('--clients', default=None, help='credentials CSV')
+    serve_parser.add_argument('--no-clients', action='store_true', help='do not log in clients')
+
+    commands.add_parser('status', help='engine health')
+    commands.add_parser('clients', help='login state per client')
+    search_parser = commands.add_parser('search', help='search symbols')
+    search_parser.add_argument('query')
+    search_parser.add_argument('--limit', type=int, default=10)
+    rows_parser = commands.add_parser('rows', help='look up instruments')
+    rows_parser.add_argument('symbol')
+    rows_parser.add_argument('--exch-seg', default='NFO')
+    rows_parser.add_argument('--type', default='OPTIDX', help='instrument type')
+    rows_parser.add_argument('--strike', type=float, default=None)
+    rows_parser.add_argument('--side', default='', help='CE or PE')
+    order_parser = commands.add_parser('order', help='place an order for every client')
+    order_parser.add_argument('side', choices=['BUY', 'SELL'])
+    order_parser.add_argument('symbol')
+    order_parser.add_argument('token')
+    order_parser.add_argument('--exchange', choices=Config.EXCHANGES, required=True,
+                              help='exchange segment of the symbol')
+    order_parser.add_argument('--quantity', required=True)
+    order_parser.add_argument('--order-type', choices=Config.ORDER_TYPES, default='MARKET')
+    order_parser.add_argument('--price', default=None)
+    order_parser.add_argument('--trigger-price', default=None, help='stop-loss orders only')
+    order_parser.add_argument('--intraday', action='store_true', help='intraday product type')
+    commands.add_parser('pnl', help='track client books and show PnL')
+    args = parser.parse_args(argv)
+
+    if args.command == 'serve':
+        serve(args)
+        return
+
+    from engine.remote import EngineError, RemoteEngine
+    engine = RemoteEngine(args.url)
+    try:
+        if args.command == 'status':
+            _print(engine.status())
+        elif args.command == 'clients':
+            _print(engine.clients())
+        elif args.command == 'search':
+            _print(engine.search_symbols(args.query, args.limit))
+        elif args.command == 'rows':
+            df, _ = engine.find_rows(args.symbol, args.exch_seg, args.type, args.strike, args.side)
+            print(df.to_string(index=False))
+        elif args.command == 'order':
+            from engine.protocol import order_params
+            params = order_params(
+                args.side, args.symbol, args.token, args.exchange, args.quantity,
+                args.order_type, args.price, args.trigger_price, args.intraday
+            )
+            summary = engine.place_order(params)
+            summary['acks'] = [ack._asdict() for ack in summary['acks']]
+            _print(summary)
+        elif args.command == 'pnl':
+            engine.track_pnl()
+            _print(engine.pnl_totals())
+    except (EngineError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        engine.shutdown()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,282 @@
+import threading
+from concurrent.futures import wait as wait_futures
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+from config import Config
+from models.client import TradingError
+from models.client_pool import ClientPool
+from models.market_feed import MarketFeed
+from models.order_dispatcher import OrderAck, OrderDispatcher, latency_percentiles
+from models.pnl_engine import PnlEngine
+from models.tick_store import TickStore
+from models.token_data import TokenData, token_data as default_token_data
+from utils.http import transport
+from utils.logger import app_logger
+
+def basket_summary(acks: List[OrderAck]) -> Dict[str, Any]:
+    """
+    Summarize the acknowledgements of one basket.
+
+    Args:
+        acks: Acknowledgement per client
+
+    Returns:
+        Dict[str, Any]: count, placed, failed and p50/p99/max
+        submit-to-acknowledgement latency in seconds
+    """
+    stats = latency_percentiles([ack.latency for ack in acks])
+    failed = sum(not ack.ok for ack in acks)
+    return dict(stats, placed=len(acks) - failed, failed=failed)
+
+class TradingEngine:
+    """
+    Headless trading core.
+
+    Hosts the scrip master, client sessions, order dispatch and live PnL
+    without any Qt dependency. Tracked positions are marked from live
+    SmartAPI ticks while the market feed is connected; otherwise they keep
+    the last price of each book refresh. Methods take and return plain data (symbol
+    lookups return the master frame and row positions), so the engine can
+    be driven in process by the desktop app, served to many UI sessions
+    by ``EngineServer`` and used remotely through ``RemoteEngine``, which
+    has the same methods.
+    """
+
+    def __init__(
+        self,
+        token_data: Optional[TokenData] = None,
+        client_pool: Optional[ClientPool] = None,
+        order_dispatcher: Optional[OrderDispatcher] = None,
+        tick_store: Optional[TickStore] = None,
+        credentials_path: Optional[str] = None,
+        market_feed: Optional[MarketFeed] = None
+    ):
+        """
+        Initialize engine.
+
+        Args:
+            token_data: Scrip master (defaults to the shared instance)
+            client_pool: Client sessions (defaults to a new pool)
+            order_dispatcher: Order dispatcher (defaults to a new one)
+            tick_store: Market data store (defaults to a new one)
+            credentials_path: Client credentials CSV (defaults to
+                Config.CLIENTS_FILE)
+            market_feed: Live tick feed (defaults to a SmartAPI websocket
+                feed into the tick store)
+        """
+        self.token_data = token_data or default_token_data
+        self.client_pool = client_pool or ClientPool()
+        self.order_dispatcher = order_dispatcher or OrderDispatcher()
+        self.tick_store = tick_store or TickStore()
+        self.pnl_engine = PnlEngine(self.tick_store)
+        self.market_feed = market_feed or MarketFeed(self.tick_store)
+        self.credentials_path = credentials_path or Config.CLIENTS_FILE
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def start(self) -> None:
+        """Load the scrip master in the background and schedule its daily refresh."""
+        self.token_data.refresh()
+        self.token_data.schedule_refresh()
+
+    def load_clients(self, is_cancelled: Optional[Callable[[], bool]] = None) -> Dict[str, int]:
+        """
+        Log in the clients from the credentials file.
+
+        Clients already in the pool are not logged in again, so every UI
+        session can call this on startup.
+
+        Args:
+            is_cancelled: Stop waiting for logins once this returns True
+
+        Returns:
+            Dict[str, int]: Clients in the file (requested) and clients
+            logged in (logged_in)
+        """
+        requested, futures = self._start_logins()
+        pending = set(futures)
+        while pending and not (is_cancelled and is_cancelled()):
+            _, pending = wait_futures(pending, timeout=0.1)
+        return {'requested': requested, 'logged_in': len(self.client_pool.clients)}
+
+    def start_clients(self) -> Dict[str, int]:
+        """
+        Start logging in the clients from the credentials file without waiting.
+
+        Clients already in the pool are skipped; ``clients`` reports how
+        each login is going.
+
+        Returns:
+            Dict[str, int]: Clients in the file (requested)
+        """
+        requested, _ = self._start_logins()
+        return {'requested': requested}
+
+    def _start_logins(self) -> Tuple[int, List[Any]]:
+        """Submit first logins for the credentials file's new clients."""
+        credentials = self.client_pool.read_credentials(self.credentials_path)
+        return len(credentials), list(self.client_pool.login_all(credentials).values())
+
+    def clients(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get login state per client.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: See ``ClientPool.status``
+        """
+        return self.client_pool.status()
+
+    def search_symbols(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Search trading symbols for autocompletion.
+
+        Args:
+            query: Symbol prefix or underlying name
+            limit: Maximum number of results
+
+        Returns:
+            List[Dict[str, Any]]: Matches with symbol, token and exch_seg;
+            empty until the scrip master is loaded
+        """
+        if not self.token_data.is_loaded:
+            return []
+        return self.token_data.search_symbols(query, limit)
+
+    def find_rows(
+        self,
+        symbol: str,
+        exch_seg: str = 'NSE',
+        instrumenttype: str = 'OPTIDX',
+        strike_price: Optional[float] = None,
+        pe_ce: str = ''
+    ) -> Tuple[pd.DataFrame, np.ndarray]:
+        """
+        Find scrip master rows for a symbol.
+
+        Args:
+            symbol: Underlying name
+            exch_seg: Exchange segment
+            instrumenttype: Instrument type
+            strike_price: Strike (None for every strike)
+            pe_ce: CE, PE or '' for both
+
+        Returns:
+            Tuple[pd.DataFrame, np.ndarray]: See ``TokenData.find_rows``
+        """
+        return self.token_data.find_rows(symbol, exch_seg, instrumenttype, strike_price, pe_ce)
+
+    def place_order(
+        self,
+        params: Dict[str, Any],
+        callback: Optional[Callable[[OrderAck], None]] = None
+    ) -> Dict[str, Any]:
+        """
+        Place the same order for every logged-in client.
+
+        Blocks until every order is acknowledged.
+
+        Args:
+            params: SmartAPI order parameters (see ``order_params``)
+            callback: Called with each OrderAck as it arrives
+
+        Returns:
+            Dict[str, Any]: See ``basket_summary``, plus the OrderAcks in
+            client order under acks
+
+        Raises:
+            TradingError: If the parameters have no known exchange or no
+                clients are logged in
+        """
+        if params.get('exchange') not in Config.EXCHANGES:
+            raise TradingError(f"Unknown exchange {params.get('exchange')!r}")
+        clients = list(self.client_pool.clients.values())
+        if not clients:
+            raise TradingError("No clients are logged in")
+        futures = self.order_dispatcher.submit_basket(clients, params, callback)
+        wait_futures(futures)
+        acks = [future.result() for future in futures]
+        summary = basket_summary(acks)
+        app_logger.info(
+            "%s %s basket: %d placed, %d failed",
+            params.get('transactiontype'), params.get('tradingsymbol'),
+            summary['placed'], summary['failed']
+        )
+        return dict(summary, acks=acks)
+
+    def track_pnl(self) -> Dict[str, Dict[str, float]]:
+        """
+        Track every logged-in client's book and get PnL per client.
+
+        Starts the market feed on first use and subscribes it to every
+        position's instrument, so the PnL follows live ticks.
+
+        Returns:
+            Dict[str, Dict[str, float]]: realized, unrealized and total by
+            client code
+        """
+        clients = list(self.client_pool.clients.values())
+        for client in clients:
+            self.pnl_engine.track(client)
+        self._stream_positions(clients)
+        return {
+            code: {key: float(value) for key, value in row.items()}
+            for code, row in self.pnl_engine.by_client().iterrows()
+        }
+
+    def _stream_positions(self, clients: List[Any]) -> None:
+        """Subscribe the market feed to the instruments the clients hold."""
+        if not clients:
+            return
+        if not self.market_feed.running and not self.market_feed.start(clients[0]):
+            return
+        instruments = []
+        for client in clients:
+            data = client.positions.get('data') if isinstance(client.positions, dict) else None
+            for row in data or []:
+                if row.get('symboltoken') and row.get('exchange'):
+                    instruments.append((int(row['symboltoken']), row['exchange']))
+        self.market_feed.subscribe(instruments)
+
+    def pnl_totals(self) -> Dict[str, float]:
+        """
+        Get aggregate PnL across tracked clients.
+
+        Returns:
+            Dict[str, float]: realized, unrealized, total and the PnL
+            version, which changes whenever the figures do
+        """
+        totals = self.pnl_engine.totals()
+        totals['version'] = self.pnl_engine.version
+        return totals
+
+    def status(self) -> Dict[str, Any]:
+        """
+        Get engine health for monitoring.
+
+        Returns:
+            Dict[str, Any]: Scrip master info, logged-in and known client
+            counts, order latency percentiles, market feed health and
+            connection reuse per HTTP host
+        """
+        return {
+            'scrip_master': dict(self.token_data.snapshot_info, loaded=self.token_data.is_loaded),
+            'clients': {
+                'known': len(self.client_pool.status()),
+                'logged_in': len(self.client_pool.clients)
+            },
+            'orders': self.order_dispatcher.latency_stats(),
+            'feed': self.market_feed.status(),
+            'http': transport.stats()['hosts']
+        }
+
+    def shutdown(self) -> None:
+        """Stop the market feed, client sessions, order dispatch and scheduled refreshes."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        self.market_feed.stop()
+        self.token_data.cancel_schedule()
+        self.client_pool.shutdown()
+        self.order_dispatcher.stop(wait=False)
@@ -0,0 +1,150 @@
+from datetime import date, datetime
+from typing import Any, Dict, Optional, Sequence, Tuple
+from config import Config
+
+# Scrip master columns sent for symbol lookups
+ROW_COLUMNS = ('token', 'symbol', 'name', 'expiry', 'strike', 'lotsize', 'instrumenttype', 'exch_seg')
+
+def json_default(value: Any) -> Any:
+    """Convert numpy scalars and arrays and datetimes for ``json.dumps``."""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+# Content type of streamed engine responses, one JSON document per line
+NDJSON = 'application/x-ndjson'
+
+# Order types that carry a limit price / a trigger price
+PRICED_ORDER_TYPES = ('LIMIT', 'STOPLOSS_LIMIT')
+STOPLOSS_ORDER_TYPES = ('STOPLOSS_LIMIT', 'STOPLOSS_MARKET')
+
+def product_type(exchange: str, intraday: bool = False) -> str:
+    """
+    Get the SmartAPI product type for an exchange.
+
+    Args:
+        exchange: NSE/BSE for cash, anything else for F&O
+        intraday: Square off the position the same day
+
+    Returns:
+        str: INTRADAY, DELIVERY for cash or CARRYFORWARD for F&O
+    """
+    if intraday:
+        return 'INTRADAY'
+    return 'DELIVERY' if exchange in ('NSE', 'BSE') else 'CARRYFORWARD'
+
+def order_params(
+    side: str,
+    symbol: str,
+    token: str,
+    exchange: str,
+    quantity: str,
+    order_type: str = 'MARKET',
+    price: Optional[str] = None,
+    trigger_price: Optional[str] = None,
+    intraday: bool = False
+) -> Dict[str, Any]:
+    """
+    Build SmartAPI order parameters.
+
+    Args:
+        side: BUY or SELL
+        symbol: Trading symbol
+        token: Symbol token
+        exchange: Exchange segment of the symbol (its scrip master
+            ``exch_seg``), e.g. NSE, BSE or NFO
+        quantity: Order quantity
+        order_type: MARKET, LIMIT, STOPLOSS_LIMIT or STOPLOSS_MARKET
+        price: Limit price (ignored for market orders)
+        trigger_price: Trigger price, required for stop-loss orders only
+        intraday: Place an intraday order instead of a delivery (cash) or
+            carry-forward (F&O) one
+
+    Returns:
+        Dict[str, Any]: Parameters for ``placeOrder``
+
+    Raises:
+        ValueError: If the exchange is unknown, or a trigger price is
+            missing for a stop-loss order or given for any other
+    """
+    if exchange not in Config.EXCHANGES:
+        raise ValueError(f"Unknown exchange {exchange!r}")
+    stoploss = order_type in STOPLOSS_ORDER_TYPES
+    if stoploss and not trigger_price:
+        raise ValueError(f"{order_type} orders need a trigger price")
+    if not stoploss and trigger_price:
+        raise ValueError(f"{order_type} orders do not take a trigger price")
+    params = {
+        'variety': 'STOPLOSS' if stoploss else 'NORMAL',
+        'tradingsymbol': symbol,
+        'symboltoken': str(token),
+        'transactiontype': side,
+        'exchange': exchange,
+        'ordertype': order_type,
+        'producttype': product_type(exchange, intraday),
+        'duration': 'DAY',
+        'price': str(price) if order_type in PRICED_ORDER_TYPES and price else '0',
+        'quantity': str(quantity)
+    }
+    if stoploss:
+        params['triggerprice'] = str(trigger_price)
+    return params
+
+def encode_rows(df, positions, columns: Sequence[str] = ROW_COLUMNS) -> Dict[str, Any]:
+    """
+    Encode looked-up scrip master rows column by column.
+
+    Args:
+        df: Scrip master frame
+        positions: Row positions to send
+        columns: Columns to send (those missing from the frame are skipped)
+
+    Returns:
+        Dict[str, Any]: count and a list of values per column; expiries are
+        ISO dates and missing values None
+    """
+    rows = df.iloc[positions]
+    encoded = {}
+    for column in columns:
+        if column not in rows:
+            continue
+        series = rows[column]
+        if column == 'expiry':
+            series = series.dt.strftime('%Y-%m-%d')
+        series = series.astype(object)
+        encoded[column] = series.where(series.notna(), None).tolist()
+    return {'count': len(positions), 'columns': encoded}
+
+def decode_rows(payload: Dict[str, Any]) -> Tuple[Any, Any]:
+    """
+    Rebuild rows encoded by ``encode_rows``.
+
+    Args:
+        payload: Decoded JSON
+
+    Returns:
+        Tuple[pd.DataFrame, np.ndarray]: The rows and their positions, in
+        the shape returned by ``TradingEngine.find_rows``
+    """
+    import numpy as np
+    import pandas as pd
+
+    df = pd.DataFrame(payload['columns'])
+    if 'expiry' in df:
+        df['expiry'] = pd.to_datetime(df['expiry'])
+    return df, np.arange(payload['count'])
+
+def encode_ack(ack) -> Dict[str, Any]:
+    """Encode an OrderAck."""
+    return ack._asdict()
+
+def decode_ack(payload: Dict[str, Any]):
+    """Rebuild an OrderAck encoded by ``encode_ack``."""
+    from models.order_dispatcher import OrderAck
+    return OrderAck(**payload)
+
+def parse_strike(value: Optional[str]) -> Optional[float]:
+    """Parse an optional strike query parameter."""
+    return float(value) if value not in (None, '') else None
@@ -0,0 +1,219 @@
+import json
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+import requests
+from config import Config
+from engine.protocol import NDJSON, decode_ack, decode_rows
+from utils.http import transport
+
+# Login states of a client whose current attempt has not finished
+LOGIN_IN_PROGRESS = ('pending', 'logging_in')
+
+# Seconds between login progress polls
+LOGIN_POLL_INTERVAL = 0.2
+
+class EngineError(Exception):
+    """Error reported by, or while reaching, a remote engine."""
+    pass
+
+class RemoteEngine:
+    """
+    Client for an engine served by ``EngineServer``.
+
+    Has the same methods as ``TradingEngine``, so the desktop app can run
+    against an engine in process or against a shared engine process.
+    Requests share the transport's keep-alive connections to the engine.
+    ``shutdown`` leaves the engine serving other sessions.
+    """
+
+    def __init__(
+        self,
+        url: Optional[str] = None,
+        token: Optional[str] = None,
+        timeout: Optional[float] = None,
+        session: Optional[requests.Session] = None
+    ):
+        """
+        Initialize remote engine client.
+
+        Args:
+            url: Engine base URL (defaults to Config.ENGINE_URL)
+            token: Engine shared secret (defaults to Config.ENGINE_TOKEN)
+            timeout: Request timeout in seconds (defaults to
+                Config.ENGINE_TIMEOUT)
+            session: HTTP session to send requests on (defaults to the
+                shared transport's pooled session for the engine's host)
+        """
+        self.url = (url or Config.ENGINE_URL).rstrip('/')
+        self.timeout = timeout or Config.ENGINE_TIMEOUT
+        self._pooled = session is None
+        self.session = session or transport.session(self.url)
+        token = Config.ENGINE_TOKEN if token is None else token
+        # Sent per request, since the pooled session is shared
+        self.headers = {'Authorization': f"Bearer {token}"} if token else {}
+
+    def _request(self, method: str, path: str, **kwargs: Any) -> Any:
+        """
+        Send a request and decode the JSON response.
+
+        Raises:
+            EngineError: If the engine is unreachable or reports an error
+        """
+        response = self._send(method, path, self.headers, **kwargs)
+        return self._payload(response)
+
+    def _send(self, method: str, path: str, headers: Dict[str, str], **kwargs: Any) -> requests.Response:
+        """Send a request, raising EngineError if the engine is unreachable."""
+        try:
+            return self.session.request(
+                method, self.url + path, headers=headers, timeout=self.timeout, **kwargs
+            )
+        except requests.RequestException as e:
+            raise EngineError(f"Engine at {self.url} is unreachable: {str(e)}")
+
+    def _payload(self, response: requests.Response) -> Any:
+        """Decode a JSON response, raising EngineError for an error status."""
+        try:
+            payload = response.json()
+        except ValueError:
+            raise EngineError(f"Engine returned HTTP {response.status_code}")
+        if response.status_code != 200:
+            raise EngineError(payload.get('error') or f"Engine returned HTTP {response.status_code}")
+        return payload
+
+    def _stream(self, method: str, path: str, **kwargs: Any) -> Iterator[Dict[str, Any]]:
+        """
+        Send a request and decode a streamed response line by line.
+
+        Falls back to the single JSON payload of an engine that does not
+        stream the route.
+
+        Raises:
+            EngineError: If the engine is unreachable, reports an error or
+                drops the connection mid-stream
+        """
+        response = self._send(method, path, dict(self.headers, Accept=NDJSON), stream=True, **kwargs)
+        with response:
+            if NDJSON not in response.headers.get('Content-Type', ''):
+                yield self._payload(response)
+                return
+            try:
+                for line in response.iter_lines():
+                    if line:
+                        yield json.loads(line)
+            except requests.RequestException as e:
+                raise EngineError(f"Engine at {self.url} dropped the stream: {str(e)}")
+
+    def start(self) -> None:
+        """The served engine is started by its own process."""
+        pass
+
+    def load_clients(self, is_cancelled: Optional[Callable[[], bool]] = None) -> Dict[str, int]:
+        """
+        Log in the engine's clients; see ``TradingEngine.load_clients``.
+
+        The engine only starts the logins, and their progress is polled
+        from ``GET /clients``, so many or slow logins never run into the
+        request timeout.
+
+        Args:
+            is_cancelled: Stop waiting for logins once this returns True
+
+        Returns:
+            Dict[str, int]: Clients in the engine's credentials file
+            (requested) and clients logged in (logged_in)
+        """
+        requested = self.start_clients()['requested']
+        while True:
+            status = self.clients()
+            if not any(entry['state'] in LOGIN_IN_PROGRESS for entry in status.values()):
+                break
+            if is_cancelled and is_cancelled():
+                break
+            time.sleep(LOGIN_POLL_INTERVAL)
+        logged_in = sum(entry['state'] == 'ok' for entry in status.values())
+        return {'requested': requested, 'logged_in': logged_in}
+
+    def start_clients(self) -> Dict[str, int]:
+        """Start the engine's logins; see ``TradingEngine.start_clients``."""
+        return self._request('POST', '/clients/load')
+
+    def clients(self) -> Dict[str, Dict[str, Any]]:
+        """Get login state per client; see ``TradingEngine.clients``."""
+        return self._request('GET', '/clients')
+
+    def search_symbols(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Search trading symbols; see ``TradingEngine.search_symbols``."""
+        return self._request('GET', '/symbols', params={'q': query, 'limit': limit})
+
+    def find_rows(
+        self,
+        symbol: str,
+        exch_seg: str = 'NSE',
+        instrumenttype: str = 'OPTIDX',
+        strike_price: Optional[float] = None,
+        pe_ce: str = ''
+    ) -> Tuple[Any, Any]:
+        """
+        Find scrip master rows; see ``TradingEngine.find_rows``.
+
+        Returns:
+            Tuple[pd.DataFrame, np.ndarray]: Only the matching rows, with
+            positions 0..n-1
+        """
+        params = {'symbol': symbol, 'exch_seg': exch_seg, 'instrumenttype': instrumenttype, 'pe_ce': pe_ce}
+        if strike_price is not None:
+            params['strike'] = strike_price
+        return decode_rows(self._request('GET', '/rows', params=params))
+
+    def place_order(
+        self,
+        params: Dict[str, Any],
+        callback: Optional[Callable[[Any], None]] = None
+    ) -> Dict[str, Any]:
+        """
+        Place an order for every logged-in client; see
+        ``TradingEngine.place_order``.
+
+        Acks are streamed, so the callback is called for each OrderAck as
+        the engine receives it, as in process.
+
+        Raises:
+            EngineError: If the engine rejects or fails the basket
+        """
+        summary, streamed = None, False
+        for event in self._stream('POST', '/orders', json={'params': params}):
+            if 'error' in event:
+                raise EngineError(event['error'])
+            if 'ack' in event:
+                if callback is not None:
+                    callback(decode_ack(event['ack']))
+            elif 'summary' in event:
+                summary, streamed = event['summary'], True
+            else:
+                # An engine that does not stream sends the summary alone
+                summary = event
+        if summary is None:
+            raise EngineError(f"Engine at {self.url} closed the order stream early")
+        summary['acks'] = [decode_ack(ack) for ack in summary['acks']]
+        if callback is not None and not streamed:
+            for ack in summary['acks']:
+                callback(ack)
+        return summary
+
+    def track_pnl(self) -> Dict[str, Dict[str, float]]:
+        """Track client books and get PnL; see ``TradingEngine.track_pnl``."""
+        return self._request('POST', '/pnl/track')
+
+    def pnl_totals(self) -> Dict[str, float]:
+        """Get aggregate PnL; see ``TradingEngine.pnl_totals``."""
+        return self._request('GET', '/pnl/totals')
+
+    def status(self) -> Dict[str, Any]:
+        """Get engine health; see ``TradingEngine.status``."""
+        return self._request('GET', '/status')
+
+    def shutdown(self) -> None:
+        """Close the session passed in; pooled connections stay open for reuse."""
+        if not self._pooled:
+            self.session.close()
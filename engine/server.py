@@ -0,0 +1,248 @@
+import hmac
+import ipaddress
+import json
+import queue
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+from config import Config
+from engine.core import TradingEngine
+from engine.protocol import NDJSON, encode_ack, encode_rows, json_default, parse_strike
+from models.client import TradingError
+from models.token_data import TokenDataError
+from utils.logger import app_logger, log_exception
+
+def is_loopback(host: str) -> bool:
+    """
+    Check whether a bind host only accepts local connections.
+
+    Args:
+        host: Host name or IP address
+
+    Returns:
+        bool: True for localhost and loopback addresses
+    """
+    if host == 'localhost':
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+class _Handler(BaseHTTPRequestHandler):
+    """JSON request handler dispatching to the server's engine."""
+
+    server: 'EngineServer'
+    protocol_version = 'HTTP/1.1'
+    # Headers and body are written separately; without TCP_NODELAY the
+    # body waits on the client's delayed ACK on a kept-alive connection
+    disable_nagle_algorithm = True
+
+    def log_message(self, format: str, *args: Any) -> None:
+        app_logger.debug("engine %s - " + format, self.address_string(), *args)
+
+    def do_GET(self) -> None:
+        self._dispatch('GET')
+
+    def do_POST(self) -> None:
+        self._dispatch('POST')
+
+    def _dispatch(self, method: str) -> None:
+        url = urlparse(self.path)
+        route = self.server.routes.get((method, url.path))
+        if route is None:
+            self._send(404, {'error': f"No route for {method} {url.path}"})
+            return
+        if not self._authorized():
+            self._send(401, {'error': "Missing or invalid engine token"})
+            return
+        try:
+            query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+            length = int(self.headers.get('Content-Length') or 0)
+            body = json.loads(self.rfile.read(length)) if length else {}
+            stream = self.server.streams.get((method, url.path))
+            if stream is not None and NDJSON in self.headers.get('Accept', ''):
+                lines = stream(query, body)
+                # Bad requests fail on the first line, before any headers
+                first = next(lines)
+                self._send_stream(first, lines)
+            else:
+                self._send(200, route(query, body))
+        except (TradingError, TokenDataError, KeyError, ValueError) as e:
+            self._send(400, {'error': str(e)})
+        except Exception as e:
+            log_exception(app_logger, e, f"Engine request {method} {url.path} failed")
+            self._send(500, {'error': str(e)})
+
+    def _authorized(self) -> bool:
+        token = self.server.token
+        if not token:
+            return True
+        header = self.headers.get('Authorization', '')
+        return hmac.compare_digest(header.encode(), f"Bearer {token}".encode())
+
+    def _send(self, status: int, payload: Any) -> None:
+        data = json.dumps(payload, separators=(',', ':'), default=json_default).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_stream(self, first: Any, lines: Iterator[Any]) -> None:
+        """Send payloads as chunked newline-delimited JSON as they are produced."""
+        self.send_response(200)
+        self.send_header('Content-Type', NDJSON)
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        payload = first
+        while True:
+            data = json.dumps(payload, separators=(',', ':'), default=json_default).encode() + b'\n'
+            self.wfile.write(b'%x\r\n%s\r\n' % (len(data), data))
+            try:
+                payload = next(lines, None)
+            except Exception as e:
+                # Headers are out; report the failure as the last line
+                log_exception(app_logger, e, f"Engine stream {self.path} failed")
+                payload, lines = {'error': str(e)}, iter(())
+            if payload is None:
+                break
+        self.wfile.write(b'0\r\n\r\n')
+
+class EngineServer(ThreadingHTTPServer):
+    """
+    Local JSON-over-HTTP interface to a TradingEngine.
+
+    Each request runs on its own thread, so many UI sessions (or a load
+    test) can share one engine and one loaded scrip master. Binds to
+    localhost by default; when a token is set every request must carry
+    ``Authorization: Bearer <token>``.
+
+    Refuses to bind any other interface without a token, since
+    ``POST /orders`` places a basket across every logged-in account.
+
+    ``POST /orders`` with ``Accept: application/x-ndjson`` streams one
+    ``{"ack": ...}`` line per client as it is acknowledged, then a
+    ``{"summary": ...}`` line (or ``{"error": ...}`` if the basket fails).
+
+    Routes:
+        GET /status, GET /clients, POST /clients/load,
+        GET /symbols?q=&limit=,
+        GET /rows?symbol=&exch_seg=&instrumenttype=&strike=&pe_ce=,
+        POST /orders {"params": {...}}, POST /pnl/track, GET /pnl/totals
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        engine: TradingEngine,
+        host: Optional[str] = None,
+        port: Optional[int] = None,
+        token: Optional[str] = None
+    ):
+        """
+        Initialize and bind the server.
+
+        Args:
+            engine: Engine to serve
+            host: Interface to bind (defaults to Config.ENGINE_HOST)
+            port: Port to bind, 0 for any free port (defaults to
+                Config.ENGINE_PORT)
+            token: Shared secret required from clients (defaults to
+                Config.ENGINE_TOKEN; empty disables the check, which is
+                only allowed on a loopback host)
+
+        Raises:
+            ValueError: If a non-loopback host is given without a token
+        """
+        host = host or Config.ENGINE_HOST
+        token = Config.ENGINE_TOKEN if token is None else token
+        if not token and not is_loopback(host):
+            raise ValueError(f"Refusing to serve on {host} without an engine token; set ENGINE_TOKEN")
+        super().__init__((host, Config.ENGINE_PORT if port is None else port), _Handler)
+        self.engine = engine
+        self.token = token
+        self._thread: Optional[threading.Thread] = None
+        self.routes: Dict[Tuple[str, str], Callable[[Dict[str, str], Dict[str, Any]], Any]] = {
+            ('GET', '/status'): lambda query, body: engine.status(),
+            ('GET', '/clients'): lambda query, body: engine.clients(),
+            # Logins can outlast any request timeout; clients poll GET /clients
+            ('POST', '/clients/load'): lambda query, body: engine.start_clients(),
+            ('GET', '/symbols'): lambda query, body: engine.search_symbols(
+                query['q'], int(query.get('limit', 10))
+            ),
+            ('GET', '/rows'): self._rows,
+            ('POST', '/orders'): self._orders,
+            ('POST', '/pnl/track'): lambda query, body: engine.track_pnl(),
+            ('GET', '/pnl/totals'): lambda query, body: engine.pnl_totals()
+        }
+        self.streams: Dict[Tuple[str, str], Callable[[Dict[str, str], Dict[str, Any]], Iterator[Any]]] = {
+            ('POST', '/orders'): self._order_stream
+        }
+
+    @property
+    def url(self) -> str:
+        """Base URL of the bound server."""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _rows(self, query: Dict[str, str], body: Dict[str, Any]) -> Dict[str, Any]:
+        df, positions = self.engine.find_rows(
+            query['symbol'],
+            query.get('exch_seg', 'NSE'),
+            query.get('instrumenttype', 'OPTIDX'),
+            parse_strike(query.get('strike')),
+            query.get('pe_ce', '')
+        )
+        return encode_rows(df, positions)
+
+    def _orders(self, query: Dict[str, str], body: Dict[str, Any]) -> Dict[str, Any]:
+        summary = self.engine.place_order(body['params'])
+        summary['acks'] = [encode_ack(ack) for ack in summary['acks']]
+        return summary
+
+    def _order_stream(self, query: Dict[str, str], body: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        params = body['params']
+        events: queue.Queue = queue.Queue()
+
+        def place() -> None:
+            try:
+                events.put(('summary', self.engine.place_order(params, callback=lambda ack: events.put(('ack', ack)))))
+            except Exception as e:
+                events.put(('error', e))
+
+        threading.Thread(target=place, name='engine-order', daemon=True).start()
+        sent = set()
+        while True:
+            kind, value = events.get()
+            if kind == 'error':
+                raise value
+            if kind == 'ack':
+                sent.add(value.client_code)
+                yield {'ack': encode_ack(value)}
+                continue
+            # Ack callbacks run after the futures resolve, so the summary
+            # can overtake the last of them
+            for ack in value['acks']:
+                if ack.client_code not in sent:
+                    sent.add(ack.client_code)
+                    yield {'ack': encode_ack(ack)}
+            value['acks'] = [encode_ack(ack) for ack in value['acks']]
+            yield {'summary': value}
+            return
+
+    def start(self) -> None:
+        """Serve requests on a background thread."""
+        self._thread = threading.Thread(target=self.serve_forever, name='engine-server', daemon=True)
+        self._thread.start()
+        app_logger.info("Engine serving on %s", self.url)
+
+    def stop(self) -> None:
+        """Stop serving and close the socket."""
+        if self._thread is not None:
+            self.shutdown()
+            self._thread.join()
+            self._thread = None
+        self.server_close()
@@ -1,9 +1,8 @@
 import sys
 import os
 from pathlib import Path
-from PyQt5 import QtWidgets
+from PyQt5 import QtCore, QtGui, QtWidgets
 from config import Config
-from models.client import Client, TradingError
 from ui.components import (
     ValidatedLineEdit,
     NumericLineEdit,
@@ -11,24 +10,79 @@ from ui.components import (
     LoadingOverlay,
     ConfirmDialog
 )
+from ui.diagnostics import DiagnosticsDialog
+from ui.status_log import StatusSink
+from ui.workers import TaskRunner, StallMonitor, Worker
 from utils.logger import app_logger, log_exception
-import pandas as pd
+from utils.profiling import EventLoopWatchdog, profiler
 
 class MainWindow(QtWidgets.QMainWindow):
-    def __init__(self):
+    """
+    Desktop client of a trading engine.
+    
+    Every trading call goes through ``engine``, either a TradingEngine
+    running in process or a RemoteEngine talking to ``python -m engine
+    serve``; the window only holds UI state.
+    """
+    
+    # Order acknowledgements arrive on an engine thread
+    orderAcknowledged = QtCore.pyqtSignal(object)
+    
+    def __init__(self, engine=None):
+        """
+        Initialize main window.
+        
+        Args:
+            engine: TradingEngine or RemoteEngine (defaults to a new
+                in-process engine, shut down with the window)
+        """
         super().__init__()
         self.setWindowTitle("TechFin Trading")
         self.setMinimumSize(800, 600)
         
         # Initialize UI
         self._init_ui()
-        
-        # Load clients
-        self._load_clients()
+        self.status_sink = StatusSink(self.status_text, parent=self)
         
         # Setup loading overlay
         self.loading_overlay = LoadingOverlay(self)
         self.loading_overlay.resize(self.size())
+        
+        # Background tasks; Esc cancels whatever is running
+        self.tasks = TaskRunner(self.loading_overlay, parent=self)
+        # Order tasks not yet finished, so Esc can tell which were already sent
+        self._order_tasks = set()
+        self.cancel_shortcut = QtWidgets.QShortcut(QtCore.Qt.Key_Escape, self)
+        self.cancel_shortcut.activated.connect(self._on_cancel_tasks)
+        self.watchdog = EventLoopWatchdog(profiler=profiler)
+        self.stall_monitor = StallMonitor(watchdog=self.watchdog, parent=self)
+        self.stall_monitor.start()
+        
+        # Hidden diagnostics panel
+        self.diagnostics = None
+        self.diagnostics_shortcut = QtWidgets.QShortcut(QtGui.QKeySequence("Ctrl+Shift+D"), self)
+        self.diagnostics_shortcut.activated.connect(self._on_show_diagnostics)
+        
+        # The engine pulls in pandas, numpy and (on first login) smartapi,
+        # so it is imported here rather than with this module
+        self._owns_engine = engine is None
+        if engine is None:
+            from engine.core import TradingEngine
+            engine = TradingEngine()
+        self.engine = engine
+        
+        # Load clients
+        self._load_clients()
+        
+        # Mark-to-market PnL, polled off the GUI thread
+        self._pnl_version = -1
+        self._pnl_pending = False
+        self.pnl_timer = QtCore.QTimer(self)
+        self.pnl_timer.setInterval(Config.PNL_REFRESH_MS)
+        self.pnl_timer.timeout.connect(self._refresh_pnl)
+        
+        # Order acknowledgements
+        self.orderAcknowledged.connect(self._on_order_ack)
     
     def _init_ui(self):
         """Initialize the user interface."""
@@ -58,21 +112,28 @@ class MainWindow(QtWidgets.QMainWindow):
         form_layout = QtWidgets.QFormLayout()
         
         self.order_type = QtWidgets.QComboBox()
-        self.order_type.addItems(["MARKET", "LIMIT"])
+        self.order_type.addItems(Config.ORDER_TYPES)
         self.order_type.currentTextChanged.connect(self._on_order_type_changed)
         
-        self.symbol = SymbolLineEdit()
+        self.symbol = SymbolLineEdit(search=self._search_symbols)
+        self.symbol.symbolSelected.connect(self._on_symbol_selected)
         self.token = NumericLineEdit("Enter Token", allow_float=False, min_value=0)
+        self.exchange = QtWidgets.QComboBox()
+        self.exchange.addItems(Config.EXCHANGES)
         self.quantity = NumericLineEdit("Enter Quantity", allow_float=False, min_value=1)
         self.price = NumericLineEdit("Enter Price", min_value=0)
         self.trigger_price = NumericLineEdit("Enter Trigger Price", min_value=0)
+        self.intraday = QtWidgets.QCheckBox("Square off the same day")
+        self._on_order_type_changed(self.order_type.currentText())
         
         form_layout.addRow("Order Type:", self.order_type)
         form_layout.addRow("Symbol:", self.symbol)
         form_layout.addRow("Token:", self.token)
+        form_layout.addRow("Exchange:", self.exchange)
         form_layout.addRow("Quantity:", self.quantity)
         form_layout.addRow("Price:", self.price)
         form_layout.addRow("Trigger Price:", self.trigger_price)
+        form_layout.addRow("Intraday:", self.intraday)
         
         layout.addLayout(form_layout)
         
@@ -93,6 +154,10 @@ class MainWindow(QtWidgets.QMainWindow):
         
         layout.addLayout(button_layout)
         
+        # Live PnL
+        self.pnl_label = QtWidgets.QLabel("PnL: -")
+        layout.addWidget(self.pnl_label)
+        
         # Status area
         self.status_text = QtWidgets.QTextBrowser()
         layout.addWidget(self.status_text)
@@ -114,7 +179,7 @@ class MainWindow(QtWidgets.QMainWindow):
         self.segment_type.addItems(Config.SEGMENT_TYPES)
         
         self.strike_price = NumericLineEdit(
-            "Strike Price",
+            "Strike Price (all if empty)",
             min_value=0,
             allow_float=False
         )
@@ -134,29 +199,61 @@ class MainWindow(QtWidgets.QMainWindow):
         self.submit_button.clicked.connect(self._on_get_token)
         layout.addWidget(self.submit_button)
         
-        # Results table
+        # Results table; cells are read from the scrip master on demand
+        self.results_filter = QtWidgets.QLineEdit()
+        self.results_filter.setPlaceholderText("Filter symbols")
+        layout.addWidget(self.results_filter)
+        
+        from ui.table_model import TokenTableModel
+        self.results_model = TokenTableModel(parent=tab)
+        self.results_filter.textChanged.connect(self.results_model.set_filter)
         self.results_table = QtWidgets.QTableView()
+        self.results_table.setModel(self.results_model)
+        self.results_table.setSortingEnabled(True)
+        self.results_table.sortByColumn(-1, QtCore.Qt.AscendingOrder)
+        self.results_table.verticalHeader().setDefaultSectionSize(22)
         layout.addWidget(self.results_table)
         
         return tab
     
     def _load_clients(self):
-        """Load client configurations."""
-        try:
-            self.clients_df = pd.read_csv('clients.csv')
-            app_logger.info(f"Loaded {len(self.clients_df)} clients")
-        except Exception as e:
-            log_exception(app_logger, e, "Failed to load clients")
-            self.show_error("Failed to load client configurations")
+        """Log in the engine's clients on a worker."""
+        self.tasks.run(
+            self.engine.load_clients,
+            on_result=self._on_clients_loaded,
+            on_error=self._on_clients_failed,
+            message="Logging in clients...",
+            pass_cancel=True
+        )
+    
+    def _on_clients_loaded(self, result):
+        """Report logged-in clients."""
+        app_logger.info("Loaded %d clients", result['requested'])
+        self.show_status(f"{result['logged_in']} of {result['requested']} clients logged in")
+    
+    def _on_clients_failed(self, error):
+        """Report a failure to load client configurations."""
+        log_exception(app_logger, error, "Failed to load clients")
+        self.show_error("Failed to load client configurations")
+    
+    def _search_symbols(self, query, limit):
+        """Search symbols once the scrip master is available."""
+        return self.engine.search_symbols(query, limit)
+    
+    def _on_symbol_selected(self, symbol, token, exchange):
+        """Fill in the token and exchange of the picked symbol."""
+        self.token.setText(str(token))
+        self.exchange.setCurrentText(exchange)
     
     def _on_order_type_changed(self, order_type):
         """Handle order type changes."""
-        is_market = order_type == "MARKET"
-        self.price.setEnabled(not is_market)
-        self.trigger_price.setEnabled(not is_market)
+        from engine.protocol import PRICED_ORDER_TYPES, STOPLOSS_ORDER_TYPES
+        self.price.setEnabled(order_type in PRICED_ORDER_TYPES)
+        self.trigger_price.setEnabled(order_type in STOPLOSS_ORDER_TYPES)
     
     def _validate_order_inputs(self):
         """Validate order input fields."""
+        from engine.protocol import PRICED_ORDER_TYPES, STOPLOSS_ORDER_TYPES
         if not all([
             self.symbol.is_valid,
             self.token.is_valid,
@@ -164,13 +261,18 @@ class MainWindow(QtWidgets.QMainWindow):
         ]):
             return False
         
-        if self.order_type.currentText() == "LIMIT":
-            if not all([
-                self.price.is_valid,
-                self.trigger_price.is_valid
-            ]):
+        order_type = self.order_type.currentText()
+        if order_type in PRICED_ORDER_TYPES:
+            if not (self.price.text() and self.price.is_valid):
                 return False
         
+        # Only stop-loss orders take a trigger price; the broker rejects it otherwise
+        if order_type in STOPLOSS_ORDER_TYPES:
+            if not (self.trigger_price.text() and self.trigger_price.is_valid):
+                return False
+        elif self.trigger_price.text():
+            return False
+        
         return True
     
     def _on_buy(self):
@@ -203,59 +305,235 @@ class MainWindow(QtWidgets.QMainWindow):
         if dialog.exec_() == QtWidgets.QDialog.Accepted:
             self._place_order("SELL")
     
+    def _order_params(self, side):
+        """Build SmartAPI order parameters from the order form."""
+        from engine.protocol import order_params
+        return order_params(
+            side,
+            self.symbol.text(),
+            self.token.text(),
+            self.exchange.currentText(),
+            self.quantity.text(),
+            self.order_type.currentText(),
+            self.price.text(),
+            self.trigger_price.text(),
+            self.intraday.isChecked()
+        )
+    
     def _place_order(self, side):
-        """Place a trading order."""
+        """Place a trading order for every logged-in client."""
         try:
-            # Implementation of order placement logic
-            self.show_status(f"{side} order placed successfully")
+            # Widgets are read here; only the submission leaves the GUI thread
+            worker = self.tasks.run(
+                self.engine.place_order,
+                self._order_params(side),
+                callback=self.orderAcknowledged.emit,
+                on_result=lambda summary: self._on_order_placed(side, summary),
+                on_error=lambda e: self._on_order_failed(side, e),
+                message=f"Placing {side} order..."
+            )
+            self._order_tasks.add(worker)
+            worker.signals.finished.connect(lambda: self._order_tasks.discard(worker))
         except Exception as e:
-            log_exception(app_logger, e, f"Failed to place {side} order")
-            self.show_error(f"Failed to place {side} order: {str(e)}")
+            self._on_order_failed(side, e)
+    
+    def _on_order_failed(self, side, error):
+        """Report an order that could not be submitted."""
+        log_exception(app_logger, error, f"Failed to place {side} order")
+        self.show_error(f"Failed to place {side} order: {str(error)}")
+    
+    def _on_order_ack(self, ack):
+        """Show an order acknowledgement."""
+        if ack.ok:
+            self.show_status(f"{ack.client_code}: order {ack.order_id} placed")
+        else:
+            self.show_status(f"{ack.client_code}: order failed - {ack.error}")
+    
+    def _on_order_placed(self, side, summary):
+        """Show the basket summary once every order is acknowledged."""
+        self.show_status(
+            f"{side} basket: {summary['placed']} placed, {summary['failed']} failed, "
+            f"p50 {summary['p50'] * 1000:.1f} ms, p99 {summary['p99'] * 1000:.1f} ms"
+        )
     
     def _on_check_pnl(self):
-        """Check profit and loss."""
-        try:
-            # Implementation of PnL calculation
-            self.show_status("PnL calculation completed")
-        except Exception as e:
-            log_exception(app_logger, e, "Failed to calculate PnL")
-            self.show_error(f"Failed to calculate PnL: {str(e)}")
+        """Check profit and loss on a worker and keep it live."""
+        self.tasks.run(
+            self.engine.track_pnl,
+            on_result=self._on_pnl_calculated,
+            on_error=self._on_pnl_failed,
+            message="Calculating PnL..."
+        )
+    
+    def _on_pnl_calculated(self, by_client):
+        """Show the per-client breakdown and start live updates."""
+        for code, row in by_client.items():
+            self.show_status(
+                f"{code}: realized {row['realized']:,.2f}, "
+                f"unrealized {row['unrealized']:,.2f}, total {row['total']:,.2f}"
+            )
+        self._refresh_pnl()
+        self.pnl_timer.start()
+        self.show_status("PnL calculation completed")
+    
+    def _on_pnl_failed(self, error):
+        """Report a failed PnL calculation."""
+        log_exception(app_logger, error, "Failed to calculate PnL")
+        self.show_error(f"Failed to calculate PnL: {str(error)}")
+    
+    def _refresh_pnl(self):
+        """Fetch aggregate PnL on a worker unless a fetch is in flight."""
+        if self._pnl_pending:
+            return
+        self._pnl_pending = True
+        worker = Worker(self.engine.pnl_totals)
+        worker.signals.result.connect(self._on_pnl_totals)
+        worker.signals.finished.connect(self._on_pnl_fetched)
+        self.tasks.pool.start(worker)
+    
+    def _on_pnl_fetched(self):
+        """Allow the next PnL fetch."""
+        self._pnl_pending = False
+    
+    def _on_pnl_totals(self, totals):
+        """Push aggregate PnL to the UI when it has changed."""
+        if totals['version'] == self._pnl_version:
+            return
+        self._pnl_version = totals['version']
+        self.pnl_label.setText(
+            f"PnL: {totals['total']:,.2f} "
+            f"(realized {totals['realized']:,.2f}, unrealized {totals['unrealized']:,.2f})"
+        )
     
     def _on_get_token(self):
-        """Get token information."""
-        try:
-            # Implementation of token information retrieval
-            self.show_status("Token information retrieved")
-        except Exception as e:
-            log_exception(app_logger, e, "Failed to get token information")
-            self.show_error(f"Failed to get token information: {str(e)}")
+        """Look up token information on a worker."""
+        segment = self.segment_type.currentText()
+        strike = self.strike_price.text()
+        self.tasks.run(
+            self.engine.find_rows,
+            self.token_symbol.currentText(),
+            'NFO',
+            'FUTIDX' if segment == 'FUTURE' else 'OPTIDX',
+            float(strike) if segment == 'OPTION' and strike else None,
+            self.option_type.currentText() if segment == 'OPTION' else '',
+            on_result=self._on_token_info,
+            on_error=self._on_token_info_failed,
+            message="Fetching token information..."
+        )
+    
+    def _on_token_info(self, result):
+        """Show the looked-up instruments."""
+        df, positions = result
+        self.results_model.set_rows(df, positions)
+        self.show_status(f"Token information retrieved: {len(positions)} instruments")
+    
+    def _on_token_info_failed(self, error):
+        """Report a failed token lookup."""
+        log_exception(app_logger, error, "Failed to get token information")
+        self.show_error(f"Failed to get token information: {str(error)}")
+    
+    def _on_show_diagnostics(self):
+        """Show latency histograms and event-loop stalls."""
+        if self.diagnostics is None:
+            self.diagnostics = DiagnosticsDialog(profiler, self.watchdog, self)
+        self.diagnostics.refresh()
+        self.diagnostics.show()
+        self.diagnostics.raise_()
+    
+    def _on_cancel_tasks(self):
+        """Cancel running background tasks; orders already submitted still go out."""
+        orders = list(self._order_tasks)
+        cancelled = self.tasks.cancel_all()
+        if not cancelled:
+            return
+        submitted = sum(worker.started for worker in orders)
+        message = f"Cancelled {cancelled} background tasks"
+        if submitted:
+            message += (
+                f"; {submitted} order basket{'s' if submitted > 1 else ''} already "
+                "submitted will still be placed"
+            )
+        self.show_status(message)
     
     def show_error(self, message):
         """Show error message."""
         QtWidgets.QMessageBox.critical(self, "Error", message)
     
     def show_status(self, message):
-        """Show status message."""
-        self.status_text.append(message)
+        """Show status message (written to the log in batches)."""
+        self.status_sink.post(message)
     
     def resizeEvent(self, event):
         """Handle window resize."""
         super().resizeEvent(event)
         self.loading_overlay.resize(event.size())
+    
+    def closeEvent(self, event):
+        """Stop background work before closing."""
+        self.pnl_timer.stop()
+        self.stall_monitor.stop()
+        self.status_sink.stop()
+        self.tasks.cancel_all()
+        if self._owns_engine:
+            self.engine.shutdown()
+        super().closeEvent(event)
+
+def install_profiling(remote=False):
+    """
+    Time MainWindow slots and the engine calls they make.
+    
+    Must run before the window is created so signal connections use the
+    timed methods.
+    
+    Args:
+        remote: Time RemoteEngine requests instead of the in-process
+            engine, Client and TokenData calls
+    """
+    slots = [name for name in vars(MainWindow) if name.startswith('_on_')]
+    slots += ['_load_clients', '_validate_order_inputs', '_place_order', '_refresh_pnl', '_search_symbols']
+    profiler.instrument(MainWindow, slots)
+    profiler.instrument(ConfirmDialog, ['exec_'])
+    if remote:
+        from engine.remote import RemoteEngine
+        profiler.instrument(RemoteEngine)
+        return
+    
+    from engine.core import TradingEngine
+    from models.client import Client
+    from models.token_data import TokenData
+    profiler.instrument(TradingEngine)
+    profiler.instrument(Client)
+    profiler.instrument(Client, ['_initialize_client', '_renew_session', '_update_positions_and_holdings'])
+    profiler.instrument(TokenData)
 
 def main():
     """Application entry point."""
     try:
+        Config.setup_directories()
+        Config.write_env_template()
+        install_profiling(remote=bool(Config.ENGINE_URL))
         app = QtWidgets.QApplication(sys.argv)
         
         # Set application style
         app.setStyle("Fusion")
         
+        # Connect to a served engine if ENGINE_URL is set, else run one here
+        if Config.ENGINE_URL:
+            from engine.remote import RemoteEngine
+            engine = RemoteEngine()
+        else:
+            from engine.core import TradingEngine
+            engine = TradingEngine()
+        # Load the scrip master in the background and schedule its refresh
+        engine.start()
+        
         # Create and show main window
-        window = MainWindow()
+        window = MainWindow(engine)
         window.show()
         
-        sys.exit(app.exec_())
+        code = app.exec_()
+        engine.shutdown()
+        sys.exit(code)
     except Exception as e:
         log_exception(app_logger, e, "Application startup failed")
         sys.exit(1)
@@ -0,0 +1,286 @@
+import time
+from typing import Dict, Optional, Callable, Iterable, Sequence, Tuple
+import numpy as np
+from config import Config
+from utils.logger import app_logger, log_exception
+
+# One bar: start of its period (epoch ms), OHLC in rupees and traded volume
+BAR_DTYPE = np.dtype([
+    ('start', 'i8'),
+    ('open', 'f8'),
+    ('high', 'f8'),
+    ('low', 'f8'),
+    ('close', 'f8'),
+    ('volume', 'i8')
+])
+
+# Supported timeframes and their period in milliseconds
+TIMEFRAMES = {
+    '1s': 1000,
+    '1m': 60 * 1000,
+    '5m': 5 * 60 * 1000
+}
+
+class _BarSeries:
+    """
+    Mirrored ring buffer of one token's bars for one timeframe.
+
+    Every bar is written twice, at ``pos`` and ``pos + capacity``, so the
+    last ``n`` bars are always one contiguous slice ending at
+    ``pos + capacity`` and can be returned as a view without copying.
+    """
+
+    __slots__ = (
+        'buffer', 'start', 'open', 'high', 'low', 'close', 'volume',
+        'period', 'capacity', 'pos', 'count', 'current', 'closed',
+        'bar_high', 'bar_low', 'bar_volume'
+    )
+
+    def __init__(self, period: int, capacity: int):
+        self.buffer = np.zeros(2 * capacity, dtype=BAR_DTYPE)
+        self.start = self.buffer['start']
+        self.open = self.buffer['open']
+        self.high = self.buffer['high']
+        self.low = self.buffer['low']
+        self.close = self.buffer['close']
+        self.volume = self.buffer['volume']
+        self.period = period
+        self.capacity = capacity
+        self.pos = capacity - 1
+        self.count = 0
+        self.current = -1
+        self.closed = True
+        # Open bar's high/low/volume as Python scalars, so ticks only
+        # write to the buffer and never read NumPy scalars back
+        self.bar_high = 0.0
+        self.bar_low = 0.0
+        self.bar_volume = 0
+
+class BarAggregator:
+    """
+    Incremental OHLCV bars built from ticks as they arrive.
+
+    Each tick updates the open bar of every configured timeframe in place.
+    A tick in a later period closes the open bar and starts a new one; a
+    tick from a period before the open bar's is dropped and counted in
+    ``late_ticks``. Periods without ticks produce no bar.
+
+    Nothing closes a bar when ticks stop: the consumer must call ``flush``
+    periodically (from the thread writing ticks), or the last bar of a
+    quiet symbol stays open.
+
+    Bar volume is the increase in the feed's cumulative day volume over
+    the bar. Like ``TickStore``, the aggregator expects a single writer.
+    """
+
+    def __init__(
+        self,
+        timeframes: Sequence[str] = ('1s', '1m', '5m'),
+        capacity: Optional[int] = None
+    ):
+        """
+        Initialize aggregator.
+
+        Args:
+            timeframes: Timeframes to build, keys of TIMEFRAMES
+            capacity: Bars kept per token and timeframe (defaults to
+                Config.BAR_HISTORY)
+
+        Raises:
+            ValueError: If a timeframe is unknown or capacity not positive
+        """
+        unknown = [tf for tf in timeframes if tf not in TIMEFRAMES]
+        if unknown:
+            raise ValueError(f"Unknown timeframes: {', '.join(unknown)}")
+        self.timeframes = tuple(timeframes)
+        self.capacity = capacity or Config.BAR_HISTORY
+        if self.capacity <= 0:
+            raise ValueError("Capacity must be greater than 0")
+
+        # Periods are nested, so a tick late for any timeframe is late for the finest
+        self._finest = min(range(len(self.timeframes)), key=lambda i: TIMEFRAMES[self.timeframes[i]])
+        self.late_ticks = 0
+        self._series: Dict[int, Tuple[_BarSeries, ...]] = {}
+        self._last_volume: Dict[int, int] = {}
+        self._listeners: Tuple[Callable[[int, str, np.void], None], ...] = ()
+
+    def _add(self, token: int) -> Tuple[_BarSeries, ...]:
+        """Allocate the bar series of a new token."""
+        series = tuple(_BarSeries(TIMEFRAMES[tf], self.capacity) for tf in self.timeframes)
+        self._series[token] = series
+        return series
+
+    def subscribe(self, tokens: Iterable[int]) -> None:
+        """
+        Preallocate bar buffers ahead of the first tick.
+
+        Args:
+            tokens: Instrument tokens, e.g. from TokenData.resolve_tokens
+        """
+        for token in tokens:
+            if int(token) not in self._series:
+                self._add(int(token))
+
+    def attach(self, store) -> None:
+        """
+        Build bars from every tick written to a TickStore.
+
+        Args:
+            store: TickStore to listen to
+        """
+        store.add_listener(self.on_tick)
+
+    def add_listener(self, callback: Callable[[int, str, np.void], None]) -> None:
+        """
+        Register a callback for closed bars.
+
+        Args:
+            callback: Called with token, timeframe and a copy of the bar
+        """
+        self._listeners = self._listeners + (callback,)
+
+    def _close(self, token: int, timeframe: str, series: _BarSeries) -> None:
+        """Mark the open bar closed and notify listeners."""
+        series.closed = True
+        if not self._listeners:
+            return
+        bar = series.buffer[series.pos + series.capacity].copy()
+        for callback in self._listeners:
+            try:
+                callback(token, timeframe, bar)
+            except Exception as e:
+                log_exception(app_logger, e, f"Bar listener failed for {token} {timeframe}")
+
+    def on_tick(self, token: int, ts: int, ltp: float, volume: int = 0, oi: int = 0) -> None:
+        """
+        Fold one tick into every timeframe's open bar.
+
+        Args:
+            token: Instrument token
+            ts: Exchange timestamp in epoch milliseconds
+            ltp: Last traded price
+            volume: Cumulative day volume
+            oi: Open interest (unused)
+        """
+        series_set = self._series.get(token)
+        if series_set is None:
+            series_set = self._add(token)
+
+        finest = series_set[self._finest]
+        if ts - ts % finest.period < finest.current:
+            # Its bar is already closed; merging it would rewrite the open one
+            self.late_ticks += 1
+            return
+
+        last_volume = self._last_volume.get(token, volume)
+        traded = volume - last_volume if volume > last_volume else 0
+        self._last_volume[token] = volume
+
+        for timeframe, series in zip(self.timeframes, series_set):
+            start = ts - ts % series.period
+            if start > series.current:
+                if not series.closed:
+                    self._close(token, timeframe, series)
+                pos = series.pos + 1
+                if pos == series.capacity:
+                    pos = 0
+                series.pos = pos
+                series.current = start
+                series.closed = False
+                if series.count < series.capacity:
+                    series.count += 1
+                series.bar_high = series.bar_low = ltp
+                series.bar_volume = traded
+                for i in (pos, pos + series.capacity):
+                    series.start[i] = start
+                    series.open[i] = ltp
+                    series.high[i] = ltp
+                    series.low[i] = ltp
+                    series.close[i] = ltp
+                    series.volume[i] = traded
+            else:
+                # Same period: update the open bar in place
+                pos = series.pos
+                mirror = pos + series.capacity
+                if ltp > series.bar_high:
+                    series.bar_high = ltp
+                    series.high[pos] = series.high[mirror] = ltp
+                elif ltp < series.bar_low:
+                    series.bar_low = ltp
+                    series.low[pos] = series.low[mirror] = ltp
+                series.close[pos] = series.close[mirror] = ltp
+                if traded:
+                    series.bar_volume += traded
+                    series.volume[pos] = series.volume[mirror] = series.bar_volume
+
+    def flush(self, now: Optional[int] = None) -> int:
+        """
+        Close open bars whose period has ended.
+
+        Must be called periodically by the bar consumer, from the thread
+        writing ticks; bars otherwise only close on a later tick.
+
+        Args:
+            now: Current time in epoch milliseconds (defaults to the clock)
+
+        Returns:
+            int: Number of bars closed
+        """
+        now = int(time.time() * 1000) if now is None else now
+        closed = 0
+        for token, series_set in self._series.items():
+            for timeframe, series in zip(self.timeframes, series_set):
+                if not series.closed and now >= series.current + series.period:
+                    self._close(token, timeframe, series)
+                    closed += 1
+        return closed
+
+    def _get(self, token: int, timeframe: str) -> Optional[_BarSeries]:
+        """Get the bar series of a token and timeframe."""
+        if timeframe not in self.timeframes:
+            raise ValueError(f"Timeframe {timeframe} is not aggregated")
+        series_set = self._series.get(token)
+        if series_set is None:
+            return None
+        return series_set[self.timeframes.index(timeframe)]
+
+    def bars(self, token: int, timeframe: str, n: Optional[int] = None) -> np.ndarray:
+        """
+        Get the most recent bars, oldest first, without copying.
+
+        The last bar is the open one unless it has been closed. The view
+        is read-only and reflects later updates to those bars.
+
+        Args:
+            token: Instrument token
+            timeframe: One of the aggregated timeframes
+            n: Number of bars (defaults to all kept)
+
+        Returns:
+            np.ndarray: Read-only BAR_DTYPE view
+
+        Raises:
+            ValueError: If the timeframe is not aggregated
+        """
+        series = self._get(token, timeframe)
+        if series is None:
+            return np.empty(0, dtype=BAR_DTYPE)
+        n = series.count if n is None else min(n, series.count)
+        end = series.pos + series.capacity + 1
+        view = series.buffer[end - n:end]
+        view.flags.writeable = False
+        return view
+
+    def is_closed(self, token: int, timeframe: str) -> bool:
+        """
+        Check whether the latest bar has been closed.
+
+        Args:
+            token: Instrument token
+            timeframe: One of the aggregated timeframes
+
+        Returns:
+            bool: True if closed or no bar exists yet
+        """
+        series = self._get(token, timeframe)
+        return series is None or series.closed
@@ -0,0 +1,99 @@
+from typing import Dict, List, Optional, Any, NamedTuple, Tuple, Union
+
+RowKey = Tuple[str, str, str, str]
+
+class BookChange(NamedTuple):
+    """A single holdings or positions row that changed between refreshes."""
+    book: str
+    kind: str
+    key: RowKey
+    old: Optional[Dict[str, Any]]
+    new: Optional[Dict[str, Any]]
+
+class BookIndex:
+    """
+    Dict indexes over a holdings or positions response.
+
+    Rows are reachable by trading symbol and by symbol token in O(1). Each
+    row also has an identity key (exchange, symbol, token, product) so two
+    snapshots can be diffed row by row.
+    """
+
+    def __init__(self, response: Optional[Dict[str, Any]] = None):
+        """
+        Build the indexes.
+
+        Args:
+            response: SmartAPI holding() or position() response; a missing
+                response or ``data`` of None gives an empty book
+        """
+        self.rows: Dict[RowKey, Dict[str, Any]] = {}
+        self.by_symbol: Dict[str, Dict[str, Any]] = {}
+        self.by_token: Dict[str, Dict[str, Any]] = {}
+
+        rows = response.get('data') if isinstance(response, dict) else None
+        for row in rows or []:
+            self.rows[self.row_key(row)] = row
+            # First row wins, matching the order the API returned them in
+            self.by_symbol.setdefault(row.get('tradingsymbol', ''), row)
+            if row.get('symboltoken') is not None:
+                self.by_token.setdefault(str(row['symboltoken']), row)
+
+    @staticmethod
+    def row_key(row: Dict[str, Any]) -> RowKey:
+        """
+        Get the identity key of a row.
+
+        Args:
+            row: Holdings or positions row
+
+        Returns:
+            RowKey: (exchange, tradingsymbol, symboltoken, product)
+        """
+        return (
+            row.get('exchange') or '',
+            row.get('tradingsymbol') or '',
+            str(row.get('symboltoken') or ''),
+            row.get('producttype') or row.get('product') or ''
+        )
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def get(self, symbol_or_token: Union[str, int]) -> Optional[Dict[str, Any]]:
+        """
+        Look up a row by trading symbol or symbol token.
+
+        Args:
+            symbol_or_token: Trading symbol, or token as str or int
+
+        Returns:
+            Optional[Dict[str, Any]]: The row, or None if absent
+        """
+        if isinstance(symbol_or_token, int):
+            return self.by_token.get(str(symbol_or_token))
+        row = self.by_symbol.get(symbol_or_token)
+        return row if row is not None else self.by_token.get(symbol_or_token)
+
+    def diff(self, new: 'BookIndex', book: str) -> List[BookChange]:
+        """
+        Compare this snapshot with a newer one.
+
+        Args:
+            new: Newer snapshot of the same book
+            book: Book name put on the events ('holdings' or 'positions')
+
+        Returns:
+            List[BookChange]: Added, removed and changed rows only
+        """
+        changes = []
+        for key, row in new.rows.items():
+            old = self.rows.get(key)
+            if old is None:
+                changes.append(BookChange(book, 'added', key, None, row))
+            elif old != row:
+                changes.append(BookChange(book, 'changed', key, old, row))
+        for key, row in self.rows.items():
+            if key not in new.rows:
+                changes.append(BookChange(book, 'removed', key, row, None))
+        return changes
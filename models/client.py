@@ -1,9 +1,29 @@
-from typing import Dict, Optional, Any
-import math
-from smartapi import SmartConnect
+from typing import TYPE_CHECKING, Dict, List, Optional, Any, Callable, Union
+import threading
+import time
 from config import Config
+from models.book_index import BookIndex, BookChange
+from models.sizing import size_positions
+from models.session_store import SessionStore, session_store as default_session_store, jwt_expiry
 from utils.logger import app_logger, log_exception
 
+if TYPE_CHECKING:
+    from models.smart_connect import PooledSmartConnect as SmartConnect
+    from utils.http import HttpTransport
+
+def __getattr__(name: str) -> Any:
+    # smartapi pulls in twisted and autobahn, so it is imported on the
+    # first login rather than with this module
+    if name == 'SmartConnect':
+        from models.smart_connect import PooledSmartConnect
+        globals()['SmartConnect'] = PooledSmartConnect
+        return PooledSmartConnect
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def _smart_connect() -> type:
+    """Get the SmartConnect class, importing smartapi on first use."""
+    return globals().get('SmartConnect') or __getattr__('SmartConnect')
+
 class TradingError(Exception):
     """Base exception for trading related errors."""
     pass
@@ -11,14 +31,27 @@ class TradingError(Exception):
 class Client:
     """Client class for managing trading operations."""
     
-    def __init__(self, code: str, password: str, capital: float) -> None:
+    def __init__(
+        self,
+        code: str,
+        password: str,
+        capital: float,
+        session_store: Optional[SessionStore] = None,
+        http: Optional['HttpTransport'] = None
+    ) -> None:
         """
         Initialize a new trading client.
         
+        A persisted session is reused when it is still valid, so a restart
+        does not force a full login.
+        
         Args:
             code: Client code
             password: Client password
             capital: Trading capital
+            session_store: Store for encrypted sessions (shared store by default)
+            http: Transport SmartAPI requests are sent on (shared transport
+                by default)
             
         Raises:
             TradingError: If client initialization fails
@@ -26,9 +59,17 @@ class Client:
         self.code = code
         self.password = password
         self.capital = capital
-        self.obj: Optional[SmartConnect] = None
+        self.obj: Optional['SmartConnect'] = None
         self.data: Optional[Dict[str, Any]] = None
         self.profile: Optional[Dict[str, Any]] = None
+        self.session: Optional[Dict[str, Any]] = None
+        self.session_store = session_store or default_session_store
+        self.http = http
+        self._session_lock = threading.RLock()
+        self._renew_timer: Optional[threading.Timer] = None
+        self._renew_failures = 0
+        self._closed = False
+        self._listeners: List[Callable[['Client', List[BookChange]], None]] = []
         self.holdings: Optional[Dict[str, Any]] = None
         self.positions: Optional[Dict[str, Any]] = None
         
@@ -38,38 +79,263 @@ class Client:
             log_exception(app_logger, e, "Client initialization failed")
             raise TradingError(f"Failed to initialize client: {str(e)}")
     
-    def _initialize_client(self) -> None:
-        """Initialize the SmartAPI client and fetch initial data."""
+    def _initialize_client(self, restore: bool = True) -> None:
+        """
+        Initialize the SmartAPI client and fetch initial data.
+        
+        Args:
+            restore: Try the persisted session before a full login
+        """
         try:
-            self.obj = SmartConnect(api_key=Config.API_KEY)
-            self.data = self.obj.generateSession(self.code, self.password)
-            
-            if not self.data or 'data' not in self.data:
-                raise TradingError("Failed to generate session")
-            
-            self.profile = self.obj.getProfile(self.data['data']['refreshToken'])
+            obj = _smart_connect()(api_key=Config.API_KEY)
+            obj.reqsession = self._requests_shim()
+            if restore:
+                self.obj = obj
+            if not (restore and self._restore_session()):
+                data = obj.generateSession(self.code, self.password)
+                
+                if not data or 'data' not in data:
+                    raise TradingError("Failed to generate session")
+                
+                profile = obj.getProfile(data['data']['refreshToken'])
+                # Swap the new login in whole; orders in flight on other
+                # threads finish on the connection they started with
+                with self._session_lock:
+                    self.obj = obj
+                    self.data = data
+                    self.profile = profile
+                    self._set_session(
+                        data['data'].get('jwtToken'),
+                        data['data'].get('refreshToken'),
+                        getattr(obj, 'feed_token', None)
+                    )
             self._update_positions_and_holdings()
             
-            app_logger.info(f"Successfully initialized client for {self.code}")
+            app_logger.info("Successfully initialized client for %s", self.code)
         except Exception as e:
             log_exception(app_logger, e, "SmartAPI initialization failed")
             raise
     
-    def _update_positions_and_holdings(self) -> None:
-        """Update current positions and holdings."""
+    def _requests_shim(self) -> Any:
+        """Get a requests stand-in sending on this client's transport."""
+        from utils.http import RequestsShim, transport
+        return RequestsShim(self.http or transport)
+    
+    def _set_session(
+        self,
+        jwt_token: Optional[str],
+        refresh_token: Optional[str],
+        feed_token: Optional[str]
+    ) -> None:
+        """Record session tokens, persist them and schedule the next renewal."""
+        if not isinstance(jwt_token, str) or not isinstance(refresh_token, str):
+            self.session = None
+            return
+        
+        jwt_token = jwt_token.split()[-1]
+        expires_at = jwt_expiry(jwt_token) or time.time() + Config.SESSION_TTL
+        self.session = {
+            'jwt_token': jwt_token,
+            'refresh_token': refresh_token,
+            'feed_token': feed_token if isinstance(feed_token, str) else None,
+            'expires_at': expires_at
+        }
+        if self.data and isinstance(self.data.get('data'), dict):
+            self.data['data']['jwtToken'] = f"Bearer {jwt_token}"
+            self.data['data']['refreshToken'] = refresh_token
+        self.session_store.save(self.code, self.session)
+        self._schedule_renewal()
+    
+    def _restore_session(self) -> bool:
+        """
+        Reuse a persisted session instead of logging in.
+        
+        Returns:
+            bool: True if the stored session was accepted by the API
+        """
+        session = self.session_store.load(self.code)
+        if not session or not session.get('jwt_token') or not session.get('refresh_token'):
+            return False
+        
+        try:
+            self.obj.setAccessToken(session['jwt_token'])
+            self.obj.setRefreshToken(session['refresh_token'])
+            if session.get('feed_token'):
+                self.obj.setFeedToken(session['feed_token'])
+            self.obj.setUserId(self.code)
+            self.session = session
+            self.data = {'data': {
+                'jwtToken': f"Bearer {session['jwt_token']}",
+                'refreshToken': session['refresh_token']
+            }}
+            
+            if session.get('expires_at', 0) - time.time() <= Config.SESSION_RENEW_MARGIN:
+                if not self._renew_session():
+                    return False
+            
+            profile = self.obj.getProfile(self.session['refresh_token'])
+            if not isinstance(profile, dict) or not profile.get('status'):
+                raise TradingError("Stored session rejected")
+            self.profile = profile
+            self._schedule_renewal()
+            app_logger.info("Reused stored session for %s", self.code)
+            return True
+        except Exception as e:
+            app_logger.warning("Stored session for %s unusable, logging in: %r", self.code, e)
+            self.session_store.delete(self.code)
+            self.session = None
+            return False
+    
+    def _renew_session(self) -> bool:
+        """
+        Renew the JWT with the refresh token, without a full login.
+        
+        Returns:
+            bool: True if a new token was issued
+        """
+        if not self.session or not self.session.get('refresh_token'):
+            return False
+        try:
+            response = self.obj.generateToken(self.session['refresh_token'])
+        except Exception as e:
+            log_exception(app_logger, e, f"Token renewal failed for {self.code}")
+            return False
+        
+        data = response.get('data') if isinstance(response, dict) else None
+        if not isinstance(data, dict) or not isinstance(data.get('jwtToken'), str):
+            app_logger.warning("Token renewal rejected for %s", self.code)
+            return False
+        
+        self._set_session(
+            data['jwtToken'],
+            data.get('refreshToken') or self.session['refresh_token'],
+            data.get('feedToken') or self.session.get('feed_token')
+        )
+        app_logger.info("Renewed session for %s", self.code)
+        return True
+    
+    @property
+    def session_expires_at(self) -> Optional[float]:
+        """UNIX timestamp at which the current JWT expires."""
+        return self.session['expires_at'] if self.session else None
+    
+    def _schedule_renewal(self, delay: Optional[float] = None) -> None:
+        """
+        Renew the session in the background ahead of its expiry.
+        
+        Args:
+            delay: Seconds until the renewal (defaults to
+                Config.SESSION_RENEW_MARGIN before the JWT expires)
+        """
+        if self._renew_timer is not None:
+            self._renew_timer.cancel()
+            self._renew_timer = None
+        if self._closed:
+            return
+        if delay is None:
+            if not self.session:
+                return
+            delay = max(self.session['expires_at'] - time.time() - Config.SESSION_RENEW_MARGIN, 1.0)
+        
+        self._renew_timer = threading.Timer(delay, self.refresh_session)
+        self._renew_timer.daemon = True
+        self._renew_timer.start()
+    
+    def _schedule_retry(self) -> None:
+        """Retry a failed session refresh, backing off exponentially."""
+        delay = min(
+            Config.SESSION_RETRY_DELAY * 2 ** self._renew_failures,
+            Config.SESSION_RETRY_MAX_DELAY
+        )
+        self._renew_failures += 1
+        app_logger.warning(
+            "Session refresh for %s failed %d times; retrying in %.0f s",
+            self.code, self._renew_failures, delay
+        )
+        self._schedule_renewal(delay)
+    
+    def close(self) -> None:
+        """Stop background session renewal."""
+        with self._session_lock:
+            self._closed = True
+            if self._renew_timer is not None:
+                self._renew_timer.cancel()
+                self._renew_timer = None
+    
+    @property
+    def holdings(self) -> Optional[Dict[str, Any]]:
+        """Latest holding() response."""
+        return self._holdings
+    
+    @holdings.setter
+    def holdings(self, response: Optional[Dict[str, Any]]) -> None:
+        self._holdings = response
+        self.holdings_index = BookIndex(response)
+    
+    @property
+    def positions(self) -> Optional[Dict[str, Any]]:
+        """Latest position() response."""
+        return self._positions
+    
+    @positions.setter
+    def positions(self, response: Optional[Dict[str, Any]]) -> None:
+        self._positions = response
+        self.positions_index = BookIndex(response)
+    
+    def add_change_listener(self, callback: Callable[['Client', List[BookChange]], None]) -> None:
+        """
+        Register a callback for holdings/positions changes.
+        
+        Args:
+            callback: Called with the client and the changed rows after a
+                refresh that changed at least one row
+        """
+        self._listeners.append(callback)
+    
+    def remove_change_listener(self, callback: Callable[['Client', List[BookChange]], None]) -> None:
+        """
+        Unregister a change callback.
+        
+        Args:
+            callback: Previously registered callback
+        """
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+    
+    def _update_positions_and_holdings(self) -> List[BookChange]:
+        """
+        Update current positions and holdings.
+        
+        Returns:
+            List[BookChange]: Rows that differ from the previous snapshot
+        """
         try:
+            old_holdings, old_positions = self.holdings_index, self.positions_index
             self.holdings = self.obj.holding()
             self.positions = self.obj.position()
         except Exception as e:
             log_exception(app_logger, e, "Failed to update positions/holdings")
             raise TradingError(f"Failed to update positions/holdings: {str(e)}")
+        
+        changes = (
+            old_holdings.diff(self.holdings_index, 'holdings') +
+            old_positions.diff(self.positions_index, 'positions')
+        )
+        if changes:
+            for callback in list(self._listeners):
+                try:
+                    callback(self, changes)
+                except Exception as e:
+                    log_exception(app_logger, e, f"Change listener failed for {self.code}")
+        return changes
     
-    def get_quantity(self, price: float) -> int:
+    def get_quantity(self, price: float, lotsize: int = 1) -> int:
         """
         Calculate quantity based on capital and price.
         
         Args:
             price: Current price of the instrument
+            lotsize: Lot size; the quantity is rounded down to whole lots
             
         Returns:
             int: Calculated quantity
@@ -80,42 +346,92 @@ class Client:
         if price <= 0:
             raise ValueError("Price must be greater than 0")
         
-        div = self.capital / 10
-        quantity = div / price
-        return math.floor(quantity)
+        return int(size_positions([self.capital], [price], [lotsize])[0, 0])
     
-    def get_holding_quantity(self, symbol: str) -> int:
+    def place_order(self, params: Dict[str, Any]) -> str:
+        """
+        Place an order for this client.
+        
+        Args:
+            params: SmartAPI order parameters (variety, tradingsymbol,
+                symboltoken, transactiontype, exchange, ordertype,
+                producttype, duration, price, quantity, ...)
+            
+        Returns:
+            str: Broker order id
+            
+        Raises:
+            TradingError: If the order is rejected
+        """
+        try:
+            # placeOrder drops None values in place, so give it its own copy
+            order_id = self.obj.placeOrder(dict(params))
+        except Exception as e:
+            log_exception(app_logger, e, f"Order placement failed for {self.code}")
+            raise TradingError(f"Failed to place order: {str(e)}")
+        
+        if not order_id:
+            raise TradingError(f"Order rejected for {self.code}")
+        app_logger.info(
+            "Placed %s %s x %s for %s: order %s",
+            params.get('transactiontype'), params.get('tradingsymbol'),
+            params.get('quantity'), self.code, order_id
+        )
+        return order_id
+    
+    def get_holding_quantity(self, symbol: Union[str, int]) -> int:
         """
         Get quantity of a symbol in holdings.
         
         Args:
-            symbol: Trading symbol
+            symbol: Trading symbol or symbol token
             
         Returns:
             int: Quantity held
         """
         try:
-            if not self.holdings or 'data' not in self.holdings:
-                return 0
-            
-            for holding in self.holdings['data']:
-                if holding['tradingsymbol'] == symbol:
-                    return holding['quantity']
-            return 0
+            holding = self.holdings_index.get(symbol)
+            return holding['quantity'] if holding is not None else 0
         except Exception as e:
             log_exception(app_logger, e, f"Error getting holding quantity for {symbol}")
             return 0
     
+    def get_position_quantity(self, symbol: Union[str, int]) -> int:
+        """
+        Get net quantity of an open position.
+        
+        Args:
+            symbol: Trading symbol or symbol token
+            
+        Returns:
+            int: Net quantity (negative when short)
+        """
+        try:
+            position = self.positions_index.get(symbol)
+            return int(float(position['netqty'])) if position is not None else 0
+        except Exception as e:
+            log_exception(app_logger, e, f"Error getting position quantity for {symbol}")
+            return 0
+    
     def refresh_session(self) -> bool:
         """
         Refresh the trading session.
         
+        Renews the token with the refresh token first and only falls back
+        to a full login if that is rejected. The new session replaces the
+        old one only once the login has succeeded; on failure the refresh
+        is retried with backoff.
+        
         Returns:
             bool: True if successful, False otherwise
         """
-        try:
-            self._initialize_client()
-            return True
-        except Exception as e:
-            log_exception(app_logger, e, "Session refresh failed")
-            return False 
\ No newline at end of file
+        with self._session_lock:
+            try:
+                if not self._renew_session():
+                    self._initialize_client(restore=False)
+            except Exception as e:
+                log_exception(app_logger, e, "Session refresh failed")
+                self._schedule_retry()
+                return False
+            self._renew_failures = 0
+            return True 
\ No newline at end of file
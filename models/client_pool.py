@@ -0,0 +1,204 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Dict, List, Optional, Any, Callable
+import pandas as pd
+from config import Config
+from models.client import Client, TradingError
+from utils.logger import app_logger, log_exception
+
+class ClientPool:
+    """
+    Concurrent login and lifecycle management for many trading clients.
+
+    Logins run on a bounded worker pool. A failed login is retried with
+    capped exponential backoff from a timer, so it never holds a worker
+    while waiting and never delays the healthy accounts.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        retry_delay: float = 5.0,
+        max_retry_delay: float = 300.0,
+        max_attempts: Optional[int] = None,
+        client_factory: Callable[..., Client] = Client
+    ):
+        """
+        Initialize client pool.
+
+        Args:
+            max_workers: Concurrent logins (defaults to Config.LOGIN_WORKERS)
+            retry_delay: Seconds before the first retry of a failed login
+            max_retry_delay: Upper bound for the retry backoff
+            max_attempts: Give up after this many attempts; None retries forever
+            client_factory: Callable creating a logged-in client
+        """
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or Config.LOGIN_WORKERS,
+            thread_name_prefix='client-login'
+        )
+        self._retry_delay = retry_delay
+        self._max_retry_delay = max_retry_delay
+        self._max_attempts = max_attempts
+        self._client_factory = client_factory
+        self._lock = threading.Lock()
+        self._clients: Dict[str, Client] = {}
+        self._status: Dict[str, Dict[str, Any]] = {}
+        self._timers: Dict[str, threading.Timer] = {}
+        self._closed = False
+
+    @staticmethod
+    def read_credentials(path: str) -> List[Dict[str, Any]]:
+        """
+        Read client credentials, dropping repeated client codes.
+
+        Args:
+            path: CSV file with Code and Pass columns and an optional
+                Capital column
+
+        Returns:
+            List[Dict[str, Any]]: One entry per unique code with code,
+            password and capital
+        """
+        df = pd.read_csv(path, dtype={'Code': str, 'Pass': str})
+        df = df.dropna(subset=['Code'])
+        duplicates = int(df.duplicated(subset=['Code']).sum())
+        if duplicates:
+            app_logger.warning("Ignoring %d duplicate client codes in %s", duplicates, path)
+        df = df.drop_duplicates(subset=['Code'], keep='first')
+
+        capitals = df['Capital'] if 'Capital' in df else [Config.DEFAULT_CAPITAL] * len(df)
+        return [
+            {'code': code, 'password': password, 'capital': float(capital)}
+            for code, password, capital in zip(df['Code'], df['Pass'], capitals)
+        ]
+
+    def login_all(self, credentials: List[Dict[str, Any]]) -> Dict[str, Future]:
+        """
+        Start logging in every client concurrently.
+
+        Args:
+            credentials: Entries with code, password and capital; repeated
+                codes and codes already in the pool are skipped
+
+        Returns:
+            Dict[str, Future]: First login attempt per newly added code
+        """
+        futures = {}
+        for entry in credentials:
+            code = entry['code']
+            with self._lock:
+                if code in self._status or self._closed:
+                    continue
+                self._status[code] = {
+                    'state': 'pending',
+                    'attempts': 0,
+                    'latency': None,
+                    'error': None
+                }
+            futures[code] = self._executor.submit(self._login, entry)
+        return futures
+
+    def _login(self, entry: Dict[str, Any]) -> Optional[Client]:
+        """Run one login attempt and schedule a retry on failure."""
+        code = entry['code']
+        with self._lock:
+            status = self._status[code]
+            status['attempts'] += 1
+            status['state'] = 'logging_in'
+            attempts = status['attempts']
+
+        start = time.perf_counter()
+        try:
+            client = self._client_factory(entry['code'], entry['password'], entry['capital'])
+        except Exception as e:
+            latency = time.perf_counter() - start
+            if not isinstance(e, TradingError):
+                log_exception(app_logger, e, f"Login failed for {code}")
+            with self._lock:
+                status.update(state='failed', latency=latency, error=str(e))
+            self._schedule_retry(entry, attempts)
+            return None
+
+        latency = time.perf_counter() - start
+        with self._lock:
+            self._clients[code] = client
+            status.update(state='ok', latency=latency, error=None)
+        app_logger.info("Client %s logged in in %.2f s (attempt %d)", code, latency, attempts)
+        return client
+
+    def _schedule_retry(self, entry: Dict[str, Any], attempts: int) -> None:
+        """Retry a failed login after a capped exponential backoff."""
+        code = entry['code']
+        if self._max_attempts is not None and attempts >= self._max_attempts:
+            app_logger.error("Giving up on client %s after %d attempts", code, attempts)
+            return
+
+        delay = min(self._retry_delay * 2 ** (attempts - 1), self._max_retry_delay)
+        with self._lock:
+            if self._closed:
+                return
+            self._status[code]['state'] = 'retrying'
+            timer = threading.Timer(delay, self._retry, args=(entry,))
+            timer.daemon = True
+            self._timers[code] = timer
+            timer.start()
+        app_logger.warning("Retrying login for %s in %.1f s", code, delay)
+
+    def _retry(self, entry: Dict[str, Any]) -> None:
+        """Resubmit a login attempt from a retry timer."""
+        with self._lock:
+            self._timers.pop(entry['code'], None)
+            if self._closed:
+                return
+        self._executor.submit(self._login, entry)
+
+    @property
+    def clients(self) -> Dict[str, Client]:
+        """Logged-in clients by code."""
+        with self._lock:
+            return dict(self._clients)
+
+    def get(self, code: str) -> Optional[Client]:
+        """
+        Get a logged-in client.
+
+        Args:
+            code: Client code
+
+        Returns:
+            Optional[Client]: The client, or None if not logged in
+        """
+        with self._lock:
+            return self._clients.get(code)
+
+    def status(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get login state per client.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: state ('pending', 'logging_in', 'ok',
+            'failed' or 'retrying'), attempts, latency of the last attempt
+            in seconds and the last error
+        """
+        with self._lock:
+            return {code: dict(status) for code, status in self._status.items()}
+
+    def shutdown(self, wait: bool = False) -> None:
+        """
+        Stop retries, session renewals and the login workers.
+
+        Args:
+            wait: Block until running logins finish
+        """
+        with self._lock:
+            self._closed = True
+            timers = list(self._timers.values())
+            self._timers.clear()
+            clients = list(self._clients.values())
+        for timer in timers:
+            timer.cancel()
+        for client in clients:
+            client.close()
+        self._executor.shutdown(wait=wait)
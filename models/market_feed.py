@@ -0,0 +1,306 @@
+import json
+import threading
+from typing import Any, Callable, Dict, Iterable, Optional, Set, Tuple
+from models.tick_store import SmartFeedAdapter, TickStore
+from utils.logger import app_logger, log_exception
+
+# Feed segment names of smartapi's legacy websocket by exchange segment
+FEED_SEGMENTS = {
+    'NSE': 'nse_cm', 'NFO': 'nse_fo', 'BSE': 'bse_cm', 'BFO': 'bse_fo',
+    'MCX': 'mcx_fo', 'NCDEX': 'ncx_fo', 'CDS': 'cde_fo'
+}
+
+# Seconds between feed heartbeats, as smartapi's own send_request sends them
+HEARTBEAT_SECONDS = 60
+
+_reactor_lock = threading.Lock()
+_reactor_thread: Optional[threading.Thread] = None
+
+def _call_in_reactor(fn: Callable[..., Any], *args: Any) -> None:
+    """Run fn on the twisted reactor thread, starting the reactor on first use."""
+    global _reactor_thread
+    from twisted.internet import reactor
+    with _reactor_lock:
+        if _reactor_thread is None:
+            # Signal handlers can only be installed from the main thread
+            _reactor_thread = threading.Thread(
+                target=reactor.run, kwargs={'installSignalHandlers': False},
+                name='twisted-reactor', daemon=True
+            )
+            _reactor_thread.start()
+    reactor.callFromThread(fn, *args)
+
+class SmartFeedSocket:
+    """
+    smartapi's legacy ``WebSocket`` driven safely from any thread.
+
+    The pinned smartapi-python 1.1.1 only ships ``smartapi.webSocket``,
+    which runs on the twisted reactor. The reactor is started once on a
+    daemon thread and every call into the socket is handed to it.
+    Subscriptions and heartbeats are sent here rather than through
+    ``send_request``, which starts a heartbeat thread that never exits on
+    every call. Callbacks take the same arguments as the wrapped
+    websocket's: ``on_open(ws)``, ``on_ticks(ws, ticks)``,
+    ``on_error(ws, code, reason)`` and ``on_close(ws, code, reason)``.
+    """
+
+    def __init__(self, feed_token: str, client_code: str):
+        """
+        Initialize socket.
+
+        Args:
+            feed_token: Session feed token
+            client_code: Client code the feed token belongs to
+        """
+        from smartapi.webSocket import WebSocket
+        self.feed_token = feed_token
+        self.client_code = client_code
+        self.on_open: Optional[Callable[..., None]] = None
+        self.on_ticks: Optional[Callable[..., None]] = None
+        self.on_error: Optional[Callable[..., None]] = None
+        self.on_close: Optional[Callable[..., None]] = None
+        self._socket = WebSocket(feed_token, client_code)
+        self._socket.on_open = self._opened
+        self._socket.on_ticks = self._ticks
+        self._socket.on_error = self._error
+        self._socket.on_close = self._closed
+        self._heartbeat: Optional[Any] = None
+        self._closing = False
+
+    def connect(self) -> None:
+        """Open the connection on the reactor thread."""
+        _call_in_reactor(self._connect)
+
+    def subscribe(self, channel: str) -> None:
+        """
+        Replace the watch list.
+
+        Args:
+            channel: ``segment|token`` entries joined by ``&``
+        """
+        _call_in_reactor(self._send, 'mw', channel)
+
+    def close(self) -> None:
+        """Close the connection."""
+        self._closing = True
+        _call_in_reactor(self._close)
+
+    def _connect(self) -> None:
+        if self._closing:
+            return
+        self._socket.connect()
+        # A connection that never opens has no protocol to report its close
+        self._socket.factory.clientConnectionFailed = self._failed
+
+    def _send(self, task: str, channel: str = '') -> None:
+        request = {
+            'task': task, 'channel': channel, 'token': self.feed_token,
+            'user': self.client_code, 'acctid': self.client_code
+        }
+        try:
+            self._socket.ws.sendMessage(json.dumps(request).encode())
+        except Exception as e:
+            log_exception(app_logger, e, f"Failed to send feed {task} request")
+
+    def _stop_heartbeat(self) -> None:
+        if self._heartbeat is not None and self._heartbeat.running:
+            self._heartbeat.stop()
+        self._heartbeat = None
+
+    def _close(self) -> None:
+        self._stop_heartbeat()
+        self._socket.close()
+
+    def _opened(self, ws: Any) -> None:
+        from twisted.internet.task import LoopingCall
+        self._send('cn')
+        self._heartbeat = LoopingCall(self._send, 'hb')
+        self._heartbeat.start(HEARTBEAT_SECONDS, now=False)
+        if self.on_open:
+            self.on_open(self)
+
+    def _ticks(self, ws: Any, ticks: Any) -> None:
+        if self.on_ticks:
+            self.on_ticks(self, ticks)
+
+    def _error(self, ws: Any, code: Any, reason: Any) -> None:
+        if self.on_error:
+            self.on_error(self, code, reason)
+
+    def _closed(self, ws: Any, code: Any, reason: Any) -> None:
+        self._stop_heartbeat()
+        if self.on_close:
+            self.on_close(self, code, reason)
+
+    def _failed(self, connector: Any, reason: Any) -> None:
+        message = reason.getErrorMessage() if hasattr(reason, 'getErrorMessage') else reason
+        self._error(self, None, message)
+        self._closed(self, None, message)
+
+class MarketFeed:
+    """
+    Live SmartAPI ticks written into a TickStore.
+
+    The websocket is authenticated with a logged-in client's feed token;
+    ticks go through ``SmartFeedAdapter``. Tokens can be subscribed before
+    or after the connection opens, and the whole watch list is sent
+    whenever it opens or grows. When the connection fails or drops the
+    feed stops running, so the next ``start`` reconnects.
+    """
+
+    def __init__(
+        self,
+        store: TickStore,
+        websocket_factory: Optional[Callable[..., Any]] = None
+    ):
+        """
+        Initialize feed.
+
+        Args:
+            store: Tick store to write into
+            websocket_factory: Called with feed_token and client_code to
+                build the websocket (defaults to SmartFeedSocket)
+        """
+        self.store = store
+        self.adapter = SmartFeedAdapter(store)
+        self._factory = websocket_factory or SmartFeedSocket
+        self._websocket: Optional[Any] = None
+        self._tokens: Set[Tuple[int, str]] = set()
+        self._lock = threading.Lock()
+        self.connected = False
+        self.error: Optional[str] = None
+
+    @property
+    def running(self) -> bool:
+        """Whether a websocket has been started and not yet closed."""
+        return self._websocket is not None
+
+    def start(self, client: Any) -> bool:
+        """
+        Connect using a logged-in client's session.
+
+        Args:
+            client: Client with a feed_token in its session
+
+        Returns:
+            bool: True if a websocket was started (or already running)
+        """
+        with self._lock:
+            if self._websocket is not None:
+                return True
+            session = client.session or {}
+            if not session.get('feed_token'):
+                self.error = f"Client {client.code} has no feed token"
+                app_logger.warning("Live ticks unavailable: %s", self.error)
+                return False
+
+            try:
+                websocket = self._factory(session['feed_token'], client.code)
+            except Exception as e:
+                self.error = str(e)
+                log_exception(app_logger, e, "Market feed failed")
+                return False
+            websocket.on_open = self._on_open
+            websocket.on_ticks = self.adapter.on_ticks
+            websocket.on_error = self._on_error
+            websocket.on_close = self._on_close
+            self._websocket = websocket
+            self.error = None
+
+        # Outside the lock: a socket may report it opened from connect itself
+        app_logger.info("Market feed connecting as %s", client.code)
+        try:
+            websocket.connect()
+        except Exception as e:
+            self.error = str(e)
+            log_exception(app_logger, e, "Market feed failed")
+            self._on_close(websocket, None, e)
+            return False
+        return True
+
+    def subscribe(self, tokens: Iterable[Tuple[int, str]]) -> int:
+        """
+        Stream ticks for instruments.
+
+        Args:
+            tokens: (token, exchange segment) pairs, e.g. (3045, 'NSE')
+
+        Returns:
+            int: Newly subscribed instruments
+        """
+        with self._lock:
+            new = {
+                (int(token), exchange) for token, exchange in tokens
+                if exchange in FEED_SEGMENTS
+            } - self._tokens
+            self._tokens |= new
+            websocket = self._websocket if self.connected else None
+            channel = self._channel()
+        if new:
+            self.store.subscribe(token for token, _ in sorted(new))
+            if websocket is not None:
+                self._send(websocket, channel)
+        return len(new)
+
+    def _channel(self) -> str:
+        """Get the watch list in the feed's ``segment|token&...`` format."""
+        return '&'.join(f"{FEED_SEGMENTS[exchange]}|{token}" for token, exchange in sorted(self._tokens))
+
+    def _send(self, websocket: Any, channel: str) -> None:
+        try:
+            websocket.subscribe(channel)
+        except Exception as e:
+            log_exception(app_logger, e, "Market feed subscription failed")
+
+    def _on_open(self, websocket: Any) -> None:
+        with self._lock:
+            if websocket is not self._websocket:
+                return
+            self.connected = True
+            count = len(self._tokens)
+            channel = self._channel()
+        app_logger.info("Market feed connected; subscribing %d instruments", count)
+        if count:
+            self._send(websocket, channel)
+
+    def _on_error(self, websocket: Any, code: Any, reason: Any) -> None:
+        self.error = str(reason)
+        app_logger.warning("Market feed error: %s", reason)
+
+    def _on_close(self, websocket: Any, code: Any, reason: Any) -> None:
+        with self._lock:
+            if websocket is not self._websocket:
+                return
+            # Forget the dead socket so the next start reconnects
+            self._websocket = None
+            self.connected = False
+        app_logger.info("Market feed closed")
+
+    def status(self) -> Dict[str, Any]:
+        """
+        Get feed health.
+
+        Returns:
+            Dict[str, Any]: running, connected, subscribed instruments,
+            ticks stored, malformed messages dropped and the last error
+        """
+        return {
+            'running': self.running,
+            'connected': self.connected,
+            'subscribed': len(self._tokens),
+            'ticks': self.store.ticks,
+            'dropped': self.adapter.errors,
+            'error': self.error
+        }
+
+    def stop(self) -> None:
+        """Close the websocket."""
+        with self._lock:
+            websocket, self._websocket = self._websocket, None
+            self.connected = False
+        if websocket is None:
+            return
+        try:
+            websocket.close()
+        except Exception as e:
+            log_exception(app_logger, e, "Failed to close market feed")
@@ -0,0 +1,315 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Dict, List, Optional, Any, Callable, NamedTuple, Sequence, Set
+import numpy as np
+from config import Config
+from models.client import Client, TradingError
+from utils.logger import app_logger, log_exception
+
+def latency_percentiles(latencies: Sequence[float]) -> Dict[str, Optional[float]]:
+    """
+    Summarize latencies.
+
+    Args:
+        latencies: Latencies in seconds
+
+    Returns:
+        Dict[str, Optional[float]]: count, p50, p99 and max (None when empty)
+    """
+    if not len(latencies):
+        return {'count': 0, 'p50': None, 'p99': None, 'max': None}
+    values = np.asarray(latencies, dtype=float)
+    p50, p99 = np.percentile(values, [50, 99])
+    return {'count': len(values), 'p50': float(p50), 'p99': float(p99), 'max': float(values.max())}
+
+class TokenBucket:
+    """
+    Token-bucket rate limiter driven by a monotonic clock.
+
+    ``reserve`` always takes a token and returns how long the caller must
+    wait before using it, so waiters queue up in order without polling.
+    Only used from the dispatcher loop thread, hence no locking.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """
+        Initialize bucket.
+
+        Args:
+            rate: Tokens added per second
+            capacity: Burst size (defaults to one second worth of tokens)
+
+        Raises:
+            ValueError: If rate is not positive
+        """
+        if rate <= 0:
+            raise ValueError("Rate must be greater than 0")
+        self.rate = rate
+        self.capacity = capacity or max(rate, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+
+    def reserve(self) -> float:
+        """
+        Take one token.
+
+        Returns:
+            float: Seconds to wait before the token may be used
+        """
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        self._tokens -= 1
+        return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+class OrderAck(NamedTuple):
+    """Outcome of one dispatched order."""
+    client_code: str
+    order_id: Optional[str]
+    error: Optional[str]
+    latency: float
+    broker_latency: float
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+class _OrderJob(NamedTuple):
+    client: Client
+    params: Dict[str, Any]
+    future: Future
+    submitted: float
+
+class OrderDispatcher:
+    """
+    Rate-limited asynchronous order dispatcher.
+
+    Orders are paced on a dedicated event-loop thread: each first waits
+    on its client's token bucket, then on the global one, and only then
+    joins an asyncio queue served by a fixed number of workers. Workers
+    send on a thread pool because SmartConnect is blocking, so an order
+    held back by its client's rate limit never occupies a send slot.
+    Callers get a ``concurrent.futures.Future`` resolving to an
+    ``OrderAck``.
+    """
+
+    LATENCY_SAMPLES = 10000
+
+    def __init__(
+        self,
+        global_rate: Optional[float] = None,
+        client_rate: Optional[float] = None,
+        concurrency: Optional[int] = None
+    ):
+        """
+        Initialize and start the dispatcher.
+
+        Args:
+            global_rate: Orders per second across all clients
+                (defaults to Config.ORDER_RATE_GLOBAL)
+            client_rate: Orders per second per client
+                (defaults to Config.ORDER_RATE_PER_CLIENT)
+            concurrency: Orders in flight at once (defaults to
+                Config.ORDER_CONCURRENCY)
+        """
+        self._global_bucket = TokenBucket(global_rate or Config.ORDER_RATE_GLOBAL)
+        self._client_rate = client_rate or Config.ORDER_RATE_PER_CLIENT
+        self._client_buckets: Dict[str, TokenBucket] = {}
+        self._concurrency = concurrency or Config.ORDER_CONCURRENCY
+        self._executor = ThreadPoolExecutor(
+            max_workers=self._concurrency,
+            thread_name_prefix='order-send'
+        )
+        self._latencies: deque = deque(maxlen=self.LATENCY_SAMPLES)
+        self._latency_lock = threading.Lock()
+        self._stopped = False
+        # Orders are only admitted to the loop while this is held and the
+        # dispatcher is running, so none can reach it after stop()
+        self._submit_lock = threading.Lock()
+
+        self._loop = asyncio.new_event_loop()
+        self._queue: Optional[asyncio.Queue] = None
+        self._pacing: Set[asyncio.Future] = set()
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='order-dispatcher', daemon=True)
+        self._thread.start()
+        self._ready.wait()
+
+    def _run(self) -> None:
+        """Run the dispatcher event loop."""
+        asyncio.set_event_loop(self._loop)
+        try:
+            self._loop.run_until_complete(self._main())
+        finally:
+            self._loop.close()
+
+    async def _main(self) -> None:
+        """Create the queue and serve it until stopped."""
+        self._queue = asyncio.Queue()
+        self._ready.set()
+        workers = [asyncio.ensure_future(self._worker()) for _ in range(self._concurrency)]
+        await asyncio.gather(*workers)
+
+    async def _worker(self) -> None:
+        """Serve queued orders until a stop sentinel arrives."""
+        while True:
+            job = await self._queue.get()
+            if job is None:
+                return
+            try:
+                await self._dispatch(job)
+            except Exception as e:
+                log_exception(app_logger, e, "Order dispatch failed")
+                if not job.future.done():
+                    job.future.set_exception(e)
+
+    def _admit(self, job: _OrderJob) -> None:
+        """Queue an order for sending once its rate limits allow (loop thread)."""
+        code = job.client.code
+        bucket = self._client_buckets.get(code)
+        if bucket is None:
+            bucket = self._client_buckets[code] = TokenBucket(self._client_rate)
+
+        # Client first, so a busy client does not burn global capacity
+        client_delay = bucket.reserve()
+        global_delay = None if client_delay else self._global_bucket.reserve()
+        if not client_delay and not global_delay:
+            self._queue.put_nowait(job)
+            return
+        task = asyncio.ensure_future(self._pace(job, client_delay, global_delay))
+        self._pacing.add(task)
+        task.add_done_callback(self._pacing.discard)
+
+    async def _pace(self, job: _OrderJob, client_delay: float, global_delay: Optional[float]) -> None:
+        """
+        Wait out the rate limits of one order, then queue it for sending.
+
+        Args:
+            job: Order to send
+            client_delay: Seconds until the client's token is usable
+            global_delay: Seconds until the global token is usable, or
+                None if it is only reserved once the client's is granted
+        """
+        try:
+            if client_delay:
+                await asyncio.sleep(client_delay)
+            if global_delay is None:
+                global_delay = self._global_bucket.reserve()
+            if global_delay:
+                await asyncio.sleep(global_delay)
+        except BaseException as e:
+            if not job.future.done():
+                job.future.set_exception(TradingError(f"Order for {job.client.code} was not sent: {e!r}"))
+            raise
+        self._queue.put_nowait(job)
+
+    async def _drain(self) -> None:
+        """Let paced orders reach the queue, then stop the workers after them."""
+        while self._pacing:
+            await asyncio.gather(*list(self._pacing), return_exceptions=True)
+        for _ in range(self._concurrency):
+            self._queue.put_nowait(None)
+
+    async def _dispatch(self, job: _OrderJob) -> None:
+        """Send one order and resolve its future."""
+        code = job.client.code
+        start = time.perf_counter()
+        order_id, error = None, None
+        try:
+            order_id = await self._loop.run_in_executor(
+                self._executor, job.client.place_order, job.params
+            )
+        except Exception as e:
+            error = str(e)
+        end = time.perf_counter()
+
+        ack = OrderAck(code, order_id, error, end - job.submitted, end - start)
+        with self._latency_lock:
+            self._latencies.append(ack.latency)
+        job.future.set_result(ack)
+
+    def submit(
+        self,
+        client: Client,
+        params: Dict[str, Any],
+        callback: Optional[Callable[[OrderAck], None]] = None
+    ) -> Future:
+        """
+        Queue an order.
+
+        Args:
+            client: Logged-in client to place the order for
+            params: SmartAPI order parameters
+            callback: Called with the OrderAck on the dispatcher thread
+
+        Returns:
+            Future: Resolves to the OrderAck
+
+        Raises:
+            TradingError: If the dispatcher has been stopped
+        """
+        future: Future = Future()
+        if callback is not None:
+            def on_done(done: Future) -> None:
+                if done.exception() is None:
+                    callback(done.result())
+            future.add_done_callback(on_done)
+        job = _OrderJob(client, dict(params), future, time.perf_counter())
+        with self._submit_lock:
+            if self._stopped:
+                raise TradingError("Order dispatcher is stopped")
+            self._loop.call_soon_threadsafe(self._admit, job)
+        return future
+
+    def submit_basket(
+        self,
+        clients: Sequence[Client],
+        params: Dict[str, Any],
+        callback: Optional[Callable[[OrderAck], None]] = None
+    ) -> List[Future]:
+        """
+        Queue the same order for many clients.
+
+        Args:
+            clients: Clients to place the order for
+            params: SmartAPI order parameters
+            callback: Called with each OrderAck
+
+        Returns:
+            List[Future]: One future per client, in order
+        """
+        return [self.submit(client, params, callback) for client in clients]
+
+    def latency_stats(self) -> Dict[str, Optional[float]]:
+        """
+        Get submit-to-acknowledgement latency percentiles.
+
+        Returns:
+            Dict[str, Optional[float]]: count, p50, p99 and max in seconds
+            over the most recent orders
+        """
+        with self._latency_lock:
+            latencies = list(self._latencies)
+        return latency_percentiles(latencies)
+
+    def stop(self, wait: bool = True) -> None:
+        """
+        Stop accepting orders and shut down once queued orders are sent.
+
+        Orders still waiting on a rate limit are sent when it allows.
+
+        Args:
+            wait: Block until queued orders have been dispatched
+        """
+        with self._submit_lock:
+            if self._stopped:
+                return
+            self._stopped = True
+            # Runs after every order admitted so far
+            asyncio.run_coroutine_threadsafe(self._drain(), self._loop)
+        if wait:
+            self._thread.join()
+        self._executor.shutdown(wait=wait)
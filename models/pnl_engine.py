@@ -0,0 +1,240 @@
+import threading
+from typing import Dict, List, Optional, Any
+import numpy as np
+import pandas as pd
+from models.book_index import BookChange
+from models.tick_store import TickStore
+
+def _column(rows: List[Dict[str, Any]], key: str, default: float = 0.0) -> np.ndarray:
+    """Read a numeric field of every position row (SmartAPI sends strings)."""
+    values = np.empty(len(rows))
+    for i, row in enumerate(rows):
+        try:
+            values[i] = float(row.get(key) or default)
+        except (TypeError, ValueError):
+            values[i] = default
+    return values
+
+def _average(qty_a: np.ndarray, avg_a: np.ndarray, qty_b: np.ndarray, avg_b: np.ndarray) -> np.ndarray:
+    """Quantity-weighted average price of two fills, 0 where neither has quantity."""
+    qty = qty_a + qty_b
+    value = qty_a * avg_a + qty_b * avg_b
+    return np.divide(value, qty, out=np.zeros_like(value), where=qty > 0)
+
+class PnlEngine:
+    """
+    Columnar mark-to-market PnL across clients.
+
+    Positions of every tracked client are held as flat arrays joined to
+    last traded prices by token. Realized PnL is fixed per load; on each
+    tick only the rows holding that token are re-marked and the per-client
+    unrealized totals are adjusted by the difference, so a tick costs
+    O(rows for the token) rather than a pass over the whole book.
+
+    Buys and sells combine the day's fills with those carried forward
+    (``cfbuyqty``/``cfbuyavgprice``, ``cfsellqty``/``cfsellavgprice``):
+
+    realized = min(buys, sells) * (sell average - buy average) * multiplier
+    unrealized = netqty * (ltp - open average) * multiplier, where netqty is
+    the broker's and the open average is the buy average for long and the
+    sell average for short positions.
+    """
+
+    def __init__(self, store: Optional[TickStore] = None):
+        """
+        Initialize PnL engine.
+
+        Args:
+            store: Tick store supplying last prices; the engine listens to
+                it for incremental updates
+        """
+        self.store = store
+        self._lock = threading.Lock()
+        self._clients: Dict[str, Any] = {}
+        self._codes: List[str] = []
+        self.version = 0
+        self._reset()
+        if store is not None:
+            store.add_listener(self.on_tick)
+
+    def _reset(self) -> None:
+        """Empty the columnar book."""
+        self._client_idx = np.empty(0, dtype=np.int64)
+        self._tokens = np.empty(0, dtype=np.int64)
+        self._symbols = np.empty(0, dtype=object)
+        self._netqty = np.empty(0)
+        self._open_avg = np.empty(0)
+        self._multiplier = np.empty(0)
+        self._ltp = np.empty(0)
+        self._realized = np.empty(0)
+        self._unrealized = np.empty(0)
+        self._client_realized = np.zeros(len(self._codes))
+        self._client_unrealized = np.zeros(len(self._codes))
+        self._rows_by_token: Dict[int, np.ndarray] = {}
+
+    def track(self, client) -> None:
+        """
+        Add a client and follow its position changes.
+
+        Args:
+            client: Logged-in client; its positions are reloaded whenever
+                a refresh reports changed position rows
+        """
+        with self._lock:
+            if client.code in self._clients:
+                return
+            self._clients[client.code] = client
+        client.add_change_listener(self._on_book_change)
+        self.reload()
+
+    def untrack(self, code: str) -> None:
+        """
+        Stop tracking a client.
+
+        Args:
+            code: Client code
+        """
+        with self._lock:
+            client = self._clients.pop(code, None)
+        if client is not None:
+            client.remove_change_listener(self._on_book_change)
+            self.reload()
+
+    def _on_book_change(self, client, changes: List[BookChange]) -> None:
+        """Reload when a tracked client's positions change."""
+        if any(change.book == 'positions' for change in changes):
+            self.reload()
+
+    def reload(self) -> None:
+        """Rebuild the columnar book from the tracked clients' positions."""
+        with self._lock:
+            clients = list(self._clients.values())
+
+        codes, rows, owners = [], [], []
+        for i, client in enumerate(clients):
+            codes.append(client.code)
+            data = client.positions.get('data') if isinstance(client.positions, dict) else None
+            for row in data or []:
+                rows.append(row)
+                owners.append(i)
+
+        tokens = np.array([int(row.get('symboltoken') or -1) for row in rows], dtype=np.int64)
+        cfbuyqty = _column(rows, 'cfbuyqty')
+        cfsellqty = _column(rows, 'cfsellqty')
+        daybuyqty = _column(rows, 'buyqty')
+        daysellqty = _column(rows, 'sellqty')
+        buyqty = cfbuyqty + daybuyqty
+        sellqty = cfsellqty + daysellqty
+        buyavg = _average(cfbuyqty, _column(rows, 'cfbuyavgprice'), daybuyqty, _column(rows, 'buyavgprice'))
+        sellavg = _average(cfsellqty, _column(rows, 'cfsellavgprice'), daysellqty, _column(rows, 'sellavgprice'))
+        # The broker's net quantity includes carry-forward buys and sells
+        netqty = _column(rows, 'netqty', np.nan)
+        netqty = np.where(np.isnan(netqty), buyqty - sellqty, netqty)
+        multiplier = _column(rows, 'multiplier', 1.0)
+        multiplier[multiplier <= 0] = 1.0
+
+        fallback = _column(rows, 'ltp', np.nan)
+        open_avg = np.where(netqty >= 0, buyavg, sellavg)
+        realized = np.minimum(buyqty, sellqty) * (sellavg - buyavg) * multiplier
+        client_idx = np.array(owners, dtype=np.int64)
+
+        order = np.argsort(tokens, kind='stable')
+        bounds = np.flatnonzero(np.diff(tokens[order])) + 1
+        rows_by_token = {
+            int(tokens[group[0]]): group
+            for group in np.split(order, bounds) if len(group)
+        }
+
+        # Mark and swap in one critical section: a tick stored after the
+        # snapshot waits in on_tick and is applied to the new book
+        with self._lock:
+            ltp = self.store.last_prices(tokens) if self.store is not None else np.full(len(rows), np.nan)
+            ltp = np.where(np.isnan(ltp), fallback, ltp)
+            unrealized = np.nan_to_num(netqty * (ltp - open_avg) * multiplier)
+            self._codes = codes
+            self._client_idx = client_idx
+            self._tokens = tokens
+            self._symbols = np.array([row.get('tradingsymbol', '') for row in rows], dtype=object)
+            self._netqty = netqty
+            self._open_avg = open_avg
+            self._multiplier = multiplier
+            self._ltp = ltp
+            self._realized = realized
+            self._unrealized = unrealized
+            self._client_realized = np.bincount(client_idx, realized, minlength=len(codes))
+            self._client_unrealized = np.bincount(client_idx, unrealized, minlength=len(codes))
+            self._rows_by_token = rows_by_token
+            self.version += 1
+
+    def on_tick(self, token: int, ts: int, ltp: float, volume: int = 0, oi: int = 0) -> None:
+        """
+        Re-mark the rows holding a token.
+
+        Args:
+            token: Instrument token
+            ts: Exchange timestamp (unused)
+            ltp: Last traded price
+            volume: Day volume (unused)
+            oi: Open interest (unused)
+        """
+        # Looked up under the lock, or a tick racing a reload could miss
+        # a token the new book holds
+        with self._lock:
+            rows = self._rows_by_token.get(token)
+            if rows is None:
+                return
+            self._ltp[rows] = ltp
+            unrealized = self._netqty[rows] * (ltp - self._open_avg[rows]) * self._multiplier[rows]
+            np.add.at(self._client_unrealized, self._client_idx[rows], unrealized - self._unrealized[rows])
+            self._unrealized[rows] = unrealized
+            self.version += 1
+
+    def by_client(self) -> pd.DataFrame:
+        """
+        Get PnL per client.
+
+        Returns:
+            pd.DataFrame: realized, unrealized and total, indexed by client code
+        """
+        with self._lock:
+            realized = self._client_realized.copy()
+            unrealized = self._client_unrealized.copy()
+            codes = list(self._codes)
+        return pd.DataFrame(
+            {'realized': realized, 'unrealized': unrealized, 'total': realized + unrealized},
+            index=pd.Index(codes, name='client')
+        )
+
+    def by_position(self) -> pd.DataFrame:
+        """
+        Get PnL per position row.
+
+        Returns:
+            pd.DataFrame: client, token, tradingsymbol, netqty, ltp,
+            realized, unrealized and total
+        """
+        with self._lock:
+            codes = np.array(self._codes, dtype=object)
+            frame = pd.DataFrame({
+                'client': codes[self._client_idx] if len(codes) else np.empty(0, dtype=object),
+                'token': self._tokens.copy(),
+                'tradingsymbol': self._symbols.copy(),
+                'netqty': self._netqty.copy(),
+                'ltp': self._ltp.copy(),
+                'realized': self._realized.copy(),
+                'unrealized': self._unrealized.copy()
+            })
+        frame['total'] = frame['realized'] + frame['unrealized']
+        return frame
+
+    def totals(self) -> Dict[str, float]:
+        """
+        Get aggregate PnL across all clients.
+
+        Returns:
+            Dict[str, float]: realized, unrealized and total
+        """
+        with self._lock:
+            realized = float(self._client_realized.sum())
+            unrealized = float(self._client_unrealized.sum())
+        return {'realized': realized, 'unrealized': unrealized, 'total': realized + unrealized}
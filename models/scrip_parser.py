@@ -0,0 +1,251 @@
+import codecs
+import json
+import re
+import sys
+import time
+from array import array
+from typing import Optional, Dict, Any, Callable, Iterable, Tuple
+import numpy as np
+import pandas as pd
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None
+
+_WHITESPACE = re.compile(r'\s*')
+
+class ScripParseError(Exception):
+    """Raised when the scrip master payload is malformed."""
+    pass
+
+def peak_rss_bytes() -> Optional[int]:
+    """
+    Get the peak resident set size of the current process.
+
+    Returns:
+        Optional[int]: Peak RSS in bytes, or None if unavailable
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+class ScripMasterParser:
+    """
+    Incremental parser for the OpenAPIScripMaster.json array.
+
+    Bytes are fed in chunks as they arrive from the network and each
+    record is decoded on its own and appended straight into per-column
+    buffers, so the full payload, the list of row dicts and the final
+    frame never coexist in memory.
+
+    Columns listed in ``SCHEMA`` are stored compactly: ``int`` columns in
+    packed int64 buffers (-1 when missing or invalid), ``float`` columns in
+    packed float64 buffers and ``category`` columns as interned int32 codes
+    that become a pandas Categorical. Other columns stay as strings.
+    """
+
+    # Strikes are already in paise in the master (price * 100)
+    SCHEMA = {
+        'token': 'int',
+        'strike': 'int',
+        'lotsize': 'int',
+        'tick_size': 'float',
+        'exch_seg': 'category',
+        'instrumenttype': 'category',
+        'name': 'category',
+        'expiry': 'category'
+    }
+    _TYPECODES = {'int': 'q', 'float': 'd', 'category': 'i'}
+
+    def __init__(self):
+        """Initialize parser state."""
+        self._decoder = codecs.getincrementaldecoder('utf-8')()
+        self._json = json.JSONDecoder()
+        self._buffer = ''
+        self._started = False
+        self._finished = False
+        self._columns: Dict[str, Any] = {}
+        self._sinks: Dict[str, Callable[[Any], None]] = {}
+        self._categories: Dict[str, Dict[str, int]] = {}
+        self._invalid = 0
+        self._rows = 0
+        self._bytes = 0
+        self._start = time.perf_counter()
+
+    @property
+    def rows(self) -> int:
+        """Number of records parsed so far."""
+        return self._rows
+
+    def _add_column(self, column: str) -> None:
+        """Create the buffer and sink for a column, backfilled to the row count."""
+        kind = self.SCHEMA.get(column)
+        rows = self._rows
+
+        if kind is None:
+            buffer = [''] * rows
+            append = buffer.append
+
+            def sink(value: Any) -> None:
+                append('' if value is None else value)
+        elif kind == 'category':
+            codes = self._categories[column] = {'': 0}
+            buffer = array('i', [0] * rows)
+            append = buffer.append
+
+            def sink(value: Any) -> None:
+                code = codes.get(value)
+                if code is None:
+                    code = 0 if value is None else codes.setdefault(value, len(codes))
+                append(code)
+        else:
+            missing = -1 if kind == 'int' else float('nan')
+            convert = (lambda value: int(round(float(value)))) if kind == 'int' else float
+            buffer = array(self._TYPECODES[kind], [missing] * rows)
+            append = buffer.append
+
+            def sink(value: Any) -> None:
+                try:
+                    append(convert(value))
+                except (TypeError, ValueError, OverflowError):
+                    if value not in (None, ''):
+                        self._invalid += 1
+                    append(missing)
+
+        self._columns[column] = buffer
+        self._sinks[column] = sink
+
+    def _append(self, record: Dict[str, Any]) -> None:
+        """Append one decoded record to the column buffers."""
+        if not isinstance(record, dict):
+            raise ScripParseError(f"Expected an object, got {type(record).__name__}")
+
+        sinks = self._sinks
+        if not record.keys() <= sinks.keys():
+            for column in record:
+                if column not in sinks:
+                    self._add_column(column)
+
+        get = record.get
+        for column, sink in sinks.items():
+            sink(get(column))
+        self._rows += 1
+
+    def _drain(self, final: bool) -> None:
+        """Decode every complete record currently in the buffer."""
+        buffer = self._buffer
+        pos = 0
+        end = len(buffer)
+
+        while not self._finished:
+            pos = _WHITESPACE.match(buffer, pos).end()
+            if pos >= end:
+                break
+
+            char = buffer[pos]
+            if not self._started:
+                if char != '[':
+                    raise ScripParseError(f"Expected '[' at start, got {char!r}")
+                self._started = True
+                pos += 1
+            elif char == ',':
+                pos += 1
+            elif char == ']':
+                self._finished = True
+                pos += 1
+            else:
+                try:
+                    record, pos = self._json.raw_decode(buffer, pos)
+                except json.JSONDecodeError as e:
+                    if final:
+                        raise ScripParseError(f"Malformed scrip master: {str(e)}")
+                    # Partial record; wait for the next chunk
+                    break
+                self._append(record)
+
+        self._buffer = buffer[pos:]
+
+    def feed(self, chunk: bytes) -> None:
+        """
+        Feed the next chunk of the payload.
+
+        Args:
+            chunk: Raw bytes from the response body
+
+        Raises:
+            ScripParseError: If the payload is malformed
+        """
+        if not chunk:
+            return
+        self._bytes += len(chunk)
+        self._buffer += self._decoder.decode(chunk)
+        self._drain(final=False)
+
+    def close(self) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+        """
+        Finish parsing and build the frame.
+
+        Returns:
+            Tuple[pd.DataFrame, Dict[str, Any]]: Parsed frame and ingest
+            statistics (rows, bytes, seconds, rows_per_second,
+            peak_rss_bytes, invalid_values)
+
+        Raises:
+            ScripParseError: If the payload is truncated or malformed
+        """
+        self._buffer += self._decoder.decode(b'', final=True)
+        self._drain(final=True)
+        if not self._finished:
+            raise ScripParseError("Truncated scrip master payload")
+        if self._buffer.strip():
+            raise ScripParseError("Unexpected data after scrip master array")
+
+        data = {}
+        for column, buffer in self._columns.items():
+            kind = self.SCHEMA.get(column)
+            if kind == 'category':
+                data[column] = pd.Categorical.from_codes(
+                    np.frombuffer(buffer, dtype=np.int32),
+                    categories=list(self._categories[column])
+                )
+            elif kind is not None:
+                data[column] = np.frombuffer(buffer, dtype=buffer.typecode)
+            else:
+                values = np.empty(len(buffer), dtype=object)
+                values[:] = buffer
+                data[column] = values
+            self._columns[column] = None
+        self._sinks.clear()
+        df = pd.DataFrame(data, copy=False)
+
+        seconds = time.perf_counter() - self._start
+        stats = {
+            'rows': self._rows,
+            'bytes': self._bytes,
+            'seconds': seconds,
+            'rows_per_second': self._rows / seconds if seconds > 0 else None,
+            'peak_rss_bytes': peak_rss_bytes(),
+            'invalid_values': self._invalid
+        }
+        return df, stats
+
+def parse_scrip_master(chunks: Iterable[bytes]) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    """
+    Parse a scrip master payload from an iterable of byte chunks.
+
+    Args:
+        chunks: Byte chunks, e.g. ``response.iter_content(...)``
+
+    Returns:
+        Tuple[pd.DataFrame, Dict[str, Any]]: Parsed frame and ingest statistics
+
+    Raises:
+        ScripParseError: If the payload is malformed
+    """
+    parser = ScripMasterParser()
+    for chunk in chunks:
+        parser.feed(chunk)
+    return parser.close()
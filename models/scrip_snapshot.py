@@ -0,0 +1,193 @@
+import json
+import os
+import shutil
+import time
+from typing import Optional, Dict, Any, Tuple
+import numpy as np
+import pandas as pd
+from utils.logger import app_logger, log_exception
+
+# Bump whenever the on-disk layout or column encoding changes; snapshots
+# written with another version are ignored and rebuilt from the API.
+SNAPSHOT_VERSION = 2
+
+class SnapshotError(Exception):
+    """Base exception for scrip master snapshot errors."""
+    pass
+
+class ScripSnapshot:
+    """
+    Versioned, columnar on-disk snapshot of the scrip master.
+
+    Each snapshot is a generation directory holding one ``.npy`` file per
+    column plus a ``meta.json``. Numeric and datetime columns are loaded
+    memory-mapped, so opening a snapshot costs milliseconds instead of a
+    full download and parse. A ``CURRENT`` pointer file is swapped
+    atomically so readers never see a half-written generation.
+    """
+
+    POINTER_FILE = 'CURRENT'
+    META_FILE = 'meta.json'
+
+    def __init__(self, directory: str):
+        """
+        Initialize snapshot store.
+
+        Args:
+            directory: Directory holding the snapshot generations
+        """
+        self.directory = directory
+
+    def _current_path(self) -> Optional[str]:
+        """Get the path of the current generation, if any."""
+        pointer = os.path.join(self.directory, self.POINTER_FILE)
+        if not os.path.exists(pointer):
+            return None
+        with open(pointer, 'r') as f:
+            name = f.read().strip()
+        path = os.path.join(self.directory, name)
+        return path if os.path.isdir(path) else None
+
+    def _write_json(self, path: str, payload: Dict[str, Any]) -> None:
+        """Write a JSON file atomically."""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(payload, f)
+        os.replace(tmp_path, path)
+
+    def save(self, df: pd.DataFrame, meta: Dict[str, Any]) -> str:
+        """
+        Write a new snapshot generation and make it current.
+
+        Args:
+            df: Scrip master frame to persist
+            meta: Extra metadata (etag, last_modified, fetched_at)
+
+        Returns:
+            str: Path of the written generation
+
+        Raises:
+            SnapshotError: If the snapshot cannot be written
+        """
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            name = f"g{time.time_ns()}"
+            path = os.path.join(self.directory, name)
+            os.makedirs(path)
+
+            columns = {}
+            for i, column in enumerate(df.columns):
+                series = df[column]
+                if isinstance(series.dtype, pd.CategoricalDtype):
+                    np.save(
+                        os.path.join(path, f"{i}.codes.npy"),
+                        series.cat.codes.to_numpy()
+                    )
+                    np.save(
+                        os.path.join(path, f"{i}.categories.npy"),
+                        series.cat.categories.to_numpy(dtype=str)
+                    )
+                    kind = 'categorical'
+                elif pd.api.types.is_datetime64_dtype(series.dtype):
+                    np.save(
+                        os.path.join(path, f"{i}.npy"),
+                        series.to_numpy(dtype='datetime64[ns]')
+                    )
+                    kind = 'datetime'
+                elif pd.api.types.is_numeric_dtype(series.dtype):
+                    np.save(os.path.join(path, f"{i}.npy"), series.to_numpy())
+                    kind = 'numeric'
+                else:
+                    np.save(
+                        os.path.join(path, f"{i}.npy"),
+                        series.fillna('').to_numpy(dtype=str)
+                    )
+                    kind = 'string'
+                columns[str(column)] = {'file': str(i), 'kind': kind}
+
+            payload = dict(meta)
+            payload.update({
+                'version': SNAPSHOT_VERSION,
+                'rows': len(df),
+                'columns': columns,
+                'created_at': time.time()
+            })
+            self._write_json(os.path.join(path, self.META_FILE), payload)
+
+            previous = self._current_path()
+            pointer = os.path.join(self.directory, self.POINTER_FILE)
+            tmp_pointer = f"{pointer}.tmp"
+            with open(tmp_pointer, 'w') as f:
+                f.write(name)
+            os.replace(tmp_pointer, pointer)
+
+            if previous is not None:
+                shutil.rmtree(previous, ignore_errors=True)
+
+            app_logger.info("Saved scrip master snapshot %s (%d rows)", name, len(df))
+            return path
+        except Exception as e:
+            log_exception(app_logger, e, "Failed to save scrip master snapshot")
+            raise SnapshotError(f"Failed to save snapshot: {str(e)}")
+
+    def load(self) -> Optional[Tuple[pd.DataFrame, Dict[str, Any]]]:
+        """
+        Load the current snapshot generation.
+
+        Returns:
+            Optional[Tuple[pd.DataFrame, Dict[str, Any]]]: Frame and
+            metadata, or None if no usable snapshot exists
+        """
+        try:
+            path = self._current_path()
+            if path is None:
+                return None
+
+            with open(os.path.join(path, self.META_FILE), 'r') as f:
+                meta = json.load(f)
+
+            if meta.get('version') != SNAPSHOT_VERSION:
+                app_logger.info(
+                    "Ignoring snapshot version %s, expected %s",
+                    meta.get('version'), SNAPSHOT_VERSION
+                )
+                return None
+
+            data = {}
+            for column, spec in meta['columns'].items():
+                base = os.path.join(path, spec['file'])
+                if spec['kind'] == 'categorical':
+                    codes = np.load(f"{base}.codes.npy", mmap_mode='r')
+                    categories = np.load(f"{base}.categories.npy")
+                    data[column] = pd.Categorical.from_codes(
+                        codes, categories=categories.astype(object)
+                    )
+                elif spec['kind'] == 'string':
+                    data[column] = np.load(f"{base}.npy").astype(object)
+                else:
+                    data[column] = np.load(f"{base}.npy", mmap_mode='r')
+
+            return pd.DataFrame(data, copy=False), meta
+        except Exception as e:
+            log_exception(app_logger, e, "Failed to load scrip master snapshot")
+            return None
+
+    def update_meta(self, **updates: Any) -> None:
+        """
+        Update metadata of the current generation in place.
+
+        Args:
+            **updates: Metadata keys to overwrite
+        """
+        try:
+            path = self._current_path()
+            if path is None:
+                return
+
+            meta_path = os.path.join(path, self.META_FILE)
+            with open(meta_path, 'r') as f:
+                meta = json.load(f)
+            meta.update(updates)
+            self._write_json(meta_path, meta)
+        except Exception as e:
+            log_exception(app_logger, e, "Failed to update snapshot metadata")
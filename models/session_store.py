@@ -0,0 +1,113 @@
+import base64
+import hashlib
+import json
+import os
+import time
+from typing import Dict, Optional, Any
+from config import Config, get_fernet
+from utils.logger import app_logger, log_exception
+
+def jwt_expiry(token: Optional[str]) -> Optional[float]:
+    """
+    Read the expiry of a JWT without verifying it.
+
+    Args:
+        token: JWT, with or without a ``Bearer`` prefix
+
+    Returns:
+        Optional[float]: Expiry as a UNIX timestamp, or None if unknown
+    """
+    if not token:
+        return None
+    try:
+        payload = token.split()[-1].split('.')[1]
+        payload += '=' * (-len(payload) % 4)
+        exp = json.loads(base64.urlsafe_b64decode(payload)).get('exp')
+        return float(exp) if exp is not None else None
+    except Exception:
+        return None
+
+class SessionStore:
+    """
+    Encrypted on-disk store of client sessions.
+
+    One file per client holds the Fernet-encrypted session tokens, named
+    by a hash of the client code so codes are not visible on disk either.
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        """
+        Initialize session store.
+
+        Args:
+            directory: Directory for session files (defaults to
+                Config.SESSION_DIR)
+        """
+        self._directory = directory
+
+    @property
+    def directory(self) -> str:
+        """Directory holding the session files."""
+        return self._directory or Config.SESSION_DIR
+
+    def _path(self, code: str) -> str:
+        """Get the session file path of a client."""
+        name = hashlib.sha256(code.encode()).hexdigest()[:32]
+        return os.path.join(self.directory, f"{name}.session")
+
+    def save(self, code: str, session: Dict[str, Any]) -> None:
+        """
+        Persist a client session.
+
+        Args:
+            code: Client code
+            session: Session tokens and expiry
+        """
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            path = self._path(code)
+            payload = dict(session, code=code, saved_at=time.time())
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(get_fernet().encrypt(json.dumps(payload).encode()))
+            os.replace(tmp_path, path)
+        except Exception as e:
+            log_exception(app_logger, e, f"Failed to save session for {code}")
+
+    def load(self, code: str) -> Optional[Dict[str, Any]]:
+        """
+        Load a persisted client session.
+
+        Args:
+            code: Client code
+
+        Returns:
+            Optional[Dict[str, Any]]: Session, or None if missing or unreadable
+        """
+        path = self._path(code)
+        if not os.path.exists(path):
+            return None
+        from cryptography.fernet import InvalidToken
+        try:
+            with open(path, 'rb') as f:
+                session = json.loads(get_fernet().decrypt(f.read()))
+        except (InvalidToken, ValueError, OSError) as e:
+            app_logger.warning("Discarding unreadable session for %s: %r", code, e)
+            self.delete(code)
+            return None
+        return session if session.get('code') == code else None
+
+    def delete(self, code: str) -> None:
+        """
+        Remove a persisted client session.
+
+        Args:
+            code: Client code
+        """
+        try:
+            os.remove(self._path(code))
+        except FileNotFoundError:
+            pass
+
+# Shared store used by clients unless one is passed explicitly
+session_store = SessionStore()
@@ -0,0 +1,78 @@
+from typing import Optional, Sequence, Union
+import numpy as np
+import pandas as pd
+
+# Each position is sized to this fraction of the client's capital
+CAPITAL_DIVISOR = 10
+
+ArrayLike = Union[Sequence[float], np.ndarray, pd.Series]
+
+def size_positions(
+    capitals: ArrayLike,
+    prices: ArrayLike,
+    lot_sizes: Optional[ArrayLike] = None
+) -> np.ndarray:
+    """
+    Size every client against every instrument in one pass.
+
+    Each cell is ``floor(capital / 10 / price)`` rounded down to a whole
+    number of lots. Instruments with a missing or non-positive price get
+    0; missing or non-positive lot sizes count as 1 (cash segment).
+
+    Args:
+        capitals: Client capitals, shape (clients,)
+        prices: Instrument prices, shape (instruments,)
+        lot_sizes: Instrument lot sizes, shape (instruments,)
+
+    Returns:
+        np.ndarray: int64 quantities, shape (clients, instruments)
+
+    Raises:
+        ValueError: If prices and lot_sizes differ in length
+    """
+    capitals = np.asarray(capitals, dtype=np.float64)
+    prices = np.asarray(prices, dtype=np.float64)
+    if lot_sizes is None:
+        lots = np.ones(len(prices), dtype=np.int64)
+    else:
+        lots = np.asarray(lot_sizes, dtype=np.float64)
+        if len(lots) != len(prices):
+            raise ValueError("prices and lot_sizes must have the same length")
+        lots = np.where(lots > 0, lots, 1).astype(np.int64)
+
+    valid = prices > 0
+    safe_prices = np.where(valid, prices, 1.0)
+    budgets = capitals / CAPITAL_DIVISOR
+    units = np.floor(budgets[:, None] / safe_prices[None, :])
+    units[:, ~valid] = 0
+    units = units.astype(np.int64)
+    return units - units % lots
+
+def size_grid(
+    capitals: pd.Series,
+    instruments: pd.DataFrame,
+    price_column: str = 'price'
+) -> pd.DataFrame:
+    """
+    Size a labelled client x instrument grid.
+
+    Args:
+        capitals: Capital per client, indexed by client code
+        instruments: One row per instrument with ``token``, ``lotsize`` and
+            a price column, e.g. ``TokenData.resolve_tokens`` output with
+            prices added
+        price_column: Name of the price column
+
+    Returns:
+        pd.DataFrame: Quantities indexed by client code, one column per token
+    """
+    quantities = size_positions(
+        capitals.to_numpy(),
+        instruments[price_column].to_numpy(),
+        instruments['lotsize'].to_numpy() if 'lotsize' in instruments else None
+    )
+    return pd.DataFrame(
+        quantities,
+        index=capitals.index,
+        columns=instruments['token'].to_numpy()
+    )
@@ -0,0 +1,88 @@
+import json
+import re
+import socket
+import uuid
+from typing import Any, Dict, Optional
+from urllib.parse import urljoin
+import smartapi.smartExceptions as ex
+from smartapi import SmartConnect
+from utils.http import RequestsShim, transport
+from utils.logger import app_logger
+
+# Echoed to the broker in the X-ClientPublicIP header of every call
+PUBLIC_IP_URL = 'https://api.ipify.org'
+
+class PooledSmartConnect(SmartConnect):
+    """
+    SmartConnect that sends every call through its ``reqsession``.
+
+    smartapi's ``_request`` sends with the module-level ``requests.request``
+    and ``get`` and only uses ``reqsession`` when built with ``pool``. This
+    sends API calls and the public IP lookup on ``reqsession`` instead, which
+    defaults to the shared pooled transport and can be replaced per client.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        if not kwargs.get('pool'):
+            self.reqsession = RequestsShim(transport)
+
+    def _request(self, route: str, method: str, parameters: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        Make an HTTP request on ``reqsession``.
+
+        Args:
+            route: Key of the SmartAPI route
+            method: HTTP method
+            parameters: Route and body parameters
+
+        Returns:
+            Any: Decoded JSON response
+
+        Raises:
+            smartapi.smartExceptions.DataException: If the response is not JSON
+            smartapi.smartExceptions.GeneralException: Or a subclass, for API errors
+        """
+        params = parameters.copy() if parameters else {}
+        url = urljoin(self.root, self._routes[route].format(**params))
+        headers = {
+            'Content-type': 'application/json',
+            'X-ClientLocalIP': socket.gethostbyname(socket.gethostname()),
+            'X-ClientPublicIP': self.reqsession.get(PUBLIC_IP_URL, timeout=self.timeout).text,
+            'X-MACAddress': ':'.join(re.findall('..', '%012x' % uuid.getnode())),
+            'Accept': 'application/json',
+            'X-PrivateKey': self.api_key,
+            'X-UserType': 'USER',
+            'X-SourceID': 'WEB'
+        }
+        if self.access_token:
+            headers['Authorization'] = f"Bearer {self.access_token}"
+        if self.debug:
+            app_logger.debug("SmartAPI request: %s %s %s", method, url, params)
+
+        response = self.reqsession.request(
+            method,
+            url,
+            data=json.dumps(params) if method in ('POST', 'PUT') else None,
+            params=json.dumps(params) if method in ('GET', 'DELETE') else None,
+            headers=headers,
+            verify=not self.disable_ssl,
+            allow_redirects=True,
+            timeout=self.timeout,
+            proxies=self.proxies
+        )
+        if self.debug:
+            app_logger.debug("SmartAPI response: %s %s", response.status_code, response.content)
+
+        try:
+            data = json.loads(response.content.decode('utf8'))
+        except ValueError:
+            raise ex.DataException(
+                f"Couldn't parse the JSON response received from the server: {response.content}"
+            )
+        if data.get('error_type'):
+            if self.session_expiry_hook and response.status_code == 403 and data['error_type'] == 'TokenException':
+                self.session_expiry_hook()
+            error = getattr(ex, data['error_type'], ex.GeneralException)
+            raise error(data['message'], code=response.status_code)
+        return data
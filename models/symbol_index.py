@@ -0,0 +1,146 @@
+from typing import Dict, List, Any, Set
+import numpy as np
+import pandas as pd
+
+def _deletes(word: str) -> Set[str]:
+    """Get every string obtained by deleting one character from a word."""
+    return {word[:i] + word[i + 1:] for i in range(len(word))}
+
+def _within_one_edit(a: str, b: str) -> bool:
+    """Check if two strings differ by at most one edit (incl. a transposition)."""
+    if a == b:
+        return True
+    if abs(len(a) - len(b)) > 1:
+        return False
+    if len(a) == len(b):
+        diff = [i for i in range(len(a)) if a[i] != b[i]]
+        if len(diff) == 1:
+            return True
+        return (
+            len(diff) == 2 and diff[1] == diff[0] + 1 and
+            a[diff[0]] == b[diff[1]] and a[diff[1]] == b[diff[0]]
+        )
+    if len(a) > len(b):
+        a, b = b, a
+    i = 0
+    while i < len(a) and a[i] == b[i]:
+        i += 1
+    return a[i:] == b[i + 1:]
+
+class SymbolIndex:
+    """
+    Search index over scrip master trading symbols.
+
+    Prefix search is a pair of binary searches over the sorted, upper-case
+    symbol array. Fuzzy search tolerates one typo in the underlying name
+    using a precomputed single-deletion neighbourhood, so both run in well
+    under a millisecond per keystroke.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        """
+        Build the index.
+
+        Args:
+            df: Scrip master frame
+        """
+        symbols = df['symbol'].to_numpy(dtype=str)
+        keys = np.char.upper(symbols)
+        self._order = np.argsort(keys, kind='stable')
+        self._keys = keys[self._order]
+        self._symbols = symbols
+        self._tokens = df['token'].to_numpy()
+        self._exch_segs = df['exch_seg'].to_numpy(dtype=object)
+
+        names = pd.unique(df['name'].to_numpy(dtype=object))
+        self._neighbours: Dict[str, Set[str]] = {}
+        for name in names:
+            if not name:
+                continue
+            name = name.upper()
+            for variant in _deletes(name) | {name}:
+                self._neighbours.setdefault(variant, set()).add(name)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _entry(self, position: int) -> Dict[str, Any]:
+        """Build a result entry for a master row."""
+        return {
+            'symbol': self._symbols[position],
+            'token': int(self._tokens[position]),
+            'exch_seg': self._exch_segs[position]
+        }
+
+    def prefix(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Find symbols starting with a prefix.
+
+        Args:
+            query: Symbol prefix (case-insensitive)
+            limit: Maximum number of results
+
+        Returns:
+            List[Dict[str, Any]]: Matches in symbol order, each with
+            symbol, token and exch_seg
+        """
+        query = query.strip().upper()
+        if not query:
+            return []
+        upper = query[:-1] + chr(ord(query[-1]) + 1)
+        lo = int(np.searchsorted(self._keys, query, side='left'))
+        hi = int(np.searchsorted(self._keys, upper, side='left'))
+        return [self._entry(position) for position in self._order[lo:min(hi, lo + limit)]]
+
+    def fuzzy(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Find symbols whose underlying name is within one edit of the query.
+
+        Args:
+            query: Approximate underlying name (case-insensitive)
+            limit: Maximum number of results
+
+        Returns:
+            List[Dict[str, Any]]: Matches grouped by name, closest first
+        """
+        query = query.strip().upper()
+        if not query:
+            return []
+
+        candidates = set()
+        for variant in _deletes(query) | {query}:
+            candidates |= self._neighbours.get(variant, set())
+        names = sorted(
+            (name for name in candidates if _within_one_edit(query, name)),
+            key=lambda name: (name != query, name)
+        )
+
+        results = []
+        for name in names:
+            results.extend(self.prefix(name, limit - len(results)))
+            if len(results) >= limit:
+                break
+        return results
+
+    def search(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Find symbols by prefix, topped up with fuzzy matches.
+
+        Args:
+            query: Search text (case-insensitive)
+            limit: Maximum number of results
+
+        Returns:
+            List[Dict[str, Any]]: Prefix matches first, then fuzzy matches
+        """
+        results = self.prefix(query, limit)
+        if len(results) < limit:
+            seen = {(entry['symbol'], entry['exch_seg']) for entry in results}
+            for entry in self.fuzzy(query, limit):
+                key = (entry['symbol'], entry['exch_seg'])
+                if key not in seen:
+                    seen.add(key)
+                    results.append(entry)
+                    if len(results) >= limit:
+                        break
+        return results
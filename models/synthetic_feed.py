@@ -0,0 +1,115 @@
+import time
+from typing import Dict, List, Optional, Any, Iterator, Sequence, Tuple
+import numpy as np
+
+class SyntheticFeed:
+    """
+    Local random-walk tick generator for load testing without a broker.
+
+    Prices, timestamps, volumes and open interest are generated a block at
+    a time with NumPy, so the generator itself stays cheap next to the
+    ingestion path being measured.
+    """
+
+    def __init__(
+        self,
+        tokens: Sequence[int],
+        base_prices: Optional[Sequence[float]] = None,
+        seed: int = 0,
+        block: int = 65536
+    ):
+        """
+        Initialize feed.
+
+        Args:
+            tokens: Instrument tokens to emit ticks for
+            base_prices: Starting price per token (defaults to 100.0)
+            seed: Random seed
+            block: Ticks generated per NumPy batch
+        """
+        self.tokens = np.asarray(tokens, dtype=np.int64)
+        self._prices = (
+            np.asarray(base_prices, dtype=np.float64).copy()
+            if base_prices is not None else np.full(len(self.tokens), 100.0)
+        )
+        self._volumes = np.zeros(len(self.tokens), dtype=np.int64)
+        self._rng = np.random.default_rng(seed)
+        self._block = block
+        self._clock = int(time.time() * 1000)
+
+    def _batch(self, size: int) -> Tuple[List[int], List[int], List[float], List[int], List[int]]:
+        """Generate one batch of ticks as Python lists."""
+        n = len(self.tokens)
+        which = self._rng.integers(0, n, size=size)
+        moves = self._rng.normal(0, 0.0005, size=size)
+        lots = self._rng.integers(1, 20, size=size) * 25
+
+        # Per-token running sums: cumulate in token order, then subtract
+        # the running total at the start of each token's group
+        order = np.argsort(which, kind='stable')
+        grouped = which[order]
+        starts = np.searchsorted(grouped, np.arange(n))
+        first = starts[grouped]
+        log_path = np.cumsum(moves[order])
+        lot_path = np.cumsum(lots[order])
+        log_path -= np.where(first > 0, log_path[first - 1], 0.0)
+        lot_path -= np.where(first > 0, lot_path[first - 1], 0)
+
+        prices = np.empty(size)
+        volumes = np.empty(size, dtype=np.int64)
+        prices[order] = np.round(self._prices[grouped] * np.exp(log_path), 2)
+        volumes[order] = self._volumes[grouped] + lot_path
+
+        seen = np.flatnonzero(np.bincount(which, minlength=n))
+        last = order[np.searchsorted(grouped, seen, side='right') - 1]
+        self._prices[seen] = prices[last]
+        self._volumes[seen] = volumes[last]
+
+        ts = self._clock + np.arange(size) // 10
+        self._clock = int(ts[-1]) + 1
+        return (
+            self.tokens[which].tolist(),
+            ts.tolist(),
+            prices.tolist(),
+            volumes.tolist(),
+            (volumes // 3).tolist()
+        )
+
+    def ticks(self, count: int) -> Iterator[Tuple[int, int, float, int, int]]:
+        """
+        Generate ticks.
+
+        Args:
+            count: Number of ticks
+
+        Yields:
+            Tuple[int, int, float, int, int]: token, ts (epoch ms), ltp
+            (rupees), volume, oi
+        """
+        remaining = count
+        while remaining > 0:
+            size = min(self._block, remaining)
+            yield from zip(*self._batch(size))
+            remaining -= size
+
+    def messages(self, count: int) -> Iterator[Dict[str, Any]]:
+        """
+        Generate SmartAPI WebSocket V2 style tick messages.
+
+        Args:
+            count: Number of messages
+
+        Yields:
+            Dict[str, Any]: Snap-quote shaped message with prices in paise
+        """
+        for sequence, (token, ts, ltp, volume, oi) in enumerate(self.ticks(count)):
+            yield {
+                'subscription_mode': 3,
+                'exchange_type': 2,
+                'token': str(token),
+                'sequence_number': sequence,
+                'exchange_timestamp': ts,
+                'last_traded_price': int(round(ltp * 100)),
+                'volume_trade_for_the_day': volume,
+                'open_interest': oi
+            }
@@ -0,0 +1,339 @@
+import threading
+import time
+from typing import Dict, List, Optional, Any, Callable, Iterable, Tuple
+import numpy as np
+from config import Config
+from utils.logger import app_logger, log_exception
+
+# One tick: exchange timestamp (epoch ms), last traded price (rupees),
+# day volume and open interest
+TICK_DTYPE = np.dtype([
+    ('ts', 'i8'),
+    ('ltp', 'f8'),
+    ('volume', 'i8'),
+    ('oi', 'i8')
+])
+
+class _TickRing:
+    """Preallocated ring buffer of one token's ticks with per-field views."""
+
+    __slots__ = ('buffer', 'ts', 'ltp', 'volume', 'oi', 'head', 'count', 'slot')
+
+    def __init__(self, capacity: int, slot: int):
+        self.buffer = np.zeros(capacity, dtype=TICK_DTYPE)
+        # Field views are taken once so writes are plain scalar stores
+        self.ts = self.buffer['ts']
+        self.ltp = self.buffer['ltp']
+        self.volume = self.buffer['volume']
+        self.oi = self.buffer['oi']
+        self.head = 0
+        self.count = 0
+        self.slot = slot
+
+class TickStore:
+    """
+    Per-token tick history in preallocated NumPy ring buffers.
+
+    Each token gets a fixed-size structured array the first time it is
+    seen (or when subscribed), after which ingestion only stores scalars
+    into existing memory. The latest price and timestamp of every token
+    are also kept in flat arrays sized for the most tokens the store
+    takes, so last-price lookups are O(1) and can be gathered for many
+    tokens at once.
+
+    Writes are expected from a single feed thread; readers on other
+    threads see each field update atomically. Since the last-price
+    arrays are never reallocated, tokens can be added from any thread
+    without losing a concurrent write.
+    """
+
+    def __init__(self, capacity: Optional[int] = None, max_tokens: Optional[int] = None):
+        """
+        Initialize tick store.
+
+        Args:
+            capacity: Ticks kept per token (defaults to Config.TICK_BUFFER_SIZE)
+            max_tokens: Most tokens the store takes (defaults to
+                Config.TICK_MAX_TOKENS)
+
+        Raises:
+            ValueError: If capacity or max_tokens is not positive
+        """
+        self.capacity = capacity or Config.TICK_BUFFER_SIZE
+        if self.capacity <= 0:
+            raise ValueError("Capacity must be greater than 0")
+        self.max_tokens = max_tokens or Config.TICK_MAX_TOKENS
+        if self.max_tokens <= 0:
+            raise ValueError("Max tokens must be greater than 0")
+
+        self._rings: Dict[int, _TickRing] = {}
+        self._lock = threading.Lock()
+        self._last_ltp = np.full(self.max_tokens, np.nan)
+        self._last_ts = np.zeros(self.max_tokens, dtype='i8')
+        self._listeners: Tuple[Callable[..., None], ...] = ()
+        self.ticks = 0
+
+    def _add(self, token: int) -> _TickRing:
+        """
+        Allocate the ring buffer of a new token.
+
+        Raises:
+            ValueError: If the store already holds max_tokens tokens
+        """
+        with self._lock:
+            ring = self._rings.get(token)
+            if ring is not None:
+                return ring
+            slot = len(self._rings)
+            if slot == self.max_tokens:
+                raise ValueError(f"Tick store is full ({self.max_tokens} tokens); raise TICK_MAX_TOKENS")
+            ring = _TickRing(self.capacity, slot)
+            self._rings[token] = ring
+            return ring
+
+    def subscribe(self, tokens: Iterable[int]) -> None:
+        """
+        Preallocate buffers for tokens ahead of the first tick.
+
+        Args:
+            tokens: Instrument tokens
+
+        Raises:
+            ValueError: If the store would exceed max_tokens tokens
+        """
+        for token in tokens:
+            if int(token) not in self._rings:
+                self._add(int(token))
+
+    def add_listener(self, callback: Callable[[int, int, float, int, int], None]) -> None:
+        """
+        Register a callback run synchronously after every tick is stored.
+
+        Args:
+            callback: Called with token, ts, ltp, volume, oi on the feed thread
+        """
+        self._listeners = self._listeners + (callback,)
+
+    def remove_listener(self, callback: Callable[[int, int, float, int, int], None]) -> None:
+        """
+        Unregister a tick callback.
+
+        Args:
+            callback: Previously registered callback
+        """
+        self._listeners = tuple(c for c in self._listeners if c != callback)
+
+    @property
+    def tokens(self) -> List[int]:
+        """Tokens with a buffer."""
+        return list(self._rings)
+
+    def write(self, token: int, ts: int, ltp: float, volume: int = 0, oi: int = 0) -> None:
+        """
+        Append one tick.
+
+        Args:
+            token: Instrument token
+            ts: Exchange timestamp in epoch milliseconds
+            ltp: Last traded price in rupees
+            volume: Day volume
+            oi: Open interest
+        """
+        ring = self._rings.get(token)
+        if ring is None:
+            ring = self._add(token)
+
+        i = ring.head
+        ring.ts[i] = ts
+        ring.ltp[i] = ltp
+        ring.volume[i] = volume
+        ring.oi[i] = oi
+        ring.head = i + 1 if i + 1 < self.capacity else 0
+        if ring.count < self.capacity:
+            ring.count += 1
+
+        slot = ring.slot
+        self._last_ltp[slot] = ltp
+        self._last_ts[slot] = ts
+        self.ticks += 1
+        for listener in self._listeners:
+            listener(token, ts, ltp, volume, oi)
+
+    def last_price(self, token: int) -> Optional[float]:
+        """
+        Get the latest traded price of a token.
+
+        Args:
+            token: Instrument token
+
+        Returns:
+            Optional[float]: Last price, or None if no tick was seen
+        """
+        ring = self._rings.get(token)
+        if ring is None or ring.count == 0:
+            return None
+        return float(self._last_ltp[ring.slot])
+
+    def last_timestamp(self, token: int) -> Optional[int]:
+        """
+        Get the exchange timestamp of a token's latest tick.
+
+        Args:
+            token: Instrument token
+
+        Returns:
+            Optional[int]: Epoch milliseconds, or None if no tick was seen
+        """
+        ring = self._rings.get(token)
+        if ring is None or ring.count == 0:
+            return None
+        return int(self._last_ts[ring.slot])
+
+    def last_prices(self, tokens: Iterable[int]) -> np.ndarray:
+        """
+        Gather the latest prices of many tokens.
+
+        Args:
+            tokens: Instrument tokens
+
+        Returns:
+            np.ndarray: Last prices, NaN where no tick was seen
+        """
+        slots = np.array([
+            ring.slot if ring is not None else -1
+            for ring in map(self._rings.get, tokens)
+        ], dtype=np.int64)
+        prices = np.full(len(slots), np.nan)
+        known = slots >= 0
+        prices[known] = self._last_ltp[slots[known]]
+        return prices
+
+    def history(self, token: int, n: Optional[int] = None) -> np.ndarray:
+        """
+        Get a token's most recent ticks, oldest first.
+
+        Args:
+            token: Instrument token
+            n: Number of ticks (defaults to all buffered)
+
+        Returns:
+            np.ndarray: Copy of the ticks with TICK_DTYPE fields
+        """
+        ring = self._rings.get(token)
+        if ring is None:
+            return np.empty(0, dtype=TICK_DTYPE)
+        n = ring.count if n is None else min(n, ring.count)
+        start = ring.head - n
+        if start >= 0:
+            return ring.buffer[start:ring.head].copy()
+        return np.concatenate([ring.buffer[start:], ring.buffer[:ring.head]])
+
+    def memory_bytes(self) -> int:
+        """
+        Get the memory held by tick buffers.
+
+        Returns:
+            int: Bytes of ring buffers and last-price arrays
+        """
+        return (
+            sum(ring.buffer.nbytes for ring in self._rings.values()) +
+            self._last_ltp.nbytes + self._last_ts.nbytes
+        )
+
+class SmartWebSocketAdapter:
+    """
+    Feeds SmartAPI WebSocket V2 messages into a TickStore.
+
+    Assign ``on_data`` as the websocket's data callback (or call
+    ``attach``). Prices arrive in paise and are stored in rupees.
+    """
+
+    def __init__(self, store: TickStore):
+        """
+        Initialize adapter.
+
+        Args:
+            store: Tick store to write into
+        """
+        self.store = store
+        self.errors = 0
+
+    def attach(self, websocket: Any) -> None:
+        """
+        Route a SmartWebSocketV2 instance's data callback to the store.
+
+        Args:
+            websocket: SmartWebSocketV2 instance
+        """
+        websocket.on_data = self.on_data
+
+    def on_data(self, wsapp: Any, message: Dict[str, Any]) -> None:
+        """
+        Handle one parsed tick message.
+
+        Args:
+            wsapp: Websocket app (unused)
+            message: Parsed V2 tick with token, exchange_timestamp,
+                last_traded_price and, in quote modes,
+                volume_trade_for_the_day and open_interest
+        """
+        try:
+            self.store.write(
+                int(message['token']),
+                message['exchange_timestamp'],
+                message['last_traded_price'] / 100,
+                message.get('volume_trade_for_the_day', 0),
+                message.get('open_interest', 0)
+            )
+        except Exception as e:
+            self.errors += 1
+            # Keep a malformed message from flooding the log
+            if self.errors == 1 or self.errors % 1000 == 0:
+                log_exception(app_logger, e, f"Dropped malformed tick ({self.errors} so far)")
+
+class SmartFeedAdapter:
+    """
+    Feeds ticks from smartapi's legacy ``WebSocket`` into a TickStore.
+
+    Assign ``on_ticks`` as the websocket's tick callback. Ticks carry
+    rupee prices as strings under short keys (``tk`` token, ``ltp``, ``v``
+    day volume, ``oi``); messages without a price (acknowledgements and
+    depth-only updates) are skipped. Their trade time has no fixed format,
+    so ticks are stamped when they arrive, and an update without volume or
+    open interest keeps the token's previous values.
+    """
+
+    def __init__(self, store: TickStore):
+        """
+        Initialize adapter.
+
+        Args:
+            store: Tick store to write into
+        """
+        self.store = store
+        self.errors = 0
+        self._last: Dict[int, Tuple[int, int]] = {}
+
+    def on_ticks(self, wsapp: Any, ticks: Any) -> None:
+        """
+        Handle one decoded feed message.
+
+        Args:
+            wsapp: Websocket (unused)
+            ticks: Tick dict or list of tick dicts
+        """
+        ts = int(time.time() * 1000)
+        for tick in ticks if isinstance(ticks, list) else [ticks]:
+            if not isinstance(tick, dict) or 'tk' not in tick or 'ltp' not in tick:
+                continue
+            try:
+                token = int(tick['tk'])
+                volume, oi = self._last.get(token, (0, 0))
+                volume = int(float(tick.get('v', volume)))
+                oi = int(float(tick.get('oi', oi)))
+                self.store.write(token, ts, float(tick['ltp']), volume, oi)
+                self._last[token] = (volume, oi)
+            except Exception as e:
+                self.errors += 1
+                if self.errors == 1 or self.errors % 1000 == 0:
+                    log_exception(app_logger, e, f"Dropped malformed tick ({self.errors} so far)")
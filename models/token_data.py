@@ -1,25 +1,119 @@
+import os
+import threading
+import time
 import requests
 import pandas as pd
-from datetime import datetime
-from typing import Optional, Dict, List
-from functools import lru_cache
+from datetime import datetime, timedelta
+from typing import Optional, Dict, List, Any, NamedTuple, Sequence, Tuple, Union
+import numpy as np
 from config import Config
+from models.scrip_parser import parse_scrip_master
+from models.scrip_snapshot import ScripSnapshot, SnapshotError
+from models.symbol_index import SymbolIndex
+from models.token_index import TokenIndex, FUTURE_TYPES, OPTION_TYPES
+from utils.cache import LookupCache
+from utils.http import HttpTransport, transport as default_transport
 from utils.logger import app_logger, log_exception
 
 class TokenDataError(Exception):
     """Base exception for token data related errors."""
     pass
 
+def _read_only(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Rebuild a frame on read-only column arrays, for sharing between callers.
+
+    Without copy-on-write, writing into a shallow copy of the result raises
+    instead of changing the shared arrays; with it, pandas copies first.
+    """
+    columns = {}
+    for name, column in df.items():
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            codes = column.cat.codes.to_numpy(copy=True)
+            codes.flags.writeable = False
+            values = pd.Categorical.from_codes(codes, dtype=column.dtype)
+        elif isinstance(column.dtype, np.dtype):
+            values = column.to_numpy(copy=True)
+            values.flags.writeable = False
+        else:
+            values = column.array.copy()
+        columns[name] = pd.Series(values, index=df.index, name=name, copy=False)
+    # copy=False also keeps the columns in separate, unconsolidated blocks
+    return pd.DataFrame(columns, copy=False)
+
+def _parse_expiry(expiry: pd.Series) -> pd.Series:
+    """Convert categorical DDMONYYYY expiries to datetime64 via their categories."""
+    categories = pd.to_datetime(
+        expiry.cat.categories.to_numpy(dtype=object),
+        format='%d%b%Y',
+        errors='coerce'
+    ).to_numpy()
+    return pd.Series(categories[expiry.cat.codes.to_numpy()], index=expiry.index)
+
+class _ScripMaster(NamedTuple):
+    """One immutable scrip master generation, swapped in as a unit."""
+    df: pd.DataFrame
+    index: TokenIndex
+    symbols: SymbolIndex
+    generation: int
+
+def _seconds_until(at: str, now: Optional[datetime] = None) -> float:
+    """Get seconds from now until the next local HH:MM."""
+    now = now or datetime.now()
+    hour, minute = (int(part) for part in at.split(':'))
+    target = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if target <= now:
+        target += timedelta(days=1)
+    return (target - now).total_seconds()
+
 class TokenData:
-    """Handler for token data operations."""
+    """
+    Handler for token data operations.
+    
+    The scrip master, its index and its cache generation are published
+    together as one immutable object, so readers always see a complete
+    generation. Once loaded, stale data keeps being served while a
+    background worker fetches and indexes the replacement.
+    """
     
     API_URL = 'https://margincalculator.angelbroking.com/OpenAPI_File/files/OpenAPIScripMaster.json'
+    CHUNK_SIZE = 256 * 1024
     
-    def __init__(self):
-        """Initialize token data handler."""
-        self._df: Optional[pd.DataFrame] = None
+    def __init__(
+        self,
+        snapshot_dir: Optional[str] = None,
+        cache_size: Optional[int] = None,
+        http: Optional[HttpTransport] = None
+    ):
+        """
+        Initialize token data handler.
+        
+        Args:
+            snapshot_dir: Directory for the on-disk scrip master snapshot
+            cache_size: Maximum cached lookups (defaults to Config.TOKEN_CACHE_SIZE)
+            http: Transport the scrip master is downloaded on (defaults to
+                the shared transport)
+        """
+        self._http = http or default_transport
+        self._master: Optional[_ScripMaster] = None
+        self._cache = LookupCache(cache_size or Config.TOKEN_CACHE_SIZE)
         self._last_update: Optional[datetime] = None
         self._update_interval = pd.Timedelta(hours=24)
+        self._retry_interval = pd.Timedelta(minutes=5)
+        self._next_attempt: Optional[datetime] = None
+        self._update_lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._refresh_thread: Optional[threading.Thread] = None
+        self._schedule_timer: Optional[threading.Timer] = None
+        self._snapshot = ScripSnapshot(
+            snapshot_dir or os.path.join(Config.DATA_DIR, 'scrip_master')
+        )
+        self._snapshot_checked = False
+        self._etag: Optional[str] = None
+        self._last_modified: Optional[str] = None
+        self._load_seconds: Optional[float] = None
+        self._source: Optional[str] = None
+        self._ingest_stats: Optional[Dict[str, Any]] = None
     
     @property
     def df(self) -> pd.DataFrame:
@@ -32,52 +126,348 @@ class TokenData:
         Raises:
             TokenDataError: If data fetch fails
         """
+        return self._current().df
+    
+    def _current(self) -> _ScripMaster:
+        """
+        Get the current scrip master generation.
+        
+        Only the very first load blocks the caller. Afterwards stale data
+        schedules a background refresh and is served until it completes.
+        After a failed first load, callers fail fast until the retry
+        interval has passed instead of each retrying the download.
+        
+        Raises:
+            TokenDataError: If no data could be loaded
+        """
+        master = self._master
+        if master is None:
+            self._check_backoff()
+            with self._update_lock:
+                if self._master is None and not self._snapshot_checked:
+                    self._load_snapshot()
+                if self._master is None:
+                    # Callers queued behind a failed download must not retry it
+                    self._check_backoff()
+                    self._update_data()
+            master = self._master
+            if master is None:
+                raise TokenDataError("Token data is not available")
+        
         if self._should_update():
-            self._update_data()
-        return self._df
+            self.refresh()
+        return master
+    
+    @property
+    def is_loaded(self) -> bool:
+        """Whether a scrip master is available without blocking."""
+        return self._master is not None
+    
+    def _backing_off(self) -> bool:
+        """Check if a failed fetch is still within its retry interval."""
+        next_attempt = self._next_attempt
+        return next_attempt is not None and datetime.now() < next_attempt
+    
+    def _check_backoff(self) -> None:
+        """
+        Fail fast while a failed first load is backing off.
+        
+        Raises:
+            TokenDataError: If the next fetch attempt is not yet due
+        """
+        if self._master is None and self._backing_off():
+            raise TokenDataError(
+                f"Token data is not available; retrying after {self._next_attempt:%H:%M:%S}"
+            )
     
     def _should_update(self) -> bool:
         """Check if data should be updated."""
-        if self._df is None or self._last_update is None:
+        if self._master is None or self._last_update is None:
             return True
-            
-        now = datetime.now()
-        return (now - self._last_update) > self._update_interval
+        if self._backing_off():
+            return False
+        return (datetime.now() - self._last_update) > self._update_interval
+    
+    def refresh(self, wait: bool = False) -> None:
+        """
+        Refresh the scrip master on a background worker.
+        
+        Only one refresh runs at a time; calls made while one is in
+        flight join it instead of starting another. Before anything is
+        loaded this warms up from the on-disk snapshot first.
+        
+        Args:
+            wait: Block until the refresh has finished
+        """
+        with self._refresh_lock:
+            thread = self._refresh_thread
+            if thread is None or not thread.is_alive():
+                thread = threading.Thread(
+                    target=self._run_refresh,
+                    name='token-data-refresh',
+                    daemon=True
+                )
+                self._refresh_thread = thread
+                thread.start()
+        if wait:
+            thread.join()
+    
+    def _run_refresh(self) -> None:
+        """Background refresh body; never raises."""
+        try:
+            with self._update_lock:
+                if self._master is None and not self._snapshot_checked:
+                    # Warm-up: a fresh snapshot makes the download unnecessary
+                    self._load_snapshot()
+                    if self._master is not None and not self._should_update():
+                        return
+                self._update_data()
+        except Exception as e:
+            log_exception(app_logger, e, "Background token data refresh failed")
+    
+    def schedule_refresh(self, at: Optional[str] = None) -> None:
+        """
+        Refresh the scrip master every day at a fixed local time.
+        
+        Args:
+            at: Local time as HH:MM (defaults to Config.SCRIP_REFRESH_TIME)
+        """
+        at = at or Config.SCRIP_REFRESH_TIME
+        self.cancel_schedule()
+        
+        def run():
+            self.refresh()
+            self.schedule_refresh(at)
+        
+        delay = _seconds_until(at)
+        self._schedule_timer = threading.Timer(delay, run)
+        self._schedule_timer.daemon = True
+        self._schedule_timer.start()
+        app_logger.info("Token data refresh scheduled at %s (in %.1f h)", at, delay / 3600)
+    
+    def cancel_schedule(self) -> None:
+        """Cancel the scheduled daily refresh, if any."""
+        if self._schedule_timer is not None:
+            self._schedule_timer.cancel()
+            self._schedule_timer = None
+    
+    @property
+    def snapshot_info(self) -> Dict[str, Any]:
+        """
+        Get monitoring information about the loaded scrip master.
+        
+        Returns:
+            Dict[str, Any]: Source, load time, snapshot age, validators
+            and statistics of the last streaming ingest
+        """
+        age = None
+        if self._last_update is not None:
+            age = (datetime.now() - self._last_update).total_seconds()
+        return {
+            'source': self._source,
+            'rows': 0 if self._master is None else len(self._master.df),
+            'load_seconds': self._load_seconds,
+            'age_seconds': age,
+            'etag': self._etag,
+            'last_modified': self._last_modified,
+            'ingest': self._ingest_stats
+        }
+    
+    def _load_snapshot(self) -> None:
+        """Load token data from the on-disk snapshot, if present."""
+        self._snapshot_checked = True
+        start = time.perf_counter()
+        loaded = self._snapshot.load()
+        if loaded is None:
+            return
+        
+        df, meta = loaded
+        self._set_data(df)
+        self._last_update = datetime.fromtimestamp(meta['fetched_at'])
+        self._etag = meta.get('etag')
+        self._last_modified = meta.get('last_modified')
+        self._load_seconds = time.perf_counter() - start
+        self._source = 'snapshot'
+        
+        app_logger.info(
+            "Loaded token data snapshot (%d rows) in %.1f ms",
+            len(df), self._load_seconds * 1000
+        )
+    
+    def _set_data(self, df: pd.DataFrame) -> None:
+        """Build the indexes for a frame, then swap it in as a new generation."""
+        index = TokenIndex(df)
+        symbols = SymbolIndex(df)
+        generation = self._cache.invalidate()
+        self._master = _ScripMaster(df, index, symbols, generation)
+    
+    def _conditional_headers(self) -> Dict[str, str]:
+        """Get conditional GET headers for the current data."""
+        headers = {}
+        if self._master is None:
+            return headers
+        if self._etag:
+            headers['If-None-Match'] = self._etag
+        if self._last_modified:
+            headers['If-Modified-Since'] = self._last_modified
+        return headers
+    
+    def _save_snapshot(self, df: pd.DataFrame) -> None:
+        """Persist token data as the current snapshot."""
+        try:
+            self._snapshot.save(
+                df,
+                {
+                    'fetched_at': self._last_update.timestamp(),
+                    'etag': self._etag,
+                    'last_modified': self._last_modified
+                }
+            )
+        except SnapshotError:
+            # The in-memory copy is still valid; next start refetches.
+            pass
     
     def _update_data(self) -> None:
         """Update token data from API."""
         try:
             app_logger.info("Fetching token data from API...")
-            response = requests.get(self.API_URL)
+            start = time.perf_counter()
+            response = self._http.get(
+                self.API_URL,
+                headers=self._conditional_headers(),
+                stream=True
+            )
+            
+            if response.status_code == 304:
+                self._last_update = datetime.now()
+                self._next_attempt = None
+                self._snapshot.update_meta(
+                    fetched_at=self._last_update.timestamp()
+                )
+                app_logger.info("Token data not modified on server")
+                return
+            
             response.raise_for_status()
             
-            data = response.json()
-            df = pd.DataFrame.from_dict(data)
+            df, stats = parse_scrip_master(
+                response.iter_content(chunk_size=self.CHUNK_SIZE)
+            )
             
             # Process data
-            df['expiry'] = pd.to_datetime(df['expiry']).apply(lambda x: x.date())
-            df = df.astype({'strike': float})
+            df['expiry'] = _parse_expiry(df['expiry'])
             
-            self._df = df
+            self._set_data(df)
             self._last_update = datetime.now()
+            self._next_attempt = None
+            self._etag = response.headers.get('ETag')
+            self._last_modified = response.headers.get('Last-Modified')
+            self._load_seconds = time.perf_counter() - start
+            self._source = 'network'
+            self._ingest_stats = stats
+            self._save_snapshot(df)
             
-            app_logger.info("Token data updated successfully")
+            app_logger.info(
+                "Token data updated successfully (%d rows in %.2f s)",
+                stats['rows'], stats['seconds']
+            )
         except requests.RequestException as e:
             log_exception(app_logger, e, "Failed to fetch token data")
-            if self._df is None:
+            self._next_attempt = datetime.now() + self._retry_interval
+            if self._master is None:
                 raise TokenDataError(f"Failed to fetch token data: {str(e)}")
         except Exception as e:
             log_exception(app_logger, e, "Failed to process token data")
-            if self._df is None:
+            self._next_attempt = datetime.now() + self._retry_interval
+            if self._master is None:
                 raise TokenDataError(f"Failed to process token data: {str(e)}")
     
-    @lru_cache(maxsize=100)
+    def memory_report(self) -> Dict[str, int]:
+        """
+        Get memory used by each scrip master column.
+        
+        Returns:
+            Dict[str, int]: Bytes per column, plus 'total'
+        """
+        usage = self.df.memory_usage(deep=True, index=False)
+        report = {str(column): int(size) for column, size in usage.items()}
+        report['total'] = sum(report.values())
+        return report
+    
+    def cache_stats(self) -> Dict[str, int]:
+        """
+        Get lookup cache counters.
+        
+        Returns:
+            Dict[str, int]: Size, capacity, generation, hits, misses, evictions
+        """
+        return self._cache.stats()
+    
+    @staticmethod
+    def _positions(
+        index: TokenIndex,
+        symbol: str,
+        exch_seg: str,
+        instrumenttype: str,
+        strike_price: Optional[float],
+        pe_ce: str
+    ) -> np.ndarray:
+        """Look up the master row positions matching a token query."""
+        if exch_seg == 'NSE':
+            return index.equity(symbol)
+        if exch_seg == 'NFO' and instrumenttype in FUTURE_TYPES:
+            return index.futures(instrumenttype, symbol)
+        if exch_seg == 'NFO' and instrumenttype in OPTION_TYPES:
+            # Rounded to whole paise: e.g. 72.35 * 100 is 7234.999999999999
+            strike = None if strike_price is None else round(strike_price * 100)
+            return index.options(instrumenttype, symbol, strike, pe_ce)
+        raise TokenDataError(f"Invalid parameters: {exch_seg}, {instrumenttype}")
+    
+    def find_rows(
+        self,
+        symbol: str,
+        exch_seg: str = 'NSE',
+        instrumenttype: str = 'OPTIDX',
+        strike_price: Optional[float] = None,
+        pe_ce: str = ''
+    ) -> Tuple[pd.DataFrame, np.ndarray]:
+        """
+        Find matching instruments without copying any rows.
+        
+        Intended for views over large result sets, which read cells from
+        the master's columns at the returned positions.
+        
+        Args:
+            symbol: Trading symbol
+            exch_seg: Exchange segment
+            instrumenttype: Instrument type
+            strike_price: Strike price; None matches every strike
+            pe_ce: PE/CE indicator
+            
+        Returns:
+            Tuple[pd.DataFrame, np.ndarray]: The scrip master and the
+            read-only row positions of the matches
+            
+        Raises:
+            TokenDataError: If data retrieval fails
+        """
+        try:
+            master = self._current()
+            positions = self._positions(
+                master.index, symbol, exch_seg, instrumenttype, strike_price, pe_ce
+            )
+            return master.df, positions
+        except TokenDataError:
+            raise
+        except Exception as e:
+            log_exception(app_logger, e, f"Failed to find rows for {symbol}")
+            raise TokenDataError(f"Failed to find rows: {str(e)}")
+    
     def get_token_info(
         self,
         symbol: str,
         exch_seg: str = 'NSE',
         instrumenttype: str = 'OPTIDX',
-        strike_price: float = 0,
+        strike_price: Optional[float] = 0,
         pe_ce: str = ''
     ) -> pd.DataFrame:
         """
@@ -87,47 +477,41 @@ class TokenData:
             symbol: Trading symbol
             exch_seg: Exchange segment
             instrumenttype: Instrument type
-            strike_price: Strike price
+            strike_price: Strike price; None matches every strike
             pe_ce: PE/CE indicator
             
         Returns:
-            pd.DataFrame: Filtered token information
+            pd.DataFrame: Filtered token information. Results are served
+            from a cache shared between callers and are read-only: each
+            caller gets a shallow copy over the same arrays, so columns can
+            be added or replaced, but writing into the returned values
+            raises (or copies first, under copy-on-write).
             
         Raises:
             TokenDataError: If data retrieval fails
         """
         try:
-            df = self.df
-            
-            if exch_seg == 'NSE':
-                result = df[
-                    (df['exch_seg'] == 'NSE') &
-                    (df['name'] == symbol)
-                ]
-            elif exch_seg == 'NFO' and instrumenttype in ['FUTSTK', 'FUTIDX']:
-                result = df[
-                    (df['exch_seg'] == 'NFO') &
-                    (df['instrumenttype'] == instrumenttype) &
-                    (df['name'] == symbol)
-                ].sort_values(by=['expiry'])
-            elif exch_seg == 'NFO' and instrumenttype in ['OPTSTK', 'OPTIDX']:
-                strike_price = strike_price * 100
-                result = df[
-                    (df['exch_seg'] == 'NFO') &
-                    (df['instrumenttype'] == instrumenttype) &
-                    (df['name'] == symbol) &
-                    (df['strike'] == strike_price) &
-                    (df['symbol'].str.endswith(pe_ce))
-                ].sort_values(by=['expiry'])
-            else:
-                raise TokenDataError(f"Invalid parameters: {exch_seg}, {instrumenttype}")
+            master = self._current()
+            df, index, generation = master.df, master.index, master.generation
+            key = (symbol, exch_seg, instrumenttype, strike_price, pe_ce)
+            
+            hit, result = self._cache.get(generation, key)
+            if hit:
+                return result.copy(deep=False)
+            
+            positions = self._positions(
+                index, symbol, exch_seg, instrumenttype, strike_price, pe_ce
+            )
+            result = df.iloc[positions]
             
             if len(result) == 0:
                 app_logger.warning(
-                    f"No data found for {symbol} ({exch_seg}, {instrumenttype})"
+                    "No data found for %s (%s, %s)", symbol, exch_seg, instrumenttype
                 )
             
-            return result
+            result = _read_only(result)
+            self._cache.put(generation, key, result)
+            return result.copy(deep=False)
         except Exception as e:
             log_exception(
                 app_logger,
@@ -136,6 +520,165 @@ class TokenData:
             )
             raise TokenDataError(f"Failed to get token info: {str(e)}")
     
+    def get_option_chain(
+        self,
+        symbol: str,
+        expiry: Optional[Any] = None,
+        around_strike: Optional[float] = None,
+        width: int = 10
+    ) -> pd.DataFrame:
+        """
+        Get the CE/PE option ladder for one expiry.
+        
+        Args:
+            symbol: Underlying name
+            expiry: Expiry date; defaults to the nearest upcoming expiry
+            around_strike: Centre the ladder on the strike nearest to this
+                price; None returns every strike
+            width: Number of strikes on each side of the centre strike
+            
+        Returns:
+            pd.DataFrame: One row per strike with columns strike (rupees),
+            ce_token, pe_token (-1 when not listed), ce_symbol, pe_symbol
+            and lotsize. The expiry used is in ``attrs['expiry']``.
+            
+        Raises:
+            TokenDataError: If the symbol has no options or the expiry is invalid
+        """
+        try:
+            index = self._current().index
+            
+            expiries = index.expiries(symbol)
+            if len(expiries) == 0:
+                raise TokenDataError(f"No options listed for {symbol}")
+            
+            if expiry is None:
+                today = np.datetime64(pd.Timestamp.now().normalize())
+                upcoming = expiries[expiries >= today]
+                if len(upcoming) == 0:
+                    raise TokenDataError(f"No upcoming expiry for {symbol}")
+                expiry = upcoming[0]
+            expiry = pd.Timestamp(expiry)
+            
+            ladder = index.chain(symbol, expiry)
+            strikes = ladder['strike']
+            if len(strikes) == 0:
+                raise TokenDataError(f"No options for {symbol} expiring {expiry.date()}")
+            
+            lo, hi = 0, len(strikes)
+            if around_strike is not None:
+                target = around_strike * 100
+                i = int(np.searchsorted(strikes, target))
+                if i == len(strikes) or (
+                    i > 0 and target - strikes[i - 1] <= strikes[i] - target
+                ):
+                    i -= 1
+                lo, hi = max(0, i - width), min(len(strikes), i + width + 1)
+            
+            result = pd.DataFrame({
+                'strike': strikes[lo:hi] / 100,
+                'ce_token': ladder['ce_token'][lo:hi],
+                'pe_token': ladder['pe_token'][lo:hi],
+                'ce_symbol': ladder['ce_symbol'][lo:hi],
+                'pe_symbol': ladder['pe_symbol'][lo:hi],
+                'lotsize': ladder['lotsize'][lo:hi]
+            })
+            result.attrs['expiry'] = expiry
+            return result
+        except TokenDataError:
+            raise
+        except Exception as e:
+            log_exception(app_logger, e, f"Failed to get option chain for {symbol}")
+            raise TokenDataError(f"Failed to get option chain: {str(e)}")
+    
+    def resolve_tokens(
+        self,
+        keys: Union[pd.DataFrame, Sequence[tuple]]
+    ) -> pd.DataFrame:
+        """
+        Resolve a basket of derivative keys in one vectorized join.
+        
+        Each key resolves to the same contract as the first row of the
+        matching NFO ``get_token_info`` call (the nearest expiry), or to
+        the exact contract when an expiry is given.
+        
+        Args:
+            keys: Frame with columns symbol, instrumenttype, strike
+                (rupees) and pe_ce, plus an optional expiry column; or a
+                sequence of (symbol, instrumenttype, strike, pe_ce[, expiry])
+                tuples
+            
+        Returns:
+            pd.DataFrame: The input keys in input order plus token (-1 on a
+            miss), tradingsymbol, lotsize (0 on a miss), expiry (NaT on a
+            miss when not given) and a boolean found column
+            
+        Raises:
+            TokenDataError: If the keys are malformed or resolution fails
+        """
+        try:
+            if not isinstance(keys, pd.DataFrame):
+                keys = list(keys)
+                columns = ['symbol', 'instrumenttype', 'strike', 'pe_ce']
+                if keys and len(keys[0]) == 5:
+                    columns.append('expiry')
+                keys = pd.DataFrame.from_records(keys, columns=columns)
+            
+            master = self._current()
+            df, index = master.df, master.index
+            lookup = pd.DataFrame({
+                'instrumenttype': keys['instrumenttype'],
+                'name': keys['symbol'],
+                # Rounded to whole paise, or fractional strikes miss the join
+                'strike': (keys['strike'].astype(float).fillna(0) * 100).round().astype('int64'),
+                'side': keys['pe_ce'].fillna('')
+            })
+            if 'expiry' in keys:
+                lookup['expiry'] = keys['expiry']
+            rows = index.resolve(lookup)
+            
+            found = rows >= 0
+            take = np.where(found, rows, 0)
+            result = keys.reset_index(drop=True).copy()
+            result['token'] = np.where(found, df['token'].to_numpy()[take], -1)
+            result['tradingsymbol'] = np.where(
+                found, df['symbol'].iloc[take].to_numpy(dtype=object), None
+            )
+            result['lotsize'] = np.where(found, df['lotsize'].to_numpy()[take], 0)
+            if 'expiry' not in keys:
+                result['expiry'] = np.where(
+                    found,
+                    df['expiry'].to_numpy()[take],
+                    np.datetime64('NaT')
+                )
+            result['found'] = found
+            
+            misses = int((~found).sum())
+            if misses:
+                app_logger.warning("%d of %d keys not found", misses, len(result))
+            return result
+        except Exception as e:
+            log_exception(app_logger, e, "Failed to resolve tokens")
+            raise TokenDataError(f"Failed to resolve tokens: {str(e)}")
+    
+    def search_symbols(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Search trading symbols for autocompletion.
+        
+        Args:
+            query: Symbol prefix, or an underlying name with at most one typo
+            limit: Maximum number of results
+            
+        Returns:
+            List[Dict[str, Any]]: Matches with symbol, token and exch_seg;
+            prefix matches first, then fuzzy matches
+        """
+        try:
+            return self._current().symbols.search(query, limit)
+        except Exception as e:
+            log_exception(app_logger, e, f"Failed to search symbols for {query}")
+            raise TokenDataError(f"Failed to search symbols: {str(e)}")
+    
     def get_symbols(self) -> List[str]:
         """
         Get list of available symbols.
@@ -0,0 +1,309 @@
+from typing import Dict, Any, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+FUTURE_TYPES = ('FUTSTK', 'FUTIDX')
+OPTION_TYPES = ('OPTSTK', 'OPTIDX')
+OPTION_SIDES = ('CE', 'PE')
+
+_EMPTY = np.empty(0, dtype=np.intp)
+_EMPTY.flags.writeable = False
+
+class TokenIndex:
+    """
+    Hash index over the scrip master for O(1) token lookups.
+
+    Buckets hold row positions into the indexed frame. Futures and option
+    buckets are pre-sorted by expiry (ties keep master order), so a lookup
+    is a single dict hit followed by ``df.iloc[positions]``.
+
+    Option chains are grouped per (name, expiry) in strike order and their
+    aligned CE/PE ladders are built on first use, then reused for the
+    lifetime of the index.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        """
+        Build the index.
+
+        Args:
+            df: Scrip master frame to index
+        """
+        exch_seg = df['exch_seg'].to_numpy(dtype=object)
+        instrumenttype = df['instrumenttype'].to_numpy(dtype=object)
+        names = df['name'].to_numpy(dtype=object)
+        self._instrumenttypes = instrumenttype
+        self._names = names
+        self._symbols = df['symbol']
+
+        # Equities keep master order, like the original NSE filter
+        equity = np.flatnonzero(exch_seg == 'NSE')
+        self._equity = self._group(
+            {'name': names[equity]},
+            equity
+        )
+
+        # Derivatives are bucketed in expiry order
+        expiry = pd.to_datetime(df['expiry']).to_numpy()
+        by_expiry = np.argsort(expiry, kind='stable')
+        nfo = exch_seg[by_expiry] == 'NFO'
+        kinds = instrumenttype[by_expiry]
+
+        futures = by_expiry[nfo & np.isin(kinds, FUTURE_TYPES)]
+        self._future_rows = futures
+        self._futures = self._group(
+            {
+                'instrumenttype': instrumenttype[futures],
+                'name': names[futures]
+            },
+            futures
+        )
+
+        options = by_expiry[nfo & np.isin(kinds, OPTION_TYPES)]
+        side = self._symbols.iloc[options].str[-2:].to_numpy(dtype=object)
+        keys = {
+            'instrumenttype': instrumenttype[options],
+            'name': names[options],
+            'strike': df['strike'].to_numpy()[options]
+        }
+        self._strikes = self._group(keys, options)
+        self._option_names = self._group(
+            {'instrumenttype': keys['instrumenttype'], 'name': keys['name']},
+            options
+        )
+        keys['side'] = np.where(np.isin(side, OPTION_SIDES), side, '')
+        self._options = self._group(keys, options)
+        self._option_rows = options
+        self._option_keys = keys
+        self._expiry_values = expiry
+        self._resolvers: Dict[bool, Tuple[pd.MultiIndex, np.ndarray]] = {}
+
+        # Chains: option rows per (name, expiry), in strike order
+        self._strike_values = df['strike'].to_numpy()
+        self._tokens = df['token'].to_numpy()
+        self._lotsizes = df['lotsize'].to_numpy()
+        self._is_call = np.zeros(len(df), dtype=bool)
+        self._is_call[options] = keys['side'] == 'CE'
+        self._is_put = np.zeros(len(df), dtype=bool)
+        self._is_put[options] = keys['side'] == 'PE'
+
+        by_strike = np.argsort(keys['strike'], kind='stable')
+        chain_rows = options[by_strike]
+        self._chains = self._group(
+            {'name': keys['name'][by_strike], 'expiry': expiry[chain_rows]},
+            chain_rows
+        )
+        self._expiries: Dict[str, np.ndarray] = {}
+        for name, chain_expiry in self._chains:
+            self._expiries.setdefault(name, []).append(chain_expiry)
+        for name, values in self._expiries.items():
+            self._expiries[name] = np.sort(np.array(values, dtype='datetime64[ns]'))
+        self._ladders: Dict[Tuple[str, Any], Dict[str, np.ndarray]] = {}
+
+    @staticmethod
+    def _group(keys: Dict[str, np.ndarray], positions: np.ndarray) -> Dict[Any, np.ndarray]:
+        """
+        Group row positions by key columns, preserving their order.
+
+        Args:
+            keys: Key column arrays aligned with ``positions``
+            positions: Row positions to group, in bucket order
+
+        Returns:
+            Dict[Any, np.ndarray]: Read-only position arrays per key
+        """
+        frame = pd.DataFrame(keys)
+        columns = list(keys)
+        groups = frame.groupby(
+            columns if len(columns) > 1 else columns[0],
+            sort=False
+        ).indices
+
+        buckets = {}
+        for key, idx in groups.items():
+            bucket = positions[idx]
+            bucket.flags.writeable = False
+            buckets[key] = bucket
+        return buckets
+
+    def equity(self, name: str) -> np.ndarray:
+        """
+        Get positions of NSE rows for a name.
+
+        Args:
+            name: Underlying name
+
+        Returns:
+            np.ndarray: Row positions in master order
+        """
+        return self._equity.get(name, _EMPTY)
+
+    def futures(self, instrumenttype: str, name: str) -> np.ndarray:
+        """
+        Get positions of NFO futures for a name, sorted by expiry.
+
+        Args:
+            instrumenttype: FUTSTK or FUTIDX
+            name: Underlying name
+
+        Returns:
+            np.ndarray: Row positions sorted by expiry
+        """
+        return self._futures.get((instrumenttype, name), _EMPTY)
+
+    def options(
+        self,
+        instrumenttype: str,
+        name: str,
+        strike: Optional[float],
+        pe_ce: str = ''
+    ) -> np.ndarray:
+        """
+        Get positions of NFO options, sorted by expiry.
+
+        Args:
+            instrumenttype: OPTSTK or OPTIDX
+            name: Underlying name
+            strike: Strike in master units (price * 100); None matches
+                every strike
+            pe_ce: Symbol suffix to match; empty matches both sides
+
+        Returns:
+            np.ndarray: Row positions sorted by expiry
+        """
+        if strike is None:
+            bucket = self._option_names.get((instrumenttype, name), _EMPTY)
+            if pe_ce in OPTION_SIDES:
+                side = self._is_call if pe_ce == 'CE' else self._is_put
+                return bucket[side[bucket]]
+        elif pe_ce in OPTION_SIDES:
+            return self._options.get((instrumenttype, name, strike, pe_ce), _EMPTY)
+        else:
+            bucket = self._strikes.get((instrumenttype, name, strike), _EMPTY)
+        if not pe_ce or len(bucket) == 0:
+            return bucket
+
+        # Arbitrary suffix: keep str.endswith semantics within the bucket
+        mask = self._symbols.iloc[bucket].str.endswith(pe_ce).to_numpy(dtype=bool)
+        return bucket[mask]
+
+    def _resolver(self, with_expiry: bool) -> Tuple[pd.MultiIndex, np.ndarray]:
+        """
+        Get the hash join table used by ``resolve``.
+
+        Keys are (instrumenttype, name, strike, side[, expiry]); options are
+        listed once per CE/PE side and once with side '' (either side), and
+        futures with strike 0 and side ''. Without an expiry, only the
+        nearest-expiry row of each key is kept.
+        """
+        resolver = self._resolvers.get(with_expiry)
+        if resolver is not None:
+            return resolver
+
+        options = self._option_rows
+        futures = self._future_rows
+        keys = self._option_keys
+        parts = [
+            (options, keys['instrumenttype'], keys['name'], keys['strike'], keys['side']),
+            (options, keys['instrumenttype'], keys['name'], keys['strike'],
+             np.full(len(options), '', dtype=object)),
+            (futures, self._instrumenttypes[futures], self._names[futures],
+             np.zeros(len(futures)), np.full(len(futures), '', dtype=object))
+        ]
+        table = pd.DataFrame({
+            'instrumenttype': np.concatenate([part[1] for part in parts]),
+            'name': np.concatenate([part[2] for part in parts]),
+            'strike': np.concatenate([part[3] for part in parts]).astype(np.float64),
+            'side': np.concatenate([part[4] for part in parts]),
+            'row': np.concatenate([part[0] for part in parts])
+        })
+        columns = ['instrumenttype', 'name', 'strike', 'side']
+        if with_expiry:
+            table['expiry'] = self._expiry_values[table['row'].to_numpy()]
+            columns.append('expiry')
+        # Rows are in expiry order within each part, so 'first' is the front contract
+        table = table.drop_duplicates(subset=columns, keep='first')
+
+        resolver = (pd.MultiIndex.from_frame(table[columns]), table['row'].to_numpy())
+        self._resolvers[with_expiry] = resolver
+        return resolver
+
+    def resolve(self, keys: pd.DataFrame) -> np.ndarray:
+        """
+        Resolve many derivative keys in one vectorized hash join.
+
+        Args:
+            keys: Frame with instrumenttype, name, strike (master units,
+                i.e. price * 100), side ('CE', 'PE' or '' for either) and
+                optionally expiry. Futures ignore strike and side.
+
+        Returns:
+            np.ndarray: Row positions aligned with ``keys``, -1 for misses
+        """
+        with_expiry = 'expiry' in keys
+        table, rows = self._resolver(with_expiry)
+
+        is_future = keys['instrumenttype'].isin(FUTURE_TYPES).to_numpy()
+        arrays = [
+            keys['instrumenttype'].to_numpy(dtype=object),
+            keys['name'].to_numpy(dtype=object),
+            np.where(is_future, 0.0, keys['strike'].to_numpy(dtype=np.float64)),
+            np.where(is_future, '', keys['side'].to_numpy(dtype=object))
+        ]
+        if with_expiry:
+            arrays.append(pd.to_datetime(keys['expiry']).to_numpy())
+
+        found = table.get_indexer(pd.MultiIndex.from_arrays(arrays))
+        return np.where(found >= 0, rows[found], -1)
+
+    def expiries(self, name: str) -> np.ndarray:
+        """
+        Get option expiries listed for a name.
+
+        Args:
+            name: Underlying name
+
+        Returns:
+            np.ndarray: Sorted datetime64 expiries
+        """
+        return self._expiries.get(name, np.empty(0, dtype='datetime64[ns]'))
+
+    def chain(self, name: str, expiry: pd.Timestamp) -> Dict[str, np.ndarray]:
+        """
+        Get the aligned CE/PE ladder for one expiry.
+
+        Args:
+            name: Underlying name
+            expiry: Expiry date
+
+        Returns:
+            Dict[str, np.ndarray]: Read-only column arrays aligned on
+            ``strike`` (sorted, unique, paise): ``ce_token``/``pe_token``
+            (-1 where a side is not listed), ``ce_symbol``/``pe_symbol``
+            (None where missing) and ``lotsize``
+        """
+        key = (name, pd.Timestamp(expiry))
+        ladder = self._ladders.get(key)
+        if ladder is not None:
+            return ladder
+
+        rows = self._chains.get(key, _EMPTY)
+        strikes = np.unique(self._strike_values[rows])
+        lotsize = np.zeros(len(strikes), dtype=self._lotsizes.dtype)
+        ladder = {'strike': strikes}
+        for side, mask in (('pe', self._is_put), ('ce', self._is_call)):
+            side_rows = rows[mask[rows]]
+            slots = np.searchsorted(strikes, self._strike_values[side_rows])
+            tokens = np.full(len(strikes), -1, dtype=self._tokens.dtype)
+            tokens[slots] = self._tokens[side_rows]
+            symbols = np.full(len(strikes), None, dtype=object)
+            symbols[slots] = self._symbols.iloc[side_rows].to_numpy(dtype=object)
+            lotsize[slots] = self._lotsizes[side_rows]
+            ladder[f"{side}_token"] = tokens
+            ladder[f"{side}_symbol"] = symbols
+        ladder['lotsize'] = lotsize
+        for values in ladder.values():
+            values.flags.writeable = False
+
+        self._ladders[key] = ladder
+        return ladder
@@ -0,0 +1,30 @@
+import pytest
+from config import Config
+from utils.logger import app_logger, SizeTimeRotatingFileHandler
+
+@pytest.fixture(autouse=True)
+def data_dir(tmp_path, monkeypatch):
+    """Keep the encryption key and snapshots out of the real data directory."""
+    directory = tmp_path / 'data'
+    monkeypatch.setattr(Config, 'DATA_DIR', str(directory))
+    return directory
+
+@pytest.fixture(autouse=True)
+def session_dir(tmp_path, monkeypatch):
+    """Keep persisted client sessions out of the real data directory."""
+    directory = tmp_path / 'sessions'
+    monkeypatch.setattr(Config, 'SESSION_DIR', str(directory))
+    return directory
+
+@pytest.fixture(autouse=True)
+def log_dir(tmp_path, monkeypatch):
+    """Keep log files out of the real log directory."""
+    directory = tmp_path / 'logs'
+    monkeypatch.setattr(Config, 'LOG_DIR', str(directory))
+    # The app logger's file was named on import; reopen it in this test's directory
+    for handler in app_logger.listener.handlers:
+        if isinstance(handler, SizeTimeRotatingFileHandler):
+            with handler.lock:
+                handler.close()
+                handler.baseFilename = str(directory / 'techfin.jsonl')
+    return directory
@@ -0,0 +1,103 @@
+import numpy as np
+import pandas as pd
+import pytest
+from models.bar_aggregator import BarAggregator, BAR_DTYPE
+from models.synthetic_feed import SyntheticFeed
+from models.tick_store import TickStore
+
+T0 = 1718000000000 - 1718000000000 % 300000
+
+@pytest.fixture
+def aggregator():
+    return BarAggregator(capacity=4)
+
+def test_ohlcv_in_place(aggregator):
+    """Test ticks within one period update a single bar."""
+    aggregator.on_tick(1, T0, 100.0, 1000)
+    aggregator.on_tick(1, T0 + 200, 105.0, 1100)
+    aggregator.on_tick(1, T0 + 400, 98.0, 1250)
+    aggregator.on_tick(1, T0 + 600, 101.0, 1300)
+
+    bars = aggregator.bars(1, '1s')
+    assert len(bars) == 1
+    bar = bars[0]
+    assert bar['start'] == T0
+    assert (bar['open'], bar['high'], bar['low'], bar['close']) == (100.0, 105.0, 98.0, 101.0)
+    assert bar['volume'] == 300
+
+def test_time_boundary_closes_bar(aggregator):
+    """Test a tick in the next period closes the bar and notifies listeners."""
+    closed = []
+    aggregator.add_listener(lambda token, tf, bar: closed.append((tf, bar['close'])))
+    aggregator.on_tick(1, T0, 100.0)
+    aggregator.on_tick(1, T0 + 999, 101.0)
+    assert not aggregator.is_closed(1, '1s')
+    aggregator.on_tick(1, T0 + 1000, 102.0)
+
+    assert closed == [('1s', 101.0)]
+    assert list(aggregator.bars(1, '1s')['start']) == [T0, T0 + 1000]
+    assert len(aggregator.bars(1, '1m')) == 1
+
+def test_flush_closes_idle_bars(aggregator):
+    """Test flush closes bars whose period ended without a newer tick."""
+    aggregator.on_tick(1, T0, 100.0)
+    assert aggregator.flush(T0 + 500) == 0
+    assert aggregator.flush(T0 + 1000) == 1
+    assert aggregator.is_closed(1, '1s')
+    assert aggregator.flush(T0 + 300000) == 2
+
+def test_late_tick_dropped(aggregator):
+    """Test a tick from an already closed period leaves the open bar alone."""
+    aggregator.on_tick(1, T0, 100.0, 1000)
+    aggregator.on_tick(1, T0 + 1000, 101.0, 1100)
+    aggregator.on_tick(1, T0 + 500, 90.0, 1050)
+    aggregator.on_tick(1, T0 + 1200, 102.0, 1200)
+
+    assert aggregator.late_ticks == 1
+    bars = aggregator.bars(1, '1s')
+    assert list(bars['close']) == [100.0, 102.0]
+    assert list(bars['low']) == [100.0, 101.0]
+    assert list(bars['volume']) == [0, 200]
+    minute = aggregator.bars(1, '1m')[-1]
+    assert (minute['low'], minute['close'], minute['volume']) == (100.0, 102.0, 200)
+
+def test_bars_are_zero_copy_views(aggregator):
+    """Test bar views share memory with the buffer across wrap-around."""
+    for i in range(10):
+        aggregator.on_tick(1, T0 + i * 1000, 100.0 + i)
+    bars = aggregator.bars(1, '1s', 3)
+    assert list(bars['close']) == [107.0, 108.0, 109.0]
+    assert list(aggregator.bars(1, '1s')['close']) == [106.0, 107.0, 108.0, 109.0]
+    assert not bars.flags.writeable
+    assert not bars.flags.owndata
+
+    aggregator.on_tick(1, T0 + 9500, 120.0)
+    assert bars['high'][-1] == 120.0
+
+def test_matches_pandas_resample():
+    """Test bars match a pandas resample of the same ticks."""
+    store = TickStore(capacity=100000)
+    aggregator = BarAggregator(capacity=1000)
+    aggregator.attach(store)
+    feed = SyntheticFeed([7], seed=3)
+    feed._clock = T0
+    for tick in feed.ticks(20000):
+        store.write(*tick)
+
+    ticks = pd.DataFrame(store.history(7))
+    ticks.index = pd.to_datetime(ticks['ts'], unit='ms')
+    expected = ticks['ltp'].resample('1s').ohlc().dropna()
+    bars = aggregator.bars(7, '1s')
+    np.testing.assert_array_equal(bars['open'], expected['open'].to_numpy())
+    np.testing.assert_array_equal(bars['high'], expected['high'].to_numpy())
+    np.testing.assert_array_equal(bars['low'], expected['low'].to_numpy())
+    np.testing.assert_array_equal(bars['close'], expected['close'].to_numpy())
+    assert bars['volume'].sum() == ticks['volume'].iloc[-1] - ticks['volume'].iloc[0]
+
+def test_unknown_timeframe():
+    """Test unsupported timeframes are rejected."""
+    with pytest.raises(ValueError):
+        BarAggregator(timeframes=('2m',))
+    with pytest.raises(ValueError):
+        BarAggregator(timeframes=('1s',)).bars(1, '1m')
+    assert BarAggregator().bars(1, '1m').dtype == BAR_DTYPE
@@ -1,6 +1,12 @@
+import base64
+import json
+import threading
+import time
 import pytest
 from unittest.mock import Mock, patch
+from config import Config
 from models.client import Client, TradingError
+from models.session_store import jwt_expiry
 
 @pytest.fixture
 def mock_smart_connect():
@@ -70,6 +76,7 @@ def test_refresh_session(test_client, mock_smart_connect):
     # Test failed refresh
     mock_smart_connect.return_value.generateSession.side_effect = Exception('API Error')
     assert test_client.refresh_session() is False
+    test_client.close()
 
 def test_update_positions_and_holdings(test_client, mock_smart_connect):
     """Test updating positions and holdings."""
@@ -81,4 +88,214 @@ def test_update_positions_and_holdings(test_client, mock_smart_connect):
     # Test failed update
     mock_smart_connect.return_value.holding.side_effect = Exception('API Error')
     with pytest.raises(TradingError):
-        test_client._update_positions_and_holdings() 
\ No newline at end of file
+        test_client._update_positions_and_holdings()
+
+def test_holding_and_position_indexes(test_client, mock_smart_connect):
+    """Test O(1) lookups by trading symbol and token."""
+    mock_smart_connect.return_value.holding.return_value = {
+        'data': [{'tradingsymbol': 'SBIN-EQ', 'symboltoken': '3045', 'exchange': 'NSE', 'quantity': 10}]
+    }
+    mock_smart_connect.return_value.position.return_value = {
+        'data': [{'tradingsymbol': 'NIFTY27JUN2422000CE', 'symboltoken': '40000',
+                  'exchange': 'NFO', 'producttype': 'CARRYFORWARD', 'netqty': '-50'}]
+    }
+    test_client._update_positions_and_holdings()
+    
+    assert test_client.get_holding_quantity('SBIN-EQ') == 10
+    assert test_client.get_holding_quantity('3045') == 10
+    assert test_client.get_holding_quantity(3045) == 10
+    assert test_client.get_position_quantity('NIFTY27JUN2422000CE') == -50
+    assert test_client.get_position_quantity(40000) == -50
+    assert test_client.get_position_quantity('NONEXISTENT') == 0
+
+def test_refresh_emits_only_changed_rows(test_client, mock_smart_connect):
+    """Test refreshes report added, changed and removed rows only."""
+    events = []
+    test_client.add_change_listener(lambda client, changes: events.append(changes))
+    mock = mock_smart_connect.return_value
+    
+    mock.holding.return_value = {'data': [
+        {'tradingsymbol': 'A', 'symboltoken': '1', 'exchange': 'NSE', 'quantity': 1},
+        {'tradingsymbol': 'B', 'symboltoken': '2', 'exchange': 'NSE', 'quantity': 2}
+    ]}
+    mock.position.return_value = {'data': None}
+    changes = test_client._update_positions_and_holdings()
+    assert sorted((c.kind, c.key[1]) for c in changes) == [('added', 'A'), ('added', 'B')]
+    
+    # An identical snapshot emits nothing
+    assert test_client._update_positions_and_holdings() == []
+    assert len(events) == 1
+    
+    mock.holding.return_value = {'data': [
+        {'tradingsymbol': 'A', 'symboltoken': '1', 'exchange': 'NSE', 'quantity': 5},
+        {'tradingsymbol': 'C', 'symboltoken': '3', 'exchange': 'NSE', 'quantity': 3}
+    ]}
+    changes = test_client._update_positions_and_holdings()
+    assert sorted((c.book, c.kind, c.key[1]) for c in changes) == [
+        ('holdings', 'added', 'C'), ('holdings', 'changed', 'A'), ('holdings', 'removed', 'B')
+    ]
+    changed = next(c for c in changes if c.kind == 'changed')
+    assert changed.old['quantity'] == 1 and changed.new['quantity'] == 5
+    assert len(events) == 2
+
+def make_jwt(expires_in):
+    """Build an unsigned JWT expiring in the given number of seconds."""
+    def encode(payload):
+        return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip('=')
+    return f"{encode({'alg': 'HS512'})}.{encode({'exp': int(time.time() + expires_in)})}.sig"
+
+@pytest.fixture
+def session_api(mock_smart_connect):
+    """SmartConnect mock issuing real-looking session tokens."""
+    mock = mock_smart_connect.return_value
+    mock.generateSession.return_value = {
+        'data': {'jwtToken': f"Bearer {make_jwt(3600)}", 'refreshToken': 'refresh-1'}
+    }
+    mock.getProfile.return_value = {'status': True, 'data': {'name': 'Test User'}}
+    mock.generateToken.return_value = {
+        'data': {'jwtToken': make_jwt(7200), 'refreshToken': 'refresh-2', 'feedToken': 'feed-2'}
+    }
+    yield mock
+
+def test_jwt_expiry():
+    """Test JWT expiry decoding."""
+    assert abs(jwt_expiry(f"Bearer {make_jwt(60)}") - (time.time() + 60)) < 2
+    assert jwt_expiry('not-a-jwt') is None
+    assert jwt_expiry(None) is None
+
+def test_session_persisted_encrypted(session_api, session_dir):
+    """Test the session is stored encrypted and tracks the JWT expiry."""
+    client = Client('test_code', 'test_pass', 100000.0)
+    try:
+        assert client.session['refresh_token'] == 'refresh-1'
+        assert abs(client.session_expires_at - (time.time() + 3600)) < 2
+        files = list(session_dir.iterdir())
+        assert len(files) == 1
+        assert b'refresh-1' not in files[0].read_bytes()
+        assert b'test_code' not in files[0].read_bytes()
+    finally:
+        client.close()
+
+def test_session_reused_on_restart(session_api):
+    """Test a second client reuses the stored session without logging in."""
+    Client('test_code', 'test_pass', 100000.0).close()
+    session_api.generateSession.reset_mock()
+    
+    client = Client('test_code', 'test_pass', 100000.0)
+    try:
+        session_api.generateSession.assert_not_called()
+        session_api.setAccessToken.assert_called()
+        assert client.data['data']['refreshToken'] == 'refresh-1'
+    finally:
+        client.close()
+
+def test_rejected_session_falls_back_to_login(session_api):
+    """Test a stored session the API rejects triggers a full login."""
+    Client('test_code', 'test_pass', 100000.0).close()
+    session_api.generateSession.reset_mock()
+    session_api.getProfile.side_effect = [
+        {'status': False, 'message': 'Invalid Token'},
+        {'status': True, 'data': {'name': 'Test User'}}
+    ]
+    
+    client = Client('test_code', 'test_pass', 100000.0)
+    client.close()
+    session_api.generateSession.assert_called_once()
+
+def test_expiring_session_renewed_on_restore(session_api):
+    """Test a stored session close to expiry is renewed with the refresh token."""
+    session_api.generateSession.return_value['data']['jwtToken'] = f"Bearer {make_jwt(5)}"
+    Client('test_code', 'test_pass', 100000.0).close()
+    session_api.generateSession.reset_mock()
+    
+    client = Client('test_code', 'test_pass', 100000.0)
+    try:
+        session_api.generateSession.assert_not_called()
+        session_api.generateToken.assert_called_once_with('refresh-1')
+        assert client.session['refresh_token'] == 'refresh-2'
+    finally:
+        client.close()
+
+def test_refresh_session_renews_token(session_api):
+    """Test refresh_session renews via the refresh token, not a full login."""
+    client = Client('test_code', 'test_pass', 100000.0)
+    try:
+        session_api.generateSession.reset_mock()
+        assert client.refresh_session() is True
+        session_api.generateSession.assert_not_called()
+        assert client.session['refresh_token'] == 'refresh-2'
+        assert client.session['feed_token'] == 'feed-2'
+        assert client.data['data']['jwtToken'] == f"Bearer {client.session['jwt_token']}"
+        assert abs(client.session_expires_at - (time.time() + 7200)) < 2
+    finally:
+        client.close()
+
+def test_renewal_scheduled_ahead_of_expiry(session_api, monkeypatch):
+    """Test the background renewal fires before the token expires."""
+    monkeypatch.setattr(Config, 'SESSION_RENEW_MARGIN', 3599)
+    renewed = threading.Event()
+    session_api.generateToken.side_effect = lambda token: (
+        renewed.set() or {'data': {'jwtToken': make_jwt(7200), 'refreshToken': token}}
+    )
+    client = Client('test_code', 'test_pass', 100000.0)
+    try:
+        assert renewed.wait(5)
+    finally:
+        client.close()
+
+def test_login_fallback_swaps_connection_when_done(session_api, mock_smart_connect):
+    """Test other threads keep the old connection until the new login completes."""
+    client = Client('test_code', 'test_pass', 100000.0)
+    try:
+        old = client.obj
+        session_api.generateToken.return_value = {'status': False}
+        new = Mock()
+        new.generateSession.side_effect = lambda code, password: (
+            {'data': {'jwtToken': f"Bearer {make_jwt(3600)}", 'refreshToken': 'refresh-3'}}
+            if client.obj is old else None
+        )
+        new.getProfile.return_value = {'status': True}
+        new.holding.return_value = {'data': []}
+        new.position.return_value = {'data': []}
+        mock_smart_connect.return_value = new
+        
+        assert client.refresh_session() is True
+        assert client.obj is new
+        assert client.session['refresh_token'] == 'refresh-3'
+        
+        failed = Mock()
+        failed.generateSession.side_effect = Exception('API Error')
+        mock_smart_connect.return_value = failed
+        new.generateToken.return_value = {'status': False}
+        assert client.refresh_session() is False
+        assert client.obj is new
+    finally:
+        client.close()
+
+def test_failed_refresh_retried_with_backoff(session_api, monkeypatch):
+    """Test a failed refresh is rescheduled with a doubling delay."""
+    monkeypatch.setattr(Config, 'SESSION_RETRY_DELAY', 30)
+    monkeypatch.setattr(Config, 'SESSION_RETRY_MAX_DELAY', 100)
+    client = Client('test_code', 'test_pass', 100000.0)
+    try:
+        session_api.generateToken.return_value = {'status': False}
+        session_api.generateSession.side_effect = Exception('API Error')
+        delays = []
+        for _ in range(3):
+            assert client.refresh_session() is False
+            delays.append(client._renew_timer.interval)
+        assert delays == [30, 60, 100]
+        
+        session_api.generateToken.return_value = {'data': {'jwtToken': make_jwt(7200), 'refreshToken': 'refresh-2'}}
+        assert client.refresh_session() is True
+        assert client._renew_failures == 0
+        assert client._renew_timer.interval > 3600
+    finally:
+        client.close()
+    assert client._renew_timer is None
+
+def test_get_quantity_lot_size(test_client):
+    """Test quantities round down to whole lots."""
+    assert test_client.get_quantity(100.0, lotsize=25) == 100
+    assert test_client.get_quantity(30.0, lotsize=50) == 300
+    assert test_client.get_quantity(30.0) == 333
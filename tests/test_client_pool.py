@@ -0,0 +1,118 @@
+import threading
+import time
+import pytest
+from unittest.mock import Mock, patch
+from models.client import TradingError
+from models.client_pool import ClientPool
+
+CREDENTIALS = [
+    {'code': 'abc1234', 'password': 'pass@123', 'capital': 100000.0},
+    {'code': 'abc2345', 'password': 'pass@234', 'capital': 100000.0}
+]
+
+@pytest.fixture
+def mock_smart_connect():
+    with patch('models.client.SmartConnect') as mock:
+        mock_instance = Mock()
+        mock_instance.generateSession.return_value = {
+            'data': {'refreshToken': 'test_token'}
+        }
+        mock_instance.getProfile.return_value = {'name': 'Test User'}
+        mock_instance.holding.return_value = {'data': []}
+        mock_instance.position.return_value = {'data': []}
+        mock.return_value = mock_instance
+        yield mock
+
+@pytest.fixture
+def pool():
+    pool = ClientPool(max_workers=4, retry_delay=0.01, max_retry_delay=0.05)
+    yield pool
+    pool.shutdown(wait=True)
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+def test_read_credentials_dedupes(tmp_path):
+    """Test repeated client codes are dropped and capital defaults."""
+    path = tmp_path / 'clients.csv'
+    path.write_text(
+        "Code,Pass\nabc1234,pass@123\nabc2345,pass@234\n"
+        "abc1234,pass@123\nabc2345,pass@234\n"
+    )
+    credentials = ClientPool.read_credentials(str(path))
+    assert [entry['code'] for entry in credentials] == ['abc1234', 'abc2345']
+    assert all(entry['capital'] == 100000.0 for entry in credentials)
+
+def test_read_credentials_capital_column(tmp_path):
+    """Test an explicit Capital column is used."""
+    path = tmp_path / 'clients.csv'
+    path.write_text("Code,Pass,Capital\nabc1234,pass@123,50000\n")
+    credentials = ClientPool.read_credentials(str(path))
+    assert credentials == [{'code': 'abc1234', 'password': 'pass@123', 'capital': 50000.0}]
+
+def test_login_all(mock_smart_connect, pool):
+    """Test every client logs in and latency is recorded."""
+    futures = pool.login_all(CREDENTIALS + CREDENTIALS[:1])
+    assert sorted(futures) == ['abc1234', 'abc2345']
+    for future in futures.values():
+        assert future.result() is not None
+
+    assert sorted(pool.clients) == ['abc1234', 'abc2345']
+    assert pool.get('abc1234').code == 'abc1234'
+    for status in pool.status().values():
+        assert status['state'] == 'ok'
+        assert status['attempts'] == 1
+        assert status['latency'] >= 0
+
+def test_login_runs_concurrently(mock_smart_connect, pool):
+    """Test slow logins overlap instead of running one after another."""
+    barrier = threading.Barrier(2, timeout=2)
+
+    def generate_session(code, password):
+        barrier.wait()
+        return {'data': {'refreshToken': 'test_token'}}
+
+    mock_smart_connect.return_value.generateSession.side_effect = generate_session
+    futures = pool.login_all(CREDENTIALS)
+    assert all(future.result() is not None for future in futures.values())
+
+def test_failed_login_retries(mock_smart_connect, pool):
+    """Test a failing client is retried without holding back the others."""
+    attempts = {'abc2345': 0}
+
+    def generate_session(code, password):
+        if code == 'abc2345':
+            attempts[code] += 1
+            if attempts[code] < 3:
+                return {}
+        return {'data': {'refreshToken': 'test_token'}}
+
+    mock_smart_connect.return_value.generateSession.side_effect = generate_session
+    futures = pool.login_all(CREDENTIALS)
+    assert futures['abc1234'].result() is not None
+    assert futures['abc2345'].result() is None
+
+    assert wait_for(lambda: pool.get('abc2345') is not None)
+    status = pool.status()['abc2345']
+    assert status['state'] == 'ok'
+    assert status['attempts'] == 3
+
+def test_max_attempts(mock_smart_connect):
+    """Test retries stop after max_attempts."""
+    mock_smart_connect.return_value.generateSession.return_value = {}
+    pool = ClientPool(max_workers=2, retry_delay=0.01, max_attempts=2)
+    try:
+        pool.login_all(CREDENTIALS[:1])
+        assert wait_for(lambda: pool.status()['abc1234']['attempts'] == 2)
+        time.sleep(0.05)
+        status = pool.status()['abc1234']
+        assert status['state'] == 'failed'
+        assert status['attempts'] == 2
+        assert pool.clients == {}
+    finally:
+        pool.shutdown(wait=True)
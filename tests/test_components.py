@@ -0,0 +1,88 @@
+import os
+import threading
+import time
+import pytest
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt5 import QtCore, QtWidgets
+from ui.components import SymbolLineEdit
+
+@pytest.fixture(scope='module')
+def app():
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+@pytest.fixture
+def pool(app):
+    pool = QtCore.QThreadPool()
+    pool.setMaxThreadCount(2)
+    yield pool
+    pool.waitForDone()
+
+def wait_until(app, condition, timeout=5.0):
+    """Process events until condition holds."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "Timed out waiting for condition"
+        app.processEvents()
+        time.sleep(0.001)
+
+def type_text(edit, text):
+    """Type text one key at a time, as textEdited reports it."""
+    for i in range(1, len(text) + 1):
+        edit.setText(text[:i])
+        edit.textEdited.emit(text[:i])
+
+def test_search_is_debounced_off_the_gui_thread(app, pool):
+    """Test a burst of keystrokes runs one search on a worker thread."""
+    calls = []
+    gui_thread = threading.get_ident()
+
+    def search(query, limit):
+        calls.append((query, threading.get_ident()))
+        return [{'symbol': 'SBIN-EQ', 'token': 3045, 'exch_seg': 'NSE'}]
+
+    edit = SymbolLineEdit(search=search, debounce_ms=20, pool=pool)
+    type_text(edit, 'SBIN')
+    wait_until(app, lambda: edit._model.stringList() == ['SBIN-EQ'])
+
+    assert [query for query, _ in calls] == ['SBIN']
+    assert calls[0][1] != gui_thread
+
+def test_stale_results_are_dropped(app, pool):
+    """Test results for text edited since the search started are ignored."""
+    release = threading.Event()
+    started = threading.Event()
+
+    def search(query, limit):
+        if query == 'NIF':
+            started.set()
+            release.wait(5)
+            return [{'symbol': 'NIFTY-STALE', 'token': 1, 'exch_seg': 'NFO'}]
+        return [{'symbol': 'SBIN-EQ', 'token': 3045, 'exch_seg': 'NSE'}]
+
+    edit = SymbolLineEdit(search=search, debounce_ms=0, pool=pool)
+    type_text(edit, 'NIF')
+    wait_until(app, started.is_set)
+    edit.setText('SBIN')
+    edit.textEdited.emit('SBIN')
+    wait_until(app, lambda: edit._model.stringList() == ['SBIN-EQ'])
+
+    release.set()
+    pool.waitForDone()
+    app.processEvents()
+    assert edit._model.stringList() == ['SBIN-EQ']
+
+def test_symbol_selected_when_editing_finishes_first(app, pool):
+    """Test a symbol typed in full is resolved once its results arrive."""
+    selected = []
+    edit = SymbolLineEdit(
+        search=lambda query, limit: [{'symbol': 'SBIN-EQ', 'token': 3045, 'exch_seg': 'NSE'}],
+        debounce_ms=0,
+        pool=pool
+    )
+    edit.symbolSelected.connect(lambda *args: selected.append(args))
+    type_text(edit, 'SBIN-EQ')
+    wait_until(app, lambda: selected)
+
+    assert selected[-1] == ('SBIN-EQ', 3045, 'NSE')
@@ -0,0 +1,273 @@
+import json
+import threading
+import pytest
+import requests
+from unittest.mock import Mock, patch
+from engine.__main__ import main as cli_main
+from engine.core import TradingEngine
+from engine.protocol import order_params
+from engine.remote import EngineError, RemoteEngine
+from engine.server import EngineServer
+from models.client import TradingError
+from models.client_pool import ClientPool
+from models.market_feed import MarketFeed
+from models.order_dispatcher import OrderAck
+from models.token_data import TokenData
+
+SCRIP_MASTER = [
+    {'token': '3045', 'symbol': 'SBIN-EQ', 'name': 'SBIN', 'expiry': '',
+     'strike': '-1.000000', 'lotsize': '1', 'instrumenttype': '',
+     'exch_seg': 'NSE', 'tick_size': '5.000000'},
+    {'token': '40000', 'symbol': 'NIFTY27JUN2422000CE', 'name': 'NIFTY',
+     'expiry': '27JUN2024', 'strike': '2200000.000000', 'lotsize': '25',
+     'instrumenttype': 'OPTIDX', 'exch_seg': 'NFO', 'tick_size': '5.000000'},
+    {'token': '40002', 'symbol': 'NIFTY27JUN2422000PE', 'name': 'NIFTY',
+     'expiry': '27JUN2024', 'strike': '2200000.000000', 'lotsize': '25',
+     'instrumenttype': 'OPTIDX', 'exch_seg': 'NFO', 'tick_size': '5.000000'},
+    {'token': '40003', 'symbol': 'NIFTY27JUN2422100CE', 'name': 'NIFTY',
+     'expiry': '27JUN2024', 'strike': '2210000.000000', 'lotsize': '25',
+     'instrumenttype': 'OPTIDX', 'exch_seg': 'NFO', 'tick_size': '5.000000'},
+]
+
+@pytest.fixture
+def smart_connect():
+    with patch('models.client.SmartConnect') as mock:
+        instance = Mock()
+        instance.generateSession.return_value = {'data': {'refreshToken': 'test_token'}}
+        instance.getProfile.return_value = {'name': 'Test User'}
+        instance.holding.return_value = {'data': []}
+        instance.position.return_value = {'data': []}
+        instance.placeOrder.return_value = '2010'
+        mock.return_value = instance
+        yield mock
+
+@pytest.fixture
+def engine(tmp_path, smart_connect):
+    payload = json.dumps(SCRIP_MASTER).encode()
+    response = Mock(status_code=200, headers={})
+    response.iter_content.side_effect = lambda chunk_size: iter([payload])
+    credentials = tmp_path / 'clients.csv'
+    credentials.write_text("Code,Pass\nabc1234,pass@123\nabc2345,pass@234\n")
+
+    with patch('utils.http.transport.get', return_value=response):
+        token_data = TokenData(snapshot_dir=str(tmp_path / 'scrip_master'))
+        token_data.refresh(wait=True)
+    engine = TradingEngine(
+        token_data=token_data,
+        client_pool=ClientPool(max_workers=2, max_attempts=1),
+        credentials_path=str(credentials)
+    )
+    yield engine
+    engine.shutdown()
+
+@pytest.fixture
+def server(engine):
+    server = EngineServer(engine, host='127.0.0.1', port=0, token='')
+    server.start()
+    yield server
+    server.stop()
+
+def test_load_clients_skips_logged_in(engine, smart_connect):
+    """Test clients are logged in once however many sessions ask."""
+    assert engine.load_clients() == {'requested': 2, 'logged_in': 2}
+    assert engine.load_clients() == {'requested': 2, 'logged_in': 2}
+    assert smart_connect.call_count == 2
+
+def test_place_order(engine):
+    """Test a basket is placed for every client and summarized."""
+    engine.load_clients()
+    acks = []
+    summary = engine.place_order(order_params('BUY', 'SBIN-EQ', '3045', 'NSE', '1'), callback=acks.append)
+
+    assert summary['placed'] == 2
+    assert summary['failed'] == 0
+    assert sorted(ack.client_code for ack in summary['acks']) == ['abc1234', 'abc2345']
+    assert all(ack.order_id == '2010' for ack in summary['acks'])
+
+def test_place_order_without_clients(engine):
+    """Test placing an order before any login fails."""
+    with pytest.raises(TradingError, match="No clients are logged in"):
+        engine.place_order(order_params('BUY', 'SBIN-EQ', '3045', 'NSE', '1'))
+
+def test_pnl_follows_market_feed(engine, smart_connect):
+    """Test tracked positions are streamed and re-marked by live ticks."""
+    instance = smart_connect.return_value
+    instance.generateSession.return_value = {'data': {'jwtToken': 'Bearer jwt', 'refreshToken': 'test_token'}}
+    instance.feed_token = 'feed'
+    instance.position.return_value = {'data': [{
+        'symboltoken': '3045', 'exchange': 'NSE', 'tradingsymbol': 'SBIN-EQ',
+        'buyqty': '10', 'sellqty': '0', 'netqty': '10',
+        'buyavgprice': '800.0', 'sellavgprice': '0', 'ltp': '800.0'
+    }]}
+    websocket = Mock()
+    engine.market_feed = MarketFeed(engine.tick_store, websocket_factory=Mock(return_value=websocket))
+    engine.load_clients()
+
+    assert engine.track_pnl()['abc1234']['unrealized'] == 0.0
+    assert engine.status()['feed']['subscribed'] == 1
+    websocket.on_ticks(websocket, [{'tk': '3045', 'ltp': '810.00'}])
+    assert engine.pnl_totals()['unrealized'] == 200.0
+
+    engine.shutdown()
+    websocket.close.assert_called_once()
+
+def test_order_params():
+    """Test order parameters follow the symbol's segment and order type."""
+    market = order_params('SELL', 'NIFTY27JUN2422000CE', 40000, 'NFO', 25, price='101')
+    assert market['exchange'] == 'NFO'
+    assert market['producttype'] == 'CARRYFORWARD'
+    assert market['price'] == '0'
+    assert 'triggerprice' not in market
+
+    limit = order_params('BUY', 'SBIN-EQ', '3045', 'NSE', '1', 'LIMIT', '820.5')
+    assert limit['exchange'] == 'NSE'
+    assert limit['producttype'] == 'DELIVERY'
+    assert limit['variety'] == 'NORMAL'
+    assert limit['price'] == '820.5'
+    assert 'triggerprice' not in limit
+
+    stoploss = order_params('SELL', 'SBIN-EQ', '3045', 'NSE', '1', 'STOPLOSS_LIMIT', '818', '819', intraday=True)
+    assert stoploss['variety'] == 'STOPLOSS'
+    assert stoploss['producttype'] == 'INTRADAY'
+    assert stoploss['price'] == '818'
+    assert stoploss['triggerprice'] == '819'
+
+    bse = order_params('BUY', 'RELIANCE', '500325', 'BSE', '1')
+    assert bse['exchange'] == 'BSE'
+    assert bse['producttype'] == 'DELIVERY'
+    with pytest.raises(ValueError, match="Unknown exchange"):
+        order_params('BUY', 'SBIN-EQ', '3045', 'NSEX', '1')
+
+def test_order_params_trigger_price_only_for_stoploss():
+    """Test a trigger price is required for stop-loss orders and rejected otherwise."""
+    with pytest.raises(ValueError, match="do not take a trigger price"):
+        order_params('BUY', 'SBIN-EQ', '3045', 'NSE', '1', 'LIMIT', '820.5', '819')
+    with pytest.raises(ValueError, match="need a trigger price"):
+        order_params('BUY', 'SBIN-EQ', '3045', 'NSE', '1', 'STOPLOSS_MARKET')
+
+def test_remote_engine_matches_local(engine, server):
+    """Test a remote engine returns what the engine it serves does."""
+    remote = RemoteEngine(server.url, token='')
+
+    assert remote.load_clients() == {'requested': 2, 'logged_in': 2}
+    assert remote.search_symbols('NIFTY', 5) == engine.search_symbols('NIFTY', 5)
+
+    df, positions = remote.find_rows('NIFTY', 'NFO', 'OPTIDX', None, 'CE')
+    local_df, local_positions = engine.find_rows('NIFTY', 'NFO', 'OPTIDX', None, 'CE')
+    assert df['token'].tolist() == local_df['token'].to_numpy()[local_positions].tolist()
+    assert positions.tolist() == [0, 1]
+    assert df['expiry'].dt.strftime('%d%b%Y').str.upper().tolist() == ['27JUN2024', '27JUN2024']
+
+    acks = []
+    summary = remote.place_order(order_params('BUY', 'SBIN-EQ', '3045', 'NSE', '1'), callback=acks.append)
+    assert summary['placed'] == 2
+    assert all(isinstance(ack, OrderAck) and ack.ok for ack in acks)
+
+    assert set(remote.track_pnl()) == {'abc1234', 'abc2345'}
+    assert remote.pnl_totals()['total'] == 0.0
+    assert remote.status()['clients'] == {'known': 2, 'logged_in': 2}
+    remote.shutdown()
+
+def test_remote_load_clients_outlasts_request_timeout(engine, server, smart_connect):
+    """Test slow logins are polled rather than waited for in one request."""
+    release = threading.Event()
+    instance = smart_connect.return_value
+    generate_session = instance.generateSession.return_value
+    instance.generateSession.side_effect = lambda *args: release.wait(5) and generate_session
+    remote = RemoteEngine(server.url, token='', timeout=0.5)
+
+    polls = []
+    assert remote.load_clients(is_cancelled=lambda: len(polls) > 3 or polls.append(1)) == {
+        'requested': 2, 'logged_in': 0
+    }
+
+    threading.Timer(0.7, release.set).start()
+    assert remote.load_clients() == {'requested': 2, 'logged_in': 2}
+    assert smart_connect.call_count == 2
+
+def test_remote_acks_streamed_before_basket_completes(server, smart_connect):
+    """Test remote callbacks see each ack while the rest of the basket is in flight."""
+    remote = RemoteEngine(server.url, token='')
+    remote.load_clients()
+    first_ack = threading.Event()
+    calls = []
+
+    def place(params):
+        calls.append(params)
+        # The second order is only sent once the first ack reached the caller
+        if len(calls) == 2 and not first_ack.wait(5):
+            raise TradingError("First ack was not streamed")
+        return str(2010 + len(calls))
+
+    smart_connect.return_value.placeOrder.side_effect = place
+    acks = []
+
+    def on_ack(ack):
+        acks.append(ack)
+        first_ack.set()
+
+    summary = remote.place_order(order_params('BUY', 'SBIN-EQ', '3045', 'NSE', '1'), callback=on_ack)
+    assert summary['placed'] == 2
+    assert sorted(ack.order_id for ack in acks) == ['2011', '2012']
+    assert sorted(ack.order_id for ack in summary['acks']) == ['2011', '2012']
+
+def test_order_route_without_streaming(engine, server):
+    """Test clients that do not accept NDJSON get the whole summary at once."""
+    engine.load_clients()
+    response = requests.post(server.url + '/orders', json={'params': order_params('BUY', 'SBIN-EQ', '3045', 'NSE', '1')})
+    assert response.headers['Content-Type'] == 'application/json'
+    assert response.json()['placed'] == 2
+
+def test_remote_engine_errors(server):
+    """Test engine failures are raised as EngineError."""
+    remote = RemoteEngine(server.url, token='')
+    with pytest.raises(EngineError, match="No clients are logged in"):
+        remote.place_order(order_params('BUY', 'SBIN-EQ', '3045', 'NSE', '1'))
+    params = order_params('BUY', 'SBIN-EQ', '3045', 'NSE', '1')
+    del params['exchange']
+    with pytest.raises(EngineError, match="Unknown exchange"):
+        remote.place_order(params)
+
+    def fail_midway(params, callback=None):
+        callback(OrderAck('abc1234', '2010', None, 0.01, 0.01))
+        raise RuntimeError("Dispatcher died")
+
+    acks = []
+    with patch.object(server.engine, 'place_order', side_effect=fail_midway):
+        with pytest.raises(EngineError, match="Dispatcher died"):
+            remote.place_order(order_params('BUY', 'SBIN-EQ', '3045', 'NSE', '1'), callback=acks.append)
+    assert [ack.client_code for ack in acks] == ['abc1234']
+
+    unreachable = RemoteEngine('http://127.0.0.1:1', token='', timeout=1)
+    with pytest.raises(EngineError, match="unreachable"):
+        unreachable.status()
+
+def test_server_requires_token(engine):
+    """Test a server with a token rejects clients without it."""
+    server = EngineServer(engine, host='127.0.0.1', port=0, token='secret')
+    server.start()
+    try:
+        with pytest.raises(EngineError, match="token"):
+            RemoteEngine(server.url, token='').status()
+        assert RemoteEngine(server.url, token='secret').status()['clients']['known'] == 0
+    finally:
+        server.stop()
+
+def test_server_requires_token_off_loopback(engine):
+    """Test a server reachable from other hosts cannot run without a token."""
+    with pytest.raises(ValueError, match="without an engine token"):
+        EngineServer(engine, host='0.0.0.0', port=0, token='')
+
+    server = EngineServer(engine, host='0.0.0.0', port=0, token='secret')
+    server.server_close()
+
+def test_remote_engine_has_engine_interface():
+    """Test the remote engine can stand in for the in-process one."""
+    public = {name for name in vars(TradingEngine) if not name.startswith('_')}
+    assert public <= set(vars(RemoteEngine))
+
+def test_cli_search(server, capsys):
+    """Test the CLI drives a served engine."""
+    cli_main(['--url', server.url, 'search', 'SBIN'])
+    results = json.loads(capsys.readouterr().out)
+    assert results[0]['symbol'] == 'SBIN-EQ'
@@ -0,0 +1,155 @@
+import gzip
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import Mock, patch
+import pytest
+import requests
+from models.client import Client
+from utils.http import HttpTransport, RequestsShim
+from utils.profiling import Profiler
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self._reply()
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        self._reply()
+
+    def _reply(self):
+        self.server.seen.append((self.command, self.path, dict(self.headers)))
+        statuses = self.server.statuses
+        status = statuses.pop(0) if statuses else 200
+        if self.path == '/slow':
+            time.sleep(0.5)
+        body = b'ok'
+        gzipped = 'gzip' in self.headers.get('Accept-Encoding', '')
+        if gzipped:
+            body = gzip.compress(body)
+        self.send_response(status)
+        if gzipped:
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Set-Cookie', 'sid=abc; Path=/')
+        self.send_header('Retry-After', '0')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    server.daemon_threads = True
+    server.seen = []
+    server.statuses = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+@pytest.fixture
+def transport():
+    transport = HttpTransport(retries=2, backoff=0, profiler=Profiler())
+    yield transport
+    transport.close()
+
+def url(server, path='/'):
+    host, port = server.server_address[:2]
+    return f"http://{host}:{port}{path}"
+
+def test_connections_are_reused(server, transport):
+    """Test requests to one host share a keep-alive connection."""
+    for _ in range(5):
+        assert transport.get(url(server, '/quote?token=1')).text == 'ok'
+
+    stats = transport.stats()
+    assert stats['hosts'][url(server).rstrip('/')] == {
+        'requests': 5, 'connections': 1, 'reuse_ratio': 0.8
+    }
+    endpoint = f"http GET {url(server, '/quote')[len('http://'):]}"
+    assert stats['endpoints'][endpoint]['count'] == 5
+
+def test_responses_are_compressed(server, transport):
+    """Test gzip is requested and decoded transparently."""
+    assert transport.get(url(server)).text == 'ok'
+    headers = server.seen[0][2]
+    assert 'gzip' in headers['Accept-Encoding']
+    assert headers['Connection'] == 'keep-alive'
+
+def test_idempotent_requests_are_retried(server, transport):
+    """Test a GET is retried through transient 5xx responses."""
+    server.statuses = [503, 502]
+    response = transport.get(url(server))
+
+    assert response.status_code == 200
+    assert len(server.seen) == 3
+
+def test_orders_are_not_retried(server, transport):
+    """Test a POST is sent once whatever the response."""
+    server.statuses = [503]
+    response = transport.request('POST', url(server, '/order'), data='{}')
+
+    assert response.status_code == 503
+    assert len(server.seen) == 1
+
+def test_default_timeout(server):
+    """Test requests without a timeout get the transport's read timeout."""
+    transport = HttpTransport(read_timeout=0.1, retries=0, profiler=Profiler())
+    with pytest.raises(requests.ConnectionError):
+        transport.get(url(server, '/slow'))
+    transport.close()
+
+def test_cookies_are_not_shared(server, transport):
+    """Test cookies set for one client are not sent for another."""
+    transport.get(url(server))
+    transport.get(url(server))
+
+    assert 'Cookie' not in server.seen[1][2]
+
+def test_client_sends_through_transport():
+    """Test SmartAPI clients are given the client's transport."""
+    transport = Mock()
+    with patch('models.client.SmartConnect') as smart_connect:
+        instance = Mock()
+        instance.generateSession.return_value = {'data': {'refreshToken': 'test_token'}}
+        instance.holding.return_value = {'data': []}
+        instance.position.return_value = {'data': []}
+        smart_connect.return_value = instance
+        Client('abc1234', 'pass@123', 100000, http=transport)
+
+    assert isinstance(instance.reqsession, RequestsShim)
+    instance.reqsession.request('POST', 'https://example.com/order', data='{}')
+    transport.request.assert_called_once_with('POST', 'https://example.com/order', data='{}')
+
+
+def test_smart_connect_sends_on_reqsession(monkeypatch):
+    """Test SmartAPI calls go through reqsession, not module-level requests."""
+    from models.smart_connect import PUBLIC_IP_URL, PooledSmartConnect
+    import smartapi.smartExceptions as ex
+    monkeypatch.setattr(requests, 'request', Mock(side_effect=AssertionError("module-level requests used")))
+    monkeypatch.setattr(requests, 'get', Mock(side_effect=AssertionError("module-level requests used")))
+
+    obj = PooledSmartConnect(api_key='key', access_token='jwt')
+    assert isinstance(obj.reqsession, RequestsShim)
+    session = obj.reqsession = Mock()
+    session.get.return_value = Mock(text='203.0.113.7')
+    session.request.return_value = Mock(status_code=200, content=b'{"status": true, "data": {"orderid": "2010"}}')
+
+    assert obj.placeOrder({'variety': 'NORMAL', 'price': None}) == '2010'
+    assert session.get.call_args.args == (PUBLIC_IP_URL,)
+    method, order_url = session.request.call_args.args
+    kwargs = session.request.call_args.kwargs
+    assert method == 'POST' and order_url.endswith('/order/v1/placeOrder')
+    assert kwargs['data'] == '{"variety": "NORMAL"}'
+    assert kwargs['headers']['Authorization'] == 'Bearer jwt'
+    assert kwargs['headers']['X-ClientPublicIP'] == '203.0.113.7'
+
+    session.request.return_value = Mock(status_code=403, content=b'{"error_type": "TokenException", "message": "Invalid Token"}')
+    with pytest.raises(ex.TokenException, match="Invalid Token"):
+        obj.getProfile('refresh')
@@ -0,0 +1,117 @@
+import json
+import logging
+import os
+import time
+import pytest
+from config import Config
+from utils.logger import JsonLinesFormatter, SizeTimeRotatingFileHandler, setup_logger
+
+def make_record(msg, *args, level=logging.INFO, exc_info=None):
+    return logging.LogRecord('techfin', level, __file__, 1, msg, args, exc_info)
+
+def test_json_lines_formatter():
+    """Test records become compact one-line JSON."""
+    line = JsonLinesFormatter().format(make_record("Placed %s for %s", '2010', 'abc1234'))
+
+    entry = json.loads(line)
+    assert '\n' not in line
+    assert entry['msg'] == "Placed 2010 for abc1234"
+    assert entry['level'] == 'INFO'
+    assert entry['logger'] == 'techfin'
+    assert 'exc' not in entry
+
+def test_json_lines_formatter_exception():
+    """Test tracebacks are kept in the exc field."""
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        import sys
+        record = make_record("failed", level=logging.ERROR, exc_info=sys.exc_info())
+
+    entry = json.loads(JsonLinesFormatter().format(record))
+    assert 'ValueError: boom' in entry['exc']
+
+def test_rotates_by_size(tmp_path):
+    """Test the file rotates before exceeding the size limit."""
+    path = str(tmp_path / 'app.jsonl')
+    handler = SizeTimeRotatingFileHandler(path, max_bytes=200, backup_count=2)
+    handler.setFormatter(JsonLinesFormatter())
+    for i in range(20):
+        handler.emit(make_record("message %d", i))
+    handler.close()
+
+    assert os.path.exists(path + '.1')
+    assert os.path.exists(path + '.2')
+    assert not os.path.exists(path + '.3')
+    assert os.path.getsize(path) <= 200
+
+def test_rotates_by_age(tmp_path):
+    """Test the file rotates once its interval has passed."""
+    path = str(tmp_path / 'app.jsonl')
+    handler = SizeTimeRotatingFileHandler(path, max_bytes=10 ** 6, backup_count=2, interval=3600)
+    handler.setFormatter(JsonLinesFormatter())
+    handler.emit(make_record("first"))
+    handler.rollover_at = time.time() - 1
+    handler.emit(make_record("second"))
+    handler.close()
+
+    with open(path + '.1') as f:
+        assert json.loads(f.read())['msg'] == "first"
+    with open(path) as f:
+        assert json.loads(f.read())['msg'] == "second"
+    assert handler.rollover_at > time.time()
+
+def test_log_directory_created_on_first_record(tmp_path):
+    """Test the log directory is only created once a record is written."""
+    path = tmp_path / 'logs' / 'app.jsonl'
+    handler = SizeTimeRotatingFileHandler(str(path), max_bytes=10 ** 6, backup_count=2)
+    handler.setFormatter(JsonLinesFormatter())
+
+    assert not path.parent.exists()
+    handler.emit(make_record("first"))
+    handler.close()
+
+    assert json.loads(path.read_text())['msg'] == "first"
+
+@pytest.fixture
+def queued_logger(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, 'LOG_DIR', str(tmp_path))
+    logger = setup_logger('techfin_test')
+    logger.propagate = False
+    yield logger
+    logger.listener.stop()
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+
+def read_lines(tmp_path):
+    with open(tmp_path / 'techfin_test.jsonl') as f:
+        return [json.loads(line) for line in f]
+
+def test_records_written_by_listener(tmp_path, queued_logger):
+    """Test records reach the file through the background listener."""
+    queued_logger.warning("Retrying login for %s in %.1f s", 'abc1234', 5)
+    try:
+        raise RuntimeError("down")
+    except RuntimeError:
+        queued_logger.exception("Login failed")
+    queued_logger.listener.stop()
+
+    entries = read_lines(tmp_path)
+    assert entries[0]['msg'] == "Retrying login for abc1234 in 5.0 s"
+    assert entries[0]['thread'] == 'MainThread'
+    assert 'RuntimeError: down' in entries[1]['exc']
+
+def test_filtered_messages_never_formatted(tmp_path, queued_logger):
+    """Test arguments are not formatted below the log level."""
+    class Expensive:
+        calls = 0
+
+        def __str__(self):
+            Expensive.calls += 1
+            return 'expensive'
+
+    queued_logger.setLevel(logging.INFO)
+    queued_logger.debug("State %s", Expensive())
+    queued_logger.listener.stop()
+
+    assert Expensive.calls == 0
@@ -0,0 +1,155 @@
+import base64
+import json
+import time
+import zlib
+import pytest
+from unittest.mock import Mock
+import smartapi.webSocket
+from models.market_feed import MarketFeed, SmartFeedSocket
+from models.tick_store import TickStore
+
+class FakeWebSocket:
+    """Stand-in for SmartFeedSocket that opens as soon as it connects."""
+
+    def __init__(self, feed_token, client_code):
+        self.auth = (feed_token, client_code)
+        self.subscriptions = []
+        self.closed = False
+
+    def connect(self):
+        self.on_open(self)
+
+    def subscribe(self, channel):
+        self.subscriptions.append(channel)
+
+    def close(self):
+        self.closed = True
+        self.on_close(self, 1000, 'closed')
+
+class FakeProtocol:
+    """Autobahn protocol stand-in recording the messages sent on it."""
+
+    def __init__(self):
+        self.sent = []
+
+    def sendMessage(self, payload):
+        self.sent.append(json.loads(payload))
+
+    def sendClose(self, code=None, reason=None):
+        self.sent.append({'task': 'close'})
+
+def encode(ticks):
+    """Encode ticks the way the legacy feed sends its text messages."""
+    return base64.b64encode(zlib.compress(json.dumps(ticks).encode()))
+
+def wait_until(condition, timeout=5.0):
+    """Wait for the feed thread to reach a state."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "Timed out waiting for condition"
+        time.sleep(0.001)
+
+@pytest.fixture
+def client():
+    return Mock(code='abc1234', session={'jwt_token': 'jwt', 'feed_token': 'feed'})
+
+@pytest.fixture
+def feed():
+    sockets = []
+
+    def factory(*args):
+        sockets.append(FakeWebSocket(*args))
+        return sockets[-1]
+
+    feed = MarketFeed(TickStore(capacity=8), websocket_factory=factory)
+    feed.sockets = sockets
+    yield feed
+    feed.stop()
+
+def test_subscriptions_sent_when_connected(feed, client):
+    """Test tokens subscribed before and after connecting reach the websocket."""
+    assert feed.subscribe([(3045, 'NSE'), (40000, 'NFO'), (1, 'XYZ')]) == 2
+    assert feed.start(client)
+    assert feed.connected
+    websocket = feed.sockets[0]
+    assert websocket.auth == ('feed', 'abc1234')
+    assert websocket.subscriptions == ['nse_cm|3045&nse_fo|40000']
+
+    assert feed.subscribe([(3045, 'NSE'), (40002, 'NFO')]) == 1
+    assert websocket.subscriptions[-1] == 'nse_cm|3045&nse_fo|40000&nse_fo|40002'
+    assert sorted(feed.store.tokens) == [3045, 40000, 40002]
+
+def test_ticks_written_to_store(feed, client):
+    """Test feed ticks land in the tick store; messages without a price are skipped."""
+    feed.start(client)
+    feed.sockets[0].on_ticks(None, [
+        {'name': 'sf', 'tk': '3045', 'e': 'nse_cm', 'ltp': '800.50', 'v': '1200'},
+        {'name': 'tm', 'ak': 'ok'}
+    ])
+    feed.sockets[0].on_ticks(None, [{'name': 'sf', 'tk': '3045', 'ltp': '801.00'}])
+    assert feed.store.last_price(3045) == 801.0
+    assert feed.store.history(3045)['volume'].tolist() == [1200, 1200]
+    assert feed.status()['ticks'] == 2
+    assert feed.status()['dropped'] == 0
+
+def test_start_without_feed_token(feed, client):
+    """Test a session without a feed token reports why there are no ticks."""
+    client.session = {'jwt_token': 'jwt', 'feed_token': None}
+    assert not feed.start(client)
+    assert not feed.running
+    assert 'feed token' in feed.status()['error']
+
+def test_stop_closes_websocket(feed, client):
+    """Test stopping closes the websocket and allows a restart."""
+    feed.start(client)
+    websocket = feed.sockets[0]
+    feed.stop()
+    assert websocket.closed
+    assert not feed.running and not feed.connected
+    assert feed.start(client)
+    assert len(feed.sockets) == 2
+
+def test_dropped_connection_restarts(feed, client, monkeypatch):
+    """Test a feed whose connection drops or fails to open can start again."""
+    feed.start(client)
+    feed.sockets[0].on_error(feed.sockets[0], 1006, 'connection lost')
+    feed.sockets[0].on_close(feed.sockets[0], 1006, 'connection lost')
+    assert not feed.running
+    assert feed.status()['error'] == 'connection lost'
+
+    with monkeypatch.context() as patch:
+        patch.setattr(FakeWebSocket, 'connect', Mock(side_effect=OSError('unreachable')))
+        assert not feed.start(client)
+    assert not feed.running
+    assert feed.start(client)
+    assert feed.connected
+
+def test_default_websocket_uses_pinned_smartapi(monkeypatch, client):
+    """Test the feed connects through smartapi's legacy websocket by default."""
+    protocol = FakeProtocol()
+    factories = []
+
+    def connect_ws(factory, contextFactory=None, timeout=None):
+        factories.append(factory)
+        factory.on_connect(protocol, None)
+        factory.on_open(protocol)
+
+    monkeypatch.setattr(smartapi.webSocket, 'connectWS', connect_ws)
+    feed = MarketFeed(TickStore(capacity=8))
+    feed.subscribe([(3045, 'NSE')])
+    assert feed.start(client)
+    assert isinstance(feed._websocket, SmartFeedSocket)
+    wait_until(lambda: any(m['task'] == 'mw' for m in protocol.sent))
+
+    assert protocol.sent[0] == {
+        'task': 'cn', 'channel': '', 'token': 'feed', 'user': 'abc1234', 'acctid': 'abc1234'
+    }
+    assert protocol.sent[1]['channel'] == 'nse_cm|3045'
+    assert feed.connected
+
+    factories[0].on_message(protocol, encode([{'name': 'sf', 'tk': '3045', 'ltp': '812.25'}]), False)
+    assert feed.store.last_price(3045) == 812.25
+
+    feed.stop()
+    wait_until(lambda: protocol.sent[-1] == {'task': 'close'})
+    assert not feed.running
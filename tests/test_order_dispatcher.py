@@ -0,0 +1,193 @@
+import threading
+import time
+import pytest
+from unittest.mock import Mock, patch
+from models.client import Client, TradingError
+from models.order_dispatcher import OrderDispatcher, TokenBucket, latency_percentiles
+
+ORDER = {
+    'variety': 'NORMAL',
+    'tradingsymbol': 'SBIN-EQ',
+    'symboltoken': '3045',
+    'transactiontype': 'BUY',
+    'exchange': 'NSE',
+    'ordertype': 'MARKET',
+    'producttype': 'INTRADAY',
+    'duration': 'DAY',
+    'price': '0',
+    'quantity': '1'
+}
+
+@pytest.fixture
+def mock_smart_connect():
+    with patch('models.client.SmartConnect') as mock:
+        mock_instance = Mock()
+        mock_instance.generateSession.return_value = {
+            'data': {'refreshToken': 'test_token'}
+        }
+        mock_instance.getProfile.return_value = {'name': 'Test User'}
+        mock_instance.holding.return_value = {'data': []}
+        mock_instance.position.return_value = {'data': []}
+        mock_instance.placeOrder.return_value = '201020000000080'
+        mock.return_value = mock_instance
+        yield mock
+
+@pytest.fixture
+def clients(mock_smart_connect):
+    return [Client(f"code{i}", 'test_pass', 100000.0) for i in range(50)]
+
+@pytest.fixture
+def dispatcher():
+    dispatcher = OrderDispatcher(global_rate=1000, client_rate=1000, concurrency=8)
+    yield dispatcher
+    dispatcher.stop()
+
+def test_token_bucket():
+    """Test bursts up to capacity, then waits at the refill rate."""
+    bucket = TokenBucket(rate=10, capacity=2)
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == pytest.approx(0.1, abs=0.02)
+    assert bucket.reserve() == pytest.approx(0.2, abs=0.02)
+
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
+
+def test_latency_percentiles():
+    """Test latency summary."""
+    stats = latency_percentiles([0.001 * i for i in range(1, 101)])
+    assert stats['count'] == 100
+    assert stats['p50'] == pytest.approx(0.0505)
+    assert stats['max'] == pytest.approx(0.1)
+    assert latency_percentiles([])['p50'] is None
+
+def test_client_place_order(clients, mock_smart_connect):
+    """Test Client.place_order returns the order id and rejects failures."""
+    assert clients[0].place_order(ORDER) == '201020000000080'
+
+    mock_smart_connect.return_value.placeOrder.return_value = None
+    with pytest.raises(TradingError):
+        clients[0].place_order(ORDER)
+
+    mock_smart_connect.return_value.placeOrder.side_effect = Exception('API Error')
+    with pytest.raises(TradingError):
+        clients[0].place_order(ORDER)
+
+def test_basket_across_50_clients(clients, dispatcher, mock_smart_connect):
+    """Test a basket resolves one acknowledgement per client with latency stats."""
+    acks = []
+    futures = dispatcher.submit_basket(clients, ORDER, callback=acks.append)
+    results = [future.result(timeout=5) for future in futures]
+
+    assert [ack.client_code for ack in results] == [client.code for client in clients]
+    assert all(ack.ok and ack.order_id == '201020000000080' for ack in results)
+    assert all(ack.latency >= ack.broker_latency >= 0 for ack in results)
+    assert len(acks) == 50
+    assert mock_smart_connect.return_value.placeOrder.call_count == 50
+
+    stats = dispatcher.latency_stats()
+    assert stats['count'] == 50
+    assert stats['p50'] <= stats['p99'] <= stats['max']
+
+def test_rejected_order_acknowledged(clients, dispatcher, mock_smart_connect):
+    """Test a broker error comes back as a failed acknowledgement."""
+    mock_smart_connect.return_value.placeOrder.side_effect = Exception('API Error')
+    ack = dispatcher.submit(clients[0], ORDER).result(timeout=5)
+    assert not ack.ok
+    assert 'API Error' in ack.error
+
+def test_client_rate_limit(clients, mock_smart_connect):
+    """Test orders for one client are spaced by its token bucket."""
+    dispatcher = OrderDispatcher(global_rate=1000, client_rate=20, concurrency=4)
+    try:
+        start = time.perf_counter()
+        futures = [dispatcher.submit(clients[0], ORDER) for _ in range(25)]
+        for future in futures:
+            future.result(timeout=5)
+        # 20 burst tokens, the remaining 5 at 20/s
+        assert time.perf_counter() - start >= 0.2
+    finally:
+        dispatcher.stop()
+
+def test_global_rate_limit(clients, mock_smart_connect):
+    """Test orders across clients are bounded by the global bucket."""
+    dispatcher = OrderDispatcher(global_rate=20, client_rate=1000, concurrency=4)
+    try:
+        start = time.perf_counter()
+        for future in dispatcher.submit_basket(clients[:30], ORDER):
+            future.result(timeout=5)
+        assert time.perf_counter() - start >= 0.45
+    finally:
+        dispatcher.stop()
+
+def test_bounded_concurrency(clients, mock_smart_connect):
+    """Test no more than `concurrency` orders are in flight."""
+    lock = threading.Lock()
+    state = {'active': 0, 'peak': 0}
+
+    def place_order(params):
+        with lock:
+            state['active'] += 1
+            state['peak'] = max(state['peak'], state['active'])
+        time.sleep(0.01)
+        with lock:
+            state['active'] -= 1
+        return '1'
+
+    mock_smart_connect.return_value.placeOrder.side_effect = place_order
+    dispatcher = OrderDispatcher(global_rate=1000, client_rate=1000, concurrency=3)
+    try:
+        for future in dispatcher.submit_basket(clients[:20], ORDER):
+            future.result(timeout=5)
+    finally:
+        dispatcher.stop()
+    assert state['peak'] <= 3
+
+def test_stop_drains_queue(clients, mock_smart_connect):
+    """Test stop sends queued orders and rejects new ones."""
+    dispatcher = OrderDispatcher(global_rate=1000, client_rate=1000, concurrency=2)
+    futures = dispatcher.submit_basket(clients[:10], ORDER)
+    dispatcher.stop()
+    assert all(future.done() and future.result().ok for future in futures)
+
+    with pytest.raises(TradingError):
+        dispatcher.submit(clients[0], ORDER)
+
+def test_rate_limited_client_does_not_block_others(clients, mock_smart_connect):
+    """Test an order waiting on its client's rate limit holds no send slot."""
+    dispatcher = OrderDispatcher(global_rate=1000, client_rate=2, concurrency=1)
+    try:
+        throttled = [dispatcher.submit(clients[0], ORDER) for _ in range(3)]
+        start = time.perf_counter()
+        dispatcher.submit(clients[1], ORDER).result(timeout=5)
+        assert time.perf_counter() - start < 0.25
+        assert not throttled[2].done()
+        assert throttled[2].result(timeout=5).ok
+    finally:
+        dispatcher.stop()
+
+def test_stop_sends_rate_limited_orders(clients, mock_smart_connect):
+    """Test orders still waiting on a rate limit are sent before stop returns."""
+    dispatcher = OrderDispatcher(global_rate=1000, client_rate=20, concurrency=2)
+    futures = [dispatcher.submit(clients[0], ORDER) for _ in range(25)]
+    dispatcher.stop()
+    assert all(future.done() and future.result().ok for future in futures)
+
+def test_submit_racing_stop(clients, mock_smart_connect):
+    """Test orders submitted while stopping are either sent or rejected."""
+    dispatcher = OrderDispatcher(global_rate=1000, client_rate=1000, concurrency=2)
+    futures, rejected = [], []
+
+    def submit():
+        for _ in range(200):
+            try:
+                futures.append(dispatcher.submit(clients[0], ORDER))
+            except TradingError:
+                rejected.append(1)
+
+    thread = threading.Thread(target=submit)
+    thread.start()
+    dispatcher.stop()
+    thread.join()
+    assert len(futures) + len(rejected) == 200
+    assert all(future.result(timeout=5).ok for future in futures)
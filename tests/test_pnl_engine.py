@@ -0,0 +1,151 @@
+import threading
+import time
+import numpy as np
+import pytest
+from unittest.mock import Mock
+from models.book_index import BookIndex, BookChange
+from models.pnl_engine import PnlEngine
+from models.tick_store import TickStore
+
+def make_client(code, rows):
+    """Client stand-in with positions and change listeners."""
+    client = Mock()
+    client.code = code
+    client.positions = {'data': rows}
+    return client
+
+def position(token, buyqty, buyavg, sellqty=0, sellavg=0, ltp=None, multiplier='-1'):
+    return {
+        'tradingsymbol': f"SYM{token}",
+        'symboltoken': str(token),
+        'buyqty': str(buyqty),
+        'sellqty': str(sellqty),
+        'buyavgprice': str(buyavg),
+        'sellavgprice': str(sellavg),
+        'ltp': None if ltp is None else str(ltp),
+        'multiplier': multiplier
+    }
+
+@pytest.fixture
+def store():
+    return TickStore(capacity=16)
+
+@pytest.fixture
+def engine(store):
+    store.write(1, 1000, 110.0)
+    engine = PnlEngine(store)
+    engine.track(make_client('A', [position(1, 100, 100.0), position(2, 0, 0, 50, 200.0, ltp=190.0)]))
+    engine.track(make_client('B', [position(1, 150, 100.0, 50, 120.0)]))
+    return engine
+
+def test_initial_pnl(engine):
+    """Test realized/unrealized per client with tick and fallback prices."""
+    pnl = engine.by_client()
+    # A: long 100 @ 100 marked 110 -> 1000; short 50 @ 200 marked 190 (row ltp) -> 500
+    assert pnl.loc['A', 'unrealized'] == pytest.approx(1500.0)
+    assert pnl.loc['A', 'realized'] == 0
+    # B: 50 closed at +20 -> 1000 realized; 100 open @ 100 marked 110 -> 1000
+    assert pnl.loc['B', 'realized'] == pytest.approx(1000.0)
+    assert pnl.loc['B', 'unrealized'] == pytest.approx(1000.0)
+    assert engine.totals() == pytest.approx({'realized': 1000.0, 'unrealized': 2500.0, 'total': 3500.0})
+
+def test_tick_updates_only_affected_rows(engine, store):
+    """Test a tick re-marks rows for its token and keeps the aggregates in sync."""
+    version = engine.version
+    store.write(1, 1001, 105.0)
+    assert engine.version == version + 1
+
+    positions = engine.by_position()
+    assert list(positions.loc[positions['token'] == 1, 'ltp']) == [105.0, 105.0]
+    assert positions.loc[positions['token'] == 2, 'ltp'].iloc[0] == 190.0
+
+    pnl = engine.by_client()
+    assert pnl.loc['A', 'unrealized'] == pytest.approx(1000.0)
+    assert pnl.loc['B', 'unrealized'] == pytest.approx(500.0)
+
+    store.write(99, 1001, 1.0)
+    assert engine.version == version + 1
+
+def test_matches_full_recompute(store):
+    """Test incremental updates equal a fresh vectorized pass."""
+    rng = np.random.default_rng(0)
+    clients = [
+        make_client(f"C{i}", [
+            position(t, int(rng.integers(0, 200)), float(rng.uniform(50, 150)),
+                     int(rng.integers(0, 200)), float(rng.uniform(50, 150)), ltp=100.0)
+            for t in rng.choice(20, size=5, replace=False)
+        ])
+        for i in range(30)
+    ]
+    engine = PnlEngine(store)
+    for client in clients:
+        engine.track(client)
+    for _ in range(500):
+        store.write(int(rng.integers(0, 20)), 1000, float(rng.uniform(80, 120)))
+
+    fresh = PnlEngine(store)
+    for client in clients:
+        fresh.track(client)
+    np.testing.assert_allclose(engine.by_client().to_numpy(), fresh.by_client().to_numpy())
+
+def test_reload_on_position_change(engine):
+    """Test position change events rebuild the book."""
+    client = engine._clients['A']
+    listener = client.add_change_listener.call_args[0][0]
+    client.positions = {'data': [position(1, 10, 100.0)]}
+    listener(client, [BookChange('holdings', 'changed', ('', '', '', ''), {}, {})])
+    assert engine.by_client().loc['A', 'unrealized'] == pytest.approx(1500.0)
+
+    listener(client, [BookChange('positions', 'changed', ('', '', '', ''), {}, {})])
+    assert engine.by_client().loc['A', 'unrealized'] == pytest.approx(100.0)
+
+def test_carry_forward_uses_broker_netqty(store):
+    """Test a position carried forward from earlier days is marked from its carried average."""
+    row = dict(position(1, 0, 0), netqty='20', cfbuyqty='20', cfbuyavgprice='100.0')
+    store.write(1, 1000, 110.0)
+    engine = PnlEngine(store)
+    engine.track(make_client('A', [row]))
+    assert engine.by_client().loc['A', 'unrealized'] == pytest.approx(200.0)
+    assert engine.by_client().loc['A', 'realized'] == 0.0
+
+def test_carry_forward_blended_with_day_fills(store):
+    """Test carried and day fills are averaged and a day sale of carried quantity is realized."""
+    row = dict(
+        position(1, 10, 106.0, sellqty=15, sellavg=112.0),
+        netqty='15', cfbuyqty='20', cfbuyavgprice='100.0'
+    )
+    store.write(1, 1000, 110.0)
+    engine = PnlEngine(store)
+    engine.track(make_client('A', [row]))
+    # Buys: 20 @ 100 carried + 10 @ 106 today = 30 @ 102
+    assert engine.by_client().loc['A', 'realized'] == pytest.approx(15 * (112.0 - 102.0))
+    assert engine.by_client().loc['A', 'unrealized'] == pytest.approx(15 * (110.0 - 102.0))
+
+def test_tick_during_reload_is_kept(engine, store):
+    """Test a tick stored while the book is rebuilt marks the new book."""
+    last_prices = store.last_prices
+    writer = threading.Thread(target=store.write, args=(1, 1002, 120.0))
+
+    def snapshot_then_tick(tokens):
+        prices = last_prices(tokens)
+        writer.start()
+        # Let the tick reach the engine before the new book is swapped in
+        time.sleep(0.05)
+        return prices
+
+    store.last_prices = snapshot_then_tick
+    engine.reload()
+    writer.join()
+
+    positions = engine.by_position()
+    assert list(positions.loc[positions['token'] == 1, 'ltp']) == [120.0, 120.0]
+    assert engine.by_client().loc['A', 'unrealized'] == pytest.approx(2500.0)
+
+def test_untrack_and_empty():
+    """Test an engine without positions reports zeros."""
+    engine = PnlEngine()
+    assert engine.totals()['total'] == 0
+    assert engine.by_position().empty
+    engine.track(make_client('A', None))
+    engine.untrack('A')
+    assert engine.by_client().empty
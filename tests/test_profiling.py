@@ -0,0 +1,137 @@
+import json
+import threading
+import time
+import pytest
+from utils.profiling import LatencyHistogram, Profiler, EventLoopWatchdog, dump
+
+def test_histogram_percentiles():
+    """Test percentiles are estimated from bucket bounds."""
+    histogram = LatencyHistogram(bounds=(0.001, 0.01, 0.1))
+    for _ in range(90):
+        histogram.record(0.0005)
+    for _ in range(10):
+        histogram.record(0.05)
+
+    assert histogram.percentile(50) == 0.001
+    assert histogram.percentile(99) == 0.05
+    snapshot = histogram.snapshot()
+    assert snapshot['count'] == 100
+    assert snapshot['max'] == 0.05
+    assert snapshot['buckets'] == {'0.001': 90, '0.1': 10}
+
+def test_histogram_overflow_uses_max():
+    """Test samples above the last bound report the exact maximum."""
+    histogram = LatencyHistogram(bounds=(0.001,))
+    histogram.record(2.5)
+
+    assert histogram.percentile(99) == 2.5
+
+def test_empty_histogram():
+    """Test an empty histogram has no percentiles."""
+    assert LatencyHistogram().percentile(50) is None
+
+def test_timed_records_on_error():
+    """Test calls are timed whether they return or raise."""
+    profiler = Profiler()
+
+    @profiler.timed('fail')
+    def fail():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        fail()
+
+    assert profiler.report()['fail']['count'] == 1
+
+def test_instrument_class():
+    """Test instrumenting patches methods once and keeps behaviour."""
+    profiler = Profiler()
+
+    class Service:
+        def fetch(self, x):
+            return x * 2
+
+        @staticmethod
+        def parse(x):
+            return int(x)
+
+        def _private(self):
+            return 1
+
+    assert sorted(profiler.instrument(Service)) == ['fetch', 'parse']
+    assert profiler.instrument(Service) == []
+
+    service = Service()
+    assert service.fetch(2) == 4
+    assert Service.parse('3') == 3
+    assert service._private() == 1
+
+    report = profiler.report()
+    assert report['Service.fetch']['count'] == 1
+    assert report['Service.parse']['count'] == 1
+    assert 'Service._private' not in report
+
+def test_disabled_profiler_records_nothing():
+    """Test a disabled profiler skips recording."""
+    profiler = Profiler()
+    profiler.enabled = False
+
+    with profiler.timer('block'):
+        pass
+
+    assert profiler.report() == {}
+
+def test_watchdog_captures_blocking_stack():
+    """Test a stalled thread's stack is captured while it blocks."""
+    profiler = Profiler()
+    started = threading.Event()
+    release = threading.Event()
+    watchdog = None
+
+    def blocking_handler():
+        release.wait(5)
+
+    def event_loop():
+        nonlocal watchdog
+        watchdog = EventLoopWatchdog(threshold_ms=20, profiler=profiler)
+        started.set()
+        blocking_handler()
+        watchdog.beat()
+
+    thread = threading.Thread(target=event_loop)
+    thread.start()
+    started.wait(1)
+    time.sleep(0.05)
+
+    event = watchdog.check()
+    release.set()
+    thread.join(1)
+
+    assert event['where'].startswith('blocking_handler')
+    assert 'release.wait' in event['stack']
+    assert watchdog.check() is None
+    stalls = watchdog.stalls()
+    assert len(stalls) == 1
+    assert stalls[0]['duration_ms'] >= 50
+    assert profiler.report()['event_loop.stall']['count'] == 1
+
+def test_watchdog_ignores_responsive_loop():
+    """Test no stall is reported while beats keep coming."""
+    watchdog = EventLoopWatchdog(threshold_ms=50)
+    watchdog.beat()
+
+    assert watchdog.check() is None
+    assert watchdog.stalls() == []
+
+def test_dump_writes_json(tmp_path):
+    """Test diagnostics are dumped with histograms and stalls."""
+    profiler = Profiler()
+    profiler.record('MainWindow._on_buy', 0.02)
+    watchdog = EventLoopWatchdog(threshold_ms=50)
+
+    path = dump(str(tmp_path / 'diag.json'), watchdog, profiler)
+
+    with open(path) as f:
+        payload = json.load(f)
+    assert payload['latency']['MainWindow._on_buy']['count'] == 1
+    assert payload['stalls'] == []
@@ -0,0 +1,61 @@
+import json
+import pytest
+from models.scrip_parser import ScripMasterParser, ScripParseError, parse_scrip_master
+
+RECORDS = [
+    {'token': '3045', 'symbol': 'SBIN-EQ', 'name': 'SBIN', 'strike': '-1.000000'},
+    {'token': '40000', 'symbol': 'NIFTY27JUN2422000CE', 'name': 'NIFTY',
+     'strike': '2200000.000000'},
+    {'token': '99', 'symbol': 'M&M-EQ', 'name': 'M&M', 'strike': ''},
+]
+
+def chunked(payload, size):
+    return [payload[i:i + size] for i in range(0, len(payload), size)]
+
+@pytest.mark.parametrize('size', [1, 2, 7, 64, 4096])
+def test_parse_independent_of_chunk_boundaries(size):
+    """Test records split across arbitrary chunk boundaries parse correctly."""
+    payload = json.dumps(RECORDS, indent=1).encode()
+    df, stats = parse_scrip_master(chunked(payload, size))
+
+    assert df['symbol'].tolist() == ['SBIN-EQ', 'NIFTY27JUN2422000CE', 'M&M-EQ']
+    assert df['strike'].dtype == 'int64'
+    assert df['strike'].tolist() == [-1, 2200000, -1]
+    assert df['token'].tolist() == [3045, 40000, 99]
+    assert df['name'].cat.categories.tolist() == ['', 'SBIN', 'NIFTY', 'M&M']
+    assert stats['rows'] == 3
+    assert stats['bytes'] == len(payload)
+
+def test_parse_multibyte_characters_split_across_chunks():
+    """Test UTF-8 sequences split between chunks are decoded."""
+    payload = json.dumps([{'name': 'café'}], ensure_ascii=False).encode()
+    df, _ = parse_scrip_master(chunked(payload, 1))
+    assert df['name'].iloc[0] == 'café'
+
+def test_parse_backfills_late_columns():
+    """Test a column first seen mid-stream is backfilled for earlier rows."""
+    payload = json.dumps([{'a': '1'}, {'a': '2', 'b': 'x'}]).encode()
+    df, _ = parse_scrip_master([payload])
+    assert df['b'].tolist() == ['', 'x']
+
+def test_parse_invalid_numbers_counted():
+    """Test unparsable numeric values become -1 and are reported."""
+    payload = json.dumps([{'token': 'abc', 'tick_size': '0.05'}]).encode()
+    df, stats = parse_scrip_master([payload])
+    assert df['token'].tolist() == [-1]
+    assert df['tick_size'].tolist() == [0.05]
+    assert stats['invalid_values'] == 1
+
+def test_parse_empty_array():
+    """Test an empty array yields an empty frame."""
+    df, stats = parse_scrip_master([b'[]'])
+    assert len(df) == 0
+    assert stats['rows'] == 0
+
+@pytest.mark.parametrize('payload', [b'{"a": 1}', b'[{"a": "1"},', b'[{"a": ]', b'[1, 2]'])
+def test_parse_malformed_payload_raises(payload):
+    """Test malformed or truncated payloads raise ScripParseError."""
+    parser = ScripMasterParser()
+    with pytest.raises(ScripParseError):
+        parser.feed(payload)
+        parser.close()
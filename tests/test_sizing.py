@@ -0,0 +1,37 @@
+import math
+import numpy as np
+import pandas as pd
+import pytest
+from models.sizing import size_positions, size_grid
+
+def test_matches_scalar_formula():
+    """Test unit lots reproduce floor(capital / 10 / price)."""
+    rng = np.random.default_rng(0)
+    capitals = rng.uniform(10000, 5000000, size=50)
+    prices = rng.uniform(0.05, 50000, size=40)
+    expected = np.array([[math.floor(c / 10 / p) for p in prices] for c in capitals])
+    np.testing.assert_array_equal(size_positions(capitals, prices), expected)
+
+def test_rounds_down_to_lots():
+    """Test quantities are whole lots."""
+    quantities = size_positions([100000.0, 1000000.0], [100.0, 50.0], [25, 15])
+    np.testing.assert_array_equal(quantities, [[100, 195], [1000, 1995]])
+    assert quantities.dtype == np.int64
+
+def test_invalid_prices_and_lots():
+    """Test bad prices size to 0 and missing lot sizes count as 1."""
+    quantities = size_positions([100000.0], [0.0, -5.0, np.nan, 100.0], [1, 1, 1, -1])
+    np.testing.assert_array_equal(quantities, [[0, 0, 0, 100]])
+
+    with pytest.raises(ValueError):
+        size_positions([100000.0], [100.0], [1, 2])
+
+def test_size_grid_labels():
+    """Test the labelled grid is indexed by client and token."""
+    capitals = pd.Series([100000.0, 200000.0], index=['A', 'B'])
+    instruments = pd.DataFrame({'token': [40000, 3045], 'lotsize': [25, 1], 'price': [100.0, 800.0]})
+    grid = size_grid(capitals, instruments)
+    assert list(grid.index) == ['A', 'B']
+    assert list(grid.columns) == [40000, 3045]
+    assert grid.loc['B', 40000] == 200
+    assert grid.loc['A', 3045] == 12
@@ -0,0 +1,89 @@
+import json
+import os
+import subprocess
+import sys
+import pytest
+import config
+from config import Config
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Imports files are opened for writing, directories created and heavy
+# modules loaded, reported as JSON by a fresh interpreter
+PROBE = """
+import builtins, json, os, sys
+writes = []
+_open, _makedirs, _mkdir = builtins.open, os.makedirs, os.mkdir
+def guarded_open(file, mode='r', *args, **kwargs):
+    if any(flag in mode for flag in 'wax+'):
+        writes.append(str(file))
+    return _open(file, mode, *args, **kwargs)
+def guarded_makedirs(name, *args, **kwargs):
+    writes.append(str(name))
+    return _makedirs(name, *args, **kwargs)
+def guarded_mkdir(name, *args, **kwargs):
+    writes.append(str(name))
+    return _mkdir(name, *args, **kwargs)
+builtins.open, os.makedirs, os.mkdir = guarded_open, guarded_makedirs, guarded_mkdir
+import {module}
+heavy = ['pandas', 'numpy', 'smartapi', 'requests', 'cryptography', 'twisted']
+print(json.dumps({{'writes': writes, 'loaded': [m for m in heavy if m in sys.modules]}}))
+"""
+
+def probe_import(module, cwd):
+    env = dict(os.environ, PYTHONPATH=ROOT, QT_QPA_PLATFORM='offscreen')
+    result = subprocess.run(
+        [sys.executable, '-c', PROBE.format(module=module)],
+        cwd=cwd, env=env, capture_output=True, text=True, timeout=60, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+@pytest.mark.parametrize('module, allowed', [
+    ('config', []),
+    ('utils.logger', []),
+    ('models.session_store', []),
+    ('models.client', ['pandas', 'numpy']),
+    ('ft', [])
+])
+def test_import_is_side_effect_free(tmp_path, module, allowed):
+    """Test importing writes no files and defers heavy modules."""
+    report = probe_import(module, tmp_path)
+
+    assert report['writes'] == []
+    assert set(report['loaded']) <= set(allowed)
+    assert list(tmp_path.iterdir()) == []
+
+def test_smart_connect_is_lazy():
+    """Test SmartConnect resolves on first access and stays patchable."""
+    from unittest.mock import patch
+    import models.client as client
+    from smartapi import SmartConnect
+    from models.smart_connect import PooledSmartConnect
+
+    assert client.SmartConnect is PooledSmartConnect
+    assert issubclass(PooledSmartConnect, SmartConnect)
+    with patch('models.client.SmartConnect') as smart_connect:
+        assert client._smart_connect() is smart_connect
+    assert client._smart_connect() is PooledSmartConnect
+
+def test_fernet_key_created_on_first_use(tmp_path, monkeypatch):
+    """Test the encryption key is generated on first use only."""
+    monkeypatch.setattr(Config, 'DATA_DIR', str(tmp_path / 'data'))
+    monkeypatch.setattr(config, '_fernet', None)
+
+    assert not (tmp_path / 'data').exists()
+    code, password = config.encrypt_credentials('abc1234', 'secret')
+
+    assert (tmp_path / 'data' / '.key').exists()
+    assert config.decrypt_credentials(code, password) == ('abc1234', 'secret')
+    assert config.fernet is config.get_fernet()
+
+def test_write_env_template(tmp_path):
+    """Test the .env template is written once and never overwritten."""
+    path = tmp_path / '.env'
+
+    assert Config.write_env_template(str(path))
+    assert 'SMART_API_KEY' in path.read_text()
+    path.write_text('SMART_API_KEY=real\n')
+    assert not Config.write_env_template(str(path))
+    assert path.read_text() == 'SMART_API_KEY=real\n'
@@ -0,0 +1,87 @@
+import os
+import threading
+import pytest
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt5 import QtWidgets
+from ui.status_log import StatusSink
+
+@pytest.fixture(scope='module')
+def app():
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+@pytest.fixture
+def widget(app):
+    return QtWidgets.QTextBrowser()
+
+def lines(widget):
+    return widget.toPlainText().split('\n')
+
+def test_messages_written_in_batches(widget):
+    """Test messages appear only when flushed, in one batch."""
+    sink = StatusSink(widget, interval_ms=10000)
+    sink.post("first")
+    sink.post("second")
+
+    assert widget.toPlainText() == ''
+    assert sink.flush() == 2
+    assert lines(widget) == ["first", "second"]
+
+    sink.post("third")
+    sink.flush()
+    assert lines(widget) == ["first", "second", "third"]
+    assert sink.stats()['flushes'] == 2
+
+def test_repeats_collapsed(widget):
+    """Test consecutive repeats are folded into one counted line."""
+    sink = StatusSink(widget, interval_ms=10000)
+    for _ in range(5):
+        sink.post("order failed")
+    sink.post("done")
+    sink.flush()
+
+    assert lines(widget) == ["order failed (x5)", "done"]
+    assert sink.stats()['coalesced'] == 4
+
+def test_overflow_drops_oldest(widget):
+    """Test a full buffer drops its oldest messages and reports them."""
+    sink = StatusSink(widget, interval_ms=10000, max_pending=3)
+    for i in range(5):
+        sink.post(f"tick {i}")
+    sink.flush()
+
+    assert lines(widget) == [
+        "... 2 earlier status messages dropped",
+        "tick 2",
+        "tick 3",
+        "tick 4"
+    ]
+    assert sink.stats()['dropped'] == 2
+
+def test_line_count_bounded(widget):
+    """Test the widget keeps only the most recent lines."""
+    sink = StatusSink(widget, interval_ms=10000, max_lines=50)
+    for batch in range(4):
+        for i in range(30):
+            sink.post(f"message {batch * 30 + i}")
+        sink.flush()
+
+    assert widget.document().blockCount() == 50
+    assert lines(widget)[-1] == "message 119"
+
+def test_post_from_threads(widget):
+    """Test messages can be posted from worker threads."""
+    sink = StatusSink(widget, interval_ms=10000, max_pending=10000)
+    threads = [
+        threading.Thread(target=lambda n=n: [sink.post(f"{n}:{i}") for i in range(200)])
+        for n in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    sink.flush()
+
+    assert sink.stats()['posted'] == 800
+    assert len(lines(widget)) == 800
@@ -0,0 +1,48 @@
+import pandas as pd
+import pytest
+from models.symbol_index import SymbolIndex, _within_one_edit
+
+@pytest.fixture
+def symbol_index():
+    return SymbolIndex(pd.DataFrame({
+        'symbol': ['SBIN-EQ', 'SBICARD-EQ', 'NIFTY27JUN2422000CE',
+                   'NIFTY27JUN2422000PE', 'BANKNIFTY26JUN2450000CE', 'M&M-EQ'],
+        'token': [3045, 17971, 40000, 40002, 41000, 2031],
+        'exch_seg': ['NSE', 'NSE', 'NFO', 'NFO', 'NFO', 'NSE'],
+        'name': ['SBIN', 'SBICARD', 'NIFTY', 'NIFTY', 'BANKNIFTY', 'M&M'],
+    }))
+
+def test_prefix_search(symbol_index):
+    """Test prefix search is case-insensitive and sorted."""
+    results = symbol_index.prefix('sbi')
+    assert [entry['symbol'] for entry in results] == ['SBICARD-EQ', 'SBIN-EQ']
+    assert results[1]['token'] == 3045
+    assert symbol_index.prefix('NIFTY27JUN2422000C')[0]['token'] == 40000
+
+def test_prefix_search_limit(symbol_index):
+    """Test prefix results are bounded by limit."""
+    assert len(symbol_index.prefix('NIFTY', limit=1)) == 1
+    assert symbol_index.prefix('') == []
+
+def test_fuzzy_search_tolerates_one_typo(symbol_index):
+    """Test names within one edit of the query are found."""
+    assert [entry['symbol'] for entry in symbol_index.fuzzy('SBNI')] == ['SBIN-EQ']
+    assert symbol_index.fuzzy('NIFTI')[0]['symbol'].startswith('NIFTY')
+    assert symbol_index.fuzzy('XYZ') == []
+
+def test_search_prefers_prefix_matches(symbol_index):
+    """Test search lists prefix matches before fuzzy ones."""
+    results = symbol_index.search('SBIN')
+    assert results[0]['symbol'] == 'SBIN-EQ'
+    assert len({entry['symbol'] for entry in results}) == len(results)
+
+@pytest.mark.parametrize('a, b, expected', [
+    ('SBIN', 'SBIN', True),
+    ('SBIN', 'SBN', True),
+    ('SBIN', 'SBNI', True),
+    ('SBIN', 'SPIN', True),
+    ('SBIN', 'SBINXX', False),
+    ('SBIN', 'NIBS', False),
+])
+def test_within_one_edit(a, b, expected):
+    assert _within_one_edit(a, b) is expected
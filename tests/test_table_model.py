@@ -0,0 +1,106 @@
+import os
+import numpy as np
+import pandas as pd
+import pytest
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt5 import QtCore, QtWidgets
+from PyQt5.QtCore import Qt
+from ui.table_model import TokenTableModel
+
+@pytest.fixture(scope='module')
+def app():
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+@pytest.fixture
+def master():
+    n = 100000
+    strikes = np.arange(n) % 500 * 5000 + 1500000
+    sides = np.where(np.arange(n) % 2, 'PE', 'CE')
+    return pd.DataFrame({
+        'token': np.arange(40000, 40000 + n),
+        'symbol': [f"NIFTY{s // 100}{side}" for s, side in zip(strikes, sides)],
+        'name': pd.Categorical(['NIFTY'] * (n - 1) + ['BANKNIFTY']),
+        'expiry': pd.to_datetime('2024-06-27') + pd.to_timedelta(np.arange(n) % 4 * 7, unit='D'),
+        'strike': strikes,
+        'lotsize': np.full(n, 25),
+        'instrumenttype': pd.Categorical(['OPTIDX'] * n),
+        'exch_seg': pd.Categorical(['NFO'] * n)
+    })
+
+@pytest.fixture
+def model(app, master):
+    model = TokenTableModel(page_size=100)
+    model.set_rows(master, np.arange(len(master)))
+    return model
+
+def cell(model, row, column):
+    return model.data(model.index(row, model.columns.index(column)))
+
+def test_pages_rows_lazily(model, master):
+    """Test only one page is exposed until more is fetched."""
+    assert model.rowCount() == 100
+    assert model.total_rows == len(master)
+    assert model.canFetchMore()
+
+    model.fetchMore()
+
+    assert model.rowCount() == 200
+
+def test_cells_read_from_master(model):
+    """Test cells are formatted from the master columns."""
+    assert cell(model, 1, 'token') == '40001'
+    assert cell(model, 1, 'symbol') == 'NIFTY15050PE'
+    assert cell(model, 1, 'strike') == '15050'
+    assert cell(model, 1, 'expiry') == '04JUL2024'
+    assert cell(model, 1, 'name') == 'NIFTY'
+    assert model.headerData(0, Qt.Horizontal) == 'token'
+
+def test_sort_reorders_positions(model, master):
+    """Test sorting orders every matching row, not just fetched ones."""
+    model.sort(model.columns.index('strike'), Qt.DescendingOrder)
+
+    strikes = master['strike'].to_numpy()[model.positions()]
+    assert (np.diff(strikes) <= 0).all()
+    assert cell(model, 0, 'strike') == '39950'
+    assert model.rowCount() == 100
+
+def test_sort_categorical(model):
+    """Test categorical columns sort by category value."""
+    model.sort(model.columns.index('name'), Qt.AscendingOrder)
+
+    assert cell(model, 0, 'name') == 'BANKNIFTY'
+
+def test_filter_masks_positions(model):
+    """Test filters are case-insensitive substring matches."""
+    model.set_filter('15000ce')
+
+    assert model.total_rows == 200
+    assert cell(model, 0, 'symbol') == 'NIFTY15000CE'
+
+    model.set_filter('bank', column='name')
+    assert model.total_rows == 1
+
+    model.set_filter('')
+    assert model.total_rows == 100000
+
+def test_filter_keeps_sort(model):
+    """Test filtering preserves the sort order."""
+    model.sort(model.columns.index('token'), Qt.DescendingOrder)
+    model.set_filter('CE')
+
+    tokens = [int(cell(model, row, 'token')) for row in range(3)]
+    assert tokens == sorted(tokens, reverse=True)
+
+def test_view_fetches_on_scroll(app, model):
+    """Test a QTableView pulls pages through fetchMore."""
+    view = QtWidgets.QTableView()
+    view.setModel(model)
+    view.resize(400, 300)
+    view.show()
+    app.processEvents()
+    view.scrollToBottom()
+    app.processEvents()
+
+    assert model.rowCount() > 100
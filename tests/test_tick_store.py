@@ -0,0 +1,96 @@
+import tracemalloc
+import numpy as np
+import pytest
+from models.synthetic_feed import SyntheticFeed
+from models.tick_store import TickStore, SmartWebSocketAdapter, TICK_DTYPE
+
+@pytest.fixture
+def store():
+    return TickStore(capacity=8)
+
+def test_last_price(store):
+    """Test last price and timestamp follow the latest tick."""
+    assert store.last_price(3045) is None
+    store.write(3045, 1000, 800.5, 10, 0)
+    store.write(3045, 1001, 801.0, 20, 0)
+    assert store.last_price(3045) == 801.0
+    assert store.last_timestamp(3045) == 1001
+
+def test_last_prices(store):
+    """Test vectorized last-price gather with unknown tokens."""
+    store.write(1, 1000, 10.0)
+    store.write(2, 1000, 20.0)
+    prices = store.last_prices([2, 99, 1])
+    assert prices[0] == 20.0 and prices[2] == 10.0
+    assert np.isnan(prices[1])
+
+def test_history_wraps(store):
+    """Test the ring keeps the most recent ticks in order."""
+    for i in range(11):
+        store.write(3045, 1000 + i, 100.0 + i, i, i)
+    history = store.history(3045)
+    assert history.dtype == TICK_DTYPE
+    assert list(history['ts']) == list(range(1003, 1011))
+    assert list(store.history(3045, 3)['ltp']) == [108.0, 109.0, 110.0]
+    assert len(store.history(42)) == 0
+
+def test_many_tokens_keep_prices():
+    """Test every token up to the limit keeps its price, and no more are taken."""
+    store = TickStore(capacity=4, max_tokens=200)
+    last_ltp = store._last_ltp
+    for token in range(200):
+        store.write(token, 1000, float(token))
+    assert store.last_price(0) == 0.0
+    assert store.last_price(199) == 199.0
+    np.testing.assert_array_equal(store.last_prices(range(200)), np.arange(200.0))
+    # A concurrent write must never land in a table being replaced
+    assert store._last_ltp is last_ltp
+
+    with pytest.raises(ValueError, match="full"):
+        store.write(200, 1000, 1.0)
+    with pytest.raises(ValueError, match="full"):
+        store.subscribe([201])
+    assert len(store.tokens) == 200
+
+def test_write_does_not_allocate():
+    """Test steady-state ingestion keeps no new memory per tick."""
+    store = TickStore(capacity=1024)
+    store.subscribe(range(10))
+    ticks = list(SyntheticFeed(range(10)).ticks(20000))
+    for tick in ticks[:1000]:
+        store.write(*tick)
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for tick in ticks[1000:]:
+        store.write(*tick)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    assert after - before < 4096
+
+def test_websocket_adapter(store):
+    """Test V2 messages are converted from paise and malformed ones dropped."""
+    adapter = SmartWebSocketAdapter(store)
+    adapter.on_data(None, {
+        'token': '3045',
+        'exchange_timestamp': 1718000000000,
+        'last_traded_price': 80050,
+        'volume_trade_for_the_day': 1500,
+        'open_interest': 0
+    })
+    adapter.on_data(None, {'token': '3045'})
+    assert store.last_price(3045) == 800.5
+    assert store.history(3045)['volume'][-1] == 1500
+    assert adapter.errors == 1
+
+def test_synthetic_feed_messages(store):
+    """Test synthetic messages round-trip through the adapter."""
+    feed = SyntheticFeed([101, 102], base_prices=[100.0, 2000.0], seed=1)
+    adapter = SmartWebSocketAdapter(store)
+    for message in feed.messages(500):
+        adapter.on_data(None, message)
+    assert store.ticks == 500
+    assert 90 < store.last_price(101) < 110
+    assert 1800 < store.last_price(102) < 2200
+    volumes = store.history(101)['volume']
+    assert np.all(np.diff(volumes) > 0)
@@ -0,0 +1,395 @@
+import json
+import threading
+import pytest
+from datetime import datetime, timedelta
+import numpy as np
+import pandas as pd
+import requests
+from unittest.mock import Mock, patch
+from models.token_data import TokenData, TokenDataError, _seconds_until
+
+SCRIP_MASTER = [
+    {'token': '3045', 'symbol': 'SBIN-EQ', 'name': 'SBIN', 'expiry': '',
+     'strike': '-1.000000', 'lotsize': '1', 'instrumenttype': '',
+     'exch_seg': 'NSE', 'tick_size': '5.000000'},
+    {'token': '35001', 'symbol': 'NIFTY25JUL24FUT', 'name': 'NIFTY',
+     'expiry': '25JUL2024', 'strike': '-1.000000', 'lotsize': '25',
+     'instrumenttype': 'FUTIDX', 'exch_seg': 'NFO', 'tick_size': '5.000000'},
+    {'token': '35000', 'symbol': 'NIFTY27JUN24FUT', 'name': 'NIFTY',
+     'expiry': '27JUN2024', 'strike': '-1.000000', 'lotsize': '25',
+     'instrumenttype': 'FUTIDX', 'exch_seg': 'NFO', 'tick_size': '5.000000'},
+    {'token': '40001', 'symbol': 'NIFTY04JUL2422000CE', 'name': 'NIFTY',
+     'expiry': '04JUL2024', 'strike': '2200000.000000', 'lotsize': '25',
+     'instrumenttype': 'OPTIDX', 'exch_seg': 'NFO', 'tick_size': '5.000000'},
+    {'token': '40000', 'symbol': 'NIFTY27JUN2422000CE', 'name': 'NIFTY',
+     'expiry': '27JUN2024', 'strike': '2200000.000000', 'lotsize': '25',
+     'instrumenttype': 'OPTIDX', 'exch_seg': 'NFO', 'tick_size': '5.000000'},
+    {'token': '40002', 'symbol': 'NIFTY27JUN2422000PE', 'name': 'NIFTY',
+     'expiry': '27JUN2024', 'strike': '2200000.000000', 'lotsize': '25',
+     'instrumenttype': 'OPTIDX', 'exch_seg': 'NFO', 'tick_size': '5.000000'},
+    {'token': '40003', 'symbol': 'NIFTY27JUN2422100CE', 'name': 'NIFTY',
+     'expiry': '27JUN2024', 'strike': '2210000.000000', 'lotsize': '25',
+     'instrumenttype': 'OPTIDX', 'exch_seg': 'NFO', 'tick_size': '5.000000'},
+    {'token': '40004', 'symbol': 'NIFTY27JUN2422100PE', 'name': 'NIFTY',
+     'expiry': '27JUN2024', 'strike': '2210000.000000', 'lotsize': '25',
+     'instrumenttype': 'OPTIDX', 'exch_seg': 'NFO', 'tick_size': '5.000000'},
+    {'token': '41000', 'symbol': 'BANKNIFTY26JUN2450000CE', 'name': 'BANKNIFTY',
+     'expiry': '26JUN2024', 'strike': '5000000.000000', 'lotsize': '15',
+     'instrumenttype': 'OPTIDX', 'exch_seg': 'NFO', 'tick_size': '5.000000'},
+    {'token': '50000', 'symbol': 'IDEA27JUN2472.35CE', 'name': 'IDEA',
+     'expiry': '27JUN2024', 'strike': '7235.000000', 'lotsize': '40000',
+     'instrumenttype': 'OPTSTK', 'exch_seg': 'NFO', 'tick_size': '5.000000'},
+]
+
+def make_response(status_code=200, headers=None):
+    payload = json.dumps(SCRIP_MASTER).encode()
+    response = Mock()
+    response.status_code = status_code
+    response.headers = headers or {}
+    response.iter_content.side_effect = lambda chunk_size: (
+        payload[i:i + 97] for i in range(0, len(payload), 97)
+    )
+    return response
+
+@pytest.fixture
+def mock_get():
+    with patch('utils.http.transport.get') as mock:
+        mock.return_value = make_response(headers={'ETag': '"v1"'})
+        yield mock
+
+@pytest.fixture
+def token_data(tmp_path, mock_get):
+    return TokenData(snapshot_dir=str(tmp_path / 'scrip_master'))
+
+def test_initial_load_fetches_from_api(token_data, mock_get):
+    """Test the first access downloads the scrip master."""
+    assert len(token_data.df) == len(SCRIP_MASTER)
+    assert mock_get.call_count == 1
+    info = token_data.snapshot_info
+    assert info['source'] == 'network'
+    assert info['etag'] == '"v1"'
+    assert info['age_seconds'] >= 0
+    assert info['ingest']['rows'] == len(SCRIP_MASTER)
+
+def test_snapshot_reused_across_instances(tmp_path, token_data, mock_get):
+    """Test a fresh instance loads the snapshot without a download."""
+    expected = token_data.df
+
+    other = TokenData(snapshot_dir=str(tmp_path / 'scrip_master'))
+    df = other.df
+
+    assert mock_get.call_count == 1
+    assert other.snapshot_info['source'] == 'snapshot'
+    assert other.snapshot_info['load_seconds'] is not None
+    assert df['symbol'].tolist() == expected['symbol'].tolist()
+    assert df['expiry'].tolist() == expected['expiry'].tolist()
+    assert df['strike'].tolist() == expected['strike'].tolist()
+
+def test_stale_snapshot_uses_conditional_get(tmp_path, token_data, mock_get):
+    """Test a stale snapshot is revalidated with ETag headers."""
+    token_data.df
+
+    other = TokenData(snapshot_dir=str(tmp_path / 'scrip_master'))
+    other._update_interval = pd.Timedelta(0)
+    mock_get.return_value = make_response(status_code=304)
+
+    assert len(other.df) == len(SCRIP_MASTER)
+    # Reading stale data started a background refresh; wait for that one
+    other._refresh_thread.join()
+    assert mock_get.call_count == 2
+    headers = mock_get.call_args.kwargs['headers']
+    assert headers['If-None-Match'] == '"v1"'
+    assert other.snapshot_info['source'] == 'snapshot'
+
+def test_fetch_failure_without_data_raises(token_data, mock_get):
+    """Test a failed first download raises TokenDataError."""
+    mock_get.return_value.raise_for_status.side_effect = (
+        requests.RequestException('down')
+    )
+
+    with pytest.raises(TokenDataError):
+        token_data._update_data()
+
+def test_failed_first_load_backs_off(token_data, mock_get):
+    """Test callers fail fast after a failed first load until the retry is due."""
+    mock_get.side_effect = requests.ConnectionError('down')
+    with pytest.raises(TokenDataError, match="Failed to fetch"):
+        token_data.df
+    with pytest.raises(TokenDataError, match="retrying after"):
+        token_data.df
+    assert mock_get.call_count == 1
+
+    mock_get.side_effect = None
+    token_data._next_attempt = datetime.now() - timedelta(seconds=1)
+    assert len(token_data.df) > 0
+    assert mock_get.call_count == 2
+
+def reference_token_info(df, symbol, exch_seg='NSE', instrumenttype='OPTIDX',
+                         strike_price=0, pe_ce=''):
+    """Original full-table filter semantics of get_token_info."""
+    if exch_seg == 'NSE':
+        return df[(df['exch_seg'] == 'NSE') & (df['name'] == symbol)]
+    if instrumenttype in ['FUTSTK', 'FUTIDX']:
+        return df[
+            (df['exch_seg'] == 'NFO') &
+            (df['instrumenttype'] == instrumenttype) &
+            (df['name'] == symbol)
+        ].sort_values(by=['expiry'], kind='stable')
+    return df[
+        (df['exch_seg'] == 'NFO') &
+        (df['instrumenttype'] == instrumenttype) &
+        (df['name'] == symbol) &
+        (df['strike'] == strike_price * 100) &
+        (df['symbol'].str.endswith(pe_ce))
+    ].sort_values(by=['expiry'], kind='stable')
+
+@pytest.mark.parametrize('args', [
+    ('SBIN', 'NSE', 'OPTIDX', 0, ''),
+    ('NIFTY', 'NSE', 'OPTIDX', 0, ''),
+    ('NIFTY', 'NFO', 'FUTIDX', 0, ''),
+    ('NIFTY', 'NFO', 'FUTSTK', 0, ''),
+    ('NIFTY', 'NFO', 'OPTIDX', 22000, 'CE'),
+    ('NIFTY', 'NFO', 'OPTIDX', 22000, 'PE'),
+    ('NIFTY', 'NFO', 'OPTIDX', 22000, ''),
+    ('NIFTY', 'NFO', 'OPTIDX', 22000.0, 'E'),
+    ('NIFTY', 'NFO', 'OPTIDX', 22100, 'CE'),
+    ('NIFTY', 'NFO', 'OPTIDX', 22050, 'CE'),
+    ('BANKNIFTY', 'NFO', 'OPTIDX', 50000, 'CE'),
+    ('BANKNIFTY', 'NFO', 'OPTSTK', 50000, 'CE'),
+    ('UNKNOWN', 'NFO', 'OPTIDX', 22000, 'CE'),
+])
+def test_get_token_info_matches_full_scan(token_data, args):
+    """Test indexed lookups match the original boolean-mask filter."""
+    result = token_data.get_token_info(*args)
+    expected = reference_token_info(token_data.df, *args)
+    pd.testing.assert_frame_equal(result, expected)
+
+def test_get_token_info_options_sorted_by_expiry(token_data):
+    """Test option lookups return contracts in expiry order."""
+    result = token_data.get_token_info('NIFTY', 'NFO', 'OPTIDX', 22000, 'CE')
+    assert result['token'].tolist() == [40000, 40001]
+
+def test_find_rows_all_strikes(token_data):
+    """Test a strike of None returns every strike without copying rows."""
+    df, positions = token_data.find_rows('NIFTY', 'NFO', 'OPTIDX', None, 'CE')
+    assert df is token_data.df
+    assert df['token'].to_numpy()[positions].tolist() == [40000, 40003, 40001]
+
+    _, positions = token_data.find_rows('NIFTY', 'NFO', 'OPTIDX', None)
+    assert len(positions) == 5
+
+def test_compact_schema(token_data):
+    """Test the scrip master uses compact column types."""
+    df = token_data.df
+    for column in ['exch_seg', 'instrumenttype', 'name']:
+        assert isinstance(df[column].dtype, pd.CategoricalDtype)
+    assert df['strike'].dtype == 'int64'
+    assert df['token'].dtype == 'int64'
+    assert df['lotsize'].dtype == 'int64'
+    assert pd.api.types.is_datetime64_dtype(df['expiry'])
+    assert df['expiry'].iloc[2] == pd.Timestamp('2024-06-27')
+    assert pd.isna(df['expiry'].iloc[0])
+
+def test_memory_report(token_data):
+    """Test memory_report lists bytes for every column."""
+    report = token_data.memory_report()
+    assert set(report) == set(token_data.df.columns) | {'total'}
+    assert report['total'] == sum(
+        size for column, size in report.items() if column != 'total'
+    )
+
+def test_get_token_info_invalid_segment(token_data):
+    """Test unsupported segments raise TokenDataError."""
+    with pytest.raises(TokenDataError):
+        token_data.get_token_info('NIFTY', 'BSE', 'OPTIDX', 0, '')
+
+def test_lookup_cache_counts_hits_and_misses(token_data):
+    """Test repeated lookups are served from the cache."""
+    token_data.get_token_info('NIFTY', 'NFO', 'FUTIDX')
+    token_data.get_token_info('NIFTY', 'NFO', 'FUTIDX')
+
+    stats = token_data.cache_stats()
+    assert stats['hits'] == 1
+    assert stats['misses'] == 1
+    assert stats['size'] == 1
+
+def test_lookup_cache_evicts_least_recently_used(tmp_path, mock_get):
+    """Test the cache is bounded with LRU eviction."""
+    token_data = TokenData(snapshot_dir=str(tmp_path / 'lru'), cache_size=2)
+    token_data.get_token_info('SBIN', 'NSE')
+    token_data.get_token_info('NIFTY', 'NFO', 'FUTIDX')
+    token_data.get_token_info('SBIN', 'NSE')
+    token_data.get_token_info('NIFTY', 'NFO', 'OPTIDX', 22000, 'CE')
+
+    stats = token_data.cache_stats()
+    assert stats['evictions'] == 1
+    assert stats['size'] == 2
+    token_data.get_token_info('SBIN', 'NSE')
+    assert token_data.cache_stats()['hits'] == 2
+
+def test_lookup_cache_invalidated_on_refresh(token_data):
+    """Test a new scrip master generation drops cached results."""
+    before = token_data.get_token_info('SBIN', 'NSE')
+    generation = token_data.cache_stats()['generation']
+
+    df = token_data.df.copy()
+    df['token'] = df['token'].replace({3045: 9999})
+    token_data._set_data(df)
+
+    after = token_data.get_token_info('SBIN', 'NSE')
+    assert before['token'].tolist() == [3045]
+    assert after['token'].tolist() == [9999]
+    assert token_data.cache_stats()['generation'] == generation + 1
+
+def test_cached_results_are_shared_read_only(token_data):
+    """Test cache hits share the cached arrays and callers can not corrupt them."""
+    result = token_data.get_token_info('NIFTY', 'NFO', 'FUTIDX')
+    again = token_data.get_token_info('NIFTY', 'NFO', 'FUTIDX')
+    assert np.shares_memory(result['lotsize'].to_numpy(), again['lotsize'].to_numpy())
+
+    try:
+        result.iloc[0, result.columns.get_loc('lotsize')] = -99
+    except ValueError:
+        pass  # Read-only arrays without copy-on-write
+    result['extra'] = 1
+
+    again = token_data.get_token_info('NIFTY', 'NFO', 'FUTIDX')
+    assert -99 not in again['lotsize'].tolist()
+    assert 'extra' not in again.columns
+
+def test_get_option_chain_aligns_sides(token_data):
+    """Test the chain aligns CE and PE contracts per strike."""
+    chain = token_data.get_option_chain('NIFTY', expiry='2024-06-27')
+
+    assert chain['strike'].tolist() == [22000.0, 22100.0]
+    assert chain['ce_token'].tolist() == [40000, 40003]
+    assert chain['pe_token'].tolist() == [40002, 40004]
+    assert chain['lotsize'].tolist() == [25, 25]
+    assert chain.attrs['expiry'] == pd.Timestamp('2024-06-27')
+
+def test_get_option_chain_marks_missing_side(token_data):
+    """Test strikes listed on one side only get -1 for the other."""
+    chain = token_data.get_option_chain('NIFTY', expiry='2024-07-04')
+
+    assert chain['ce_token'].tolist() == [40001]
+    assert chain['pe_token'].tolist() == [-1]
+    assert chain['pe_symbol'].tolist() == [None]
+
+def test_get_option_chain_atm_window(token_data):
+    """Test around_strike/width select strikes around the nearest strike."""
+    chain = token_data.get_option_chain(
+        'NIFTY', expiry='2024-06-27', around_strike=22090, width=0
+    )
+    assert chain['strike'].tolist() == [22100.0]
+
+    chain = token_data.get_option_chain(
+        'NIFTY', expiry='2024-06-27', around_strike=21000, width=1
+    )
+    assert chain['strike'].tolist() == [22000.0, 22100.0]
+
+def test_get_option_chain_defaults_to_next_expiry(token_data):
+    """Test the nearest upcoming expiry is used when none is given."""
+    df = token_data.df.copy()
+    df['expiry'] = df['expiry'] + pd.DateOffset(years=50)
+    token_data._set_data(df)
+
+    chain = token_data.get_option_chain('NIFTY')
+    assert chain.attrs['expiry'] == pd.Timestamp('2074-06-27')
+
+def test_get_option_chain_unknown_symbol(token_data):
+    """Test symbols without options raise TokenDataError."""
+    with pytest.raises(TokenDataError):
+        token_data.get_option_chain('SBIN')
+
+def test_stale_data_served_during_background_refresh(token_data, mock_get):
+    """Test readers keep the old generation until the refresh swaps in."""
+    old = token_data.df
+    release = threading.Event()
+    response = make_response()
+
+    def slow_get(*args, **kwargs):
+        release.wait(5)
+        return response
+
+    mock_get.side_effect = slow_get
+    token_data._update_interval = pd.Timedelta(0)
+
+    assert token_data.df is old
+    assert token_data.df is old
+    assert token_data.get_token_info('SBIN', 'NSE')['token'].tolist() == [3045]
+
+    token_data._update_interval = pd.Timedelta(hours=24)
+    release.set()
+    token_data.refresh(wait=True)
+
+    assert token_data.df is not old
+    assert mock_get.call_count == 2
+
+def test_failed_background_refresh_keeps_data(token_data, mock_get):
+    """Test a failed refresh keeps serving data and backs off."""
+    old = token_data.df
+    mock_get.side_effect = requests.ConnectionError('down')
+    token_data._update_interval = pd.Timedelta(0)
+
+    token_data.refresh(wait=True)
+
+    assert token_data.df is old
+    assert token_data._should_update() is False
+
+def test_seconds_until_next_refresh_time():
+    """Test the scheduler targets the next occurrence of HH:MM."""
+    now = datetime(2024, 6, 27, 8, 0)
+    assert _seconds_until('08:30', now) == 30 * 60
+    assert _seconds_until('07:30', now) == 23.5 * 3600
+
+def test_resolve_tokens_matches_per_call_lookup(token_data):
+    """Test bulk resolution returns the front contract of each key in order."""
+    keys = [
+        ('NIFTY', 'OPTIDX', 22100, 'PE'),
+        ('NIFTY', 'FUTIDX', 0, ''),
+        ('NIFTY', 'OPTIDX', 22000, 'CE'),
+        ('NIFTY', 'OPTIDX', 22000, ''),
+        ('BANKNIFTY', 'OPTIDX', 50000, 'CE'),
+    ]
+    result = token_data.resolve_tokens(keys)
+
+    assert result['found'].all()
+    for row, key in zip(result.itertuples(), keys):
+        symbol, instrumenttype, strike, pe_ce = key
+        expected = token_data.get_token_info(
+            symbol, 'NFO', instrumenttype, strike, pe_ce
+        ).iloc[0]
+        assert row.token == expected['token']
+        assert row.tradingsymbol == expected['symbol']
+        assert row.lotsize == expected['lotsize']
+        assert row.expiry == expected['expiry']
+
+def test_resolve_tokens_marks_misses(token_data):
+    """Test unknown keys are flagged instead of raising."""
+    result = token_data.resolve_tokens([
+        ('NIFTY', 'OPTIDX', 22050, 'CE'),
+        ('NIFTY', 'OPTIDX', 22000, 'CE'),
+        ('SBIN', 'EQ', 0, ''),
+    ])
+
+    assert result['found'].tolist() == [False, True, False]
+    assert result['token'].tolist() == [-1, 40000, -1]
+    assert pd.isna(result['tradingsymbol'].iloc[0])
+
+def test_fractional_strike(token_data):
+    """Test a strike in rupees and paise matches its whole-paise master strike."""
+    result = token_data.resolve_tokens([('IDEA', 'OPTSTK', 72.35, 'CE')])
+    assert result['token'].tolist() == [50000]
+    assert token_data.get_token_info('IDEA', 'NFO', 'OPTSTK', 72.35, 'CE')['token'].tolist() == [50000]
+
+def test_resolve_tokens_with_expiry(token_data):
+    """Test an expiry column selects that exact contract."""
+    keys = pd.DataFrame({
+        'symbol': ['NIFTY', 'NIFTY'],
+        'instrumenttype': ['OPTIDX', 'FUTIDX'],
+        'strike': [22000, 0],
+        'pe_ce': ['CE', ''],
+        'expiry': ['2024-07-04', '2024-07-25'],
+    })
+    result = token_data.resolve_tokens(keys)
+    assert result['token'].tolist() == [40001, 35001]
@@ -0,0 +1,171 @@
+import os
+import threading
+import time
+import pytest
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt5 import QtCore, QtWidgets
+from config import Config
+from ui.components import LoadingOverlay
+from ui.workers import Worker, TaskRunner, StallMonitor
+
+@pytest.fixture(scope='module')
+def app():
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+@pytest.fixture
+def runner(app):
+    pool = QtCore.QThreadPool()
+    pool.setMaxThreadCount(2)
+    window = QtWidgets.QWidget()
+    overlay = LoadingOverlay(window)
+    runner = TaskRunner(overlay, pool)
+    yield runner
+    runner.cancel_all()
+    pool.waitForDone()
+
+def wait_until(app, condition, timeout=5.0):
+    """Process events until condition holds."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "Timed out waiting for condition"
+        app.processEvents()
+        time.sleep(0.001)
+
+def test_result_delivered_on_gui_thread(app, runner):
+    """Test results arrive through signals on the GUI thread."""
+    results = []
+    gui_thread = threading.get_ident()
+
+    runner.run(
+        lambda x: (x * 2, threading.get_ident()),
+        21,
+        on_result=results.append
+    )
+    wait_until(app, lambda: runner.active == 0)
+
+    value, worker_thread = results[0]
+    assert value == 42
+    assert worker_thread != gui_thread
+
+def test_error_delivered(app, runner):
+    """Test exceptions are delivered to the error callback."""
+    errors = []
+
+    def fail():
+        raise ValueError("boom")
+
+    runner.run(fail, on_error=errors.append)
+    wait_until(app, lambda: runner.active == 0)
+
+    assert isinstance(errors[0], ValueError)
+
+def test_overlay_shown_while_running(app, runner):
+    """Test overlay stays visible until every task finishes."""
+    release = threading.Event()
+
+    runner.run(release.wait, message="Working...")
+    runner.run(release.wait)
+
+    assert runner.overlay.isVisibleTo(runner.overlay.parentWidget())
+    assert runner.overlay.message.text() == "Working..."
+    assert runner.active == 2
+
+    release.set()
+    wait_until(app, lambda: runner.active == 0)
+    assert runner.overlay.isHidden()
+
+def test_cancel_drops_result(app, runner):
+    """Test a cancelled task's result is not delivered."""
+    started = threading.Event()
+    release = threading.Event()
+    results = []
+
+    def task():
+        started.set()
+        release.wait()
+        return 'done'
+
+    runner.run(task, on_result=results.append)
+    started.wait(1)
+    assert runner.cancel_all() == 1
+    release.set()
+    wait_until(app, lambda: runner.active == 0)
+
+    assert results == []
+
+def test_cancel_queued_task(app):
+    """Test a task cancelled while queued finishes without running."""
+    pool = QtCore.QThreadPool()
+    pool.setMaxThreadCount(1)
+    runner = TaskRunner(pool=pool)
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def block():
+        started.set()
+        release.wait(5)
+
+    running = runner.run(block)
+    queued = runner.run(calls.append, 1)
+    started.wait(1)
+    assert runner.cancel_all() == 2
+    release.set()
+    wait_until(app, lambda: runner.active == 0)
+    pool.waitForDone()
+
+    assert calls == []
+    assert running.started
+    assert not queued.started
+
+def test_cancel_before_start(app):
+    """Test a worker cancelled before it runs never calls its function."""
+    calls = []
+    worker = Worker(calls.append, 1)
+    worker.cancel()
+    worker.run()
+
+    assert calls == []
+
+def test_cooperative_cancel(app, runner):
+    """Test tasks can poll for cancellation."""
+    started = threading.Event()
+    stopped = threading.Event()
+
+    def task(is_cancelled):
+        started.set()
+        while not is_cancelled():
+            time.sleep(0.001)
+        stopped.set()
+
+    runner.run(task, pass_cancel=True)
+    started.wait(1)
+    runner.cancel_all()
+
+    assert stopped.wait(1)
+    wait_until(app, lambda: runner.active == 0)
+
+def test_stall_monitor_logs_stall(app):
+    """Test a blocked GUI thread is measured as a stall."""
+    monitor = StallMonitor(threshold_ms=16, interval_ms=1)
+    stalls = []
+    monitor.stalled.connect(stalls.append)
+    monitor.start()
+
+    wait_until(app, lambda: monitor._last is not None)
+    app.processEvents()
+    time.sleep(0.05)
+    wait_until(app, lambda: stalls)
+    monitor.stop()
+
+    assert monitor.stats()['stalls'] >= 1
+    assert monitor.stats()['max_stall_ms'] >= 30
+
+def test_stall_monitor_uses_coarse_heartbeat(app):
+    """Test the heartbeat defaults to a coarse timer at the configured interval."""
+    monitor = StallMonitor()
+
+    assert monitor._timer.interval() == Config.STALL_INTERVAL_MS
+    assert monitor._timer.timerType() == QtCore.Qt.CoarseTimer
@@ -1,7 +1,8 @@
 from PyQt5 import QtWidgets, QtCore, QtGui
 from PyQt5.QtCore import Qt
-from typing import Optional, Callable
+from typing import Optional, Callable, Dict, List, Any
 import re
+from ui.workers import TaskRunner, Worker
 
 class ValidatedLineEdit(QtWidgets.QLineEdit):
     """Line edit with validation."""
@@ -76,17 +77,99 @@ class NumericLineEdit(ValidatedLineEdit):
         super().__init__(placeholder, validator, parent)
 
 class SymbolLineEdit(ValidatedLineEdit):
-    """Line edit for trading symbols."""
+    """
+    Line edit for trading symbols with search-as-you-type completion.
+    
+    The search runs on a worker thread once typing pauses for
+    ``debounce_ms``, so a slow search (e.g. over HTTP to a served engine)
+    never blocks the GUI thread. Results for text that has since changed
+    are dropped.
+    """
+    
+    # Emitted with (symbol, token, exch_seg) when a known symbol is picked
+    symbolSelected = QtCore.pyqtSignal(str, int, str)
     
     def __init__(
         self,
         placeholder: str = "Enter Symbol",
+        search: Optional[Callable[[str, int], List[Dict[str, Any]]]] = None,
+        max_results: int = 15,
+        debounce_ms: int = 150,
+        pool: Optional[QtCore.QThreadPool] = None,
         parent: Optional[QtWidgets.QWidget] = None
     ):
         def validator(text: str) -> bool:
-            return bool(re.match(r'^[A-Z0-9]+$', text)) if text else True
+            return bool(re.match(r'^[A-Z0-9&_\-]+$', text)) if text else True
         
         super().__init__(placeholder, validator, parent)
+        self._search = search
+        self._max_results = max_results
+        self._matches: Dict[str, Dict[str, Any]] = {}
+        self._pending: Optional[Worker] = None
+        self._generation = 0
+        
+        if search is not None:
+            if pool is None:
+                # Own threads, so searches never queue behind orders or PnL
+                pool = QtCore.QThreadPool(self)
+                pool.setMaxThreadCount(2)
+            self.tasks = TaskRunner(pool=pool, parent=self)
+            self._debounce = QtCore.QTimer(self)
+            self._debounce.setSingleShot(True)
+            self._debounce.setInterval(debounce_ms)
+            self._debounce.timeout.connect(lambda: self._update_completions(self.text()))
+            self._model = QtCore.QStringListModel(self)
+            completer = QtWidgets.QCompleter(self._model, self)
+            # Results are already ranked by the search index
+            completer.setCompletionMode(QtWidgets.QCompleter.UnfilteredPopupCompletion)
+            completer.activated[str].connect(self._on_completion)
+            self.setCompleter(completer)
+            self.textEdited.connect(self._on_text_edited)
+            self.editingFinished.connect(lambda: self._on_completion(self.text()))
+    
+    def _on_text_edited(self, text: str):
+        """Invalidate in-flight results and search once typing pauses."""
+        self._generation += 1
+        self._debounce.start()
+    
+    def _update_completions(self, text: str):
+        """Search for the current text in the background."""
+        if self._pending is not None:
+            # Its result is dropped even if it is already running
+            self._pending.cancel()
+            self._pending = None
+        generation = self._generation
+        if not text:
+            self._show_completions(generation, [])
+            return
+        self._pending = self.tasks.run(
+            self._search,
+            text,
+            self._max_results,
+            on_result=lambda results: self._show_completions(generation, results),
+            on_error=lambda e: self._show_completions(generation, [])
+        )
+    
+    def _show_completions(self, generation: int, results: List[Dict[str, Any]]):
+        """Show search results unless the text has been edited since."""
+        if generation != self._generation:
+            return
+        self._pending = None
+        self._matches = {}
+        for entry in results:
+            self._matches.setdefault(entry['symbol'], entry)
+        self._model.setStringList(list(self._matches))
+        if not self.hasFocus():
+            # Editing finished before the results arrived
+            self._on_completion(self.text())
+        elif self._matches:
+            self.completer().complete()
+    
+    def _on_completion(self, text: str):
+        """Emit the token and exchange of a picked symbol."""
+        entry = self._matches.get(text)
+        if entry is not None:
+            self.symbolSelected.emit(entry['symbol'], entry['token'], entry['exch_seg'])
 
 class LoadingOverlay(QtWidgets.QWidget):
     """Loading overlay with spinner."""
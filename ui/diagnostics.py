@@ -0,0 +1,74 @@
+from PyQt5 import QtWidgets, QtGui
+from typing import Optional
+from utils.profiling import Profiler, EventLoopWatchdog, dump, profiler as default_profiler
+
+class DiagnosticsDialog(QtWidgets.QDialog):
+    """
+    Hidden diagnostics panel (Ctrl+Shift+D in the main window).
+    
+    Shows per-call latency histograms and recent event-loop stalls with
+    the stack that was blocking, and can dump both to a JSON file.
+    """
+    
+    def __init__(
+        self,
+        profiler: Optional[Profiler] = None,
+        watchdog: Optional[EventLoopWatchdog] = None,
+        parent: Optional[QtWidgets.QWidget] = None
+    ):
+        super().__init__(parent)
+        self.profiler = profiler or default_profiler
+        self.watchdog = watchdog
+        self.setWindowTitle("Diagnostics")
+        self.resize(900, 600)
+        
+        layout = QtWidgets.QVBoxLayout(self)
+        
+        self.text = QtWidgets.QPlainTextEdit()
+        self.text.setReadOnly(True)
+        self.text.setLineWrapMode(QtWidgets.QPlainTextEdit.NoWrap)
+        self.text.setFont(QtGui.QFontDatabase.systemFont(QtGui.QFontDatabase.FixedFont))
+        layout.addWidget(self.text)
+        
+        self.path_label = QtWidgets.QLabel()
+        layout.addWidget(self.path_label)
+        
+        # Buttons
+        button_layout = QtWidgets.QHBoxLayout()
+        self.refresh_button = QtWidgets.QPushButton("Refresh")
+        self.dump_button = QtWidgets.QPushButton("Dump to File")
+        self.reset_button = QtWidgets.QPushButton("Reset")
+        self.refresh_button.clicked.connect(self.refresh)
+        self.dump_button.clicked.connect(self._on_dump)
+        self.reset_button.clicked.connect(self._on_reset)
+        button_layout.addWidget(self.refresh_button)
+        button_layout.addWidget(self.dump_button)
+        button_layout.addWidget(self.reset_button)
+        layout.addLayout(button_layout)
+        
+        self.refresh()
+    
+    def report(self) -> str:
+        """Format latency histograms and stall events."""
+        sections = ["Latency (ms)", self.profiler.format_report()]
+        stalls = self.watchdog.stalls() if self.watchdog is not None else []
+        sections.append(f"\nEvent loop stalls ({len(stalls)})")
+        for stall in reversed(stalls):
+            duration = stall['duration_ms']
+            length = f"{duration:.0f} ms" if duration is not None else "ongoing"
+            sections.append(f"\n{stall['at']}  {length}  in {stall['where']}\n{stall['stack']}")
+        return '\n'.join(sections)
+    
+    def refresh(self):
+        """Reload the report."""
+        self.text.setPlainText(self.report())
+    
+    def _on_dump(self):
+        """Write diagnostics to a file."""
+        path = dump(watchdog=self.watchdog, source=self.profiler)
+        self.path_label.setText(f"Saved to {path}")
+    
+    def _on_reset(self):
+        """Clear the latency histograms."""
+        self.profiler.reset()
+        self.refresh()
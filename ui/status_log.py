@@ -0,0 +1,131 @@
+from PyQt5 import QtWidgets, QtCore, QtGui
+from collections import deque
+from typing import Optional, Dict, List
+import threading
+from config import Config
+
+class StatusSink(QtCore.QObject):
+    """
+    Batched, bounded writer for a status text widget.
+    
+    Messages may be posted from any thread. They are buffered and written
+    to the widget in one edit per timer tick, so a burst costs one layout
+    pass instead of one per message. Consecutive repeats within a batch
+    are collapsed into a single line with a count, the buffer drops its
+    oldest messages when full, and the widget keeps at most ``max_lines``
+    lines, discarding the oldest.
+    """
+    
+    def __init__(
+        self,
+        widget: QtWidgets.QTextEdit,
+        interval_ms: Optional[int] = None,
+        max_lines: Optional[int] = None,
+        max_pending: Optional[int] = None,
+        parent: Optional[QtCore.QObject] = None
+    ):
+        """
+        Initialize status sink.
+        
+        Args:
+            widget: Text widget to write to (QTextBrowser or QTextEdit)
+            interval_ms: Flush interval (defaults to Config.STATUS_FLUSH_MS)
+            max_lines: Lines kept in the widget (defaults to Config.STATUS_MAX_LINES)
+            max_pending: Messages buffered between flushes (defaults to
+                Config.STATUS_MAX_PENDING)
+            parent: Parent object
+        """
+        super().__init__(parent)
+        self.widget = widget
+        self.max_lines = max_lines or Config.STATUS_MAX_LINES
+        self.max_pending = max_pending or Config.STATUS_MAX_PENDING
+        widget.document().setMaximumBlockCount(self.max_lines)
+        
+        self._lock = threading.Lock()
+        # Pending entries are [message, repeat count]
+        self._pending: deque = deque()
+        self.posted = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.flushes = 0
+        self._reported_dropped = 0
+        
+        self._timer = QtCore.QTimer(self)
+        self._timer.setInterval(interval_ms or Config.STATUS_FLUSH_MS)
+        self._timer.timeout.connect(self.flush)
+        self._timer.start()
+    
+    def post(self, message: str) -> None:
+        """
+        Queue a message for the next flush.
+        
+        Args:
+            message: Status line
+        """
+        with self._lock:
+            self.posted += 1
+            pending = self._pending
+            if pending and pending[-1][0] == message:
+                pending[-1][1] += 1
+                self.coalesced += 1
+                return
+            if len(pending) >= self.max_pending:
+                _, count = pending.popleft()
+                self.dropped += count
+            pending.append([message, 1])
+    
+    def flush(self) -> int:
+        """
+        Write buffered messages to the widget.
+        
+        Returns:
+            int: Lines written
+        """
+        with self._lock:
+            if not self._pending:
+                return 0
+            entries = list(self._pending)
+            self._pending.clear()
+            dropped = self.dropped - self._reported_dropped
+            self._reported_dropped = self.dropped
+        
+        lines: List[str] = []
+        if dropped:
+            lines.append(f"... {dropped} earlier status messages dropped")
+        for message, count in entries:
+            lines.append(message if count == 1 else f"{message} (x{count})")
+        
+        scrollbar = self.widget.verticalScrollBar()
+        at_bottom = scrollbar.value() >= scrollbar.maximum()
+        document = self.widget.document()
+        cursor = QtGui.QTextCursor(document)
+        cursor.movePosition(QtGui.QTextCursor.End)
+        text = '\n'.join(lines)
+        cursor.insertText(text if document.isEmpty() else '\n' + text)
+        if at_bottom:
+            scrollbar.setValue(scrollbar.maximum())
+        
+        self.flushes += 1
+        return len(lines)
+    
+    def stop(self) -> None:
+        """Stop the flush timer after writing what is buffered."""
+        self._timer.stop()
+        self.flush()
+    
+    def stats(self) -> Dict[str, int]:
+        """
+        Get sink counters.
+        
+        Returns:
+            Dict[str, int]: posted, coalesced (repeats folded into a count),
+            dropped (buffer overflow), flushes and pending messages
+        """
+        with self._lock:
+            return {
+                'posted': self.posted,
+                'coalesced': self.coalesced,
+                'dropped': self.dropped,
+                'flushes': self.flushes,
+                'pending': sum(count for _, count in self._pending)
+            }
@@ -0,0 +1,236 @@
+from PyQt5 import QtCore
+from PyQt5.QtCore import Qt
+from typing import Optional, Dict, Sequence, Any
+import numpy as np
+import pandas as pd
+
+class _ColumnReader:
+    """Reads one scrip master column at row positions without copying it."""
+    
+    def __init__(self, series: pd.Series):
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            # Cells are looked up through the small category array
+            self.codes = series.cat.codes.to_numpy()
+            self.categories = series.cat.categories.to_numpy(dtype=object)
+            self.values = None
+        else:
+            self.codes = None
+            self.categories = None
+            self.values = series.to_numpy()
+    
+    def value(self, position: int) -> Any:
+        """Get the raw value at a row position."""
+        if self.codes is None:
+            return self.values[position]
+        code = self.codes[position]
+        return self.categories[code] if code >= 0 else None
+    
+    def sort_keys(self, positions: np.ndarray) -> np.ndarray:
+        """Get sortable keys for row positions."""
+        if self.codes is None:
+            return self.values[positions]
+        rank = np.empty(len(self.categories) + 1, dtype=np.int64)
+        # Missing values (code -1) take the last slot and sort first
+        rank[-1] = -1
+        rank[:-1] = np.argsort(np.argsort(self.categories.astype(str), kind='stable'))
+        return rank[self.codes[positions]]
+    
+    def contains(self, positions: np.ndarray, text: str) -> np.ndarray:
+        """Case-insensitive substring match of row positions."""
+        if self.codes is None:
+            values = pd.Series(self.values[positions]).astype(str)
+            return values.str.contains(text, case=False, regex=False).to_numpy(dtype=bool)
+        matches = np.append(
+            pd.Series(self.categories).astype(str)
+            .str.contains(text, case=False, regex=False).to_numpy(dtype=bool),
+            False
+        )
+        return matches[self.codes[positions]]
+
+def _format_strike(value: Any) -> str:
+    """Strikes are stored in paise; -1 marks instruments without one."""
+    return f"{value / 100:g}" if value >= 0 else ''
+
+def _format_expiry(value: Any) -> str:
+    """Show expiries like the master does (DDMONYYYY)."""
+    if pd.isna(value):
+        return ''
+    return pd.Timestamp(value).strftime('%d%b%Y').upper()
+
+class TokenTableModel(QtCore.QAbstractTableModel):
+    """
+    Virtualized table over scrip master rows.
+    
+    The model holds the master frame and an array of row positions; cells
+    are read from the master's columns on demand, so no per-cell objects
+    are created and memory is one integer per matching row. Rows are
+    exposed in pages through ``canFetchMore``/``fetchMore`` as the view
+    scrolls. Sorting and filtering reorder or mask the position array.
+    """
+    
+    PAGE_SIZE = 256
+    COLUMNS = ('token', 'symbol', 'name', 'expiry', 'strike', 'lotsize', 'instrumenttype', 'exch_seg')
+    FORMATTERS = {'strike': _format_strike, 'expiry': _format_expiry}
+    
+    def __init__(
+        self,
+        columns: Optional[Sequence[str]] = None,
+        page_size: Optional[int] = None,
+        parent: Optional[QtCore.QObject] = None
+    ):
+        """
+        Initialize table model.
+        
+        Args:
+            columns: Master columns to show
+            page_size: Rows added per fetchMore
+            parent: Parent object
+        """
+        super().__init__(parent)
+        self.columns = tuple(columns or self.COLUMNS)
+        self.page_size = page_size or self.PAGE_SIZE
+        self._df: Optional[pd.DataFrame] = None
+        self._readers: Dict[str, _ColumnReader] = {}
+        self._positions = np.empty(0, dtype=np.intp)
+        self._view = self._positions
+        self._loaded = 0
+        self._sort_column: Optional[int] = None
+        self._sort_order = Qt.AscendingOrder
+        self._filter_text = ''
+        self._filter_column = 'symbol'
+    
+    def set_rows(self, df: pd.DataFrame, positions: np.ndarray) -> None:
+        """
+        Show rows of a scrip master frame.
+        
+        Args:
+            df: Scrip master, e.g. from TokenData.find_rows
+            positions: Row positions to show
+        """
+        self.beginResetModel()
+        if df is not self._df:
+            # Column arrays are taken once per master generation
+            self._df = df
+            self._readers = {
+                column: _ColumnReader(df[column])
+                for column in self.columns if column in df.columns
+            }
+        self._positions = np.asarray(positions, dtype=np.intp)
+        self._apply()
+        self.endResetModel()
+    
+    def clear(self) -> None:
+        """Remove all rows."""
+        self.beginResetModel()
+        self._df = None
+        self._readers = {}
+        self._positions = np.empty(0, dtype=np.intp)
+        self._view = self._positions
+        self._loaded = 0
+        self.endResetModel()
+    
+    @property
+    def total_rows(self) -> int:
+        """Rows matching the current filter, fetched or not."""
+        return len(self._view)
+    
+    def positions(self) -> np.ndarray:
+        """
+        Get the master positions in display order.
+        
+        Returns:
+            np.ndarray: Row positions after filtering and sorting
+        """
+        return self._view
+    
+    def _apply(self) -> None:
+        """Rebuild the view from the positions, filter and sort order."""
+        view = self._positions
+        reader = self._readers.get(self._filter_column)
+        if self._filter_text and reader is not None and len(view):
+            view = view[reader.contains(view, self._filter_text)]
+        
+        if self._sort_column is not None and len(view):
+            reader = self._readers.get(self.columns[self._sort_column])
+            if reader is not None:
+                order = np.argsort(reader.sort_keys(view), kind='stable')
+                if self._sort_order == Qt.DescendingOrder:
+                    order = order[::-1]
+                view = view[order]
+        
+        self._view = view
+        self._loaded = min(len(view), self.page_size)
+    
+    def set_filter(self, text: str, column: Optional[str] = None) -> None:
+        """
+        Show only rows whose column contains text (case-insensitive).
+        
+        Args:
+            text: Substring to match; empty shows every row
+            column: Column to match (defaults to the previous one, symbol)
+        """
+        self.beginResetModel()
+        self._filter_text = text
+        if column is not None:
+            self._filter_column = column
+        self._apply()
+        self.endResetModel()
+    
+    def rowCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:
+        return 0 if parent.isValid() else self._loaded
+    
+    def columnCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.columns)
+    
+    def canFetchMore(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> bool:
+        return not parent.isValid() and self._loaded < len(self._view)
+    
+    def fetchMore(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> None:
+        if parent.isValid():
+            return
+        count = min(self.page_size, len(self._view) - self._loaded)
+        if count <= 0:
+            return
+        self.beginInsertRows(QtCore.QModelIndex(), self._loaded, self._loaded + count - 1)
+        self._loaded += count
+        self.endInsertRows()
+    
+    def data(self, index: QtCore.QModelIndex, role: int = Qt.DisplayRole) -> Any:
+        if not index.isValid() or role != Qt.DisplayRole or index.row() >= self._loaded:
+            return None
+        column = self.columns[index.column()]
+        reader = self._readers.get(column)
+        if reader is None:
+            return None
+        value = reader.value(self._view[index.row()])
+        if value is None:
+            return ''
+        formatter = self.FORMATTERS.get(column)
+        return formatter(value) if formatter else str(value)
+    
+    def headerData(self, section: int, orientation: int, role: int = Qt.DisplayRole) -> Any:
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return self.columns[section]
+        return str(section + 1)
+    
+    def sort(self, column: int, order: int = Qt.AscendingOrder) -> None:
+        """
+        Sort the matching rows by a column.
+        
+        Args:
+            column: Column number; -1 restores the lookup order
+            order: Qt.AscendingOrder or Qt.DescendingOrder
+        """
+        self.layoutAboutToBeChanged.emit()
+        self._sort_column = column if 0 <= column < len(self.columns) else None
+        self._sort_order = order
+        loaded = self._loaded
+        self._apply()
+        # Same rows, new order: keep what the view has already fetched
+        self._loaded = loaded
+        persistent = self.persistentIndexList()
+        if persistent:
+            self.changePersistentIndexList(persistent, [QtCore.QModelIndex()] * len(persistent))
+        self.layoutChanged.emit()
@@ -0,0 +1,282 @@
+from PyQt5 import QtWidgets, QtCore
+from typing import Optional, Callable, List, Any
+import threading
+import time
+from config import Config
+from utils.logger import app_logger
+from utils.profiling import EventLoopWatchdog
+
+class WorkerSignals(QtCore.QObject):
+    """Signals delivering a worker's outcome to the GUI thread."""
+    
+    result = QtCore.pyqtSignal(object)
+    error = QtCore.pyqtSignal(object)
+    finished = QtCore.pyqtSignal()
+
+class Worker(QtCore.QRunnable):
+    """
+    Runs a callable on a QThreadPool thread.
+    
+    Cancellation is cooperative: a worker cancelled before it starts never
+    runs, and a running worker's result or error is dropped. Callables
+    that accept an ``is_cancelled`` keyword can also stop early. Once
+    cancelled, ``started`` tells whether the callable was already called.
+    """
+    
+    def __init__(
+        self,
+        fn: Callable[..., Any],
+        *args: Any,
+        pass_cancel: bool = False,
+        **kwargs: Any
+    ):
+        """
+        Initialize worker.
+        
+        Args:
+            fn: Callable to run in the background
+            *args: Positional arguments for fn
+            pass_cancel: Pass an ``is_cancelled`` callable to fn
+            **kwargs: Keyword arguments for fn
+        """
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = WorkerSignals()
+        self._cancelled = threading.Event()
+        # Makes the start check and cancel atomic, so started is final once cancelled
+        self._lock = threading.Lock()
+        self._started = False
+        if pass_cancel:
+            self.kwargs['is_cancelled'] = self._cancelled.is_set
+    
+    def cancel(self) -> None:
+        """Request cancellation."""
+        with self._lock:
+            self._cancelled.set()
+    
+    @property
+    def is_cancelled(self) -> bool:
+        return self._cancelled.is_set()
+    
+    @property
+    def started(self) -> bool:
+        """Whether the callable has been called."""
+        return self._started
+    
+    def run(self) -> None:
+        """Run the callable and emit its outcome unless cancelled."""
+        try:
+            with self._lock:
+                if self.is_cancelled:
+                    return
+                self._started = True
+            try:
+                result = self.fn(*self.args, **self.kwargs)
+            except Exception as e:
+                if not self.is_cancelled:
+                    self.signals.error.emit(e)
+            else:
+                if not self.is_cancelled:
+                    self.signals.result.emit(result)
+        finally:
+            self.signals.finished.emit()
+
+class TaskRunner(QtCore.QObject):
+    """
+    Starts background tasks and shows a loading overlay while any run.
+    
+    Callbacks are connected to the worker's signals from the GUI thread,
+    so they always run on the GUI thread.
+    """
+    
+    activeChanged = QtCore.pyqtSignal(int)
+    
+    def __init__(
+        self,
+        overlay: Optional[QtWidgets.QWidget] = None,
+        pool: Optional[QtCore.QThreadPool] = None,
+        parent: Optional[QtCore.QObject] = None
+    ):
+        """
+        Initialize task runner.
+        
+        Args:
+            overlay: Widget shown while tasks are running
+            pool: Thread pool (defaults to the global instance)
+            parent: Parent object
+        """
+        super().__init__(parent)
+        self.overlay = overlay
+        self.pool = pool or QtCore.QThreadPool.globalInstance()
+        self._workers: List[Worker] = []
+    
+    @property
+    def active(self) -> int:
+        """Number of tasks not yet finished."""
+        return len(self._workers)
+    
+    def run(
+        self,
+        fn: Callable[..., Any],
+        *args: Any,
+        on_result: Optional[Callable[[Any], None]] = None,
+        on_error: Optional[Callable[[Exception], None]] = None,
+        message: Optional[str] = None,
+        pass_cancel: bool = False,
+        **kwargs: Any
+    ) -> Worker:
+        """
+        Run a callable in the background.
+        
+        Args:
+            fn: Callable to run
+            *args: Positional arguments for fn
+            on_result: Called with the return value on the GUI thread
+            on_error: Called with the raised exception on the GUI thread
+            message: Overlay text while the task runs
+            pass_cancel: Pass an ``is_cancelled`` callable to fn
+            **kwargs: Keyword arguments for fn
+        
+        Returns:
+            Worker: The started worker, for cancellation
+        """
+        worker = Worker(fn, *args, pass_cancel=pass_cancel, **kwargs)
+        if on_result is not None:
+            worker.signals.result.connect(on_result)
+        if on_error is not None:
+            worker.signals.error.connect(on_error)
+        worker.signals.finished.connect(lambda: self._on_finished(worker))
+        
+        self._workers.append(worker)
+        if self.overlay is not None:
+            if message:
+                self.overlay.message.setText(message)
+            self.overlay.show()
+            self.overlay.raise_()
+        self.activeChanged.emit(self.active)
+        self.pool.start(worker)
+        return worker
+    
+    def _on_finished(self, worker: Worker) -> None:
+        """Forget a finished worker and hide the overlay when idle."""
+        if worker in self._workers:
+            self._workers.remove(worker)
+        if not self._workers and self.overlay is not None:
+            self.overlay.hide()
+        self.activeChanged.emit(self.active)
+    
+    def cancel_all(self) -> int:
+        """
+        Cancel every running task.
+        
+        Returns:
+            int: Number of tasks cancelled
+        """
+        workers = list(self._workers)
+        for worker in workers:
+            # Queued workers see the flag when the pool starts them and
+            # finish without running; the pool owns and deletes them, so
+            # they are never taken back out of it
+            worker.cancel()
+        return len(workers)
+    
+    def wait(self, msecs: int = -1) -> bool:
+        """
+        Wait for the pool to finish (mainly for shutdown and tests).
+        
+        Args:
+            msecs: Timeout in milliseconds, -1 to wait forever
+        
+        Returns:
+            bool: True if all tasks finished
+        """
+        return self.pool.waitForDone(msecs)
+
+class StallMonitor(QtCore.QObject):
+    """
+    Measures how long the GUI thread fails to service its event loop.
+    
+    A coarse heartbeat timer runs on the GUI thread; any gap between beats
+    longer than the interval plus ``threshold_ms`` means the thread was
+    busy for that long, and is counted as a stall. Each beat also feeds an
+    optional ``EventLoopWatchdog``, which captures the stack of longer
+    stalls while they are still happening and logs them itself.
+    """
+    
+    stalled = QtCore.pyqtSignal(float)
+    
+    def __init__(
+        self,
+        threshold_ms: float = 16.0,
+        interval_ms: Optional[int] = None,
+        watchdog: Optional[EventLoopWatchdog] = None,
+        parent: Optional[QtCore.QObject] = None
+    ):
+        """
+        Initialize stall monitor.
+        
+        Args:
+            threshold_ms: Stalls longer than this are logged (one 60 Hz frame)
+            interval_ms: Heartbeat interval (defaults to
+                Config.STALL_INTERVAL_MS)
+            watchdog: Watchdog to feed with heartbeats
+            parent: Parent object
+        """
+        super().__init__(parent)
+        self.threshold_ms = threshold_ms
+        self.interval_ms = interval_ms or Config.STALL_INTERVAL_MS
+        self.watchdog = watchdog
+        self.stalls = 0
+        self.max_stall_ms = 0.0
+        self.total_stall_ms = 0.0
+        self._last: Optional[float] = None
+        self._timer = QtCore.QTimer(self)
+        self._timer.setTimerType(QtCore.Qt.CoarseTimer)
+        self._timer.setInterval(self.interval_ms)
+        self._timer.timeout.connect(self._beat)
+    
+    def start(self) -> None:
+        """Start monitoring."""
+        self._last = time.perf_counter()
+        self._timer.start()
+        if self.watchdog is not None:
+            self.watchdog.start()
+    
+    def stop(self) -> None:
+        """Stop monitoring."""
+        self._timer.stop()
+        self._last = None
+        if self.watchdog is not None:
+            self.watchdog.stop()
+    
+    def _beat(self) -> None:
+        """Record the gap since the previous heartbeat."""
+        now = time.perf_counter()
+        if self.watchdog is not None:
+            self.watchdog.beat()
+        if self._last is not None:
+            stall_ms = (now - self._last) * 1000 - self.interval_ms
+            if stall_ms > self.threshold_ms:
+                self.stalls += 1
+                self.total_stall_ms += stall_ms
+                self.max_stall_ms = max(self.max_stall_ms, stall_ms)
+                # Stalls the watchdog caught are logged by it, with the stack
+                if self.watchdog is None or stall_ms < self.watchdog.threshold * 1000:
+                    app_logger.warning("GUI thread stalled for %.1f ms", stall_ms)
+                self.stalled.emit(stall_ms)
+        self._last = now
+    
+    def stats(self) -> dict:
+        """
+        Get stall counters.
+        
+        Returns:
+            dict: stalls, max_stall_ms and total_stall_ms
+        """
+        return {
+            'stalls': self.stalls,
+            'max_stall_ms': self.max_stall_ms,
+            'total_stall_ms': self.total_stall_ms
+        }
@@ -0,0 +1,105 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Tuple
+
+class LookupCache:
+    """
+    Thread-safe LRU cache bound to a data generation.
+
+    Entries belong to the generation that was current when they were
+    stored. ``invalidate`` bumps the generation and drops every entry under
+    one lock, and values computed against an older generation are never
+    stored, so a refresh can not leave stale results behind.
+    """
+
+    def __init__(self, maxsize: int = 4096):
+        """
+        Initialize cache.
+
+        Args:
+            maxsize: Maximum number of entries before LRU eviction
+
+        Raises:
+            ValueError: If maxsize is not positive
+        """
+        if maxsize <= 0:
+            raise ValueError("Cache size must be greater than 0")
+
+        self.maxsize = maxsize
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @property
+    def generation(self) -> int:
+        """Current data generation."""
+        return self._generation
+
+    def get(self, generation: int, key: Hashable) -> Tuple[bool, Any]:
+        """
+        Look up a cached value.
+
+        Args:
+            generation: Generation the caller is reading from
+            key: Cache key
+
+        Returns:
+            Tuple[bool, Any]: Hit flag and cached value (None on miss)
+        """
+        with self._lock:
+            if generation == self._generation and key in self._entries:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return True, self._entries[key]
+            self._misses += 1
+            return False, None
+
+    def put(self, generation: int, key: Hashable, value: Any) -> None:
+        """
+        Store a value computed against a generation.
+
+        Args:
+            generation: Generation the value was computed from
+            key: Cache key
+            value: Value to cache
+        """
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def invalidate(self) -> int:
+        """
+        Drop all entries and start a new generation.
+
+        Returns:
+            int: The new generation
+        """
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+            return self._generation
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get cache counters.
+
+        Returns:
+            Dict[str, int]: Size, capacity, generation, hits, misses, evictions
+        """
+        with self._lock:
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'generation': self._generation,
+                'hits': self._hits,
+                'misses': self._misses,
+                'evictions': self._evictions
+            }
@@ -0,0 +1,246 @@
+import threading
+import time
+from http.cookiejar import DefaultCookiePolicy
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from config import Config
+from utils.profiling import Profiler, profiler as default_profiler
+
+# Only idempotent requests are retried: a timed-out order POST may still
+# have reached the broker, and sending it again would place it twice
+RETRY_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS'})
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+def endpoint_name(method: str, url: str) -> str:
+    """
+    Get the latency histogram name for a request.
+
+    Args:
+        method: HTTP method
+        url: Request URL (the query string is ignored)
+
+    Returns:
+        str: e.g. ``http GET margincalculator.angelbroking.com/OpenAPI_File/files/OpenAPIScripMaster.json``
+    """
+    parts = urlsplit(url)
+    return f"http {method.upper()} {parts.netloc}{parts.path or '/'}"
+
+class PooledSession(requests.Session):
+    """
+    Keep-alive session for one host.
+
+    Asks for gzip/deflate responses, applies default connect/read timeouts
+    to requests that do not set their own and records each request's
+    time to response headers in the profiler. Cookies are not kept, since
+    the session is shared by every client talking to the host.
+    """
+
+    def __init__(self, timeout: Tuple[float, float], adapter: HTTPAdapter, profiler: Profiler):
+        """
+        Initialize session.
+
+        Args:
+            timeout: Default (connect, read) timeout in seconds
+            adapter: Connection pool and retry policy for http and https
+            profiler: Profiler to record endpoint latency in
+        """
+        super().__init__()
+        self.timeout = timeout
+        self.profiler = profiler
+        self.headers['Accept-Encoding'] = 'gzip, deflate'
+        self.headers['Connection'] = 'keep-alive'
+        self.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        self.mount('https://', adapter)
+        self.mount('http://', adapter)
+
+    def request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        if kwargs.get('timeout') is None:
+            kwargs['timeout'] = self.timeout
+        start = time.perf_counter()
+        try:
+            return super().request(method, url, **kwargs)
+        finally:
+            self.profiler.record(endpoint_name(method, url), time.perf_counter() - start)
+
+class HttpTransport:
+    """
+    Shared HTTP transport.
+
+    Keeps one pooled keep-alive session per host, so the scrip master
+    download, every client's SmartAPI calls and the remote engine reuse
+    connections instead of opening one per request. Failed idempotent
+    requests are retried with exponential backoff; orders are not.
+    """
+
+    def __init__(
+        self,
+        connect_timeout: Optional[float] = None,
+        read_timeout: Optional[float] = None,
+        retries: Optional[int] = None,
+        backoff: Optional[float] = None,
+        pool_size: Optional[int] = None,
+        profiler: Optional[Profiler] = None
+    ):
+        """
+        Initialize transport.
+
+        Args:
+            connect_timeout: Connect timeout in seconds (defaults to
+                Config.HTTP_CONNECT_TIMEOUT)
+            read_timeout: Read timeout in seconds (defaults to
+                Config.HTTP_READ_TIMEOUT)
+            retries: Retries per idempotent request (defaults to
+                Config.HTTP_RETRIES)
+            backoff: Backoff factor in seconds (defaults to
+                Config.HTTP_BACKOFF)
+            pool_size: Connections kept per host (defaults to
+                Config.HTTP_POOL_SIZE)
+            profiler: Profiler to record endpoint latency in (defaults to
+                the shared profiler)
+        """
+        self.timeout = (
+            Config.HTTP_CONNECT_TIMEOUT if connect_timeout is None else connect_timeout,
+            Config.HTTP_READ_TIMEOUT if read_timeout is None else read_timeout
+        )
+        self.retries = Config.HTTP_RETRIES if retries is None else retries
+        self.backoff = Config.HTTP_BACKOFF if backoff is None else backoff
+        self.pool_size = Config.HTTP_POOL_SIZE if pool_size is None else pool_size
+        self.profiler = profiler or default_profiler
+        self._sessions: Dict[str, PooledSession] = {}
+        self._lock = threading.Lock()
+
+    def retry_policy(self) -> Retry:
+        """
+        Get the retry policy for new sessions.
+
+        Returns:
+            Retry: Retries connection errors, read errors and 429/5xx
+            responses of idempotent requests, honouring Retry-After
+        """
+        return Retry(
+            total=self.retries,
+            backoff_factor=self.backoff,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=RETRY_METHODS,
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+
+    def session(self, url: str) -> PooledSession:
+        """
+        Get the pooled session for a URL's host.
+
+        Args:
+            url: Any URL on the host
+
+        Returns:
+            PooledSession: Session shared by every request to the host
+        """
+        parts = urlsplit(url)
+        key = f"{parts.scheme}://{parts.netloc}"
+        session = self._sessions.get(key)
+        if session is None:
+            with self._lock:
+                session = self._sessions.get(key)
+                if session is None:
+                    adapter = HTTPAdapter(
+                        pool_connections=1,
+                        pool_maxsize=self.pool_size,
+                        max_retries=self.retry_policy()
+                    )
+                    session = PooledSession(self.timeout, adapter, self.profiler)
+                    self._sessions[key] = session
+        return session
+
+    def request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        """
+        Send a request on the host's pooled session.
+
+        Args:
+            method: HTTP method
+            url: Request URL
+            **kwargs: As for ``requests.request``
+
+        Returns:
+            requests.Response: The response
+        """
+        return self.session(url).request(method, url, **kwargs)
+
+    def get(self, url: str, **kwargs: Any) -> requests.Response:
+        """Send a GET request; see ``request``."""
+        return self.request('GET', url, **kwargs)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get connection reuse and endpoint latency.
+
+        Returns:
+            Dict[str, Any]: Per host (hosts) the requests sent, connections
+            opened and reuse ratio (share of requests sent on an already
+            open connection); per endpoint (endpoints) the latency summary
+        """
+        with self._lock:
+            sessions = dict(self._sessions)
+        hosts = {}
+        for key, session in sorted(sessions.items()):
+            sent = opened = 0
+            for adapter in set(session.adapters.values()):
+                pools = adapter.poolmanager.pools
+                for pool_key in pools.keys():
+                    pool = pools.get(pool_key)
+                    if pool is not None:
+                        sent += pool.num_requests
+                        opened += pool.num_connections
+            hosts[key] = {
+                'requests': sent,
+                'connections': opened,
+                'reuse_ratio': 1 - opened / sent if sent else None
+            }
+        endpoints = {
+            name: snapshot for name, snapshot in self.profiler.report().items()
+            if name.startswith('http ')
+        }
+        return {'hosts': hosts, 'endpoints': endpoints}
+
+    def close(self) -> None:
+        """Close every pooled connection."""
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions = {}
+        for session in sessions:
+            session.close()
+
+class RequestsShim:
+    """
+    Stand-in for the ``requests`` module that sends through a transport.
+
+    For libraries that call ``requests.request`` or ``requests.get``
+    directly; every other attribute is the real module's.
+    """
+
+    def __init__(self, transport: HttpTransport):
+        """
+        Initialize shim.
+
+        Args:
+            transport: Transport to send requests on
+        """
+        self._transport = transport
+
+    def request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        return self._transport.request(method, url, **kwargs)
+
+    def get(self, url: str, **kwargs: Any) -> requests.Response:
+        return self._transport.request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs: Any) -> requests.Response:
+        return self._transport.request('POST', url, **kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(requests, name)
+
+# Shared transport for the application
+transport = HttpTransport()
@@ -1,46 +1,167 @@
+import atexit
+import copy
+import json
 import logging
 import os
+import queue
+import time
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from config import Config
 
+_traceback_formatter = logging.Formatter()
+
+class JsonLinesFormatter(logging.Formatter):
+    """Format records as compact one-line JSON objects."""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        """
+        Format a record.
+        
+        Args:
+            record: Log record
+        
+        Returns:
+            str: JSON with ts, level, logger, thread, msg and, for
+            exceptions, exc
+        """
+        entry = {
+            'ts': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'thread': record.threadName,
+            'msg': record.getMessage()
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exc'] = record.exc_text
+        return json.dumps(entry, separators=(',', ':'), default=str)
+
+class SizeTimeRotatingFileHandler(RotatingFileHandler):
+    """
+    Rotating file handler that rolls over by size or age.
+    
+    The file is rotated once it would exceed ``max_bytes`` or once
+    ``interval`` seconds have passed since it was opened, whichever comes
+    first. Rotated files are numbered like RotatingFileHandler's
+    (``name.1`` is the newest) and at most ``backup_count`` are kept.
+    """
+    
+    def __init__(
+        self,
+        filename: str,
+        max_bytes: int,
+        backup_count: int,
+        interval: float = 24 * 3600,
+        encoding: str = 'utf-8'
+    ):
+        """
+        Initialize handler.
+        
+        Args:
+            filename: Log file path; it and its directory are created on
+                the first record
+            max_bytes: Size limit per file
+            backup_count: Rotated files kept
+            interval: Maximum age of a file in seconds
+            encoding: File encoding
+        """
+        super().__init__(
+            filename,
+            maxBytes=max_bytes,
+            backupCount=backup_count,
+            encoding=encoding,
+            delay=True
+        )
+        self.interval = interval
+        self.rollover_at = time.time() + interval
+    
+    def _open(self):
+        os.makedirs(os.path.dirname(self.baseFilename), exist_ok=True)
+        return super()._open()
+    
+    def shouldRollover(self, record: logging.LogRecord) -> bool:
+        if time.time() >= self.rollover_at:
+            return True
+        return bool(super().shouldRollover(record))
+    
+    def doRollover(self) -> None:
+        super().doRollover()
+        self.rollover_at = time.time() + self.interval
+
+class _QueueHandler(QueueHandler):
+    """
+    Queue handler that leaves formatting to the writer thread.
+    
+    The message and its arguments are merged by the listener's handlers,
+    so arguments should be values that are not changed after the call.
+    Only tracebacks are rendered up front, since they hold frames that
+    must not outlive the call.
+    """
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = _traceback_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+class _QueueListener(QueueListener):
+    """Queue listener that can be stopped more than once."""
+    
+    def stop(self) -> None:
+        if self._thread is not None:
+            super().stop()
+
 def setup_logger(name: str) -> logging.Logger:
     """
-    Set up a logger with file and console handlers.
+    Set up a logger whose records are written on a background thread.
+    
+    Callers only enqueue records; a QueueListener writes them as JSON
+    lines to ``<name>.jsonl`` in Config.LOG_DIR (rotated by size and age)
+    and as text to the console. Pass arguments %-style
+    (``logger.info("Placed %s", order_id)``) so messages below the log
+    level are never formatted.
     
     Args:
         name: The name of the logger
-        
+    
     Returns:
         logging.Logger: Configured logger instance
     """
     logger = logging.getLogger(name)
     logger.setLevel(getattr(logging, Config.LOG_LEVEL))
     
-    # Create formatters
-    file_formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    )
-    console_formatter = logging.Formatter(
-        '%(levelname)s: %(message)s'
-    )
-    
     # Create file handler
-    log_file = os.path.join(
-        Config.LOG_DIR,
-        f"{name}_{datetime.now().strftime('%Y%m%d')}.log"
+    file_handler = SizeTimeRotatingFileHandler(
+        os.path.join(Config.LOG_DIR, f"{name}.jsonl"),
+        max_bytes=Config.LOG_MAX_BYTES,
+        backup_count=Config.LOG_BACKUP_COUNT,
+        interval=Config.LOG_ROTATE_HOURS * 3600
     )
-    file_handler = logging.FileHandler(log_file)
-    file_handler.setFormatter(file_formatter)
+    file_handler.setFormatter(JsonLinesFormatter())
     file_handler.setLevel(logging.DEBUG)
     
     # Create console handler
     console_handler = logging.StreamHandler()
-    console_handler.setFormatter(console_formatter)
+    console_handler.setFormatter(logging.Formatter('%(levelname)s: %(message)s'))
     console_handler.setLevel(logging.INFO)
     
-    # Add handlers to logger
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
+    # Hand records to a background writer
+    records: queue.SimpleQueue = queue.SimpleQueue()
+    listener = _QueueListener(
+        records,
+        file_handler,
+        console_handler,
+        respect_handler_level=True
+    )
+    logger.addHandler(_QueueHandler(records))
+    listener.start()
+    # Drain the queue on exit
+    atexit.register(listener.stop)
+    logger.listener = listener
     
     return logger
 
@@ -56,7 +177,7 @@ def log_exception(logger: logging.Logger, exc: Exception, context: str = None):
         exc: The exception to log
         context: Additional context information
     """
-    message = f"Exception occurred: {str(exc)}"
     if context:
-        message = f"{context} - {message}"
-    logger.exception(message) 
\ No newline at end of file
+        logger.exception("%s - Exception occurred: %s", context, exc)
+    else:
+        logger.exception("Exception occurred: %s", exc)
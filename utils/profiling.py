@@ -0,0 +1,430 @@
+import functools
+import inspect
+import json
+import os
+import sys
+import threading
+import time
+import traceback
+from bisect import bisect_left
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+from config import Config
+from utils.logger import app_logger
+
+# Histogram bucket upper bounds in seconds: 50 us doubling up to ~52 s
+BUCKET_BOUNDS = tuple(0.00005 * 2 ** i for i in range(21))
+
+class LatencyHistogram:
+    """
+    Thread-safe latency histogram with fixed log-scale buckets.
+
+    Recording is a bisect and a counter increment, so it is cheap enough
+    to wrap every UI slot. Percentiles are estimated as the upper bound
+    of the bucket they fall in; the exact maximum is kept separately.
+    """
+
+    def __init__(self, bounds: Iterable[float] = BUCKET_BOUNDS):
+        """
+        Initialize histogram.
+
+        Args:
+            bounds: Ascending bucket upper bounds in seconds; one overflow
+                bucket is added above the last
+        """
+        self.bounds = tuple(bounds)
+        self._counts = [0] * (len(self.bounds) + 1)
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        """
+        Add one sample.
+
+        Args:
+            seconds: Latency in seconds
+        """
+        i = bisect_left(self.bounds, seconds)
+        with self._lock:
+            self._counts[i] += 1
+            self.count += 1
+            self.total += seconds
+            if seconds > self.max:
+                self.max = seconds
+
+    def percentile(self, q: float) -> Optional[float]:
+        """
+        Estimate a percentile.
+
+        Args:
+            q: Percentile between 0 and 100
+
+        Returns:
+            Optional[float]: Bucket upper bound in seconds (the maximum for
+            the overflow bucket), or None without samples
+        """
+        with self._lock:
+            if not self.count:
+                return None
+            rank = max(1, q / 100 * self.count)
+            seen = 0
+            for i, count in enumerate(self._counts):
+                seen += count
+                if seen >= rank:
+                    return min(self.bounds[i], self.max) if i < len(self.bounds) else self.max
+        return self.max
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Get a summary of the histogram.
+
+        Returns:
+            Dict[str, Any]: count, mean, p50, p90, p99, max (seconds) and
+            the non-empty buckets keyed by upper bound
+        """
+        with self._lock:
+            counts = list(self._counts)
+            count, total, maximum = self.count, self.total, self.max
+        buckets = {
+            (f"{self.bounds[i]:.6g}" if i < len(self.bounds) else 'inf'): n
+            for i, n in enumerate(counts) if n
+        }
+        return {
+            'count': count,
+            'mean': total / count if count else None,
+            'p50': self.percentile(50),
+            'p90': self.percentile(90),
+            'p99': self.percentile(99),
+            'max': maximum if count else None,
+            'buckets': buckets
+        }
+
+class Profiler:
+    """
+    Named latency histograms for instrumented calls.
+
+    Functions are timed with ``timer``, the ``timed`` decorator or by
+    patching a class with ``instrument``. Timings are recorded whether the
+    call returns or raises.
+    """
+
+    def __init__(self):
+        """Initialize profiler."""
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+        self.enabled = True
+
+    def histogram(self, name: str) -> LatencyHistogram:
+        """
+        Get or create a histogram.
+
+        Args:
+            name: Histogram name, e.g. ``MainWindow._on_buy``
+
+        Returns:
+            LatencyHistogram: The histogram
+        """
+        histogram = self._histograms.get(name)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(name, LatencyHistogram())
+        return histogram
+
+    def record(self, name: str, seconds: float) -> None:
+        """
+        Add one sample to a histogram.
+
+        Args:
+            name: Histogram name
+            seconds: Latency in seconds
+        """
+        if self.enabled:
+            self.histogram(name).record(seconds)
+
+    @contextmanager
+    def timer(self, name: str) -> Iterator[None]:
+        """
+        Time a block of code.
+
+        Args:
+            name: Histogram name
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def timed(self, name: Optional[str] = None) -> Callable:
+        """
+        Decorator timing every call of a function.
+
+        Args:
+            name: Histogram name (defaults to the function's qualified name)
+
+        Returns:
+            Callable: Decorator
+        """
+        def decorator(fn: Callable) -> Callable:
+            label = name or fn.__qualname__
+
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return fn(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    self.histogram(label).record(time.perf_counter() - start)
+
+            wrapper.__profiled__ = True
+            return wrapper
+        return decorator
+
+    def instrument(
+        self,
+        cls: type,
+        methods: Optional[Iterable[str]] = None,
+        prefix: Optional[str] = None
+    ) -> List[str]:
+        """
+        Time methods of a class in place.
+
+        Instrument before instances connect bound methods to signals, so
+        the connections pick up the timed versions. Instrumenting a method
+        twice has no effect.
+
+        Args:
+            cls: Class to patch
+            methods: Method names (defaults to every public method defined
+                on the class itself)
+            prefix: Histogram name prefix (defaults to the class name)
+
+        Returns:
+            List[str]: Names of the methods instrumented by this call
+        """
+        prefix = prefix or cls.__name__
+        if methods is None:
+            methods = [
+                name for name, value in vars(cls).items()
+                if not name.startswith('_') and callable(value)
+            ]
+
+        patched = []
+        for name in methods:
+            raw = inspect.getattr_static(cls, name, None)
+            wrap = None
+            if isinstance(raw, (staticmethod, classmethod)):
+                fn, wrap = raw.__func__, type(raw)
+            else:
+                fn = raw
+            if not callable(fn) or getattr(fn, '__profiled__', False):
+                continue
+            timed = self.timed(f"{prefix}.{name}")(fn)
+            setattr(cls, name, wrap(timed) if wrap else timed)
+            patched.append(name)
+        return patched
+
+    def reset(self) -> None:
+        """Drop every histogram."""
+        with self._lock:
+            self._histograms = {}
+
+    def report(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get every histogram's summary.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Snapshot per histogram name
+        """
+        with self._lock:
+            histograms = dict(self._histograms)
+        return {name: histograms[name].snapshot() for name in sorted(histograms)}
+
+    def format_report(self) -> str:
+        """
+        Format the histograms as a text table in milliseconds.
+
+        Returns:
+            str: One line per histogram, slowest p99 first
+        """
+        def ms(value: Optional[float]) -> str:
+            return f"{value * 1000:>9.2f}" if value is not None else f"{'-':>9}"
+
+        rows = sorted(
+            self.report().items(),
+            key=lambda item: item[1]['p99'] or 0,
+            reverse=True
+        )
+        lines = [f"{'call':<44}{'count':>8}{'mean':>9}{'p50':>9}{'p90':>9}{'p99':>9}{'max':>9}"]
+        for name, stats in rows:
+            lines.append(
+                f"{name:<44}{stats['count']:>8}{ms(stats['mean'])}{ms(stats['p50'])}"
+                f"{ms(stats['p90'])}{ms(stats['p99'])}{ms(stats['max'])}"
+            )
+        return '\n'.join(lines)
+
+def _blame(stack: traceback.StackSummary) -> str:
+    """Name the innermost application frame of a stack (else the innermost)."""
+    if not stack:
+        return '?'
+    frame = next(
+        (f for f in reversed(stack) if f.filename.startswith(Config.BASE_DIR)),
+        stack[-1]
+    )
+    return f"{frame.name} ({os.path.basename(frame.filename)}:{frame.lineno})"
+
+class EventLoopWatchdog:
+    """
+    Detects event-loop stalls and captures the blocking stack.
+
+    The watched thread calls ``beat`` from its event loop (e.g. from a
+    short timer). A background thread checks the time since the last beat;
+    once it exceeds ``threshold_ms`` the watched thread's current stack is
+    captured with ``sys._current_frames`` while it is still blocked. The
+    stall's full duration is recorded when beats resume.
+    """
+
+    def __init__(
+        self,
+        thread_id: Optional[int] = None,
+        threshold_ms: Optional[float] = None,
+        profiler: Optional[Profiler] = None,
+        max_events: int = 50
+    ):
+        """
+        Initialize watchdog.
+
+        Args:
+            thread_id: Thread to watch (defaults to the calling thread)
+            threshold_ms: Stall length that triggers a capture (defaults to
+                Config.WATCHDOG_STALL_MS)
+            profiler: Profiler receiving ``event_loop.stall`` durations
+            max_events: Stall events kept, oldest dropped first
+        """
+        self.thread_id = thread_id or threading.get_ident()
+        self.threshold = (threshold_ms or Config.WATCHDOG_STALL_MS) / 1000
+        self.profiler = profiler
+        self.events: deque = deque(maxlen=max_events)
+        self._last_beat = time.monotonic()
+        self._current: Optional[Dict[str, Any]] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start the watchdog thread."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._last_beat = time.monotonic()
+        self._thread = threading.Thread(target=self._run, name='event-loop-watchdog', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the watchdog thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(1)
+            self._thread = None
+
+    def beat(self) -> None:
+        """Signal that the watched event loop is responsive."""
+        now = time.monotonic()
+        with self._lock:
+            event = self._current
+            self._current = None
+            self._last_beat = now
+        if event is not None:
+            event['duration_ms'] = (now - event['_started']) * 1000
+            if self.profiler is not None:
+                self.profiler.record('event_loop.stall', event['duration_ms'] / 1000)
+            app_logger.warning(
+                "Event loop stalled for %.0f ms in %s", event['duration_ms'], event['where']
+            )
+
+    def _run(self) -> None:
+        """Poll for stalls until stopped."""
+        interval = self.threshold / 4
+        while not self._stop.wait(interval):
+            self.check()
+
+    def check(self) -> Optional[Dict[str, Any]]:
+        """
+        Capture the watched thread's stack if it is stalled.
+
+        Returns:
+            Optional[Dict[str, Any]]: The new stall event, or None
+        """
+        now = time.monotonic()
+        with self._lock:
+            if self._current is not None or now - self._last_beat < self.threshold:
+                return None
+            started = self._last_beat
+
+            frame = sys._current_frames().get(self.thread_id)
+            stack = traceback.extract_stack(frame) if frame is not None else []
+            event = {
+                'at': datetime.now().isoformat(timespec='milliseconds'),
+                'duration_ms': None,
+                'where': _blame(stack),
+                'stack': ''.join(stack.format()) if stack else '',
+                '_started': started
+            }
+            self._current = event
+            self.events.append(event)
+        return event
+
+    def stalls(self) -> List[Dict[str, Any]]:
+        """
+        Get recorded stall events, oldest first.
+
+        Returns:
+            List[Dict[str, Any]]: at, duration_ms (None while ongoing),
+            where and the captured stack
+        """
+        with self._lock:
+            return [
+                {key: value for key, value in event.items() if not key.startswith('_')}
+                for event in self.events
+            ]
+
+def dump(
+    path: Optional[str] = None,
+    watchdog: Optional[EventLoopWatchdog] = None,
+    source: Optional[Profiler] = None
+) -> str:
+    """
+    Write histograms and stall events to a JSON file.
+
+    Args:
+        path: Output file (defaults to diagnostics_<timestamp>.json in
+            Config.LOG_DIR)
+        watchdog: Watchdog whose stalls to include
+        source: Profiler to dump (defaults to the shared profiler)
+
+    Returns:
+        str: Path written
+    """
+    if path is None:
+        os.makedirs(Config.LOG_DIR, exist_ok=True)
+        path = os.path.join(
+            Config.LOG_DIR,
+            f"diagnostics_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        )
+    payload = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'latency': (source or profiler).report(),
+        'stalls': watchdog.stalls() if watchdog is not None else []
+    }
+    with open(path, 'w') as f:
+        json.dump(payload, f, indent=2)
+    return path
+
+# Shared profiler for the application
+profiler = Profiler()